@@ -1,4 +1,4 @@
-from flask import Flask, send_from_directory
+from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from flask_cors import CORS
 from flask_migrate import Migrate
@@ -69,11 +69,50 @@ def create_app():
     app.register_blueprint(test_runner_bp, url_prefix='/api/admin')
     app.register_blueprint(emails_bp, url_prefix='/api')
     
-    # Static file serving for uploads
+    # Product autocomplete index, built off the request path (SUGGEST_WARMUP=false to build on first use)
+    from app.utils.product_suggest import suggest_warmup_enabled, build_suggest_index
+    if suggest_warmup_enabled():
+        import threading
+        
+        def _build_suggest_index():
+            try:
+                build_suggest_index(app, if_unbuilt=True)
+            except Exception as e:
+                print(f"⚠️  Suggest index warm-up failed: {str(e)}")
+        
+        threading.Thread(target=_build_suggest_index, daemon=True).start()
+    
+    # Sales, like and review counters on Product, updated in the same transaction as their sources
+    from app.utils.product_counters import install_product_counters
+    install_product_counters()
+
+    # Reference counts of upload blobs, updated in the same transaction as the records holding their URLs
+    from app.utils.upload_store import install_upload_refcounts
+    install_upload_refcounts()
+    
+    # Stored home page payload, rebuilt per section after commits that change it
+    from app.utils.home_snapshot import install_home_snapshot
+    install_home_snapshot(app)
+    
+    # Compiled theme + settings stylesheet, rebuilt after commits that change them
+    from app.utils.site_stylesheet import install_site_stylesheet
+    install_site_stylesheet(app)
+    
+    # Product image variants are recorded once the product and its derivatives both exist
+    from app.utils.image_derivatives import install_image_variants
+    install_image_variants(app)
+    
+    # SQL statement count per response, for pinning endpoints in tests (QUERY_COUNT_HEADER=true)
+    from app.utils.query_counter import query_count_header_enabled, install_query_count_header
+    if query_count_header_enabled():
+        install_query_count_header(app)
+    
+    # Static file serving for uploads (cache headers, ETag/304, byte ranges, optional nginx offload)
     @app.route('/uploads/<path:filename>')
     def uploaded_file(filename):
+        from app.utils.upload_serving import serve_upload
         # Serve from the uploads folder one level up from app/
         upload_folder = os.path.join(os.path.dirname(app.root_path), 'uploads')
-        return send_from_directory(upload_folder, filename)
+        return serve_upload(upload_folder, filename)
     
     return app 
\ No newline at end of file
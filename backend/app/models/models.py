@@ -24,6 +24,9 @@ class User(db.Model):
     cancelled_orders = db.relationship('Order', foreign_keys='Order.cancelled_by', backref='canceller', lazy=True)
     addresses = db.relationship('UserAddress', backref='user', lazy=True, cascade='all, delete-orphan')
     
+    # Admin user list pages by (created_at, id)
+    __table_args__ = (db.Index('ix_user_created_at_id', 'created_at', 'id'),)
+    
     def set_password(self, password):
         self.password_hash = generate_password_hash(password)
     
@@ -43,6 +46,14 @@ class Category(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     products = db.relationship('Product', backref='category', lazy=True)
+    
+    @staticmethod
+    def product_counts(active_only=False):
+        """{category_id: number of products} from one grouped query; empty categories are missing"""
+        query = db.session.query(Product.category_id, db.func.count(Product.id))
+        if active_only:
+            query = query.filter(Product.is_active == True)
+        return dict(query.group_by(Product.category_id).all())
 
 class Product(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -54,6 +65,7 @@ class Product(db.Model):
     stock_quantity = db.Column(db.Integer, default=0)
     category_id = db.Column(db.Integer, db.ForeignKey('category.id'), nullable=False)
     images = db.Column(db.JSON)  # Array of image URLs
+    image_variants = db.Column(db.JSON)  # {image_url: {thumb|card|detail|zoom: {width, height, webp, jpeg}}}
     video_url = db.Column(db.String(255))  # Single video URL
     is_featured = db.Column(db.Boolean, default=False)
     is_active = db.Column(db.Boolean, default=True)
@@ -71,11 +83,46 @@ class Product(db.Model):
     dimensions = db.Column(db.String(100))  # Size information
     material = db.Column(db.String(100))  # Material information
     
+    # Denormalized counters, kept in step by app/utils/product_counters.py
+    # (reconcile_product_counters.py recomputes them from scratch)
+    units_sold = db.Column(db.Integer, nullable=False, default=0)  # Excludes cancelled/returned orders
+    revenue = db.Column(db.Float, nullable=False, default=0.0)
+    order_count = db.Column(db.Integer, nullable=False, default=0)  # Order lines containing the product
+    like_count = db.Column(db.Integer, nullable=False, default=0)
+    review_count = db.Column(db.Integer, nullable=False, default=0)  # Approved reviews
+    rating_total = db.Column(db.Integer, nullable=False, default=0)  # Sum of approved ratings
+    # Approved reviews per star rating
+    rating_1_count = db.Column(db.Integer, nullable=False, default=0)
+    rating_2_count = db.Column(db.Integer, nullable=False, default=0)
+    rating_3_count = db.Column(db.Integer, nullable=False, default=0)
+    rating_4_count = db.Column(db.Integer, nullable=False, default=0)
+    rating_5_count = db.Column(db.Integer, nullable=False, default=0)
+    
     # Relationships
     product_variations = db.relationship('ProductVariation', backref='product', lazy=True, cascade='all, delete-orphan')
     
+    # Catalog browse (per category or all, by date or price) and the home page featured row
+    __table_args__ = (
+        db.Index('ix_product_active_category_created', 'is_active', 'category_id', 'created_at'),
+        db.Index('ix_product_active_created_id', 'is_active', 'created_at', 'id'),
+        db.Index('ix_product_active_price_id', 'is_active', 'price', 'id'),
+        db.Index('ix_product_featured_active', 'is_featured', 'is_active'),
+    )
+    
+    @property
+    def rating_average(self):
+        return round(self.rating_total / self.review_count, 2) if self.review_count else None
+    
+    def review_summary(self):
+        """Review count, average and star histogram, from the maintained counters (no query)"""
+        return {
+            'review_count': self.review_count,
+            'average_rating': self.rating_average,
+            'histogram': {str(star): getattr(self, f'rating_{star}_count') for star in range(5, 0, -1)}
+        }
+    
     def get_like_count(self):
-        return ProductLike.query.filter_by(product_id=self.id).count()
+        return self.like_count
     
     def is_liked_by_user(self, user_id):
         if not user_id:
@@ -168,6 +215,13 @@ class Order(db.Model):
     shipping_address_obj = db.relationship('UserAddress', foreign_keys=[shipping_address_id], lazy=True)
     billing_address_obj = db.relationship('UserAddress', foreign_keys=[billing_address_id], lazy=True)
     
+    # A user's order history, dashboard status counts and the admin order list
+    __table_args__ = (
+        db.Index('ix_order_user_created', 'user_id', 'created_at'),
+        db.Index('ix_order_status', 'status'),
+        db.Index('ix_order_created_at_id', 'created_at', 'id'),
+    )
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -221,6 +275,12 @@ class OrderItem(db.Model):
     # Relationships
     product = db.relationship('Product', backref='order_items')
     
+    # Items of an order, and sales of a product
+    __table_args__ = (
+        db.Index('ix_order_item_order', 'order_id'),
+        db.Index('ix_order_item_product', 'product_id'),
+    )
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -254,11 +314,14 @@ class BlogPost(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # Denormalized like counter, kept in step by app/utils/product_counters.py
+    like_count = db.Column(db.Integer, nullable=False, default=0)
+    
     # Relationships
     likes = db.relationship('BlogLike', backref='blog_post', lazy=True, cascade='all, delete-orphan')
     
     def get_like_count(self):
-        return BlogLike.query.filter_by(blog_post_id=self.id).count()
+        return self.like_count
     
     def is_liked_by_user(self, user_id):
         if not user_id:
@@ -304,8 +367,11 @@ class ProductReview(db.Model):
     user = db.relationship('User', backref='product_reviews', lazy=True)
     product = db.relationship('Product', backref='reviews', lazy=True)
     
-    # Unique constraint to prevent duplicate reviews from same user
-    __table_args__ = (db.UniqueConstraint('product_id', 'user_id', name='unique_product_review'),)
+    # Unique constraint to prevent duplicate reviews from same user; approved reviews of a product, newest first
+    __table_args__ = (
+        db.UniqueConstraint('product_id', 'user_id', name='unique_product_review'),
+        db.Index('ix_product_review_product_approved_created', 'product_id', 'is_approved', 'created_at'),
+    )
 
 class ContactMessage(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -316,6 +382,8 @@ class ContactMessage(db.Model):
     is_read = db.Column(db.Boolean, default=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+# Legacy settings row, only read to import it: the fields and their defaults are declared in
+# utils/settings_fields.py and the values are stored per section in SettingsSection
 class SiteSettings(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     
@@ -857,6 +925,12 @@ class Cart(db.Model):
     items = db.relationship('CartItem', backref='cart', lazy=True, cascade='all, delete-orphan')
     user = db.relationship('User', backref='carts', lazy=True)
     
+    # Guest carts are found by session, signed-in carts by user
+    __table_args__ = (
+        db.Index('ix_cart_session', 'session_id'),
+        db.Index('ix_cart_user', 'user_id'),
+    )
+    
     def to_dict(self):
         items_list = getattr(self, 'items', []) or []
         return {
@@ -882,6 +956,9 @@ class CartItem(db.Model):
     # Relationships
     product = db.relationship('Product', lazy=True)
     
+    # Cart contents and the "already in cart?" lookup
+    __table_args__ = (db.Index('ix_cart_item_cart_product', 'cart_id', 'product_id'),)
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -953,6 +1030,9 @@ class Invoice(db.Model):
     user = db.relationship('User', backref='invoices', lazy=True)
     invoice_items = db.relationship('InvoiceItem', backref='invoice', lazy=True, cascade='all, delete-orphan')
     
+    # Admin invoice list pages by (invoice_date, id)
+    __table_args__ = (db.Index('ix_invoice_date_id', 'invoice_date', 'id'),)
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -1122,6 +1202,9 @@ class EmailQueue(db.Model):
     invoice_id = db.Column(db.Integer, db.ForeignKey('invoice.id'))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # The sender takes pending emails by priority, oldest first
+    __table_args__ = (db.Index('ix_email_queue_status_priority_created', 'status', 'priority', 'created_at'),)
 
 class EmailLog(db.Model):
     """Log of all sent emails for analytics and tracking"""
@@ -1141,6 +1224,9 @@ class EmailLog(db.Model):
     order_id = db.Column(db.Integer, db.ForeignKey('order.id'))
     invoice_id = db.Column(db.Integer, db.ForeignKey('invoice.id'))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    # Rate limiting counts sent emails in the last hour/day
+    __table_args__ = (db.Index('ix_email_log_status_created', 'status', 'created_at'),)
 
 class EmailSettings(db.Model):
     """Email configuration settings"""
@@ -1215,4 +1301,26 @@ class EmailSubscriber(db.Model):
     total_emails_clicked = db.Column(db.Integer, default=0)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'))  # If subscriber is also a user
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow) 
\ No newline at end of file
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class PageSnapshot(db.Model):
+    """Precomputed JSON payload of a page, stored per section and rebuilt when its data changes"""
+    key = db.Column(db.String(50), primary_key=True)  # 'home'
+    sections = db.Column(db.JSON, nullable=False, default=dict)  # {section: payload}
+    section_built_at = db.Column(db.JSON, nullable=False, default=dict)  # {section: ISO timestamp}
+    version = db.Column(db.Integer, nullable=False, default=1)  # Bumped on every rebuild
+    etag = db.Column(db.String(64), nullable=False)  # Hash of sections
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class SettingsSection(db.Model):
+    """One section of the site settings (header, footer, ...) stored as a JSON document of its fields"""
+    section = db.Column(db.String(50), primary_key=True)  # 'header', see utils/settings_fields.py
+    data = db.Column(db.JSON, nullable=False, default=dict)  # {field: value}, unset fields use their default
+    version = db.Column(db.Integer, nullable=False, default=1)  # Bumped on every write to this section
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class UploadBlob(db.Model):
+    """Number of references to an upload blob, kept in step with the records that hold its URL"""
+    url = db.Column(db.String(255), primary_key=True)  # /uploads/blobs/ab/<sha256>.<ext>
+    refcount = db.Column(db.Integer, nullable=False, default=0)  # No row means nothing references the blob
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -1,4 +1,4 @@
-from flask import Blueprint, request, jsonify, send_file
+from flask import Blueprint, request, jsonify, send_file, current_app
 from app.models.models import User, Product, Category, Order, ContactMessage, SiteSettings, UserAddress, Invoice
 from app import db
 import jwt
@@ -7,6 +7,10 @@ from functools import wraps
 import pandas as pd
 from io import BytesIO
 from datetime import datetime
+from app.utils.image_derivatives import get_derivative_pipeline, record_product_variants
+from app.utils.upload_store import get_upload_store
+from app.utils.response_cache import get_response_cache, invalidates
+from app.utils.keyset import CursorError, count_rows, cursor_requested, keyset_page
 
 admin_bp = Blueprint('admin', __name__)
 
@@ -301,6 +305,7 @@ def filter_empty_variations(variation_options):
 
 @admin_bp.route('/products', methods=['POST'])
 @admin_required
+@invalidates('products')
 def create_admin_product():
     try:
         # Safely get JSON data
@@ -335,6 +340,7 @@ def create_admin_product():
             dimensions=data.get('dimensions', ''),
             material=data.get('material', '')
         )
+        record_product_variants(product)
         
         db.session.add(product)
         db.session.commit()
@@ -347,6 +353,7 @@ def create_admin_product():
 
 @admin_bp.route('/products/<int:product_id>', methods=['PUT'])
 @admin_required
+@invalidates('products')
 def update_admin_product(product_id):
     try:
         product = Product.query.get_or_404(product_id)
@@ -367,6 +374,7 @@ def update_admin_product(product_id):
             product.category_id = data['category_id']
         if 'images' in data:
             product.images = data['images']
+            record_product_variants(product)
         if 'video_url' in data:
             product.video_url = data['video_url']
 
@@ -399,6 +407,7 @@ def update_admin_product(product_id):
 
 @admin_bp.route('/products/<int:product_id>', methods=['DELETE'])
 @admin_required
+@invalidates('products')
 def delete_admin_product(product_id):
     try:
         product = Product.query.get_or_404(product_id)
@@ -413,6 +422,7 @@ def delete_admin_product(product_id):
 
 @admin_bp.route('/products/import-excel', methods=['POST'])
 @admin_required
+@invalidates('products')
 def import_products_excel():
     """Import products from Excel file"""
     try:
@@ -515,6 +525,7 @@ def import_products_excel():
                         product.stock_quantity = int(row['Stock Quantity']) if not pd.isna(row['Stock Quantity']) else 0
                         product.category_id = int(row['Category ID'])
                         product.images = images
+                        record_product_variants(product)
                         product.video_url = str(row['Video URL']) if not pd.isna(row['Video URL']) else None
                         product.is_featured = str_to_bool(row['Is Featured'])
                         product.is_active = str_to_bool(row['Is Active']) if not pd.isna(row['Is Active']) else True
@@ -552,6 +563,7 @@ def import_products_excel():
                     dimensions=str(row['Dimensions']) if not pd.isna(row['Dimensions']) else '',
                     material=str(row['Material']) if not pd.isna(row['Material']) else ''
                 )
+                record_product_variants(product)
                 
                 db.session.add(product)
                 success_count += 1
@@ -632,22 +644,40 @@ def get_admin_users():
         elif is_admin_filter == 'false':
             query = query.filter(User.is_admin == False)
         
-        # Order by creation date (newest first)
-        query = query.order_by(User.created_at.desc())
-        
-        # Get total count before pagination
-        total_users = query.count()
-        
-        # Apply pagination
-        users_paginated = query.paginate(
-            page=page,
-            per_page=per_page,
-            error_out=False
-        )
+        if cursor_requested():
+            # Keyset page: ?cursor= first, then next_cursor; ?total=exact|approx adds a total
+            keyset = keyset_page(query, User.created_at, User.id, 'newest', True,
+                                 per_page, request.args.get('cursor'))
+            users = keyset['items']
+            pagination = {
+                'per_page': per_page,
+                'next_cursor': keyset['next_cursor'],
+                'has_next': keyset['has_next'],
+                **count_rows(query, request.args.get('total'))
+            }
+        else:
+            # Order by creation date (newest first)
+            query = query.order_by(User.created_at.desc(), User.id.desc())
+            
+            # Apply pagination (paginate runs the count itself)
+            users_paginated = query.paginate(
+                page=page,
+                per_page=per_page,
+                error_out=False
+            )
+            users = users_paginated.items
+            pagination = {
+                'page': page,
+                'per_page': per_page,
+                'total': users_paginated.total,
+                'pages': users_paginated.pages,
+                'has_next': users_paginated.has_next,
+                'has_prev': users_paginated.has_prev
+            }
         
         # Format users data
         users_data = []
-        for user in users_paginated.items:
+        for user in users:
             # Get user statistics
             user_orders = Order.query.filter_by(user_id=user.id).count()
             user_total_spent = db.session.query(db.func.sum(Order.total_amount)).filter_by(user_id=user.id, payment_status='paid').scalar() or 0
@@ -669,14 +699,11 @@ def get_admin_users():
         
         return jsonify({
             'users': users_data,
-            'page': page,
-            'per_page': per_page,
-            'total': total_users,
-            'pages': users_paginated.pages,
-            'has_next': users_paginated.has_next,
-            'has_prev': users_paginated.has_prev
+            **pagination
         })
         
+    except CursorError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         print(f'❌ Error fetching users: {str(e)}')
         return jsonify({'error': str(e)}), 500
@@ -1136,8 +1163,6 @@ def create_invoice_from_order_admin(order_id):
 def upload_product_images():
     try:
         from werkzeug.utils import secure_filename
-        import uuid
-        from flask import current_app
         
         # Check for both 'files' and 'images' field names
         files = request.files.getlist('files') or request.files.getlist('images')
@@ -1148,10 +1173,6 @@ def upload_product_images():
         if all(f.filename == '' for f in files):
             return jsonify({'error': 'No files selected'}), 400
         
-        # Create upload folders
-        upload_dir = os.path.join(os.path.dirname(current_app.root_path), 'uploads', 'products')
-        os.makedirs(upload_dir, exist_ok=True)
-        
         uploaded_files = []
         allowed_extensions = {'png', 'jpg', 'jpeg', 'gif', 'webp'}
         
@@ -1164,23 +1185,22 @@ def upload_product_images():
             if file_ext not in allowed_extensions:
                 continue
             
-            # Generate unique filename
-            filename = f"{uuid.uuid4().hex}.{file_ext}"
-            
-            # Save file
-            file_path = os.path.join(upload_dir, filename)
-            file.save(file_path)
+            # Store by content hash - identical files share one blob
+            stored = get_upload_store().save_file(file, file_ext)
             
             # Add file info to list
-            url = f'/uploads/products/{filename}'
             uploaded_files.append({
-                'filename': filename,
-                'url': url
+                'filename': stored['url'].rsplit('/', 1)[1],
+                'url': stored['url'],
+                'deduplicated': stored['deduplicated']
             })
         
         if not uploaded_files:
             return jsonify({'error': 'No valid image files uploaded'}), 400
         
+        # Thumbnails / card / detail / zoom variants are built off the request path
+        get_derivative_pipeline().submit([f['url'] for f in uploaded_files], current_app._get_current_object())
+        
         return jsonify({
             'message': f'{len(uploaded_files)} product images uploaded successfully',
             'files': uploaded_files
@@ -1194,8 +1214,6 @@ def upload_product_images():
 def upload_product_video():
     try:
         from werkzeug.utils import secure_filename
-        import uuid
-        from flask import current_app
         
         # Check for both 'file' and 'video' field names
         file = request.files.get('file') or request.files.get('video')
@@ -1212,19 +1230,8 @@ def upload_product_video():
         if file_ext not in allowed_extensions:
             return jsonify({'error': 'Invalid file type. Only videos are allowed.'}), 400
         
-        # Create upload folders
-        upload_dir = os.path.join(os.path.dirname(current_app.root_path), 'uploads', 'videos')
-        os.makedirs(upload_dir, exist_ok=True)
-        
-        # Generate unique filename
-        filename = f"{uuid.uuid4().hex}.{file_ext}"
-        
-        # Save file
-        file_path = os.path.join(upload_dir, filename)
-        file.save(file_path)
-        
-        # Return the URL path
-        url = f'/uploads/videos/{filename}'
+        # Store by content hash - videos are streamed to disk, never held in memory
+        url = get_upload_store().save_file(file, file_ext)['url']
         
         return jsonify({
             'message': 'Product video uploaded successfully',
@@ -1233,4 +1240,25 @@ def upload_product_video():
         })
     
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
\ No newline at end of file
+        return jsonify({'error': str(e)}), 500
+
+@admin_bp.route('/cache/stats', methods=['GET'])
+@admin_required
+def get_response_cache_stats():
+    """Response cache hit/miss counters and size for this worker"""
+    try:
+        return jsonify(get_response_cache().stats())
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@admin_bp.route('/cache', methods=['DELETE'])
+@admin_required
+def clear_response_cache():
+    """Drop every cached response"""
+    try:
+        removed = get_response_cache().clear()
+        print(f"🧹 Response cache cleared ({removed} entries)")
+        return jsonify({'message': 'Response cache cleared', 'removed': removed})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
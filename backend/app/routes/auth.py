@@ -311,8 +311,8 @@ def google_auth():
         # Verify the Google token
         try:
             # Get Google OAuth settings from database
-            from app.models.models import SiteSettings
-            site_settings = SiteSettings.query.first()
+            from app.utils.settings_store import get_settings_store
+            site_settings = get_settings_store().load()
             
             if not site_settings or not site_settings.google_oauth_enabled:
                 return jsonify({'error': 'Google OAuth is disabled in site settings.'}), 400
@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify
 from app.models.models import Category, Product, User
 from app import db
+from app.utils.response_cache import invalidates
 import jwt
 import os
 from functools import wraps
@@ -42,6 +43,7 @@ def get_categories():
         print('🔍 DEBUG: Fetching categories from database...')
         categories = Category.query.all()
         print(f'📋 DEBUG: Found {len(categories)} categories')
+        product_counts = Category.product_counts()
         
         categories_data = [{
             'id': c.id,
@@ -52,7 +54,7 @@ def get_categories():
             'background_image_url': c.background_image_url,
             'is_active': c.is_active,
             'sort_order': c.sort_order,
-            'product_count': Product.query.filter_by(category_id=c.id).count()
+            'product_count': product_counts.get(c.id, 0)
         } for c in categories]
         
         print(f'📋 DEBUG: Categories data: {[cat["name"] for cat in categories_data]}')
@@ -67,6 +69,7 @@ def get_categories():
 
 @categories_bp.route('/categories', methods=['POST'])
 @admin_required
+@invalidates('categories', 'products')
 def create_category():
     try:
         # Safely get JSON data
@@ -114,6 +117,7 @@ def create_category():
 
 @categories_bp.route('/categories/<int:category_id>', methods=['PUT'])
 @admin_required
+@invalidates('categories', 'products')
 def update_category(category_id):
     try:
         category = Category.query.get_or_404(category_id)
@@ -174,6 +178,7 @@ def update_category(category_id):
 
 @categories_bp.route('/categories/<int:category_id>', methods=['DELETE'])
 @admin_required
+@invalidates('categories', 'products')
 def delete_category(category_id):
     try:
         category = Category.query.get_or_404(category_id)
@@ -200,7 +205,7 @@ def get_category_analytics():
     try:
         from sqlalchemy import func
         
-        # Get category analytics
+        # Get category analytics; sales come from the maintained product counters
         category_analytics = db.session.query(
             Category.id,
             Category.name,
@@ -209,39 +214,16 @@ def get_category_analytics():
             func.sum(Product.stock_quantity).label('total_stock'),
             func.avg(Product.price).label('avg_price'),
             func.min(Product.price).label('min_price'),
-            func.max(Product.price).label('max_price')
+            func.max(Product.price).label('max_price'),
+            func.sum(Product.order_count).label('total_orders'),
+            func.sum(Product.units_sold).label('total_sold'),
+            func.sum(Product.revenue).label('total_revenue')
         ).outerjoin(Product, Category.id == Product.category_id)\
          .group_by(Category.id)\
          .all()
         
-        # Get order analytics per category
-        from app.models.models import Order, OrderItem
-        order_analytics = db.session.query(
-            Category.id,
-            func.count(OrderItem.id).label('total_orders'),
-            func.sum(OrderItem.quantity).label('total_sold'),
-            func.sum(OrderItem.price * OrderItem.quantity).label('total_revenue')
-        ).join(Product, Category.id == Product.category_id)\
-         .join(OrderItem, Product.id == OrderItem.product_id)\
-         .join(Order, OrderItem.order_id == Order.id)\
-         .group_by(Category.id)\
-         .all()
-        
-        # Convert to dictionaries
-        order_data = {row.id: {
-            'total_orders': row.total_orders,
-            'total_sold': row.total_sold,
-            'total_revenue': float(row.total_revenue) if row.total_revenue else 0
-        } for row in order_analytics}
-        
         analytics_data = []
         for row in category_analytics:
-            category_orders = order_data.get(row.id, {
-                'total_orders': 0,
-                'total_sold': 0,
-                'total_revenue': 0
-            })
-            
             analytics_data.append({
                 'id': row.id,
                 'name': row.name,
@@ -251,9 +233,9 @@ def get_category_analytics():
                 'avg_price': float(row.avg_price) if row.avg_price else 0,
                 'min_price': float(row.min_price) if row.min_price else 0,
                 'max_price': float(row.max_price) if row.max_price else 0,
-                'total_orders': category_orders['total_orders'],
-                'total_sold': category_orders['total_sold'],
-                'total_revenue': category_orders['total_revenue']
+                'total_orders': row.total_orders or 0,
+                'total_sold': row.total_sold or 0,
+                'total_revenue': float(row.total_revenue) if row.total_revenue else 0
             })
         
         return jsonify({
@@ -271,6 +253,7 @@ def get_category_analytics():
 
 @categories_bp.route('/categories/bulk-operations', methods=['POST'])
 @admin_required
+@invalidates('categories', 'products')
 def bulk_category_operations():
     try:
         data = request.get_json()
@@ -295,8 +278,9 @@ def bulk_category_operations():
             
         elif operation == 'delete':
             # Check if any category has products
+            product_counts = Category.product_counts()
             for category in categories:
-                product_count = Product.query.filter_by(category_id=category.id).count()
+                product_count = product_counts.get(category.id, 0)
                 if product_count > 0:
                     return jsonify({
                         'error': f'Cannot delete category "{category.name}". It has {product_count} products.'
@@ -318,6 +302,7 @@ def bulk_category_operations():
 
 @categories_bp.route('/categories/reorder', methods=['POST'])
 @admin_required
+@invalidates('categories', 'products')
 def reorder_categories():
     try:
         data = request.get_json()
@@ -7,6 +7,7 @@ from functools import wraps
 from datetime import datetime, timedelta
 import uuid
 from app.utils.invoice_pdf import generate_invoice_pdf
+from app.utils.keyset import CursorError, count_rows, cursor_requested, keyset_page
 
 invoices_bp = Blueprint('invoices', __name__)
 
@@ -121,22 +122,40 @@ def get_invoices():
             except ValueError:
                 pass
         
-        # Order by invoice date (newest first)
-        query = query.order_by(Invoice.invoice_date.desc())
-        
-        # Get total count before pagination
-        total_invoices = query.count()
-        
-        # Apply pagination
-        invoices_paginated = query.paginate(
-            page=page,
-            per_page=per_page,
-            error_out=False
-        )
+        if cursor_requested():
+            # Keyset page: ?cursor= first, then next_cursor; ?total=exact|approx adds a total
+            keyset = keyset_page(query, Invoice.invoice_date, Invoice.id, 'newest', True,
+                                 per_page, request.args.get('cursor'))
+            invoices = keyset['items']
+            pagination = {
+                'per_page': per_page,
+                'next_cursor': keyset['next_cursor'],
+                'has_next': keyset['has_next'],
+                **count_rows(query, request.args.get('total'))
+            }
+        else:
+            # Order by invoice date (newest first)
+            query = query.order_by(Invoice.invoice_date.desc(), Invoice.id.desc())
+            
+            # Apply pagination (paginate runs the count itself)
+            invoices_paginated = query.paginate(
+                page=page,
+                per_page=per_page,
+                error_out=False
+            )
+            invoices = invoices_paginated.items
+            pagination = {
+                'page': page,
+                'per_page': per_page,
+                'total': invoices_paginated.total,
+                'pages': invoices_paginated.pages,
+                'has_next': invoices_paginated.has_next,
+                'has_prev': invoices_paginated.has_prev
+            }
         
         # Format response
         invoices_data = []
-        for invoice in invoices_paginated.items:
+        for invoice in invoices:
             invoice_data = invoice.to_dict()
             # Add user information
             if invoice.user:
@@ -151,14 +170,11 @@ def get_invoices():
         
         return jsonify({
             'invoices': invoices_data,
-            'page': page,
-            'per_page': per_page,
-            'total': total_invoices,
-            'pages': invoices_paginated.pages,
-            'has_next': invoices_paginated.has_next,
-            'has_prev': invoices_paginated.has_prev
+            **pagination
         })
         
+    except CursorError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         print(f'❌ Error fetching invoices: {str(e)}')
         return jsonify({'error': str(e)}), 500
@@ -5,6 +5,7 @@ import jwt
 import os
 from functools import wraps
 from datetime import datetime, timedelta
+from app.utils.keyset import CursorError, count_rows, cursor_requested, keyset_page
 import uuid
 import string
 import random
@@ -304,22 +305,40 @@ def get_orders():
             except ValueError:
                 pass
         
-        # Order by creation date (newest first)
-        query = query.order_by(Order.created_at.desc())
-        
-        # Get total count before pagination
-        total_orders = query.count()
-        
-        # Apply pagination
-        orders_paginated = query.paginate(
-            page=page,
-            per_page=per_page,
-            error_out=False
-        )
+        if cursor_requested():
+            # Keyset page: ?cursor= first, then next_cursor; ?total=exact|approx adds a total
+            keyset = keyset_page(query, Order.created_at, Order.id, 'newest', True,
+                                 per_page, request.args.get('cursor'))
+            orders = keyset['items']
+            pagination = {
+                'per_page': per_page,
+                'next_cursor': keyset['next_cursor'],
+                'has_next': keyset['has_next'],
+                **count_rows(query, request.args.get('total'))
+            }
+        else:
+            # Order by creation date (newest first)
+            query = query.order_by(Order.created_at.desc(), Order.id.desc())
+            
+            # Apply pagination (paginate runs the count itself)
+            orders_paginated = query.paginate(
+                page=page,
+                per_page=per_page,
+                error_out=False
+            )
+            orders = orders_paginated.items
+            pagination = {
+                'page': page,
+                'per_page': per_page,
+                'total': orders_paginated.total,
+                'pages': orders_paginated.pages,
+                'has_next': orders_paginated.has_next,
+                'has_prev': orders_paginated.has_prev
+            }
         
         # Format response
         orders_data = []
-        for order in orders_paginated.items:
+        for order in orders:
             order_data = order.to_dict()
             # Add user information
             if order.user:
@@ -334,14 +353,11 @@ def get_orders():
         
         return jsonify({
             'orders': orders_data,
-            'page': page,
-            'per_page': per_page,
-            'total': total_orders,
-            'pages': orders_paginated.pages,
-            'has_next': orders_paginated.has_next,
-            'has_prev': orders_paginated.has_prev
+            **pagination
         })
     
+    except CursorError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -18,7 +18,8 @@ This module has been optimized for REMBG-ONLY background removal:
 - Detailed logging and performance metrics
 
 ✅ API ENDPOINTS:
-- /remove-background - REMBG-only endpoint
+- /remove-background/jobs - queue a job, poll it, then fetch its result
+  (/remove-background is a deprecated alias that queues and returns 202)
 - Returns processing time, file sizes, dimensions
 
 Last optimized: 2025-01-28
@@ -26,35 +27,52 @@ Version: REMBG_Only_Optimized
 """
 
 import os
-import uuid
 import base64
+import time
 from datetime import datetime
-from flask import Blueprint, request, jsonify, current_app, send_file
+from flask import Blueprint, request, jsonify, current_app, make_response, send_file, Response, stream_with_context
 from app.models.models import Product, Category, Order, User, ContactMessage, BlogPost, VariationType, VariationOption, ProductVariation, SiteSettings, ProductReview
 from app import db
 import jwt
 import os
 from functools import wraps
 from werkzeug.utils import secure_filename
-import uuid
 from datetime import datetime
 import pandas as pd
 from io import BytesIO
 import tempfile
 from PIL import Image, ImageOps
 import numpy as np
-
-# REMBG import - only U2Net, no BiRefNet
-try:
-    from rembg import remove
-    AI_BACKGROUND_REMOVAL_AVAILABLE = True
-    print("✅ REMBG available - U2Net background removal enabled")
-except ImportError:
-    AI_BACKGROUND_REMOVAL_AVAILABLE = False
-    print("❌ REMBG not available - Background removal disabled")
+from app.utils.background_removal import AI_BACKGROUND_REMOVAL_AVAILABLE
+from app.utils.image_derivatives import get_derivative_pipeline, record_product_variants, image_srcset
+from app.utils.result_cache import get_result_cache
+from app.utils.upload_store import get_upload_store
+from app.utils.background_jobs import get_background_job_manager, QueueFullError
+from app.utils.response_cache import cached, invalidates
+from app.utils.product_search import apply_product_search, highlight_product
+from app.utils.product_suggest import current_suggest_index
+from app.utils.product_facets import (PRICE_BUCKETS, count_facet_groups, get_facet_index, load_facet_groups,
+                                      material_key, parse_flag, parse_price_buckets, serialize_facets)
+from app.utils.keyset import CursorError, cursor_requested, keyset_page
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload
 
 products_bp = Blueprint('products', __name__)
 
+# Sort orders available in cursor mode: name -> (column, descending); id breaks ties
+PRODUCT_KEYSET_SORTS = {
+    'newest': (Product.created_at, True),
+    'oldest': (Product.created_at, False),
+    'price_low': (Product.price, False),
+    'price_high': (Product.price, True)
+}
+
+# Products per bulk like-status request
+MAX_LIKE_STATUS_IDS = 100
+
+# Largest page of the review feed
+MAX_REVIEWS_PER_PAGE = 50
+
 def admin_required(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
@@ -84,38 +102,78 @@ def admin_required(f):
     return decorated_function
 
 @products_bp.route('/')
+@cached(timeout=60, tags=('products', 'categories'))
 def product_list():
+    """
+    Catalog browse: filtered, sorted page plus facet counts
+
+    Filters: category (comma-separated slugs), search, min_price/max_price,
+    price_bucket (see facets.price), material (comma-separated), in_stock
+    and has_variations. The total and facet counts come from the facet
+    index, so no COUNT query runs; with a search they come from one
+    GROUP BY over the matches. The index picks up other workers' edits
+    within FACET_INDEX_MAX_AGE.
+    
+    Pass ?cursor= (then each response's next_cursor) instead of page to
+    page by keyset; not available for relevance sort.
+    """
     try:
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 12, type=int)
+        page = max(request.args.get('page', 1, type=int), 1)
+        per_page = max(request.args.get('per_page', 12, type=int), 1)
         category_slug = request.args.get('category')
         search = request.args.get('search')
-        sort_by = request.args.get('sort', 'newest')  # newest, oldest, price_low, price_high
+        sort_by = request.args.get('sort', 'relevance' if search else 'newest')  # relevance, newest, oldest, price_low, price_high
         min_price = request.args.get('min_price', type=float)
         max_price = request.args.get('max_price', type=float)
+        price_buckets = parse_price_buckets(request.args.get('price_bucket'))
+        materials = [m.strip() for m in (request.args.get('material') or '').split(',') if m.strip()]
+        in_stock = parse_flag(request.args.get('in_stock'))
+        has_variations = parse_flag(request.args.get('has_variations'))
         
-        query = Product.query.filter_by(is_active=True)
+        # Categories are serialized per item; load them with the page, not from the identity map
+        query = Product.query.filter_by(is_active=True).options(joinedload(Product.category))
         
-        # Filter by category
+        # Filter by category (several slugs select any of them)
+        categories = Category.query.order_by(Category.sort_order, Category.name).all()
+        category_ids = []
         if category_slug:
-            category = Category.query.filter_by(slug=category_slug).first()
-            if category:
-                query = query.filter_by(category_id=category.id)
+            slugs = {slug.strip() for slug in category_slug.split(',')}
+            category_ids = [c.id for c in categories if c.slug in slugs]
+            if category_ids:
+                query = query.filter(Product.category_id.in_(category_ids))
         
-        # Search filter
+        # Full-text search filter; its matches also restrict the facet counts
+        rank = None
         if search:
-            query = query.filter(
-                Product.name.ilike(f'%{search}%') | Product.description.ilike(f'%{search}%')
-            )
+            query, rank = apply_product_search(query, search)
         
         # Price filters
         if min_price is not None:
             query = query.filter(Product.price >= min_price)
         if max_price is not None:
             query = query.filter(Product.price <= max_price)
+        if price_buckets:
+            query = query.filter(db.or_(*[
+                db.and_(Product.price >= low, Product.price < high) if high is not None else Product.price >= low
+                for low, high in (PRICE_BUCKETS[b] for b in price_buckets)
+            ]))
+        
+        # Attribute filters
+        if materials:
+            query = query.filter(db.func.lower(db.func.trim(Product.material)).in_([material_key(m) for m in materials]))
+        if in_stock is not None:
+            stock = db.func.coalesce(Product.stock_quantity, 0)
+            query = query.filter(stock > 0 if in_stock else stock <= 0)
+        if has_variations is not None:
+            query = query.filter(db.func.coalesce(Product.has_variations, False) == has_variations)
         
         # Sorting
-        if sort_by == 'price_low':
+        if cursor_requested():
+            if sort_by not in PRODUCT_KEYSET_SORTS:
+                return jsonify({'error': f"Cursor pagination supports sort: {', '.join(PRODUCT_KEYSET_SORTS)}"}), 400
+        elif sort_by == 'relevance' and rank is not None:
+            query = query.order_by(rank.asc(), Product.created_at.desc())
+        elif sort_by == 'price_low':
             query = query.order_by(Product.price.asc())
         elif sort_by == 'price_high':
             query = query.order_by(Product.price.desc())
@@ -124,18 +182,53 @@ def product_list():
         else:  # newest
             query = query.order_by(Product.created_at.desc())
         
-        products = query.paginate(
-            page=page, per_page=per_page, error_out=False
-        )
+        selection = {
+            'category_ids': category_ids,
+            'price_buckets': price_buckets,
+            'materials': materials,
+            'in_stock': in_stock,
+            'has_variations': has_variations
+        }
+        if search:
+            # Matches come from SQL: group them there rather than loading their ids
+            matches, _ = apply_product_search(Product.query.filter_by(is_active=True), search)
+            facet_result = count_facet_groups(load_facet_groups(matches, min_price, max_price),
+                                              min_price=min_price, max_price=max_price, **selection)
+        else:
+            facet_result = get_facet_index().query(min_price=min_price, max_price=max_price, **selection)
+        # Products matching every filter, counted by the index (or the groups), not a COUNT query
+        total = facet_result['total']
+        
+        if cursor_requested():
+            sort_column, descending = PRODUCT_KEYSET_SORTS[sort_by]
+            keyset = keyset_page(query, sort_column, Product.id, sort_by, descending,
+                                 per_page, request.args.get('cursor'))
+            products = keyset['items']
+            pagination = {
+                'per_page': per_page,
+                'total': total,
+                'next_cursor': keyset['next_cursor'],
+                'has_next': keyset['has_next']
+            }
+        else:
+            products = query.limit(per_page).offset((page - 1) * per_page).all()
+            pagination = {
+                'page': page,
+                'pages': (total + per_page - 1) // per_page,
+                'per_page': per_page,
+                'total': total
+            }
         
-        return jsonify({
-            'products': [{
+        items = []
+        for p in products:
+            item = {
                 'id': p.id,
                 'name': p.name,
                 'slug': p.slug,
                 'price': p.price,
                 'original_price': p.original_price,
                 'images': p.images,
+                'image_srcset': image_srcset(p),
                 'category': p.category.name,
                 'category_slug': p.category.slug,
                 'is_featured': p.is_featured,
@@ -143,28 +236,33 @@ def product_list():
                 'has_variations': p.has_variations,
                 'variation_type': p.variation_type,
                 'variation_name': p.variation_name
-            } for p in products.items],
-            'pagination': {
-                'page': products.page,
-                'pages': products.pages,
-                'per_page': products.per_page,
-                'total': products.total
             }
+            if search:
+                item['highlight'] = highlight_product(p, search)
+            items.append(item)
+        
+        return jsonify({
+            'products': items,
+            'pagination': pagination,
+            'facets': serialize_facets(facet_result, categories, selection)
         })
     
+    except CursorError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @products_bp.route('/<slug>')
+@cached(timeout=60, tags=('products', 'categories', 'reviews'))
 def product_detail(slug):
     try:
-        product = Product.query.filter_by(slug=slug, is_active=True).first()
+        product = Product.query.options(joinedload(Product.category)).filter_by(slug=slug, is_active=True).first()
         
         if not product:
             return jsonify({'error': 'Product not found'}), 404
         
         # Related products from same category
-        related_products = Product.query.filter_by(
+        related_products = Product.query.options(joinedload(Product.category)).filter_by(
             category_id=product.category_id,
             is_active=True
         ).filter(Product.id != product.id).limit(4).all()
@@ -178,6 +276,7 @@ def product_detail(slug):
                 'price': product.price,
                 'original_price': product.original_price,
                 'images': product.images,
+                'image_srcset': image_srcset(product),
                 'video_url': product.video_url,
                 'category': product.category.name,
                 'category_slug': product.category.slug,
@@ -191,6 +290,8 @@ def product_detail(slug):
                 'weight': product.weight,
                 'dimensions': product.dimensions,
                 'material': product.material,
+                'like_count': product.like_count,
+                'review_summary': product.review_summary(),
                 'created_at': product.created_at.isoformat(),
                 'updated_at': product.updated_at.isoformat()
             },
@@ -200,6 +301,7 @@ def product_detail(slug):
                 'slug': p.slug,
                 'price': p.price,
                 'images': p.images,
+                'image_srcset': image_srcset(p),
                 'category': p.category.name
             } for p in related_products]
         })
@@ -208,6 +310,7 @@ def product_detail(slug):
         return jsonify({'error': str(e)}), 500
 
 @products_bp.route('/category/<slug>')
+@cached(timeout=60, tags=('products', 'categories'))
 def products_by_category(slug):
     try:
         category = Category.query.filter_by(slug=slug, is_active=True).first()
@@ -218,22 +321,33 @@ def products_by_category(slug):
         page = request.args.get('page', 1, type=int)
         per_page = request.args.get('per_page', 12, type=int)
         sort_by = request.args.get('sort', 'newest')
+        if sort_by not in PRODUCT_KEYSET_SORTS:
+            sort_by = 'newest'
+        sort_column, descending = PRODUCT_KEYSET_SORTS[sort_by]
         
         query = Product.query.filter_by(category_id=category.id, is_active=True)
         
-        # Sorting
-        if sort_by == 'price_low':
-            query = query.order_by(Product.price.asc())
-        elif sort_by == 'price_high':
-            query = query.order_by(Product.price.desc())
-        elif sort_by == 'oldest':
-            query = query.order_by(Product.created_at.asc())
-        else:  # newest
-            query = query.order_by(Product.created_at.desc())
-        
-        products = query.paginate(
-            page=page, per_page=per_page, error_out=False
-        )
+        if cursor_requested():
+            keyset = keyset_page(query, sort_column, Product.id, sort_by, descending,
+                                 per_page, request.args.get('cursor'))
+            products = keyset['items']
+            pagination = {
+                'per_page': per_page,
+                'next_cursor': keyset['next_cursor'],
+                'has_next': keyset['has_next']
+            }
+        else:
+            query = query.order_by(sort_column.desc() if descending else sort_column.asc())
+            paginated = query.paginate(
+                page=page, per_page=per_page, error_out=False
+            )
+            products = paginated.items
+            pagination = {
+                'page': paginated.page,
+                'pages': paginated.pages,
+                'per_page': paginated.per_page,
+                'total': paginated.total
+            }
         
         return jsonify({
             'category': {
@@ -250,15 +364,34 @@ def products_by_category(slug):
                 'price': p.price,
                 'original_price': p.original_price,
                 'images': p.images,
+                'image_srcset': image_srcset(p),
                 'stock_quantity': p.stock_quantity,
                 'is_featured': p.is_featured
-            } for p in products.items],
-            'pagination': {
-                'page': products.page,
-                'pages': products.pages,
-                'per_page': products.per_page,
-                'total': products.total
-            }
+            } for p in products],
+            'pagination': pagination
+        })
+    
+    except CursorError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@products_bp.route('/suggest')
+def suggest_products():
+    """Autocomplete for the search box: products and categories, tolerating typos"""
+    try:
+        q = request.args.get('q', '')
+        limit = min(max(request.args.get('limit', 8, type=int), 1), 20)
+        
+        index = current_suggest_index()
+        
+        started = time.perf_counter()
+        suggestions = index.suggest(q, limit)
+        
+        return jsonify({
+            'query': q,
+            'suggestions': suggestions,
+            'took_ms': round((time.perf_counter() - started) * 1000, 2)
         })
     
     except Exception as e:
@@ -274,10 +407,9 @@ def search_products():
         if not q:
             return jsonify({'error': 'Search query is required'}), 400
         
-        products = Product.query.filter(
-            Product.is_active == True,
-            Product.name.ilike(f'%{q}%') | Product.description.ilike(f'%{q}%')
-        ).order_by(Product.created_at.desc()).paginate(
+        # Ranked full-text match, newest first among equally relevant products
+        query, rank = apply_product_search(Product.query.filter(Product.is_active == True), q)
+        products = query.order_by(rank.asc(), Product.created_at.desc()).paginate(
             page=page, per_page=per_page, error_out=False
         )
         
@@ -290,9 +422,11 @@ def search_products():
                 'price': p.price,
                 'original_price': p.original_price,
                 'images': p.images,
+                'image_srcset': image_srcset(p),
                 'category': p.category.name,
                 'category_slug': p.category.slug,
-                'stock_quantity': p.stock_quantity
+                'stock_quantity': p.stock_quantity,
+                'highlight': highlight_product(p, q)
             } for p in products.items],
             'pagination': {
                 'page': products.page,
@@ -305,419 +439,186 @@ def search_products():
     except Exception as e:
         return jsonify({'error': str(e)}), 500 
 
-def unified_background_removal(image, model_type="fast"):
+# Debug fonksiyonu kaldırıldı - artık unified_background_removal içinde built-in debug var
+
+# Eski ayrı fonksiyonlar kaldırıldı - artık sadece unified_background_removal kullanılıyor
+
+@products_bp.route('/remove-background', methods=['POST'])
+def remove_background():
+    """
+    Deprecated alias of POST /remove-background/jobs
+
+    Inference can take 30 s, so this no longer waits for it: it queues the
+    job and returns 202 with the URLs to poll, like the jobs endpoint.
+    """
+    response = make_response(submit_background_removal_job())
+    response.headers['Deprecation'] = 'true'
+    response.headers['Link'] = '</api/products/remove-background/jobs>; rel="successor-version"'
+    return response
+
+@products_bp.route('/remove-background/batch', methods=['POST'])
+def remove_background_batch_endpoint():
     """
-    🚀 Smart Background Removal - Professional 3-Model System (BiRefNet 2nd Position)
+    Batch background removal for product galleries
     
-    Model options:
-    - Fast Mode: U2Net (2-5 seconds, good quality)
-    - Premium Mode: BiRefNet-General (10-30 seconds, maximum quality - 2nd position)
-    - Ultra Mode: BRIA RMBG-1.4 (5-15 seconds, very high quality - 3rd position)
+    Accepts a multipart list of images (field name 'images'), queues them as
+    one job for the worker pool and streams one NDJSON line per image as the
+    job records it, followed by a summary line with the total processing time.
+    The job is cancelled if the client goes away.
+    """
+    import json
     
-    Args:
-        image: PIL Image object
-        model_type: "fast", "premium", or "ultra"
+    if not AI_BACKGROUND_REMOVAL_AVAILABLE:
+        return jsonify({'error': 'REMBG library not available. Please install rembg package.'}), 500
     
-    Returns:
-        PIL Image with background removed (RGBA format)
-    """
-    print("🚀 Starting Professional Background Removal with Model Isolation...")
+    image_files = [f for f in request.files.getlist('images') if f.filename]
+    if not image_files:
+        return jsonify({'error': 'No images provided'}), 400
     
-    # Performance setup
-    import multiprocessing
-    cpu_count = multiprocessing.cpu_count()
-    print(f"   🖥️  Using all {cpu_count} CPU cores")
+    max_images = int(os.environ.get('BG_BATCH_MAX_IMAGES') or 20)
+    if len(image_files) > max_images:
+        return jsonify({'error': f'Too many images (maximum {max_images} per batch)'}), 400
     
-    # Convert to RGBA if needed
-    if image.mode != 'RGBA':
-        image = image.convert('RGBA')
-        print(f"   📷 Converted {image.mode} to RGBA format")
+    model_preference = request.form.get('model_preference', 'fast')
+    speed_mode = "fast" if model_preference in ['auto', 'u2net', 'fast'] else "premium"
+    batch_size = max(1, request.form.get('batch_size', 4, type=int))
     
-    print(f"   📏 Processing image: {image.size} pixels")
+    # Reject unreadable files up front (header only) so the job holds decodable images
+    images = []
+    indexes = []
+    errors = []
+    for index, image_file in enumerate(image_files):
+        try:
+            image_data = image_file.read()
+            Image.open(BytesIO(image_data))
+            images.append((image_file.filename, image_data))
+            indexes.append(index)
+        except Exception as e:
+            errors.append({
+                'type': 'result',
+                'index': index,
+                'filename': image_file.filename,
+                'success': False,
+                'error': f'Could not read image: {str(e)}'
+            })
     
-    # Model isolation - clear any previous model states
-    import gc
-    gc.collect()
-    print("   🧹 Cleared memory before model loading")
+    manager = get_background_job_manager()
+    job = None
+    if images:
+        try:
+            job = manager.submit_batch(images, speed_mode, batch_size)
+        except QueueFullError as e:
+            return jsonify({'error': str(e), 'retry_after': 5}), 429, {'Retry-After': '5'}
     
-    try:
-        if model_type == "premium":
-            print("   🌟 Premium Mode: BiRefNet-General (Maximum Quality - Takes 10-30s) - 2ND POSITION")
-            print("   🔒 Isolated BiRefNet processing...")
-            result = _process_with_birefnet_isolated(image)
-        elif model_type == "ultra":
-            print("   🚀 Ultra Mode: BRIA RMBG-1.4 (Very High Quality - Takes 5-15s) - 3RD POSITION")
-            print("   🔒 Isolated BRIA processing...")
-            result = _process_with_bria_isolated(image)
-        else:
-            print("   ⚡ Fast Mode: U2Net (Good Quality - Takes 2-5s)")
-            result = _process_with_u2net_from_image(image)
-        
-        # Clean up after processing
-        gc.collect()
-        print("   🧹 Cleaned up after model processing")
-        
-        return result
+    def generate():
+        start_time = time.perf_counter()
+        for error in errors:
+            yield json.dumps(error) + '\n'
         
+        succeeded = 0
+        finished = job is None
+        try:
+            current = job
+            while current is not None:
+                current = manager.get(job['id'])
+                for result in current['results'][succeeded:]:
+                    position = result['position']
+                    with open(manager.result_path(job['id'], position), 'rb') as f:
+                        preview_base64 = base64.b64encode(f.read()).decode('utf-8')
+                    succeeded += 1
+                    yield json.dumps({
+                        'type': 'result',
+                        'index': indexes[position],
+                        'filename': images[position][0],
+                        'success': True,
+                        'preview': f'data:image/png;base64,{preview_base64}',
+                        'model_used': speed_mode,
+                        'input_size': len(images[position][1]),
+                        'output_size': result['output_size'],
+                        'dimensions': result['dimensions'],
+                        'timings': result['timings']
+                    }) + '\n'
+                if current['status'] in ('done', 'failed', 'cancelled', 'timeout'):
+                    if current['status'] != 'done':
+                        error = current.get('error') or f"job {current['status']}"
+                        print(f"❌ Batch background removal failed: {error}")
+                        yield json.dumps({'type': 'error', 'error': f'Batch background removal failed: {error}'}) + '\n'
+                    break
+                time.sleep(0.2)
+            finished = True
+        finally:
+            # Client disconnected mid-stream - free the workers
+            if not finished:
+                manager.cancel(job['id'])
+        
+        total_time = time.perf_counter() - start_time
+        print(f"🎉 Batch background removal: {succeeded}/{len(image_files)} images in {total_time:.2f}s")
+        yield json.dumps({
+            'type': 'summary',
+            'total': len(image_files),
+            'succeeded': succeeded,
+            'failed': len(image_files) - succeeded,
+            'model_used': speed_mode,
+            'total_time': round(total_time, 3)
+        }) + '\n'
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+@products_bp.route('/remove-background/models', methods=['GET'])
+@admin_required
+def background_model_stats():
+    """Get each inference worker's model session pool counters (loads, hits, evictions)"""
+    try:
+        return jsonify({'workers': get_background_job_manager().model_stats()})
     except Exception as e:
-        print(f"   ❌ Background removal failed: {str(e)}")
-        print("   🔄 Returning original image")
-        # Cleanup on error
-        gc.collect()
-        return image
+        return jsonify({'error': str(e)}), 500
 
-def _process_with_u2net_from_image(image):
-    """Process with U2Net model directly from PIL Image"""
+@products_bp.route('/remove-background/models/warm-up', methods=['POST'])
+@admin_required
+def warm_up_background_models():
+    """Ask the inference workers to preload background removal models"""
     try:
-        # Convert to bytes for REMBG
-        input_buffer = BytesIO()
-        image.save(input_buffer, format='PNG', optimize=False)
-        input_buffer.seek(0)
-        input_bytes = input_buffer.getvalue()
-        
-        # Use U2Net - fast and reliable
-        output_bytes = remove(input_bytes)  # Default U2Net
-        print("   ✅ U2Net processing completed (Reliable & Fast)")
-        
-        # Convert back to PIL
-        result_image = Image.open(BytesIO(output_bytes))
-        if result_image.mode != 'RGBA':
-            result_image = result_image.convert('RGBA')
+        if not AI_BACKGROUND_REMOVAL_AVAILABLE:
+            return jsonify({'error': 'REMBG library not available. Please install rembg package.'}), 500
         
-        print("   🎉 U2Net background removal completed successfully")
-        return result_image
+        data = request.get_json(silent=True) or {}
+        models = data.get('models', ['u2net'])
+        request_info = get_background_job_manager().request_warm_up(models)
         
+        return jsonify({
+            'success': True,
+            'requested': request_info,
+            'message': 'Workers load the models between jobs; see /remove-background/models'
+        }), 202
     except Exception as e:
-        print(f"   ❌ U2Net processing failed: {str(e)}")
-        raise
-
-# Old BRIA function removed - using isolated version above
+        return jsonify({'error': str(e)}), 500
 
-def _process_with_birefnet_isolated(image):
-    """Process with BiRefNet-General model - NO FALLBACKS (Testing Mode)"""
-    print("   🌟 STARTING BiRefNet-General - NO FALLBACKS ALLOWED!")
-    print("   🚫 WILL FAIL IF BiRefNet NOT WORKING!")
-    
-    # Complete isolation - clear all previous model states
-    import gc
-    
+@products_bp.route('/remove-background/cache', methods=['GET'])
+@admin_required
+def background_removal_cache_stats():
+    """Get background removal result cache hit/miss counters and disk usage"""
     try:
-        import torch
-        # Clear GPU cache if available
-        if torch.cuda.is_available():
-            torch.cuda.empty_cache()
-            print("   🧹 BiRefNet: GPU cache cleared")
-        else:
-            print("   🧹 BiRefNet: CPU mode (no GPU)")
-    except ImportError:
-        print("   🧹 BiRefNet: PyTorch not available, CPU only")
-    
-    # Clear Python garbage
-    gc.collect()
-    print("   🧹 BiRefNet isolation: Memory cleared")
-    
-    # Check REMBG availability with detailed error reporting
-    print("   📦 Checking REMBG availability...")
-    from rembg import new_session, remove
-    print("   ✅ REMBG imported successfully")
-    
-    print("   🌟 BiRefNet Processing - FORCING BiRefNet-General...")
-    
-    # Create a completely fresh image copy to avoid any contamination
-    fresh_image = image.copy()
-    if fresh_image.mode != 'RGB':
-        fresh_image = fresh_image.convert('RGB')
-        print(f"   📷 Converted {image.mode} to RGB")
-    else:
-        print("   📷 Image already in RGB mode")
-    
-    # BiRefNet-specific preprocessing for maximum sharpness
-    import numpy as np
-    from PIL import ImageEnhance, ImageFilter
-    
-    print("   🔪 Applying BiRefNet aggressive preprocessing...")
-    # Enhance image for BiRefNet's aggressive processing
-    enhancer = ImageEnhance.Contrast(fresh_image)
-    enhanced_image = enhancer.enhance(1.2)  # Increase contrast
-    print("   🔪 Applied contrast enhancement (1.2x)")
-    
-    # Sharpen slightly for better edge detection
-    sharpened_image = enhanced_image.filter(ImageFilter.UnsharpMask(radius=1, percent=120, threshold=3))
-    print("   🔪 Applied UnsharpMask sharpening")
-    
-    # Convert PIL to bytes for REMBG with maximum quality
-    input_buffer = BytesIO()
-    sharpened_image.save(input_buffer, format='PNG', compress_level=0)
-    input_bytes = input_buffer.getvalue()
-    print(f"   📏 BiRefNet input size: {len(input_bytes)} bytes (uncompressed)")
-    
-    # Force fresh session creation
-    print("   🧠 Creating BiRefNet-General session - NO ALTERNATIVES!")
-    print("   ⚠️  This WILL FAIL if BiRefNet model not available...")
-    
-    session = new_session('birefnet-general')  # NO TRY/CATCH - Let it fail!
-    print("   ✅ BiRefNet-General session created successfully!")
-    
-    print("   🎨 BiRefNet background removal - NO FALLBACKS!")
-    print("   ⏱️  Processing may take 10-30 seconds...")
-    
-    output_bytes = remove(input_bytes, session=session)  # NO TRY/CATCH - Let it fail!
-    print(f"   ✅ BiRefNet processing completed!")
-    print(f"   📏 BiRefNet output size: {len(output_bytes)} bytes")
-    
-    # Convert back to PIL Image
-    output_image = Image.open(BytesIO(output_bytes))  # NO TRY/CATCH - Let it fail!
-    print(f"   📊 BiRefNet output: {output_image.mode}, size: {output_image.size}")
-    
-    # BiRefNet ultra-sharp postprocessing
-    print("   🔪 Applying BiRefNet ULTRA-SHARP postprocessing...")
-    if output_image.mode == 'RGBA':
-        # LOG RAW MODEL OUTPUT BEFORE POSTPROCESSING
-        output_array = np.array(output_image)
-        raw_alpha = output_array[:, :, 3]
-        raw_unique = len(np.unique(raw_alpha))
-        raw_range = f"{raw_alpha.min()}-{raw_alpha.max()}"
-        raw_transparency = np.sum(raw_alpha == 0) / raw_alpha.size
-        print(f"   📊 RAW BiRefNet Alpha: {raw_unique} unique values, range {raw_range}, transparency {raw_transparency:.3f}")
-        
-        alpha = output_array[:, :, 3]
-        
-        # Very high threshold for ultra-sharp edges
-        ultra_threshold = 160  # Higher than before for sharper results
-        alpha_ultra = np.where(alpha > ultra_threshold, 255, 0).astype(np.uint8)
-        print(f"   🔪 Applied ultra-sharp threshold: {ultra_threshold}")
-        
-        # Multiple-pass sharpening for ultra-crisp edges
-        alpha_img = Image.fromarray(alpha_ultra, mode='L')
-        
-        # Light blur then aggressive re-sharpen
-        alpha_blurred = alpha_img.filter(ImageFilter.GaussianBlur(radius=0.3))
-        alpha_array = np.array(alpha_blurred)
-        alpha_final = np.where(alpha_array > 100, 255, 0).astype(np.uint8)
-        
-        # Second pass for ultra-crisp edges
-        alpha_img2 = Image.fromarray(alpha_final, mode='L')
-        alpha_crisp = alpha_img2.filter(ImageFilter.UnsharpMask(radius=0.5, percent=200, threshold=1))
-        alpha_final = np.array(alpha_crisp)
-        alpha_final = np.where(alpha_final > 127, 255, 0).astype(np.uint8)
-        
-        # LOG FINAL PROCESSED OUTPUT
-        final_unique = len(np.unique(alpha_final))
-        final_range = f"{alpha_final.min()}-{alpha_final.max()}"
-        final_transparency = np.sum(alpha_final == 0) / alpha_final.size
-        print(f"   📊 FINAL BiRefNet Alpha: {final_unique} unique values, range {final_range}, transparency {final_transparency:.3f}")
-        
-        output_array[:, :, 3] = alpha_final
-        output_image = Image.fromarray(output_array, 'RGBA')
-        print("   🔪 Applied BiRefNet ULTRA-SHARP edge processing")
-    else:
-        output_image = output_image.convert('RGBA')
-        print("   📷 Converted to RGBA format")
-    
-    # Clean up session
-    del session
-    gc.collect()
-    print("   🧹 BiRefNet session cleaned up")
-    
-    print("   ✅ BiRefNet-General processing completed (NO FALLBACKS USED)")
-    print("   🎉 PURE BiRefNet quality confirmed!")
-    print("   🌟 BiRefNet is ACTUALLY WORKING!")
-    return output_image
+        return jsonify(get_result_cache().stats())
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
 
-def _process_with_bria_isolated(image):
-    """Process with BRIA RMBG-1.4 model - NO FALLBACKS (Testing Mode)"""
-    print("   🚀 STARTING BRIA RMBG-1.4 - NO FALLBACKS ALLOWED!")
-    print("   🚫 WILL FAIL IF BRIA NOT WORKING!")
-    
-    # Complete isolation - clear all previous model states
-    import gc
-    
+@products_bp.route('/remove-background/cache', methods=['DELETE'])
+@admin_required
+def clear_background_removal_cache():
+    """Delete every cached background removal result"""
     try:
-        import torch
-        # Clear GPU cache if available
-        if torch.cuda.is_available():
-            torch.cuda.empty_cache()
-            print("   🧹 BRIA: GPU cache cleared")
-        else:
-            print("   🧹 BRIA: CPU mode (no GPU)")
-    except ImportError:
-        print("   🧹 BRIA: PyTorch not available, CPU only")
-    
-    # Clear Python garbage
-    gc.collect()
-    print("   🧹 BRIA isolation: Memory cleared")
-    
-    # Import transformers for BRIA RMBG
-    print("   📦 Importing transformers for BRIA...")
-    from transformers import pipeline
-    print("   ✅ BRIA RMBG dependencies loaded successfully")
-    
-    print("   🚀 BRIA Processing - FORCING BRIA RMBG-1.4...")
-    
-    # Create a completely fresh image copy
-    fresh_image = image.copy()
-    if fresh_image.mode != 'RGB':
-        fresh_image = fresh_image.convert('RGB')
-    
-    # BRIA-specific preprocessing for precision
-    from PIL import ImageFilter, ImageEnhance
-    import numpy as np
-    
-    # Slight enhancement for better precision
-    enhancer = ImageEnhance.Sharpness(fresh_image)
-    enhanced_image = enhancer.enhance(1.05)  # Subtle sharpness increase
-    
-    # Very light smoothing for BRIA's precision processing
-    smoothed_image = enhanced_image.filter(ImageFilter.GaussianBlur(radius=0.2))
-    print("   🎨 Applied BRIA precision preprocessing")
-    
-    print(f"   📏 BRIA input: {smoothed_image.mode}, size: {smoothed_image.size}")
-    
-    # Force fresh pipeline creation
-    print("   🤖 Creating BRIA RMBG-1.4 pipeline - NO ALTERNATIVES!")
-    print("   ⚠️  This WILL FAIL if BRIA model not available...")
-    
-    pipe = pipeline(
-        "image-segmentation", 
-        model="briaai/RMBG-1.4", 
-        trust_remote_code=True,
-        device="cpu"  # Use CPU for consistency
-    )  # NO TRY/CATCH - Let it fail!
-    print("   ✅ BRIA RMBG-1.4 pipeline created successfully!")
-    
-    print("   🎨 BRIA precision background removal - NO FALLBACKS!")
-    
-    # Process with BRIA RMBG using fresh pipeline
-    result = pipe(smoothed_image)  # NO TRY/CATCH - Let it fail!
-    print(f"   📊 BRIA result type: {type(result)}")
-    
-    # Extract mask with enhanced precision
-    mask = None
-    if isinstance(result, list) and len(result) > 0:
-        for i, item in enumerate(result):
-            if isinstance(item, dict) and 'mask' in item:
-                mask = item['mask']
-                print(f"   ✅ Extracted precision mask from item {i}")
-                break
-    
-    if mask is None:
-        raise Exception("Could not extract mask from BRIA result - NO FALLBACK!")
-    
-    # Process mask with BRIA precision optimization
-    if image.mode != 'RGBA':
-        rgba_image = image.convert('RGBA')
-    else:
-        rgba_image = image.copy()
-    
-    # Ensure mask size matches
-    if hasattr(mask, 'resize') and mask.size != rgba_image.size:
-        mask = mask.resize(rgba_image.size, Image.Resampling.LANCZOS)
-    
-    # Convert mask to numpy with precision processing
-    mask_array = np.array(mask)
-    
-    if len(mask_array.shape) == 3:
-        mask_array = np.mean(mask_array, axis=2)
-    
-    if mask_array.max() <= 1.0:
-        mask_array = (mask_array * 255).astype(np.uint8)
-    
-    # BRIA precision threshold (optimized for smooth edges)
-    precision_threshold = 80  # Lower for maximum smoothness
-    mask_smooth = (mask_array > precision_threshold).astype(np.float32)
-    
-    # Apply multiple smoothing passes for ultra-smooth edges
-    mask_img = Image.fromarray((mask_smooth * 255).astype(np.uint8), mode='L')
-    
-    # Multi-pass smoothing for BRIA precision
-    mask_smooth1 = mask_img.filter(ImageFilter.GaussianBlur(radius=1.0))
-    mask_smooth2 = mask_smooth1.filter(ImageFilter.GaussianBlur(radius=0.5))
-    mask_final = np.array(mask_smooth2)
-    
-    print("   🌊 Applied BRIA multi-pass precision smoothing")
-    
-    # Check inversion
-    foreground_pixels = np.sum(mask_final > 200)
-    background_pixels = np.sum(mask_final < 50)
-    
-    if background_pixels > foreground_pixels:
-        mask_final = 255 - mask_final
-        print("   🔄 Inverted mask for correct orientation")
-    
-    # Apply smooth mask
-    rgba_array = np.array(rgba_image)
-    
-    if rgba_array.shape[:2] != mask_final.shape:
-        mask_pil = Image.fromarray(mask_final.astype(np.uint8), mode='L')
-        mask_pil = mask_pil.resize((rgba_array.shape[1], rgba_array.shape[0]), Image.Resampling.LANCZOS)
-        mask_final = np.array(mask_pil)
-    
-    # LOG RAW BRIA MASK BEFORE FINAL APPLICATION
-    raw_unique = len(np.unique(mask_final))
-    raw_range = f"{mask_final.min()}-{mask_final.max()}"
-    raw_transparency = np.sum(mask_final < 50) / mask_final.size
-    print(f"   📊 RAW BRIA Mask: {raw_unique} unique values, range {raw_range}, transparency {raw_transparency:.3f}")
-    
-    rgba_array[:, :, 3] = mask_final.astype(np.uint8)
-    result_image = Image.fromarray(rgba_array, 'RGBA')
-    
-    # LOG FINAL BRIA OUTPUT
-    final_alpha = np.array(result_image)[:, :, 3]
-    final_unique = len(np.unique(final_alpha))
-    final_range = f"{final_alpha.min()}-{final_alpha.max()}"
-    final_transparency = np.sum(final_alpha == 0) / final_alpha.size
-    print(f"   📊 FINAL BRIA Alpha: {final_unique} unique values, range {final_range}, transparency {final_transparency:.3f}")
-    
-    # Clean up pipeline
-    del pipe
-    gc.collect()
-    print("   🧹 BRIA pipeline cleaned up")
-    
-    print("   ✅ BRIA RMBG-1.4 processing completed (NO FALLBACKS USED)")
-    print("   🎉 PURE BRIA quality confirmed!")
-    print("   🚀 BRIA is ACTUALLY WORKING!")
-    return result_image
-
-def _debug_bria_result(result, depth=0, max_depth=3):
-    """Debug helper to understand BRIA RMBG result structure"""
-    indent = "  " * depth
-    if depth > max_depth:
-        print(f"{indent}... (max depth reached)")
-        return
-    
-    if isinstance(result, list):
-        print(f"{indent}📋 List with {len(result)} items:")
-        for i, item in enumerate(result[:3]):  # Show first 3 items
-            print(f"{indent}  📦 [{i}]:")
-            _debug_bria_result(item, depth+1, max_depth)
-        if len(result) > 3:
-            print(f"{indent}  ... and {len(result)-3} more items")
-    elif isinstance(result, dict):
-        print(f"{indent}📋 Dict with keys: {list(result.keys())}")
-        for key, value in list(result.items())[:5]:  # Show first 5 keys
-            print(f"{indent}  🔑 {key}:")
-            _debug_bria_result(value, depth+1, max_depth)
-    else:
-        shape_info = getattr(result, 'shape', getattr(result, 'size', str(result)[:50]))
-        print(f"{indent}📊 {type(result).__name__}: {shape_info}")
-
-# Debug fonksiyonu kaldırıldı - artık unified_background_removal içinde built-in debug var
-
-# Eski ayrı fonksiyonlar kaldırıldı - artık sadece unified_background_removal kullanılıyor
+        removed = get_result_cache().clear()
+        return jsonify({'success': True, 'removed': removed})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
 
-@products_bp.route('/remove-background', methods=['POST'])
-def remove_background():
-    """Smart background removal endpoint - Fast vs Premium"""
+@products_bp.route('/remove-background/jobs', methods=['POST'])
+def submit_background_removal_job():
+    """Queue a background removal job for the inference worker pool"""
     try:
-        print("🚀 Starting Smart background removal endpoint...")
-        from datetime import datetime
-        start_time = datetime.now()
-        
-        # Check if REMBG is available
         if not AI_BACKGROUND_REMOVAL_AVAILABLE:
             return jsonify({'error': 'REMBG library not available. Please install rembg package.'}), 500
         
-        # Get image data from request
         if 'image' not in request.files:
             return jsonify({'error': 'No image provided'}), 400
         
@@ -725,67 +626,90 @@ def remove_background():
         if image_file.filename == '':
             return jsonify({'error': 'No image selected'}), 400
         
-        # Get speed/quality preference
         model_preference = request.form.get('model_preference', 'fast')
         speed_mode = "fast" if model_preference in ['auto', 'u2net', 'fast'] else "premium"
+        timeout = request.form.get('timeout', type=int)
         
-        if speed_mode == "fast":
-            print("   ⚡ Using FAST mode (U2Net - 2-5 seconds)")
-        else:
-            print("   🌟 Using PREMIUM mode (BiRefNet - 10-30 seconds)")
-        
-        # Read image data
-        image_data = image_file.read()
-        print(f"   Image file size: {len(image_data)} bytes")
-        
-        # Open image with PIL
-        input_image = Image.open(BytesIO(image_data))
-        print(f"   Image dimensions: {input_image.size}")
-        print(f"   Image mode: {input_image.mode}")
-        
-        # Remove background with smart processing
-        output_image = unified_background_removal(input_image, speed_mode)
-        
-        # Calculate processing time
-        processing_time = (datetime.now() - start_time).total_seconds()
-        print(f"   Background removal completed in {processing_time:.2f} seconds")
-        
-        # Convert to base64 for preview
-        buffer = BytesIO()
-        output_image.save(buffer, format='PNG', compress_level=1, optimize=False)
-        buffer.seek(0)
-        
-        # Create base64 string for preview
-        preview_base64 = base64.b64encode(buffer.getvalue()).decode('utf-8')
-        output_size = len(buffer.getvalue())
-        print(f"   Output image size: {output_size} bytes")
-        
-        model_name = "U2Net (Enhanced Premium)" if speed_mode == "premium" else "U2Net (Fast)"
-        premium_note = " - BiRefNet temporarily disabled for speed" if speed_mode == "premium" else ""
-        print(f"🎉 Smart background removal completed successfully in {processing_time:.2f}s using {model_name}{premium_note}!")
+        job = get_background_job_manager().submit(image_file.read(), speed_mode, timeout)
         
         return jsonify({
             'success': True,
-            'preview': f'data:image/png;base64,{preview_base64}',
-            'message': f'Background removed successfully using {model_name}{premium_note}',
-            'model_used': speed_mode,
-            'version': 'Smart_U2Net_Optimized',
-            'processing_time': f'{processing_time:.2f}s',
-            'input_size': len(image_data),
-            'output_size': output_size,
-            'dimensions': f'{input_image.size[0]}x{input_image.size[1]}'
-        })
+            'job': job,
+            'status_url': f"/api/products/remove-background/jobs/{job['id']}",
+            # Available once the job is done; ?format=json for a base64 preview
+            'result_url': f"/api/products/remove-background/jobs/{job['id']}/result"
+        }), 202
+    
+    except QueueFullError as e:
+        return jsonify({'error': str(e), 'retry_after': 5}), 429, {'Retry-After': '5'}
+    except Exception as e:
+        return jsonify({'error': f'Could not queue background removal: {str(e)}'}), 500
+
+@products_bp.route('/remove-background/jobs', methods=['GET'])
+@admin_required
+def background_removal_queue_stats():
+    """Get background removal queue and worker counters"""
+    try:
+        return jsonify(get_background_job_manager().stats())
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@products_bp.route('/remove-background/jobs/<job_id>', methods=['GET'])
+def get_background_removal_job(job_id):
+    """Poll a background removal job"""
+    try:
+        job = get_background_job_manager().get(job_id)
+        if not job:
+            return jsonify({'error': 'Job not found'}), 404
+        
+        return jsonify({'job': job})
     
     except Exception as e:
-        print(f"❌ Smart background removal failed: {str(e)}")
-        import traceback
-        print(f"   Full error details: {traceback.format_exc()}")
+        return jsonify({'error': str(e)}), 500
+
+@products_bp.route('/remove-background/jobs/<job_id>', methods=['DELETE'])
+def cancel_background_removal_job(job_id):
+    """Cancel a pending or running background removal job"""
+    try:
+        job = get_background_job_manager().cancel(job_id)
+        if not job:
+            return jsonify({'error': 'Job not found'}), 404
         
-        return jsonify({
-            'error': f'Background removal failed: {str(e)}',
-            'version': 'Smart_Speed_Quality_Optimized',
-            'suggestion': 'Please check if REMBG package is properly installed or try a different image format'
-        }), 500
+        return jsonify({'success': True, 'job': job})
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@products_bp.route('/remove-background/jobs/<job_id>/result', methods=['GET'])
+def get_background_removal_result(job_id):
+    """Download the processed PNG of a finished job"""
+    try:
+        manager = get_background_job_manager()
+        job = manager.get(job_id)
+        if not job:
+            return jsonify({'error': 'Job not found'}), 404
+        
+        if job['status'] != 'done':
+            return jsonify({'error': f"Job is {job['status']}", 'job': job}), 409
+        
+        # Same shape as /remove-background for the existing preview flow
+        if request.args.get('format') == 'json':
+            with open(manager.result_path(job_id), 'rb') as f:
+                output_bytes = f.read()
+            return jsonify({
+                'success': True,
+                'preview': f"data:image/png;base64,{base64.b64encode(output_bytes).decode('utf-8')}",
+                'model_used': job['model_type'],
+                'processing_time': f"{job.get('processing_time', 0):.2f}s",
+                'input_size': job['input_size'],
+                'output_size': len(output_bytes),
+                'dimensions': job.get('dimensions')
+            })
+        
+        return send_file(manager.result_path(job_id), mimetype='image/png')
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
 
 @products_bp.route('/save-processed-image', methods=['POST'])
 def save_processed_image():
@@ -803,21 +727,9 @@ def save_processed_image():
         # Decode base64
         image_bytes = base64.b64decode(image_data)
         
-        # Generate unique filename
-        filename = f"{uuid.uuid4().hex}.png"
-        
-        # Save to uploads/products directory - use correct path one level up from app
-        upload_dir = os.path.join(os.path.dirname(current_app.root_path), 'uploads', 'products')
-        os.makedirs(upload_dir, exist_ok=True)
-        
-        filepath = os.path.join(upload_dir, filename)
-        
-        # Save the image
-        with open(filepath, 'wb') as f:
-            f.write(image_bytes)
-        
-        # Return the URL
-        image_url = f'/uploads/products/{filename}'
+        # Store by content hash - saving the same processed image twice reuses the blob
+        image_url = get_upload_store().save_bytes(image_bytes, 'png')['url']
+        get_derivative_pipeline().submit([image_url], current_app._get_current_object())
         
         return jsonify({
             'success': True,
@@ -852,20 +764,11 @@ def upload_cropped_image():
         # Resize to higher quality square size (800x800) for better quality
         output_image = input_image.resize((800, 800), Image.Resampling.LANCZOS)
         
-        # Generate unique filename
-        filename = f"{uuid.uuid4().hex}.jpg"
-        
-        # Save to uploads/products directory - use correct path one level up from app
-        upload_dir = os.path.join(os.path.dirname(current_app.root_path), 'uploads', 'products')
-        os.makedirs(upload_dir, exist_ok=True)
-        
-        filepath = os.path.join(upload_dir, filename)
-        
-        # Save the image with high quality
-        output_image.save(filepath, 'JPEG', quality=95, optimize=True)
-        
-        # Return the URL
-        image_url = f'/uploads/products/{filename}'
+        # Save the image with high quality, stored by content hash
+        output_buffer = BytesIO()
+        output_image.save(output_buffer, 'JPEG', quality=95, optimize=True)
+        image_url = get_upload_store().save_bytes(output_buffer.getvalue(), 'jpg')['url']
+        get_derivative_pipeline().submit([image_url], current_app._get_current_object())
         
         return jsonify({
             'success': True,
@@ -921,6 +824,7 @@ def filter_empty_variations(variation_options):
 
 @products_bp.route('/products', methods=['POST'])
 @admin_required
+@invalidates('products')
 def create_product():
     try:
         data = request.get_json()
@@ -951,6 +855,7 @@ def create_product():
             dimensions=data.get('dimensions', ''),
             material=data.get('material', '')
         )
+        record_product_variants(product)
         
         db.session.add(product)
         db.session.commit()
@@ -963,6 +868,7 @@ def create_product():
 
 @products_bp.route('/products/<int:product_id>', methods=['PUT'])
 @admin_required
+@invalidates('products')
 def update_product(product_id):
     try:
         product = Product.query.get_or_404(product_id)
@@ -983,6 +889,7 @@ def update_product(product_id):
             product.category_id = data['category_id']
         if 'images' in data:
             product.images = data['images']
+            record_product_variants(product)
         if 'video_url' in data:
             product.video_url = data['video_url']
 
@@ -1015,6 +922,7 @@ def update_product(product_id):
 
 @products_bp.route('/products/<int:product_id>', methods=['DELETE'])
 @admin_required
+@invalidates('products')
 def delete_product(product_id):
     try:
         product = Product.query.get_or_404(product_id)
@@ -1149,6 +1057,7 @@ def export_products_template():
 
 @products_bp.route('/products/import-excel', methods=['POST'])
 @admin_required
+@invalidates('products')
 def import_products_excel():
     """Import products from Excel file"""
     try:
@@ -1251,6 +1160,7 @@ def import_products_excel():
                         product.stock_quantity = int(row['Stock Quantity']) if not pd.isna(row['Stock Quantity']) else 0
                         product.category_id = int(row['Category ID'])
                         product.images = images
+                        record_product_variants(product)
                         product.video_url = str(row['Video URL']) if not pd.isna(row['Video URL']) else None
                         product.is_featured = str_to_bool(row['Is Featured'])
                         product.is_active = str_to_bool(row['Is Active']) if not pd.isna(row['Is Active']) else True
@@ -1288,6 +1198,7 @@ def import_products_excel():
                     dimensions=str(row['Dimensions']) if not pd.isna(row['Dimensions']) else '',
                     material=str(row['Material']) if not pd.isna(row['Material']) else ''
                 )
+                record_product_variants(product)
                 
                 db.session.add(product)
                 success_count += 1
@@ -1340,8 +1251,6 @@ def import_products_excel():
 def get_product_like_status(product_id):
     """Get like status for a product"""
     try:
-        from app.models.models import ProductLike
-        
         # Get current user if authenticated
         user_id = None
         token = request.headers.get('Authorization')
@@ -1354,20 +1263,15 @@ def get_product_like_status(product_id):
             except:
                 pass
         
-        # Get product
+        # Get product (like_count is kept on the row)
         product = Product.query.get_or_404(product_id)
         
-        # Get like count
-        like_count = ProductLike.query.filter_by(product_id=product_id).count()
-        
         # Check if user has liked this product
-        is_liked = False
-        if user_id:
-            is_liked = ProductLike.query.filter_by(product_id=product_id, user_id=user_id).first() is not None
+        is_liked = product.is_liked_by_user(user_id)
         
         return jsonify({
             'is_liked': is_liked,
-            'like_count': like_count
+            'like_count': product.like_count
         })
     
     except Exception as e:
@@ -1410,14 +1314,18 @@ def toggle_product_like(product_id):
             action = 'liked'
             is_liked = True
         
-        db.session.commit()
-        
-        # Get updated like count
-        like_count = ProductLike.query.filter_by(product_id=product_id).count()
+        # like_count moves in the same transaction (app/utils/product_counters.py)
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # A concurrent request liked it first
+            db.session.rollback()
+            action = 'liked'
+            is_liked = True
         
         return jsonify({
             'is_liked': is_liked,
-            'like_count': like_count,
+            'like_count': product.like_count,
             'action': action
         })
     
@@ -1425,20 +1333,63 @@ def toggle_product_like(product_id):
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
+@products_bp.route('/like-status', methods=['POST'])
+def get_products_like_status():
+    """Like counts and the current user's likes for many products, e.g. a product grid"""
+    try:
+        from app.models.models import ProductLike
+        
+        # Get current user if authenticated
+        user_id = None
+        token = request.headers.get('Authorization')
+        if token:
+            try:
+                if token.startswith('Bearer '):
+                    token = token[7:]
+                data = jwt.decode(token, os.environ.get('SECRET_KEY') or 'dev-secret-key', algorithms=['HS256'])
+                user_id = data.get('user_id')
+            except:
+                pass
+        
+        product_ids = (request.get_json(silent=True) or {}).get('product_ids')
+        if not isinstance(product_ids, list) or not all(isinstance(i, int) for i in product_ids):
+            return jsonify({'error': 'product_ids must be a list of integers'}), 400
+        if len(product_ids) > MAX_LIKE_STATUS_IDS:
+            return jsonify({'error': f'At most {MAX_LIKE_STATUS_IDS} product_ids per request'}), 400
+        
+        # Counts and the user's likes in one query
+        rows = db.session.query(Product.id, Product.like_count, ProductLike.id).outerjoin(
+            ProductLike, db.and_(ProductLike.product_id == Product.id, ProductLike.user_id == user_id)
+        ).filter(Product.id.in_(set(product_ids))).all() if product_ids else []
+        
+        return jsonify({
+            'like_counts': {str(product_id): like_count for product_id, like_count, _ in rows},
+            'liked': sorted(product_id for product_id, _, like_id in rows if like_id is not None)
+        })
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 # ============ REVIEW ENDPOINTS ============
 
 @products_bp.route('/<int:product_id>/reviews', methods=['GET'])
+@cached(timeout=60, tags=('reviews',))
 def get_product_reviews(product_id):
-    """Get reviews for a product"""
+    """Get a page of approved reviews for a product, newest first, with the rating summary"""
     try:
-        # Get product
+        # Get product (review counts and histogram are kept on the row)
         product = Product.query.get_or_404(product_id)
         
-        # Get reviews
-        reviews = ProductReview.query.filter_by(
+        page = max(request.args.get('page', 1, type=int), 1)
+        per_page = min(max(request.args.get('per_page', 10, type=int), 1), MAX_REVIEWS_PER_PAGE)
+        
+        # Get one page of reviews with their authors
+        reviews = ProductReview.query.options(joinedload(ProductReview.user)).filter_by(
             product_id=product_id, 
             is_approved=True
-        ).order_by(ProductReview.created_at.desc()).all()
+        ).order_by(ProductReview.created_at.desc(), ProductReview.id.desc()).offset(
+            (page - 1) * per_page
+        ).limit(per_page).all()
         
         reviews_data = []
         for review in reviews:
@@ -1451,15 +1402,26 @@ def get_product_reviews(product_id):
                 'updated_at': review.updated_at.isoformat()
             })
         
+        total = product.review_count
         return jsonify({
             'reviews': reviews_data,
-            'total_reviews': len(reviews_data)
+            'total_reviews': total,
+            'summary': product.review_summary(),
+            'pagination': {
+                'page': page,
+                'pages': (total + per_page - 1) // per_page,
+                'per_page': per_page,
+                'total': total,
+                'has_next': page * per_page < total,
+                'has_prev': page > 1
+            }
         })
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @products_bp.route('/<int:product_id>/reviews', methods=['POST'])
+@invalidates('reviews')
 def submit_product_review(product_id):
     """Submit a review for a product"""
     try:
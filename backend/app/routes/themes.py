@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify, current_app
-from app.models.models import CustomTheme, User, SiteSettings
+from app.models.models import CustomTheme, User
 from app import db
+from app.utils.settings_store import get_settings_store
 import jwt
 import os
 from functools import wraps
@@ -11,7 +12,7 @@ from werkzeug.utils import secure_filename
 # Helper function to extract site settings colors for theme export
 def extract_site_settings_colors():
     """Extract current site settings colors for theme export"""
-    settings = SiteSettings.query.first()
+    settings = get_settings_store().load()
     if not settings:
         return {}
     
@@ -120,10 +121,8 @@ def extract_site_settings_colors():
 # Helper function to sync custom theme colors with site settings
 def sync_custom_theme_colors_to_site_settings(theme_colors, site_settings_colors=None):
     """Sync custom theme colors to site settings"""
-    settings = SiteSettings.query.first()
-    if not settings:
-        settings = SiteSettings()
-        db.session.add(settings)
+    store = get_settings_store()
+    settings = store.load() or store.new()
     
     print(f"🎨 SYNC - Starting sync process...")
     print(f"   Theme colors available: {bool(theme_colors)}")
@@ -306,6 +305,7 @@ def sync_custom_theme_colors_to_site_settings(theme_colors, site_settings_colors
                 print(f"   ✅ Mapped {setting_key}: {color_value}")
     
     try:
+        store.save(settings)
         db.session.commit()
         print(f"✅ SYNC - Site settings successfully committed to database")
         return True
@@ -5,7 +5,7 @@ import jwt
 import os
 from functools import wraps
 from werkzeug.utils import secure_filename
-import uuid
+from app.utils.upload_store import get_upload_store
 
 uploads_bp = Blueprint('uploads', __name__)
 
@@ -44,10 +44,6 @@ def allowed_file(filename, file_type):
     }
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS.get(file_type, set())
 
-def generate_unique_filename(filename):
-    ext = filename.rsplit('.', 1)[1].lower() if '.' in filename else ''
-    return f"{uuid.uuid4().hex}.{ext}"
-
 def create_upload_folders():
     """Create upload folders if they don't exist"""
     # Use correct path - one level up from app directory to match serving path
@@ -75,15 +71,8 @@ def upload_category_image():
         # Create upload folders
         create_upload_folders()
         
-        # Generate unique filename
-        filename = generate_unique_filename(file.filename)
-        
-        # Save file - use correct path one level up from app
-        file_path = os.path.join(os.path.dirname(current_app.root_path), 'uploads', 'categories', filename)
-        file.save(file_path)
-        
-        # Return the URL path
-        url = f'/uploads/categories/{filename}'
+        # Store by content hash - identical files share one blob
+        url = get_upload_store().save_file(file)['url']
         
         return jsonify({
             'message': 'Category image uploaded successfully',
@@ -110,15 +99,8 @@ def upload_category_background():
         # Create upload folders
         create_upload_folders()
         
-        # Generate unique filename
-        filename = generate_unique_filename(file.filename)
-        
-        # Save file - use correct path one level up from app
-        file_path = os.path.join(os.path.dirname(current_app.root_path), 'uploads', 'categories', filename)
-        file.save(file_path)
-        
-        # Return the URL path
-        url = f'/uploads/categories/{filename}'
+        # Store by content hash - identical files share one blob
+        url = get_upload_store().save_file(file)['url']
         
         return jsonify({
             'message': 'Category background uploaded successfully',
@@ -150,6 +132,15 @@ def delete_file():
         relative_path = file_path[1:]  # Remove leading slash
         full_path = os.path.join(os.path.dirname(current_app.root_path), relative_path)
         
+        # Blobs can be shared by several records - only delete one nothing references
+        store = get_upload_store()
+        if store.path_for_url(file_path):
+            if store.refcount(file_path) > 0:
+                return jsonify({'message': 'File is still in use, it will be removed once nothing references it'})
+            if not store.release([file_path], grace_seconds=0):
+                return jsonify({'error': 'File not found'}), 404
+            return jsonify({'message': 'File deleted successfully'})
+        
         # Check if file exists and delete
         if os.path.exists(full_path):
             os.remove(full_path)
@@ -178,15 +169,8 @@ def upload_blog_image():
         # Create upload folders
         create_upload_folders()
         
-        # Generate unique filename
-        filename = generate_unique_filename(file.filename)
-        
-        # Save file - use correct path one level up from app
-        file_path = os.path.join(os.path.dirname(current_app.root_path), 'uploads', 'blog', filename)
-        file.save(file_path)
-        
-        # Return the URL path
-        url = f'/uploads/blog/{filename}'
+        # Store by content hash - identical files share one blob
+        url = get_upload_store().save_file(file)['url']
         
         return jsonify({
             'message': 'Blog image uploaded successfully',
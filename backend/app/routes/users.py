@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify
 from app.models.models import User, UserAddress, Order, Cart, Invoice
 from app import db
+from app.utils.image_derivatives import image_srcset
 import jwt
 import os
 from functools import wraps
@@ -556,6 +557,7 @@ def get_user_favorites(user):
                 'price': p.price,
                 'original_price': p.original_price,
                 'images': p.images,
+                'image_srcset': image_srcset(p),
                 'category': p.category.name,
                 'category_slug': p.category.slug,
                 'stock_quantity': p.stock_quantity,
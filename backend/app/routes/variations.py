@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify
 from app.models.models import VariationType, VariationOption, User
 from app import db
+from app.utils.response_cache import invalidates
 import jwt
 import os
 from functools import wraps
@@ -58,6 +59,7 @@ def get_variation_types():
 
 @variations_bp.route('/variation-types', methods=['POST'])
 @admin_required
+@invalidates('products')
 def create_variation_type():
     try:
         data = request.get_json()
@@ -88,6 +90,7 @@ def create_variation_type():
 
 @variations_bp.route('/variation-types/<int:variation_type_id>', methods=['PUT'])
 @admin_required
+@invalidates('products')
 def update_variation_type(variation_type_id):
     try:
         variation_type = VariationType.query.get_or_404(variation_type_id)
@@ -122,6 +125,7 @@ def update_variation_type(variation_type_id):
 
 @variations_bp.route('/variation-types/<int:variation_type_id>', methods=['DELETE'])
 @admin_required
+@invalidates('products')
 def delete_variation_type(variation_type_id):
     try:
         variation_type = VariationType.query.get_or_404(variation_type_id)
@@ -173,6 +177,7 @@ def get_variation_options():
 
 @variations_bp.route('/variation-options', methods=['POST'])
 @admin_required
+@invalidates('products')
 def create_variation_option():
     try:
         data = request.get_json()
@@ -212,6 +217,7 @@ def create_variation_option():
 
 @variations_bp.route('/variation-options/<int:variation_option_id>', methods=['PUT'])
 @admin_required
+@invalidates('products')
 def update_variation_option(variation_option_id):
     try:
         variation_option = VariationOption.query.get_or_404(variation_option_id)
@@ -249,6 +255,7 @@ def update_variation_option(variation_option_id):
 
 @variations_bp.route('/variation-options/<int:variation_option_id>', methods=['DELETE'])
 @admin_required
+@invalidates('products')
 def delete_variation_option(variation_option_id):
     try:
         variation_option = VariationOption.query.get_or_404(variation_option_id)
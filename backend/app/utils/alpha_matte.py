@@ -0,0 +1,114 @@
+"""
+Alpha Matte Post-Processing for PEBDEQ
+Single-buffer threshold / blur / re-threshold stage for background removal masks
+"""
+
+import os
+import math
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+# OpenCV is the fast path, SciPy and PIL are fallbacks
+try:
+    import cv2
+    ALPHA_BACKEND = 'opencv'
+except ImportError:
+    cv2 = None
+    try:
+        from scipy import ndimage
+        ALPHA_BACKEND = 'scipy'
+    except ImportError:
+        ndimage = None
+        ALPHA_BACKEND = 'pil'
+
+
+def diagnostics_enabled() -> bool:
+    """Full-resolution alpha statistics are only computed when BG_DIAGNOSTICS is on"""
+    return os.environ.get('BG_DIAGNOSTICS', 'false').lower() in ['true', 'on', '1']
+
+
+def _histogram(alpha: np.ndarray) -> np.ndarray:
+    """256-bin histogram without an intermediate int64 copy of the buffer"""
+    if cv2 is not None:
+        return cv2.calcHist([alpha], [0], None, [256], [0, 256]).ravel()
+    return np.bincount(alpha.ravel(), minlength=256)
+
+
+def alpha_stats(alpha: np.ndarray) -> Dict[str, Any]:
+    """Unique values, range and transparency of an alpha channel in one histogram pass"""
+    histogram = _histogram(alpha)
+    present = np.flatnonzero(histogram)
+    return {
+        'unique': int(present.size),
+        'min': int(present[0]) if present.size else 0,
+        'max': int(present[-1]) if present.size else 0,
+        'transparency': float(histogram[0] / alpha.size) if alpha.size else 0.0
+    }
+
+
+def _threshold(alpha: np.ndarray, value: int):
+    """alpha = 255 where alpha > value else 0, in place"""
+    if cv2 is not None:
+        cv2.threshold(alpha, value, 255, cv2.THRESH_BINARY, dst=alpha)
+    else:
+        mask = alpha > value
+        alpha.fill(0)
+        alpha[mask] = 255
+
+
+def _blur(alpha: np.ndarray, sigma: float):
+    """Gaussian blur of a uint8 buffer, in place"""
+    if cv2 is not None:
+        cv2.GaussianBlur(alpha, (0, 0), sigmaX=sigma, sigmaY=sigma, dst=alpha)
+    elif ALPHA_BACKEND == 'scipy':
+        alpha[...] = ndimage.gaussian_filter(alpha, sigma=sigma)
+    else:
+        from PIL import Image, ImageFilter
+        blurred = Image.fromarray(alpha, mode='L').filter(ImageFilter.GaussianBlur(radius=sigma))
+        alpha[...] = np.asarray(blurred)
+
+
+def postprocess_alpha(alpha: np.ndarray, params: Dict[str, Any], label: Optional[str] = None) -> np.ndarray:
+    """
+    Run threshold -> blur -> re-threshold on a uint8 alpha buffer in place
+
+    Recognised params (all optional):
+        threshold:        binarize at this value before blurring
+        blur_radii:       gaussian sigmas; consecutive blurs are merged into one
+                          pass since sigma_total = sqrt(sum(sigma_i ** 2))
+        rethreshold:      binarize again after blurring (hard edges)
+        auto_invert:      flip the matte if background outweighs foreground
+
+    Returns the same array so calls can be chained.
+    """
+    if alpha.dtype != np.uint8 or not alpha.flags.writeable:
+        raise ValueError('postprocess_alpha needs a writeable uint8 buffer')
+
+    show_stats = diagnostics_enabled()
+    if show_stats and label:
+        stats = alpha_stats(alpha)
+        print(f"   📊 RAW {label} Alpha: {stats['unique']} unique values, range {stats['min']}-{stats['max']}, transparency {stats['transparency']:.3f}")
+
+    if params.get('threshold') is not None:
+        _threshold(alpha, params['threshold'])
+
+    blur_radii = params.get('blur_radii') or []
+    if blur_radii:
+        _blur(alpha, math.sqrt(sum(r * r for r in blur_radii)))
+
+    if params.get('rethreshold') is not None:
+        _threshold(alpha, params['rethreshold'])
+
+    if params.get('auto_invert'):
+        # Same rule as before: more clear background than solid foreground means the mask is upside down
+        histogram = _histogram(alpha)
+        if histogram[:50].sum() > histogram[201:].sum():
+            np.subtract(255, alpha, out=alpha)
+            print("   🔄 Inverted mask for correct orientation")
+
+    if show_stats and label:
+        stats = alpha_stats(alpha)
+        print(f"   📊 FINAL {label} Alpha: {stats['unique']} unique values, range {stats['min']}-{stats['max']}, transparency {stats['transparency']:.3f}")
+
+    return alpha
@@ -0,0 +1,700 @@
+"""
+Background Removal Job Queue for PEBDEQ
+Runs model inference in dedicated worker processes so web workers only enqueue.
+The queue is a directory shared by every web worker on the host and one supervisor
+per host owns the worker pool: the process holding the supervisor lock, or
+run_bg_worker.py with BG_WORKER_MODE=external. Pool size and queue limit are host-wide
+"""
+
+import os
+import json
+import time
+import uuid
+import threading
+import multiprocessing
+from multiprocessing.connection import wait
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows - every process supervises its own pool
+    fcntl = None
+
+# Job states
+JOB_PENDING = 'pending'
+JOB_RUNNING = 'running'
+JOB_DONE = 'done'
+JOB_FAILED = 'failed'
+JOB_CANCELLED = 'cancelled'
+JOB_TIMEOUT = 'timeout'
+
+FINISHED_STATES = (JOB_DONE, JOB_FAILED, JOB_CANCELLED, JOB_TIMEOUT)
+
+# Job kinds
+JOB_SINGLE = 'single'
+JOB_BATCH = 'batch'
+
+# Rough peak RAM (GB) one inference worker needs with BiRefNet resident
+WORKER_MEMORY_GB = 2.5
+
+# Files in the jobs directory shared by every process on the host
+QUEUE_FOLDER = 'queue'
+QUEUE_LOCK_FILE = 'queue.lock'
+SUPERVISOR_LOCK_FILE = 'supervisor.lock'
+HEARTBEAT_FILE = 'supervisor.state'
+WARMUP_FILE = 'warmup.request'
+
+# Seconds between supervisor lock attempts of standby web workers
+ELECTION_INTERVAL = 2.0
+
+
+class QueueFullError(Exception):
+    """Raised when the job queue has no room for another job"""
+    pass
+
+
+def _total_memory_gb() -> float:
+    """Total physical memory in GB (0 if it cannot be determined)"""
+    try:
+        import psutil
+        return psutil.virtual_memory().total / (1024 ** 3)
+    except ImportError:
+        pass
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES') / (1024 ** 3)
+    except (ValueError, OSError, AttributeError):
+        return 0
+
+
+def default_worker_count() -> int:
+    """Size the host's worker pool to available cores and RAM"""
+    configured = os.environ.get('BG_WORKERS')
+    if configured:
+        return max(1, int(configured))
+    cpu_workers = max(1, (os.cpu_count() or 1) // 2)
+    memory_gb = _total_memory_gb()
+    if memory_gb:
+        return max(1, min(cpu_workers, int(memory_gb // WORKER_MEMORY_GB)))
+    return 1
+
+
+def worker_mode() -> str:
+    """'embedded' (a web worker elected by lock runs the pool) or 'external' (run_bg_worker.py does)"""
+    mode = (os.environ.get('BG_WORKER_MODE') or 'embedded').strip().lower()
+    return 'external' if mode == 'external' else 'embedded'
+
+
+def _default_jobs_dir() -> str:
+    # backend/instance/bg_jobs
+    backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    return os.path.join(backend_dir, 'instance', 'bg_jobs')
+
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class _HostLock:
+    """An exclusive flock on a file, shared by every process on the host"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fd = None
+
+    def acquire(self, blocking: bool = True) -> bool:
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        if fcntl is not None:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                os.close(fd)
+                return False
+        self._fd = fd
+        return True
+
+    def release(self):
+        if self._fd is None:
+            return
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        os.close(self._fd)
+        self._fd = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+def _save_png(output_image, path: str):
+    cached_png = output_image.info.get('cached_png')
+    if cached_png is not None:
+        with open(path, 'wb') as f:
+            f.write(cached_png)
+    else:
+        output_image.save(path, format='PNG', compress_level=1)
+
+
+def _run_single(conn, task, pool):
+    from io import BytesIO
+    from PIL import Image
+    from app.utils.background_removal import unified_background_removal, background_removal_cache_key
+
+    start = time.perf_counter()
+    with open(task['input_path'], 'rb') as f:
+        image_bytes = f.read()
+    cache_key = background_removal_cache_key(image_bytes, task['model_type'])
+    input_image = Image.open(BytesIO(image_bytes))
+    output_image = unified_background_removal(input_image, task['model_type'], cache_key=cache_key)
+    _save_png(output_image, task['result_path'])
+    conn.send({
+        'job_id': task['job_id'],
+        'status': JOB_DONE,
+        'processing_time': round(time.perf_counter() - start, 3),
+        'dimensions': f'{output_image.size[0]}x{output_image.size[1]}',
+        'cache_hit': bool(output_image.info.get('cache_hit')),
+        'inference_size': output_image.info.get('inference_size'),
+        'peak_memory_mb': output_image.info.get('peak_memory_mb'),
+        'models': pool.stats()
+    })
+
+
+def _run_batch(conn, task, pool):
+    from io import BytesIO
+    from PIL import Image
+    from app.utils.background_removal import remove_background_batch, background_removal_cache_key
+
+    start = time.perf_counter()
+    images, cache_keys = [], []
+    for path in task['input_paths']:
+        with open(path, 'rb') as f:
+            image_bytes = f.read()
+        cache_keys.append(background_removal_cache_key(image_bytes, task['model_type']))
+        images.append(Image.open(BytesIO(image_bytes)))
+
+    for position, output_image, timings in remove_background_batch(images, task['model_type'],
+                                                                   task['batch_size'], cache_keys):
+        encode_start = time.perf_counter()
+        result_path = task['result_paths'][position]
+        _save_png(output_image, result_path)
+        timings['encode_time'] = round(time.perf_counter() - encode_start, 3)
+        timings['elapsed'] = round(time.perf_counter() - start, 3)
+        conn.send({
+            'job_id': task['job_id'],
+            'status': 'progress',
+            'result': {
+                'position': position,
+                'dimensions': f'{images[position].size[0]}x{images[position].size[1]}',
+                'output_size': os.path.getsize(result_path),
+                'timings': timings
+            }
+        })
+    conn.send({
+        'job_id': task['job_id'],
+        'status': JOB_DONE,
+        'processing_time': round(time.perf_counter() - start, 3),
+        'models': pool.stats()
+    })
+
+
+def _worker_main(conn):
+    """Worker process loop: receive a job, run inference, send back the result"""
+    from app.utils.model_sessions import get_model_session_pool
+    pool = get_model_session_pool()
+
+    # Load models before the first job arrives
+    warmup_models = [m.strip() for m in (os.environ.get('BG_MODEL_WARMUP') or '').split(',') if m.strip()]
+    if warmup_models:
+        pool.warm_up(warmup_models)
+
+    while True:
+        try:
+            task = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            break
+        if task is None:
+            break
+
+        if task.get('kind') == 'warmup':
+            results = pool.warm_up(task['models'])
+            conn.send({'kind': 'warmup', 'results': results, 'models': pool.stats()})
+            continue
+
+        try:
+            if task['kind'] == JOB_BATCH:
+                _run_batch(conn, task, pool)
+            else:
+                _run_single(conn, task, pool)
+        except Exception as e:
+            conn.send({'job_id': task['job_id'], 'status': JOB_FAILED, 'error': str(e)})
+
+
+class _Worker:
+    """Handle for one inference worker process"""
+
+    def __init__(self, ctx):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.job = None
+        self.started_at = None
+        self.models = None
+
+    def stop(self, force=False):
+        try:
+            if force:
+                self.process.terminate()
+            else:
+                self.conn.send(None)
+            self.process.join(timeout=5)
+            if self.process.is_alive():
+                self.process.kill()
+        except Exception:
+            pass
+        self.conn.close()
+
+
+class BackgroundJobManager:
+    """
+    Queues background removal jobs and, in the host's supervisor, runs them
+
+    Every method works from the shared jobs directory, so any web worker
+    can submit, poll or cancel any job. Only the supervisor starts worker
+    processes; in embedded mode web workers take over supervision when
+    the current supervisor exits.
+    """
+
+    def __init__(self, workers: Optional[int] = None, max_queue: Optional[int] = None,
+                 job_timeout: Optional[int] = None, jobs_dir: Optional[str] = None):
+        """Initialize the manager (worker processes start once this process supervises)"""
+        self.worker_count = workers or default_worker_count()
+        self.max_queue = max_queue or int(os.environ.get('BG_QUEUE_SIZE') or 20)
+        self.job_timeout = job_timeout or int(os.environ.get('BG_JOB_TIMEOUT') or 120)
+        self.result_ttl = int(os.environ.get('BG_JOB_RESULT_TTL') or 3600)
+        self.jobs_dir = jobs_dir or _default_jobs_dir()
+        self.queue_dir = os.path.join(self.jobs_dir, QUEUE_FOLDER)
+        os.makedirs(self.queue_dir, exist_ok=True)
+
+        self._ctx = multiprocessing.get_context('spawn')
+        self._lock = threading.Lock()
+        self._workers = []
+        self._elector = None
+        self._supervisor_lock = None
+        self._running = False
+        self._last_heartbeat = 0.0
+        self._last_cleanup = 0.0
+        self._warmup_mtime = None
+
+    # ---- job files ---------------------------------------------------
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.jobs_dir, name)
+
+    def _record_path(self, job_id: str) -> str:
+        return self._path(f'{job_id}.json')
+
+    def _cancel_path(self, job_id: str) -> str:
+        return self._path(f'{job_id}.cancel')
+
+    def input_path(self, job_id: str, position: Optional[int] = None) -> str:
+        suffix = '' if position is None else f'-{position}'
+        return self._path(f'{job_id}{suffix}.input')
+
+    def result_path(self, job_id: str, position: Optional[int] = None) -> str:
+        suffix = '' if position is None else f'-{position}'
+        return self._path(f'{job_id}{suffix}.png')
+
+    def _input_paths(self, job: Dict[str, Any]) -> List[str]:
+        if job.get('kind') == JOB_BATCH:
+            return [self.input_path(job['id'], position) for position in range(len(job['items']))]
+        return [self.input_path(job['id'])]
+
+    def _result_paths(self, job: Dict[str, Any]) -> List[str]:
+        if job.get('kind') == JOB_BATCH:
+            return [self.result_path(job['id'], position) for position in range(len(job['items']))]
+        return [self.result_path(job['id'])]
+
+    def _write_json(self, path: str, data: Dict[str, Any]):
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    def _read_json(self, path: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _save(self, job: Dict[str, Any]):
+        """Persist a job record so any web worker can answer polls"""
+        self._write_json(self._record_path(job['id']), job)
+
+    def _load(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self._read_json(self._record_path(job_id))
+
+    def _queue_entries(self) -> List[str]:
+        # <enqueue time_ns>-<job id>, so sorting gives FIFO order
+        return sorted(os.listdir(self.queue_dir))
+
+    def _claim(self, job_id: str) -> bool:
+        """Take a job off the queue; only one process wins"""
+        for entry in self._queue_entries():
+            if entry.endswith(job_id):
+                try:
+                    os.remove(os.path.join(self.queue_dir, entry))
+                    return True
+                except FileNotFoundError:
+                    return False
+        return False
+
+    @staticmethod
+    def _valid_job_id(job_id: str) -> bool:
+        return len(job_id) == 32 and all(c in '0123456789abcdef' for c in job_id)
+
+    # ---- public API --------------------------------------------------
+
+    def submit(self, image_bytes: bytes, model_type: str = 'fast', timeout: Optional[int] = None) -> Dict[str, Any]:
+        """Queue an image for background removal"""
+        return self._enqueue(JOB_SINGLE, [image_bytes], model_type,
+                             min(timeout or self.job_timeout, self.job_timeout))
+
+    def submit_batch(self, images: List[Tuple[str, bytes]], model_type: str = 'fast',
+                     batch_size: int = 4) -> Dict[str, Any]:
+        """Queue a list of (filename, image bytes) as one job; results are recorded per image"""
+        items = [{'filename': filename, 'input_size': len(data)} for filename, data in images]
+        return self._enqueue(JOB_BATCH, [data for _, data in images], model_type,
+                             self.job_timeout * max(1, len(images)),
+                             {'items': items, 'batch_size': max(1, batch_size), 'results': []})
+
+    def _enqueue(self, kind: str, inputs: List[bytes], model_type: str, timeout: int,
+                 extra: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        job_id = uuid.uuid4().hex
+        job = {
+            'id': job_id,
+            'kind': kind,
+            'status': JOB_PENDING,
+            'model_type': model_type,
+            'timeout': timeout,
+            'input_size': sum(len(data) for data in inputs),
+            'created_at': time.time(),
+            'started_at': None,
+            'finished_at': None,
+            'error': None,
+            **(extra or {})
+        }
+        # Count and enqueue under one host-wide lock so the cap holds across web workers
+        with _HostLock(self._path(QUEUE_LOCK_FILE)):
+            if len(os.listdir(self.queue_dir)) >= self.max_queue:
+                raise QueueFullError(f'Background removal queue is full ({self.max_queue} jobs)')
+            for path, data in zip(self._input_paths(job), inputs):
+                with open(path, 'wb') as f:
+                    f.write(data)
+            self._save(job)
+            open(os.path.join(self.queue_dir, f'{time.time_ns():020d}-{job_id}'), 'w').close()
+        self._ensure_supervisor()
+        return self._public(job)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get a job record"""
+        if not self._valid_job_id(job_id):
+            return None
+        self._ensure_supervisor()
+        job = self._load(job_id)
+        return self._public(job) if job else None
+
+    def cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Cancel a pending or running job"""
+        if not self._valid_job_id(job_id):
+            return None
+        job = self._load(job_id)
+        if job is None:
+            return None
+        if job['status'] not in FINISHED_STATES:
+            # The supervisor stops running jobs that have a cancel flag
+            open(self._cancel_path(job_id), 'w').close()
+            if job['status'] == JOB_PENDING and self._claim(job_id):
+                self._finish(job, JOB_CANCELLED)
+        return self._public(self._load(job_id) or job)
+
+    def request_warm_up(self, models: List[str]) -> Dict[str, Any]:
+        """Ask every inference worker to preload the given models"""
+        self._write_json(self._path(WARMUP_FILE), {'models': list(models), 'requested_at': time.time()})
+        self._ensure_supervisor()
+        return {'models': list(models), 'workers': self.stats()['workers_alive']}
+
+    def model_stats(self) -> List[Dict[str, Any]]:
+        """Model session pool counters of each inference worker, as last reported"""
+        heartbeat = self._read_json(self._path(HEARTBEAT_FILE)) or {}
+        return heartbeat.get('models') or []
+
+    def stats(self) -> Dict[str, Any]:
+        """Host-wide queue and worker counters"""
+        counts = {}
+        for name in os.listdir(self.jobs_dir):
+            if name.endswith('.json'):
+                job = self._read_json(self._path(name))
+                if job:
+                    counts[job['status']] = counts.get(job['status'], 0) + 1
+        heartbeat = self._read_json(self._path(HEARTBEAT_FILE)) or {}
+        # A heartbeat older than a few seconds means no supervisor is running
+        alive = time.time() - heartbeat.get('updated_at', 0) < 10
+        return {
+            'mode': worker_mode(),
+            'supervisor_pid': heartbeat.get('pid') if alive else None,
+            'workers': heartbeat.get('workers', self.worker_count),
+            'workers_alive': heartbeat.get('workers_alive', 0) if alive else 0,
+            'busy_workers': heartbeat.get('busy_workers', 0) if alive else 0,
+            'queued': len(os.listdir(self.queue_dir)),
+            'max_queue': self.max_queue,
+            'job_timeout': self.job_timeout,
+            'jobs': counts
+        }
+
+    def shutdown(self):
+        """Stop supervising and all worker processes"""
+        self._running = False
+        with self._lock:
+            for worker in self._workers:
+                worker.stop(force=worker.job is not None)
+            self._workers = []
+            if self._supervisor_lock is not None:
+                self._supervisor_lock.release()
+                self._supervisor_lock = None
+
+    # ---- supervision -------------------------------------------------
+
+    def _public(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        data = dict(job)
+        data['cancel_requested'] = os.path.exists(self._cancel_path(job['id']))
+        if job['status'] == JOB_DONE and job.get('kind') != JOB_BATCH:
+            data['result_url'] = f"/api/products/remove-background/jobs/{job['id']}/result"
+        if job['status'] == JOB_PENDING:
+            for position, entry in enumerate(self._queue_entries()):
+                if entry.endswith(job['id']):
+                    data['queue_position'] = position + 1
+                    break
+        return data
+
+    def _ensure_supervisor(self):
+        """In embedded mode, start competing for the host's supervisor lock"""
+        if worker_mode() == 'external' or self._elector is not None:
+            return
+        with self._lock:
+            if self._elector is None:
+                self._elector = threading.Thread(target=self._elect, daemon=True)
+                self._elector.start()
+
+    def _elect(self):
+        lock = _HostLock(self._path(SUPERVISOR_LOCK_FILE))
+        while not lock.acquire(blocking=False):
+            time.sleep(ELECTION_INTERVAL)
+        self._supervise(lock)
+
+    def run(self):
+        """Supervise the host's worker pool in the foreground (run_bg_worker.py)"""
+        lock = _HostLock(self._path(SUPERVISOR_LOCK_FILE))
+        if not lock.acquire(blocking=False):
+            print("⏳ Another background removal supervisor is running - waiting for it to exit")
+            lock.acquire()
+        self._supervise(lock)
+
+    def _supervise(self, lock: _HostLock):
+        with self._lock:
+            self._supervisor_lock = lock
+            self._running = True
+            self._recover()
+            self._workers = [_Worker(self._ctx) for _ in range(self.worker_count)]
+        print(f"🧵 Background removal supervisor (pid {os.getpid()}) started "
+              f"{self.worker_count} worker process(es)")
+        while self._running:
+            ready = wait([w.conn for w in self._workers], timeout=0.2)
+            with self._lock:
+                if not self._running:
+                    break
+                self._collect(ready)
+                self._enforce_limits()
+                self._dispatch()
+                self._forward_warm_up()
+                self._heartbeat()
+                self._cleanup()
+
+    def _recover(self):
+        """Fail jobs a previous supervisor was running when it exited"""
+        for name in os.listdir(self.jobs_dir):
+            if name.endswith('.json'):
+                job = self._read_json(self._path(name))
+                if job and job['status'] == JOB_RUNNING:
+                    self._finish(job, JOB_FAILED, 'Supervisor exited while the job was running')
+
+    def _finish(self, job: Dict[str, Any], status: str, error: Optional[str] = None):
+        job['status'] = status
+        job['error'] = error
+        job['finished_at'] = time.time()
+        if job.get('started_at'):
+            job['processing_time'] = round(job['finished_at'] - job['started_at'], 3)
+        self._save(job)
+        for path in self._input_paths(job) + [self._cancel_path(job['id'])]:
+            _remove(path)
+
+    def _replace_worker(self, worker: _Worker):
+        worker.stop(force=True)
+        self._workers[self._workers.index(worker)] = _Worker(self._ctx)
+
+    def _task(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        task = {'job_id': job['id'], 'kind': job.get('kind', JOB_SINGLE), 'model_type': job['model_type']}
+        if task['kind'] == JOB_BATCH:
+            task.update(input_paths=self._input_paths(job), result_paths=self._result_paths(job),
+                        batch_size=job['batch_size'])
+        else:
+            task.update(input_path=self.input_path(job['id']), result_path=self.result_path(job['id']))
+        return task
+
+    def _dispatch(self):
+        free = [w for w in self._workers if w.job is None]
+        if not free:
+            return
+        for entry in self._queue_entries():
+            if not free:
+                return
+            job_id = entry.split('-', 1)[1]
+            try:
+                os.remove(os.path.join(self.queue_dir, entry))
+            except FileNotFoundError:
+                continue  # cancelled meanwhile
+            job = self._load(job_id)
+            if job is None:
+                continue
+            if os.path.exists(self._cancel_path(job_id)):
+                self._finish(job, JOB_CANCELLED)
+                continue
+            worker = free.pop(0)
+            job['status'] = JOB_RUNNING
+            job['started_at'] = time.time()
+            self._save(job)
+            worker.job = job
+            worker.started_at = job['started_at']
+            try:
+                worker.conn.send(self._task(job))
+            except (BrokenPipeError, OSError):
+                # Idle worker died - respawn it and put the job back in its place
+                job['status'] = JOB_PENDING
+                job['started_at'] = None
+                self._save(job)
+                open(os.path.join(self.queue_dir, entry), 'w').close()
+                self._replace_worker(worker)
+                return
+
+    def _collect(self, ready):
+        for worker in list(self._workers):
+            if worker.conn not in ready:
+                continue
+            try:
+                message = worker.conn.recv()
+            except (EOFError, OSError):
+                # Worker died (e.g. OOM) - fail its job and respawn it
+                if worker.job is not None:
+                    self._finish(worker.job, JOB_FAILED, 'Worker process exited unexpectedly')
+                self._replace_worker(worker)
+                continue
+            worker.models = message.get('models') or worker.models
+            if message.get('kind') == 'warmup':
+                continue
+            job = worker.job
+            if job is None or job['id'] != message.get('job_id'):
+                continue
+            if message['status'] == 'progress':
+                job['results'].append(message['result'])
+                self._save(job)
+                continue
+            worker.job = None
+            if message['status'] == JOB_DONE:
+                for field in ('dimensions', 'cache_hit', 'inference_size', 'peak_memory_mb'):
+                    if field in message:
+                        job[field] = message[field]
+                job['inference_time'] = message.get('processing_time')
+                self._finish(job, JOB_DONE)
+            else:
+                self._finish(job, JOB_FAILED, message.get('error'))
+
+    def _enforce_limits(self):
+        now = time.time()
+        for worker in list(self._workers):
+            job = worker.job
+            if job is None:
+                continue
+            if os.path.exists(self._cancel_path(job['id'])):
+                self._finish(job, JOB_CANCELLED)
+                self._replace_worker(worker)
+            elif now - worker.started_at > job['timeout']:
+                self._finish(job, JOB_TIMEOUT, f"Job exceeded {job['timeout']}s timeout")
+                self._replace_worker(worker)
+
+    def _forward_warm_up(self):
+        try:
+            mtime = os.path.getmtime(self._path(WARMUP_FILE))
+        except OSError:
+            return
+        if mtime == self._warmup_mtime:
+            return
+        first_check = self._warmup_mtime is None
+        self._warmup_mtime = mtime
+        request = self._read_json(self._path(WARMUP_FILE))
+        # Requests older than this supervisor were already served by the previous one
+        if not request or (first_check and request.get('requested_at', 0) < time.time() - 60):
+            return
+        for worker in self._workers:
+            try:
+                worker.conn.send({'kind': 'warmup', 'models': request['models']})
+            except (BrokenPipeError, OSError):
+                pass
+
+    def _heartbeat(self):
+        now = time.time()
+        if now - self._last_heartbeat < 1.0:
+            return
+        self._last_heartbeat = now
+        self._write_json(self._path(HEARTBEAT_FILE), {
+            'pid': os.getpid(),
+            'workers': self.worker_count,
+            'workers_alive': sum(1 for w in self._workers if w.process.is_alive()),
+            'busy_workers': sum(1 for w in self._workers if w.job is not None),
+            'models': [w.models for w in self._workers if w.models],
+            'updated_at': now
+        })
+
+    def _cleanup(self):
+        """Delete finished jobs' files after the result TTL"""
+        now = time.time()
+        if now - self._last_cleanup < 60:
+            return
+        self._last_cleanup = now
+        for name in os.listdir(self.jobs_dir):
+            if not name.endswith('.json'):
+                continue
+            job = self._read_json(self._path(name))
+            if job and job['status'] in FINISHED_STATES and now - job['finished_at'] > self.result_ttl:
+                for path in self._result_paths(job) + [self._record_path(job['id'])]:
+                    _remove(path)
+
+
+# Global job manager instance - lazy loading
+background_job_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_background_job_manager() -> BackgroundJobManager:
+    """Get or create this process's handle on the host's background removal queue"""
+    global background_job_manager
+    if background_job_manager is None:
+        with _manager_lock:
+            if background_job_manager is None:
+                background_job_manager = BackgroundJobManager()
+    return background_job_manager
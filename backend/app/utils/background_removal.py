@@ -0,0 +1,481 @@
+"""
+Background Removal Service for PEBDEQ
+U2Net / BiRefNet / BRIA inference shared by the API routes and worker processes
+"""
+
+import time
+from io import BytesIO
+from PIL import Image
+import numpy as np
+from app.utils.model_sessions import get_model_session_pool
+from app.utils.alpha_matte import postprocess_alpha
+from app.utils.large_image import PeakMemoryTracker, large_image_settings, remove_background_large
+
+# REMBG import - only U2Net, no BiRefNet
+try:
+    from rembg import remove
+    AI_BACKGROUND_REMOVAL_AVAILABLE = True
+    print("✅ REMBG available - U2Net background removal enabled")
+except ImportError:
+    AI_BACKGROUND_REMOVAL_AVAILABLE = False
+    print("❌ REMBG not available - Background removal disabled")
+
+# Pre/post-processing parameters per mode - part of the result cache key,
+# so changing any of them invalidates previously cached results
+POSTPROCESS_PARAMS = {
+    'fast': {
+        'model': 'u2net'
+    },
+    'premium': {
+        'model': 'birefnet-general',
+        'contrast': 1.2,
+        # Ultra-sharp: hard threshold, light blur, hard re-threshold
+        'threshold': 160,
+        'blur_radii': [0.3],
+        'rethreshold': 100
+    },
+    'ultra': {
+        'model': 'bria-rmbg-1.4',
+        'sharpness': 1.05,
+        # Precision: threshold then soft multi-pass blur edges
+        'threshold': 80,
+        'blur_radii': [1.0, 0.5],
+        'auto_invert': True
+    }
+}
+
+def background_removal_cache_key(image_bytes, model_type="fast"):
+    """Content-addressed cache key for a background removal result"""
+    from app.utils.result_cache import make_cache_key
+    params = POSTPROCESS_PARAMS.get(model_type, POSTPROCESS_PARAMS['fast'])
+    # Downscaled inference changes the output of large photos
+    params = dict(params, large_image=large_image_settings())
+    return make_cache_key(image_bytes, params['model'], params)
+
+def unified_background_removal(image, model_type="fast", cache_key=None):
+    """
+    🚀 Smart Background Removal - Professional 3-Model System (BiRefNet 2nd Position)
+    
+    Model options:
+    - Fast Mode: U2Net (2-5 seconds, good quality)
+    - Premium Mode: BiRefNet-General (10-30 seconds, maximum quality - 2nd position)
+    - Ultra Mode: BRIA RMBG-1.4 (5-15 seconds, very high quality - 3rd position)
+    
+    Args:
+        image: PIL Image object
+        model_type: "fast", "premium", or "ultra"
+        cache_key: optional result cache key (see background_removal_cache_key)
+    
+    Returns:
+        PIL Image with background removed (RGBA format). When the result
+        went through the cache its encoded PNG is kept in
+        image.info['cached_png'] so callers can skip re-encoding, and
+        image.info['cache_hit'] is set when inference was skipped.
+        image.info['peak_memory_mb'] reports the process RSS peak during
+        inference and image.info['inference_size'] the size the model saw.
+    """
+    if cache_key:
+        from app.utils.result_cache import get_result_cache
+        cached_bytes = get_result_cache().get(cache_key)
+        if cached_bytes is not None:
+            print("   ⚡ Background removal cache hit - skipping inference")
+            # Image.open is lazy - pixels are only decoded if the caller needs them
+            cached_image = Image.open(BytesIO(cached_bytes))
+            cached_image.info['cached_png'] = cached_bytes
+            cached_image.info['cache_hit'] = True
+            return cached_image
+    
+    print("🚀 Starting Professional Background Removal with Model Isolation...")
+    
+    # Performance setup
+    import multiprocessing
+    cpu_count = multiprocessing.cpu_count()
+    print(f"   🖥️  Using all {cpu_count} CPU cores")
+    
+    print(f"   📏 Processing image: {image.size} pixels")
+    
+    try:
+        with PeakMemoryTracker() as memory:
+            # Large photos: infer on a downscaled copy, refine the mask at full size
+            result = remove_background_large(image, model_type, _run_background_removal)
+            if result is None:
+                # Convert to RGBA if needed
+                if image.mode != 'RGBA':
+                    image = image.convert('RGBA')
+                    print("   📷 Converted to RGBA format")
+                result = _run_background_removal(image, model_type)
+                result.info['inference_size'] = f'{image.size[0]}x{image.size[1]}'
+        result.info['peak_memory_mb'] = memory.peak_mb
+        print(f"   📈 Peak memory: {memory.peak_mb} MB (+{memory.delta_mb} MB)")
+        
+        if cache_key:
+            from app.utils.result_cache import get_result_cache
+            get_result_cache().put_image(cache_key, result)
+        
+        return result
+        
+    except Exception as e:
+        print(f"   ❌ Background removal failed: {str(e)}")
+        print("   🔄 Returning original image")
+        return image if image.mode == 'RGBA' else image.convert('RGBA')
+
+def _run_background_removal(image, model_type):
+    """Dispatch to the model for model_type - raises on failure"""
+    # Models stay warm in the process-wide session pool - no per-request reload
+    if model_type == "premium":
+        print("   🌟 Premium Mode: BiRefNet-General (Maximum Quality - Takes 10-30s) - 2ND POSITION")
+        print("   🔒 Isolated BiRefNet processing...")
+        return _process_with_birefnet_isolated(image)
+    elif model_type == "ultra":
+        print("   🚀 Ultra Mode: BRIA RMBG-1.4 (Very High Quality - Takes 5-15s) - 3RD POSITION")
+        print("   🔒 Isolated BRIA processing...")
+        return _process_with_bria_isolated(image)
+    else:
+        print("   ⚡ Fast Mode: U2Net (Good Quality - Takes 2-5s)")
+        return _process_with_u2net_from_image(image)
+
+def _process_with_u2net_from_image(image):
+    """Process with U2Net model directly from PIL Image"""
+    try:
+        # Convert to bytes for REMBG
+        input_buffer = BytesIO()
+        image.save(input_buffer, format='PNG', optimize=False)
+        input_buffer.seek(0)
+        input_bytes = input_buffer.getvalue()
+        
+        # Use U2Net - fast and reliable (warm session from the pool)
+        session = get_model_session_pool().get('u2net')
+        output_bytes = remove(input_bytes, session=session)
+        print("   ✅ U2Net processing completed (Reliable & Fast)")
+        
+        # Convert back to PIL
+        result_image = Image.open(BytesIO(output_bytes))
+        if result_image.mode != 'RGBA':
+            result_image = result_image.convert('RGBA')
+        
+        print("   🎉 U2Net background removal completed successfully")
+        return result_image
+        
+    except Exception as e:
+        print(f"   ❌ U2Net processing failed: {str(e)}")
+        raise
+
+# Old BRIA function removed - using isolated version above
+
+def _process_with_birefnet_isolated(image):
+    """Process with BiRefNet-General model - NO FALLBACKS (Testing Mode)"""
+    print("   🌟 STARTING BiRefNet-General - NO FALLBACKS ALLOWED!")
+    print("   🚫 WILL FAIL IF BiRefNet NOT WORKING!")
+    
+    # Check REMBG availability with detailed error reporting
+    print("   📦 Checking REMBG availability...")
+    from rembg import remove
+    print("   ✅ REMBG imported successfully")
+    
+    print("   🌟 BiRefNet Processing - FORCING BiRefNet-General...")
+    
+    # Create a completely fresh image copy to avoid any contamination
+    fresh_image = image.copy()
+    if fresh_image.mode != 'RGB':
+        fresh_image = fresh_image.convert('RGB')
+        print(f"   📷 Converted {image.mode} to RGB")
+    else:
+        print("   📷 Image already in RGB mode")
+    
+    # BiRefNet-specific preprocessing for maximum sharpness
+    import numpy as np
+    from PIL import ImageEnhance, ImageFilter
+    
+    print("   🔪 Applying BiRefNet aggressive preprocessing...")
+    # Enhance image for BiRefNet's aggressive processing
+    enhancer = ImageEnhance.Contrast(fresh_image)
+    params = POSTPROCESS_PARAMS['premium']
+    enhanced_image = enhancer.enhance(params['contrast'])  # Increase contrast
+    print(f"   🔪 Applied contrast enhancement ({params['contrast']}x)")
+    
+    # Sharpen slightly for better edge detection
+    sharpened_image = enhanced_image.filter(ImageFilter.UnsharpMask(radius=1, percent=120, threshold=3))
+    print("   🔪 Applied UnsharpMask sharpening")
+    
+    # Convert PIL to bytes for REMBG with maximum quality
+    input_buffer = BytesIO()
+    sharpened_image.save(input_buffer, format='PNG', compress_level=0)
+    input_bytes = input_buffer.getvalue()
+    print(f"   📏 BiRefNet input size: {len(input_bytes)} bytes (uncompressed)")
+    
+    # Warm session from the process-wide pool (loaded once per process)
+    print("   🧠 Getting BiRefNet-General session - NO ALTERNATIVES!")
+    print("   ⚠️  This WILL FAIL if BiRefNet model not available...")
+    
+    session = get_model_session_pool().get('birefnet-general')  # NO TRY/CATCH - Let it fail!
+    print("   ✅ BiRefNet-General session ready!")
+    
+    print("   🎨 BiRefNet background removal - NO FALLBACKS!")
+    print("   ⏱️  Processing may take 10-30 seconds...")
+    
+    output_bytes = remove(input_bytes, session=session)  # NO TRY/CATCH - Let it fail!
+    print(f"   ✅ BiRefNet processing completed!")
+    print(f"   📏 BiRefNet output size: {len(output_bytes)} bytes")
+    
+    # Convert back to PIL Image
+    output_image = Image.open(BytesIO(output_bytes))  # NO TRY/CATCH - Let it fail!
+    print(f"   📊 BiRefNet output: {output_image.mode}, size: {output_image.size}")
+    
+    # BiRefNet ultra-sharp postprocessing
+    print("   🔪 Applying BiRefNet ULTRA-SHARP postprocessing...")
+    if output_image.mode == 'RGBA':
+        # Work on the alpha channel only - one uint8 buffer, processed in place
+        alpha = np.array(output_image.getchannel('A'))
+        postprocess_alpha(alpha, params, label='BiRefNet')
+        output_image.putalpha(Image.fromarray(alpha, mode='L'))
+        print("   🔪 Applied BiRefNet ULTRA-SHARP edge processing")
+    else:
+        output_image = output_image.convert('RGBA')
+        print("   📷 Converted to RGBA format")
+    
+    print("   ✅ BiRefNet-General processing completed (NO FALLBACKS USED)")
+    print("   🎉 PURE BiRefNet quality confirmed!")
+    print("   🌟 BiRefNet is ACTUALLY WORKING!")
+    return output_image
+
+def _process_with_bria_isolated(image):
+    """Process with BRIA RMBG-1.4 model - NO FALLBACKS (Testing Mode)"""
+    print("   🚀 STARTING BRIA RMBG-1.4 - NO FALLBACKS ALLOWED!")
+    
+    print("   🚀 BRIA Processing - FORCING BRIA RMBG-1.4...")
+    
+    # Create a completely fresh image copy
+    fresh_image = image.copy()
+    if fresh_image.mode != 'RGB':
+        fresh_image = fresh_image.convert('RGB')
+    
+    # BRIA-specific preprocessing for precision
+    from PIL import ImageFilter, ImageEnhance
+    import numpy as np
+    
+    # Slight enhancement for better precision
+    enhancer = ImageEnhance.Sharpness(fresh_image)
+    params = POSTPROCESS_PARAMS['ultra']
+    enhanced_image = enhancer.enhance(params['sharpness'])  # Subtle sharpness increase
+    
+    # Very light smoothing for BRIA's precision processing
+    smoothed_image = enhanced_image.filter(ImageFilter.GaussianBlur(radius=0.2))
+    print("   🎨 Applied BRIA precision preprocessing")
+    
+    print(f"   📏 BRIA input: {smoothed_image.mode}, size: {smoothed_image.size}")
+    
+    # Warm pipeline from the process-wide pool (loaded once per process)
+    print("   🤖 Getting BRIA RMBG-1.4 pipeline - NO ALTERNATIVES!")
+    print("   ⚠️  This WILL FAIL if BRIA model not available...")
+    
+    pipe = get_model_session_pool().get('bria-rmbg-1.4')  # NO TRY/CATCH - Let it fail!
+    print("   ✅ BRIA RMBG-1.4 pipeline ready!")
+    
+    print("   🎨 BRIA precision background removal - NO FALLBACKS!")
+    
+    # Process with BRIA RMBG using warm pipeline
+    result = pipe(smoothed_image)  # NO TRY/CATCH - Let it fail!
+    print(f"   📊 BRIA result type: {type(result)}")
+    
+    # Extract mask with enhanced precision
+    mask = None
+    if isinstance(result, list) and len(result) > 0:
+        for i, item in enumerate(result):
+            if isinstance(item, dict) and 'mask' in item:
+                mask = item['mask']
+                print(f"   ✅ Extracted precision mask from item {i}")
+                break
+    
+    if mask is None:
+        raise Exception("Could not extract mask from BRIA result - NO FALLBACK!")
+    
+    # Process mask with BRIA precision optimization
+    if image.mode != 'RGBA':
+        rgba_image = image.convert('RGBA')
+    else:
+        rgba_image = image.copy()
+    
+    # Ensure mask size matches
+    if hasattr(mask, 'resize') and mask.size != rgba_image.size:
+        mask = mask.resize(rgba_image.size, Image.Resampling.LANCZOS)
+    
+    # Convert mask to a single uint8 buffer
+    if hasattr(mask, 'mode'):
+        if mask.mode != 'L':
+            mask = mask.convert('L')
+        mask_array = np.array(mask)
+    else:
+        mask_array = np.asarray(mask)
+        if mask_array.ndim == 3:
+            mask_array = mask_array.mean(axis=2)
+        if mask_array.max() <= 1.0:
+            mask_array = mask_array * 255
+        mask_array = mask_array.astype(np.uint8)
+    
+    # Threshold, merged multi-pass blur and orientation check - in place
+    postprocess_alpha(mask_array, params, label='BRIA')
+    print("   🌊 Applied BRIA multi-pass precision smoothing")
+    
+    if mask_array.shape != (rgba_image.size[1], rgba_image.size[0]):
+        mask_pil = Image.fromarray(mask_array, mode='L').resize(rgba_image.size, Image.Resampling.LANCZOS)
+    else:
+        mask_pil = Image.fromarray(mask_array, mode='L')
+    
+    rgba_image.putalpha(mask_pil)
+    result_image = rgba_image
+    
+    print("   ✅ BRIA RMBG-1.4 processing completed (NO FALLBACKS USED)")
+    print("   🎉 PURE BRIA quality confirmed!")
+    print("   🚀 BRIA is ACTUALLY WORKING!")
+    return result_image
+
+def _debug_bria_result(result, depth=0, max_depth=3):
+    """Debug helper to understand BRIA RMBG result structure"""
+    indent = "  " * depth
+    if depth > max_depth:
+        print(f"{indent}... (max depth reached)")
+        return
+    
+    if isinstance(result, list):
+        print(f"{indent}📋 List with {len(result)} items:")
+        for i, item in enumerate(result[:3]):  # Show first 3 items
+            print(f"{indent}  📦 [{i}]:")
+            _debug_bria_result(item, depth+1, max_depth)
+        if len(result) > 3:
+            print(f"{indent}  ... and {len(result)-3} more items")
+    elif isinstance(result, dict):
+        print(f"{indent}📋 Dict with keys: {list(result.keys())}")
+        for key, value in list(result.items())[:5]:  # Show first 5 keys
+            print(f"{indent}  🔑 {key}:")
+            _debug_bria_result(value, depth+1, max_depth)
+    else:
+        shape_info = getattr(result, 'shape', getattr(result, 'size', str(result)[:50]))
+        print(f"{indent}📊 {type(result).__name__}: {shape_info}")
+
+# ImageNet normalization used by rembg's U2Net session
+U2NET_MEAN = (0.485, 0.456, 0.406)
+U2NET_STD = (0.229, 0.224, 0.225)
+U2NET_INPUT_SIZE = (320, 320)
+
+def _session_supports_batching(session):
+    """True if the ONNX model has a dynamic batch dimension"""
+    try:
+        batch_dim = session.inner_session.get_inputs()[0].shape[0]
+    except Exception:
+        return False
+    return not isinstance(batch_dim, int) or batch_dim != 1
+
+def _u2net_batch_masks(session, images):
+    """Run one batched U2Net inference and return a mask per image"""
+    inputs = [session.normalize(img, U2NET_MEAN, U2NET_STD, U2NET_INPUT_SIZE) for img in images]
+    input_name = next(iter(inputs[0]))
+    batch = np.concatenate([item[input_name] for item in inputs], axis=0)
+    predictions = session.inner_session.run(None, {input_name: batch})[0][:, 0, :, :]
+    
+    masks = []
+    for img, pred in zip(images, predictions):
+        pred_max, pred_min = pred.max(), pred.min()
+        if pred_max > pred_min:
+            pred = (pred - pred_min) / (pred_max - pred_min)
+        mask = Image.fromarray((pred * 255).astype(np.uint8), mode='L')
+        masks.append(mask.resize(img.size, Image.Resampling.LANCZOS))
+    return masks
+
+def remove_background_batch(images, model_type="fast", batch_size=4, cache_keys=None):
+    """
+    Remove backgrounds from several images with one warm session
+    
+    Fast mode stacks same-size U2Net input tensors into a single ONNX run
+    when the model has a dynamic batch dimension; other modes (and models
+    with a fixed batch of 1) go image by image through unified_background_removal.
+    
+    Args:
+        images: list of PIL Image objects
+        model_type: "fast", "premium", or "ultra"
+        batch_size: images per ONNX run in fast mode
+        cache_keys: optional list of result cache keys, one per image
+    
+    Yields:
+        (index, RGBA PIL Image, timing dict) as each image finishes
+    """
+    from app.utils.result_cache import get_result_cache
+    
+    cache_keys = cache_keys or [None] * len(images)
+    
+    # Serve cached results first, only the misses need inference
+    pending = []
+    for index, cache_key in enumerate(cache_keys):
+        cached_bytes = get_result_cache().get(cache_key) if cache_key else None
+        if cached_bytes is None:
+            pending.append(index)
+            continue
+        cached_image = Image.open(BytesIO(cached_bytes))
+        cached_image.info['cached_png'] = cached_bytes
+        cached_image.info['cache_hit'] = True
+        yield index, cached_image, {'inference_time': 0, 'batch_size': 0, 'cache_hit': True}
+    
+    batched = False
+    session = None
+    if model_type == "fast" and len(pending) > 1:
+        try:
+            session = get_model_session_pool().get('u2net')
+            batched = _session_supports_batching(session)
+        except Exception as e:
+            print(f"   ⚠️  Batch session unavailable, processing one by one: {str(e)}")
+    
+    def process_single(index):
+        single_start = time.perf_counter()
+        # Cache lookup already happened above - only store successful results
+        image = images[index]
+        try:
+            result = remove_background_large(image, model_type, _run_background_removal)
+            if result is None:
+                result = _run_background_removal(image if image.mode == 'RGBA' else image.convert('RGBA'), model_type)
+            if cache_keys[index]:
+                get_result_cache().put_image(cache_keys[index], result)
+        except Exception as e:
+            print(f"   ❌ Background removal failed: {str(e)}")
+            result = image if image.mode == 'RGBA' else image.convert('RGBA')
+        return result, {'inference_time': round(time.perf_counter() - single_start, 3), 'batch_size': 1}
+    
+    if batched:
+        # Large photos take the downscaled path one at a time instead of a full-size batch tensor
+        max_side = large_image_settings()['max_side']
+        oversized = [index for index in pending if max(images[index].size) > max_side]
+        for index in oversized:
+            result, timings = process_single(index)
+            yield index, result, timings
+        pending = [index for index in pending if index not in oversized]
+    
+    if not batched:
+        for index in pending:
+            result, timings = process_single(index)
+            yield index, result, timings
+        return
+    
+    # U2Net resizes every input to 320x320, so any group of images shares a tensor shape
+    print(f"   📦 Batched U2Net inference: {len(pending)} images, batch size {batch_size}")
+    for chunk_start in range(0, len(pending), batch_size):
+        chunk_indices = pending[chunk_start:chunk_start + batch_size]
+        chunk = [images[index].convert('RGB') for index in chunk_indices]
+        start = time.perf_counter()
+        try:
+            masks = _u2net_batch_masks(session, chunk)
+        except Exception as e:
+            print(f"   ⚠️  Batched inference failed, processing chunk one by one: {str(e)}")
+            for index in chunk_indices:
+                result, timings = process_single(index)
+                yield index, result, timings
+            continue
+        
+        # Batch inference cost is shared evenly between its images
+        per_image_time = (time.perf_counter() - start) / len(chunk)
+        for index, rgb_image, mask in zip(chunk_indices, chunk, masks):
+            result = rgb_image.convert('RGBA')
+            result.putalpha(mask)
+            if cache_keys[index]:
+                get_result_cache().put_image(cache_keys[index], result)
+            yield index, result, {
+                'inference_time': round(per_image_time, 3),
+                'batch_size': len(chunk)
+            }
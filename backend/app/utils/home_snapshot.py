@@ -0,0 +1,287 @@
+"""
+Home Page Snapshot for PEBDEQ
+The home payload is stored precomputed and rebuilt per section when its data changes,
+so serving the home page is a single read
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable
+
+SNAPSHOT_KEY = 'home'
+
+# Which sections a committed change to each model makes stale
+SECTIONS_BY_MODEL = {
+    'Product': ('featured_products', 'categories', 'discounted_products', 'popular_products', 'site_stats'),
+    'Category': ('featured_products', 'categories', 'discounted_products', 'popular_products'),
+    'BlogPost': ('latest_posts',),
+    'Order': ('site_stats', 'popular_products'),
+    'SettingsSection': ('site_settings',),
+}
+# Also refreshed on a schedule, to pick up counters changed outside the ORM (reconciliation, SQL)
+SCHEDULED_SECTIONS = ('popular_products', 'site_stats')
+
+
+def popular_max_age() -> int:
+    return int(os.environ.get('HOME_POPULAR_MAX_AGE') or 600)
+
+
+def format_product(p) -> Dict[str, Any]:
+    from app.utils.image_derivatives import image_srcset
+    return {
+        'id': p.id,
+        'name': p.name,
+        'slug': p.slug,
+        'price': p.price,
+        'original_price': p.original_price,
+        'discount_percentage': round((p.original_price - p.price) / p.original_price * 100) if p.original_price else None,
+        'images': p.images,
+        'image_srcset': image_srcset(p),
+        'category': p.category.name,
+        'category_slug': p.category.slug,
+        'stock_quantity': p.stock_quantity,
+        'is_featured': p.is_featured
+    }
+
+
+def _featured_products():
+    from sqlalchemy.orm import joinedload
+    from app.models.models import Product
+    products = Product.query.options(joinedload(Product.category)).filter_by(
+        is_featured=True,
+        is_active=True
+    ).limit(8).all()
+    return [format_product(p) for p in products]
+
+
+def _categories():
+    from app.models.models import Category
+    categories = Category.query.filter_by(is_active=True).all()
+    product_counts = Category.product_counts(active_only=True)
+    return [{
+        'id': c.id,
+        'name': c.name,
+        'slug': c.slug,
+        'description': c.description,
+        'image_url': c.image_url,
+        'background_image_url': c.background_image_url,
+        'background_color': c.background_color,
+        'is_active': c.is_active,
+        'product_count': product_counts.get(c.id, 0)
+    } for c in categories]
+
+
+def _latest_posts():
+    from app.models.models import BlogPost
+    posts = BlogPost.query.filter_by(
+        is_published=True
+    ).order_by(BlogPost.created_at.desc()).limit(3).all()
+    return [{
+        'id': p.id,
+        'title': p.title,
+        'slug': p.slug,
+        'excerpt': p.excerpt,
+        'featured_image': p.featured_image,
+        'created_at': p.created_at.isoformat()
+    } for p in posts]
+
+
+def _discounted_products():
+    from sqlalchemy.orm import joinedload
+    from app.models.models import Product
+    # Products with original_price > price, biggest discount first
+    products = Product.query.options(joinedload(Product.category)).filter(
+        Product.is_active == True,
+        Product.original_price.isnot(None),
+        Product.original_price > Product.price
+    ).order_by(((Product.original_price - Product.price) / Product.original_price).desc()).limit(4).all()
+    return [format_product(p) for p in products]
+
+
+def _popular_products():
+    from sqlalchemy.orm import joinedload
+    from app.models.models import Product
+    # Most ordered products, from the maintained order_count counter
+    products = Product.query.options(joinedload(Product.category)).filter(
+        Product.is_active == True,
+        Product.order_count > 0
+    ).order_by(Product.order_count.desc(), Product.id.desc()).limit(4).all()
+    return [format_product(p) for p in products]
+
+
+def _site_stats():
+    from app.models.models import Product, Order
+    return {
+        'total_products': Product.query.filter_by(is_active=True).count(),
+        'total_orders': Order.query.count()
+    }
+
+
+def _site_settings():
+    from app.utils.settings_store import get_settings_store
+    site_settings = get_settings_store().load()
+    return {
+        'site_name': site_settings.site_name if site_settings else 'PEBDEQ',
+        'welcome_title': site_settings.welcome_title if site_settings else 'Welcome to PEBDEQ',
+        'welcome_subtitle': site_settings.welcome_subtitle if site_settings else 'Crafted. Vintage. Smart.'
+    }
+
+
+SECTION_BUILDERS: Dict[str, Callable[[], Any]] = {
+    'featured_products': _featured_products,
+    'categories': _categories,
+    'latest_posts': _latest_posts,
+    'discounted_products': _discounted_products,
+    'popular_products': _popular_products,
+    'site_stats': _site_stats,
+    'site_settings': _site_settings,
+}
+
+
+def sections_etag(sections: Dict[str, Any]) -> str:
+    return hashlib.sha1(json.dumps(sections, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class HomeSnapshot:
+    """Reads and rebuilds the stored home payload; sections rebuild in a background thread"""
+
+    def __init__(self):
+        """Initialize the rebuild queue"""
+        self._pending = set()
+        self._worker = None
+        self._lock = threading.Lock()
+        self._scheduled_at = 0.0
+        self.rebuilds = 0
+
+    def read(self) -> Dict[str, Any]:
+        """{sections, version, etag} in one query; builds the snapshot if it does not exist yet"""
+        from app import db
+        from app.models.models import PageSnapshot
+        row = db.session.get(PageSnapshot, SNAPSHOT_KEY)
+        if row is None or set(row.sections) != set(SECTION_BUILDERS):
+            self.rebuild()
+            row = db.session.get(PageSnapshot, SNAPSHOT_KEY)
+        else:
+            self._refresh_scheduled(row.section_built_at)
+        return {'sections': row.sections, 'version': row.version, 'etag': row.etag}
+
+    def rebuild(self, sections: Iterable[str] = None) -> int:
+        """
+        Rebuild sections (all by default) and store them; returns the new version
+
+        The write only lands if nobody stored a newer version meanwhile,
+        otherwise it is redone on top of that version, so concurrent
+        rebuilds of different sections from several workers don't lose
+        each other's work.
+        """
+        from app import db
+        from sqlalchemy.exc import IntegrityError
+        from app.models.models import PageSnapshot
+        names = list(sections or SECTION_BUILDERS)
+        built = {name: SECTION_BUILDERS[name]() for name in names}
+        now = datetime.utcnow().isoformat()
+
+        for _ in range(5):
+            row = db.session.get(PageSnapshot, SNAPSHOT_KEY, populate_existing=True)
+            if row is None:
+                # First build always covers every section
+                if set(names) != set(SECTION_BUILDERS):
+                    return self.rebuild()
+                db.session.add(PageSnapshot(key=SNAPSHOT_KEY, sections=built, version=1, etag=sections_etag(built),
+                                            section_built_at={name: now for name in names}))
+                try:
+                    db.session.commit()
+                    self.rebuilds += 1
+                    return 1
+                except IntegrityError:
+                    db.session.rollback()
+                    continue
+
+            merged = {**row.sections, **built}
+            result = db.session.execute(
+                db.update(PageSnapshot)
+                .where(PageSnapshot.key == SNAPSHOT_KEY, PageSnapshot.version == row.version)
+                .values(sections=merged, etag=sections_etag(merged), version=row.version + 1,
+                        section_built_at={**row.section_built_at, **{name: now for name in names}},
+                        updated_at=datetime.utcnow())
+            )
+            if result.rowcount == 1:
+                db.session.commit()
+                self.rebuilds += 1
+                return row.version + 1
+            db.session.rollback()
+        raise RuntimeError('Home snapshot kept changing while it was rebuilt')
+
+    def schedule(self, app, sections: Iterable[str]):
+        """Rebuild sections in the background; requests arriving meanwhile are coalesced"""
+        with self._lock:
+            self._pending.update(sections)
+            if self._worker is not None:
+                return
+            self._worker = threading.Thread(target=self._run, args=(app,), daemon=True)
+            self._worker.start()
+
+    def _run(self, app):
+        while True:
+            with self._lock:
+                if not self._pending:
+                    self._worker = None
+                    return
+                sections = set(self._pending)
+                self._pending.clear()
+            try:
+                with app.app_context():
+                    self.rebuild(sections)
+            except Exception as e:
+                print(f"⚠️  Home snapshot rebuild failed: {str(e)}")
+
+    def _refresh_scheduled(self, section_built_at: Dict[str, str]):
+        max_age = popular_max_age()
+        if not max_age or time.time() - self._scheduled_at < max_age:
+            return
+        built_at = section_built_at.get('popular_products')
+        if built_at and (datetime.utcnow() - datetime.fromisoformat(built_at)).total_seconds() < max_age:
+            return
+        from flask import current_app
+        self._scheduled_at = time.time()
+        self.schedule(current_app._get_current_object(), SCHEDULED_SECTIONS)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get rebuild statistics"""
+        return {
+            'rebuilds': self.rebuilds,
+            'pending': sorted(self._pending),
+            'popular_max_age': popular_max_age()
+        }
+
+
+# Global home snapshot instance
+home_snapshot = None
+_app = None
+
+
+def get_home_snapshot() -> HomeSnapshot:
+    """Get or create the global home snapshot instance"""
+    global home_snapshot
+    if home_snapshot is None:
+        home_snapshot = HomeSnapshot()
+    return home_snapshot
+
+
+def install_home_snapshot(app):
+    """Rebuild the affected home sections after each commit touching their models"""
+    global _app
+    first_install = _app is None
+    _app = app
+    if not first_install:
+        return
+    from app.models import models
+    from app.utils.model_events import subscribe
+    snapshot = get_home_snapshot()
+    for model_name, sections in SECTIONS_BY_MODEL.items():
+        subscribe(getattr(models, model_name), lambda obj: True,
+                  lambda changes, sections=sections: snapshot.schedule(_app, sections))
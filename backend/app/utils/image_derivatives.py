@@ -0,0 +1,326 @@
+"""
+Image Derivative Pipeline for PEBDEQ
+Builds fixed-size WebP + JPEG variants of uploaded product images in a background pool
+"""
+
+import os
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from PIL import Image, ImageOps, features
+
+# Variant name -> target width in pixels (smallest first)
+DERIVATIVE_WIDTHS = {
+    'thumb': 160,
+    'card': 400,
+    'detail': 960,
+    'zoom': 1920,
+}
+
+WEBP_QUALITY = 80
+JPEG_QUALITY = 82
+AVIF_QUALITY = 60
+
+DERIVATIVES_FOLDER = 'derivatives'
+
+
+def _backend_dir() -> str:
+    return os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def avif_enabled() -> bool:
+    """AVIF variants are opt-in and need a Pillow build with AVIF support"""
+    wanted = os.environ.get('IMAGE_DERIVATIVE_AVIF', 'false').lower() in ['true', 'on', '1']
+    return wanted and features.check('avif')
+
+
+def _split_upload_url(image_url: str):
+    """'/uploads/products/abc.jpg' -> ('products', 'abc'), or None for external URLs"""
+    if not image_url or not image_url.startswith('/uploads/'):
+        return None
+    folder, _, filename = image_url[len('/uploads/'):].rpartition('/')
+    stem, dot, _ = filename.rpartition('.')
+    if not folder or not dot or not stem or '..' in folder:
+        return None
+    return folder, stem
+
+
+def _manifest_path(folder: str, stem: str) -> str:
+    return os.path.join(_backend_dir(), 'uploads', folder, DERIVATIVES_FOLDER, f'{stem}.json')
+
+
+def load_variants(image_url: str) -> Optional[Dict[str, Any]]:
+    """Variants recorded for an uploaded image, or None if they are not built yet"""
+    parts = _split_upload_url(image_url)
+    if parts is None:
+        return None
+    try:
+        with open(_manifest_path(*parts)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def generate_derivatives(image_url: str) -> Optional[Dict[str, Any]]:
+    """
+    Build every variant of an uploaded image and write its manifest
+
+    Variants are never upscaled: sizes wider than the original collapse
+    into one variant at the original width. Returns the manifest
+    {variant: {width, height, webp, jpeg[, avif]}} or None for images
+    outside the uploads folder.
+    """
+    parts = _split_upload_url(image_url)
+    if parts is None:
+        return None
+    folder, stem = parts
+    source_path = os.path.join(_backend_dir(), 'uploads', folder, image_url.rsplit('/', 1)[1])
+    output_dir = os.path.join(_backend_dir(), 'uploads', folder, DERIVATIVES_FOLDER)
+    os.makedirs(output_dir, exist_ok=True)
+    url_prefix = f'/uploads/{folder}/{DERIVATIVES_FOLDER}'
+    write_avif = avif_enabled()
+
+    with Image.open(source_path) as source:
+        largest = max(DERIVATIVE_WIDTHS.values())
+        # JPEG sources decode straight at a reduced scale when that is enough
+        source.draft('RGB', (largest, largest * source.height // max(1, source.width)))
+        image = ImageOps.exif_transpose(source)
+        image.load()
+
+    has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+    image = image.convert('RGBA' if has_alpha else 'RGB')
+
+    variants = {}
+    # Largest first, each variant resized from the previous one
+    current = image
+    for name, width in sorted(DERIVATIVE_WIDTHS.items(), key=lambda item: -item[1]):
+        target_width = min(width, image.width)
+        if target_width < current.width:
+            target_height = max(1, round(current.height * target_width / current.width))
+            current = current.resize((target_width, target_height), Image.Resampling.LANCZOS)
+
+        base_name = f'{stem}_{name}'
+        current.save(os.path.join(output_dir, f'{base_name}.webp'), 'WEBP', quality=WEBP_QUALITY, method=4)
+
+        # JPEG has no alpha - flatten transparent cut-outs onto white
+        if has_alpha:
+            jpeg_image = Image.new('RGB', current.size, (255, 255, 255))
+            jpeg_image.paste(current, mask=current.getchannel('A'))
+        else:
+            jpeg_image = current
+        jpeg_image.save(os.path.join(output_dir, f'{base_name}.jpg'), 'JPEG',
+                        quality=JPEG_QUALITY, optimize=True, progressive=True)
+
+        variant = {
+            'width': current.width,
+            'height': current.height,
+            'webp': f'{url_prefix}/{base_name}.webp',
+            'jpeg': f'{url_prefix}/{base_name}.jpg'
+        }
+        if write_avif:
+            current.save(os.path.join(output_dir, f'{base_name}.avif'), 'AVIF', quality=AVIF_QUALITY)
+            variant['avif'] = f'{url_prefix}/{base_name}.avif'
+        variants[name] = variant
+
+    manifest_path = _manifest_path(folder, stem)
+    tmp_path = f'{manifest_path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(variants, f)
+    os.replace(tmp_path, manifest_path)
+    return variants
+
+
+def collect_variants(image_urls) -> Dict[str, Any]:
+    """Manifest per image URL for the images whose variants are already built"""
+    collected = {}
+    for image_url in image_urls or []:
+        variants = load_variants(image_url)
+        if variants:
+            collected[image_url] = variants
+    return collected
+
+
+def _srcset(variants: Dict[str, Any], fmt: str) -> str:
+    # Variants that collapsed to the same width only need one entry
+    entries = {}
+    for variant in variants.values():
+        if fmt in variant:
+            entries[variant['width']] = f"{variant[fmt]} {variant['width']}w"
+    return ', '.join(entries[width] for width in sorted(entries))
+
+
+def image_srcset(product) -> List[Dict[str, Any]]:
+    """
+    srcset-ready data for each product image, in product.images order
+
+    Images without built variants only carry 'src' so clients fall back
+    to the original file.
+    """
+    recorded = product.image_variants or {}
+    srcsets = []
+    for image_url in product.images or []:
+        variants = recorded.get(image_url)
+        entry = {'src': image_url}
+        if variants:
+            entry['webp'] = _srcset(variants, 'webp')
+            entry['jpeg'] = _srcset(variants, 'jpeg')
+            if any('avif' in variant for variant in variants.values()):
+                entry['avif'] = _srcset(variants, 'avif')
+            entry['variants'] = variants
+            fallback = variants.get('card') or next(iter(variants.values()))
+            entry['fallback'] = fallback['jpeg']
+        srcsets.append(entry)
+    return srcsets
+
+
+class DerivativePipeline:
+    """Thread pool that builds derivatives off the request path"""
+
+    def __init__(self, max_workers: Optional[int] = None):
+        """Initialize the pool - Pillow releases the GIL while resizing and encoding"""
+        if max_workers is None:
+            max_workers = int(os.environ.get('IMAGE_DERIVATIVE_WORKERS') or 2)
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix='derivatives')
+        self._lock = threading.Lock()
+        self._in_flight = set()
+        self._waiting = {}  # {image URL: product ids to record it on}
+        self._failed = {}  # {image URL: error}, not queued again
+        self._stats = {'submitted': 0, 'completed': 0, 'failed': 0}
+
+    def submit(self, image_urls, app=None, product_id: Optional[int] = None):
+        """
+        Queue derivative generation for uploaded image URLs
+
+        With a Flask app and a product id, the product gets the variants
+        recorded once they are built - also when the URL was already
+        queued by an earlier upload. Sources that failed once are skipped.
+        """
+        for image_url in image_urls:
+            if _split_upload_url(image_url) is None:
+                continue
+            with self._lock:
+                if image_url in self._failed:
+                    continue
+                if product_id is not None:
+                    self._waiting.setdefault(image_url, set()).add(product_id)
+                if image_url in self._in_flight:
+                    continue
+                self._in_flight.add(image_url)
+                self._stats['submitted'] += 1
+            self._executor.submit(self._run, image_url, app)
+
+    def track(self, product_id: int, image_urls, app):
+        """Record variants on a committed product once all of image_urls are built"""
+        built = False
+        for image_url in image_urls:
+            with self._lock:
+                if image_url in self._failed:
+                    continue
+                # The manifest is written before a URL leaves _in_flight
+                if image_url in self._in_flight:
+                    self._waiting.setdefault(image_url, set()).add(product_id)
+                    continue
+            if load_variants(image_url) is not None:
+                built = True
+            else:
+                self.submit([image_url], app, product_id)
+        if built:
+            self._executor.submit(self._record, {product_id}, app)
+
+    def _run(self, image_url: str, app):
+        product_ids = set()
+        try:
+            generate_derivatives(image_url)
+            with self._lock:
+                product_ids = self._waiting.pop(image_url, set())
+                self._stats['completed'] += 1
+        except Exception as e:
+            print(f"⚠️  Image derivatives failed for {image_url}: {str(e)}")
+            with self._lock:
+                self._waiting.pop(image_url, None)
+                self._failed[image_url] = str(e)
+                self._stats['failed'] += 1
+        finally:
+            with self._lock:
+                self._in_flight.discard(image_url)
+        if product_ids and app is not None:
+            self._record(product_ids, app)
+
+    def _record(self, product_ids, app):
+        try:
+            with app.app_context():
+                _record_for_products(product_ids)
+        except Exception as e:
+            print(f"⚠️  Recording image variants failed for products {sorted(product_ids)}: {str(e)}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Submitted / completed / failed counters and queue depth"""
+        with self._lock:
+            return dict(self._stats, in_flight=len(self._in_flight), waiting=len(self._waiting))
+
+
+def _record_for_products(product_ids):
+    """Refresh image_variants on the given products"""
+    from app import db
+    from app.models.models import Product
+    products = Product.query.filter(Product.id.in_(list(product_ids))).all()
+    for product in products:
+        product.image_variants = collect_variants(product.images)
+    if products:
+        db.session.commit()
+        from app.utils.response_cache import invalidate_cache
+        invalidate_cache('products')
+
+
+def record_product_variants(product):
+    """Set product.image_variants from already built variants; the rest are recorded after commit"""
+    product.image_variants = collect_variants(product.images)
+
+
+def _missing_variants(product):
+    """Images of the flushed product that still lack variants, or UNCHANGED if images didn't change"""
+    from sqlalchemy import inspect
+    from app.utils.model_events import UNCHANGED
+    if not inspect(product).attrs.images.history.has_changes():
+        return UNCHANGED
+    recorded = product.image_variants or {}
+    return [url for url in (product.images or []) if url not in recorded and _split_upload_url(url)]
+
+
+_app = None
+
+
+def install_image_variants(app):
+    """After a commit that changes a product's images, build the variants it lacks and record them on it"""
+    global _app
+    first_install = _app is None
+    _app = app
+    if not first_install:
+        return
+    from app.models.models import Product
+    from app.utils.model_events import subscribe
+
+    def apply(changes):
+        pipeline = get_derivative_pipeline()
+        for product_id, missing in changes.items():
+            if missing:
+                pipeline.track(product_id, missing, _app)
+
+    subscribe(Product, _missing_variants, apply)
+
+
+# Global derivative pipeline - lazy loading
+derivative_pipeline = None
+_pipeline_lock = threading.Lock()
+
+
+def get_derivative_pipeline() -> DerivativePipeline:
+    """Get or create the image derivative pipeline"""
+    global derivative_pipeline
+    if derivative_pipeline is None:
+        with _pipeline_lock:
+            if derivative_pipeline is None:
+                derivative_pipeline = DerivativePipeline()
+    return derivative_pipeline
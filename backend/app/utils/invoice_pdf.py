@@ -466,8 +466,8 @@ def generate_invoice_pdf(invoice, output_dir=None):
     """Main function to generate invoice PDF"""
     try:
         # Get site settings for company information
-        from app.models.models import SiteSettings
-        site_settings = SiteSettings.query.first()
+        from app.utils.settings_store import get_settings_store
+        site_settings = get_settings_store().load()
         
         print(f"🔍 PDF Debug - Site Settings Found: {site_settings is not None}")
         if site_settings:
@@ -0,0 +1,117 @@
+"""
+Keyset Pagination for PEBDEQ
+Opaque cursors over a (sort column, id) key so deep pages cost the same as the first
+"""
+
+import json
+import base64
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from flask import request
+
+MAX_PER_PAGE = 100
+# Filtered counts stop here when an approximate total is enough
+APPROXIMATE_COUNT_CAP = 10000
+
+
+class CursorError(ValueError):
+    """Malformed cursor, or a cursor issued for another sort order"""
+
+
+def cursor_requested() -> bool:
+    """Cursor mode is opt-in: ?cursor= (empty for the first page) or ?cursor=<next_cursor>"""
+    return 'cursor' in request.args
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {'dt': value.isoformat()}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict) and 'dt' in value:
+        return datetime.fromisoformat(value['dt'])
+    return value
+
+
+def encode_cursor(sort_name: str, sort_value, row_id: int) -> str:
+    payload = json.dumps([sort_name, _encode_value(sort_value), row_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str, sort_name: str) -> Tuple[Any, int]:
+    """(sort value, id) of a cursor; raises CursorError if it is not one of ours for sort_name"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        name, sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as e:
+        raise CursorError('Invalid cursor') from e
+    if name != sort_name or not isinstance(row_id, int):
+        raise CursorError('Cursor does not match the requested sort order')
+    return _decode_value(sort_value), row_id
+
+
+def keyset_page(query, sort_column, id_column, sort_name: str, descending: bool = True,
+                per_page: int = 20, cursor: Optional[str] = None) -> Dict[str, Any]:
+    """
+    One page of query ordered by (sort_column, id_column)
+
+    Rows after the cursor are found with a row-value comparison, which an
+    index on (sort_column, id) answers with a seek instead of skipping
+    OFFSET rows. Returns {'items', 'next_cursor', 'has_next'}; the query
+    must not be ordered yet.
+    """
+    from app import db
+    per_page = min(max(per_page, 1), MAX_PER_PAGE)
+    key = db.tuple_(sort_column, id_column)
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor, sort_name)
+        query = query.filter(key < db.tuple_(sort_value, row_id) if descending
+                             else key > db.tuple_(sort_value, row_id))
+    if descending:
+        query = query.order_by(sort_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(sort_column.asc(), id_column.asc())
+
+    rows = query.limit(per_page + 1).all()
+    items: List[Any] = rows[:per_page]
+    has_next = len(rows) > per_page
+    next_cursor = None
+    if has_next:
+        last = items[-1]
+        next_cursor = encode_cursor(sort_name, getattr(last, sort_column.key), getattr(last, id_column.key))
+    return {'items': items, 'next_cursor': next_cursor, 'has_next': has_next}
+
+
+def _planner_estimate(query) -> Optional[int]:
+    """Row estimate from Postgres' planner (no scan), None elsewhere"""
+    from app import db
+    bind = db.session.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return None
+    compiled = query.statement.compile(dialect=bind.dialect)
+    result = db.session.connection().exec_driver_sql(f'EXPLAIN (FORMAT JSON) {compiled}', compiled.params)
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def count_rows(query, mode: Optional[str]) -> Dict[str, Any]:
+    """
+    Total for ?total=exact|approx (anything else: no total)
+
+    approx uses the Postgres planner's estimate, or elsewhere a count that
+    stops at APPROXIMATE_COUNT_CAP rows.
+    """
+    if mode == 'exact':
+        return {'total': query.order_by(None).count(), 'total_is_estimate': False}
+    if mode != 'approx':
+        return {}
+    estimate = _planner_estimate(query.order_by(None))
+    if estimate is not None:
+        return {'total': estimate, 'total_is_estimate': True}
+    capped = query.order_by(None).limit(APPROXIMATE_COUNT_CAP + 1).count()
+    return {'total': min(capped, APPROXIMATE_COUNT_CAP), 'total_is_estimate': capped > APPROXIMATE_COUNT_CAP}
@@ -0,0 +1,218 @@
+"""
+Large Image Background Removal for PEBDEQ
+Infers masks on a downscaled copy and refines them back onto full-resolution photos
+"""
+
+import os
+import threading
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+from PIL import Image
+
+try:
+    import cv2
+except ImportError:
+    cv2 = None
+
+LARGE_IMAGE_MODES = ('auto', 'tiled', 'off')
+
+
+def large_image_settings() -> Dict[str, Any]:
+    """
+    Large image handling from the environment
+
+    BG_LARGE_IMAGE_MODE:    auto (downscale, tile refinement past BG_TILED_MIN_MP),
+                            tiled (always tile refinement) or off (full-size inference)
+    BG_INFERENCE_MAX_SIDE:  longest side of the copy the model actually sees
+    BG_TILED_MIN_MP:        megapixels above which auto mode refines in tiles
+    BG_TILE_SIZE:           refinement tile edge in pixels
+    """
+    mode = (os.environ.get('BG_LARGE_IMAGE_MODE') or 'auto').lower()
+    if mode not in LARGE_IMAGE_MODES:
+        mode = 'auto'
+    return {
+        'mode': mode,
+        'max_side': int(os.environ.get('BG_INFERENCE_MAX_SIDE') or 2048),
+        'tiled_min_mp': float(os.environ.get('BG_TILED_MIN_MP') or 12),
+        'tile_size': int(os.environ.get('BG_TILE_SIZE') or 2048)
+    }
+
+
+def _current_rss() -> int:
+    """Resident set size of this process in bytes (0 if unknown)"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+class PeakMemoryTracker:
+    """Samples process RSS in a background thread while a request runs"""
+
+    def __init__(self, interval: float = 0.02):
+        """Initialize the tracker with a sampling interval in seconds"""
+        self.interval = interval
+        self.baseline = 0
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, _current_rss())
+
+    def __enter__(self):
+        self.baseline = self.peak = _current_rss()
+        if self.baseline:
+            self._thread = threading.Thread(target=self._sample, daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.peak = max(self.peak, _current_rss())
+        return False
+
+    @property
+    def peak_mb(self) -> float:
+        return round(self.peak / (1024 * 1024), 1)
+
+    @property
+    def delta_mb(self) -> float:
+        """Growth over the RSS measured when the request started"""
+        return round(max(0, self.peak - self.baseline) / (1024 * 1024), 1)
+
+
+def _box(values: np.ndarray, radius: int) -> np.ndarray:
+    """Mean filter over a (2r+1) square window"""
+    size = 2 * radius + 1
+    if cv2 is not None:
+        return cv2.boxFilter(values, -1, (size, size), borderType=cv2.BORDER_REFLECT)
+    from scipy import ndimage
+    return ndimage.uniform_filter(values, size=size, mode='reflect')
+
+
+def _resize(values: np.ndarray, size) -> np.ndarray:
+    """Bilinear resize of a float32 plane to size=(width, height)"""
+    if cv2 is not None:
+        return cv2.resize(values, size, interpolation=cv2.INTER_LINEAR)
+    from scipy import ndimage
+    return ndimage.zoom(values, (size[1] / values.shape[0], size[0] / values.shape[1]), order=1)
+
+
+def _guided_filter(guide: np.ndarray, mask: np.ndarray, radius: int, eps: float, subsample: int = 1) -> np.ndarray:
+    """
+    Edge-aware smoothing of mask (float32, 0-1) following the luminance guide (float32, 0-1)
+
+    With subsample > 1 the linear coefficients are computed on a reduced
+    copy and upsampled (fast guided filter), which is what makes full
+    resolution refinement of 12-48 MP photos affordable.
+    """
+    height, width = guide.shape
+    if subsample > 1:
+        small_size = (max(1, width // subsample), max(1, height // subsample))
+        small_guide, small_mask = _resize(guide, small_size), _resize(mask, small_size)
+        radius = max(1, radius // subsample)
+    else:
+        small_guide, small_mask = guide, mask
+    mean_guide = _box(small_guide, radius)
+    mean_mask = _box(small_mask, radius)
+    covariance = _box(small_guide * small_mask, radius) - mean_guide * mean_mask
+    variance = _box(small_guide * small_guide, radius) - mean_guide * mean_guide
+    a = covariance / (variance + eps)
+    b = mean_mask - a * mean_guide
+    mean_a, mean_b = _box(a, radius), _box(b, radius)
+    if subsample > 1:
+        mean_a, mean_b = _resize(mean_a, (width, height)), _resize(mean_b, (width, height))
+    return mean_a * guide + mean_b
+
+
+def _upsample(mask: np.ndarray, size) -> np.ndarray:
+    """Bilinear resize of a uint8 mask to size=(width, height)"""
+    if cv2 is not None:
+        return cv2.resize(mask, size, interpolation=cv2.INTER_LINEAR)
+    return np.asarray(Image.fromarray(mask, mode='L').resize(size, Image.Resampling.BILINEAR))
+
+
+def refine_mask(mask: np.ndarray, guide: np.ndarray, tile_size: Optional[int] = None, eps: float = 1e-3) -> np.ndarray:
+    """
+    Upsample a low-resolution uint8 mask to the guide's size with edge-aware refinement
+
+    The guided filter needs several float32 planes, so with tile_size set it
+    runs on overlapping tiles and only on tiles that contain an edge - peak
+    memory then depends on the tile size, not on the photo.
+    """
+    height, width = guide.shape
+    alpha = _upsample(mask, (width, height))
+    scale = max(width / mask.shape[1], height / mask.shape[0])
+    radius = max(2, int(round(scale * 2)))
+    # Coefficients vary at the mask resolution, so compute them at roughly that scale
+    subsample = max(1, int(scale))
+
+    tile = tile_size or max(width, height)
+    overlap = radius * 3
+    for top in range(0, height, tile):
+        for left in range(0, width, tile):
+            y0, x0 = max(0, top - overlap), max(0, left - overlap)
+            y1, x1 = min(height, top + tile + overlap), min(width, left + tile + overlap)
+            alpha_tile = alpha[y0:y1, x0:x1]
+            # Fully opaque or fully transparent tiles have no edge to refine
+            if alpha_tile.min() == alpha_tile.max():
+                continue
+            refined = _guided_filter(
+                guide[y0:y1, x0:x1].astype(np.float32) / 255.0,
+                alpha_tile.astype(np.float32) / 255.0,
+                radius, eps, subsample
+            )
+            inner = refined[top - y0:top - y0 + tile, left - x0:left - x0 + tile]
+            np.clip(inner * 255.0, 0, 255, out=inner)
+            alpha[top:top + inner.shape[0], left:left + inner.shape[1]] = inner.astype(np.uint8)
+    return alpha
+
+
+def remove_background_large(image, model_type: str, run_model: Callable, settings: Optional[Dict[str, Any]] = None):
+    """
+    Run run_model(small_image, model_type) on a downscaled copy and apply the refined mask to image
+
+    Returns None when the image is small enough (or the mode is off) for
+    full-size inference, otherwise an RGBA image with info['inference_size']
+    and info['tiled'] set.
+    """
+    settings = settings or large_image_settings()
+    width, height = image.size
+    if settings['mode'] == 'off' or max(width, height) <= settings['max_side']:
+        return None
+
+    megapixels = width * height / 1_000_000
+    tiled = settings['mode'] == 'tiled' or megapixels >= settings['tiled_min_mp']
+    print(f"   🗜️  Large image ({megapixels:.1f} MP): inferring at max side {settings['max_side']}"
+          f"{', tiled refinement' if tiled else ''}")
+
+    rgb_image = image if image.mode == 'RGB' else image.convert('RGB')
+    small_image = rgb_image.copy()
+    small_image.thumbnail((settings['max_side'], settings['max_side']), Image.Resampling.LANCZOS)
+    inference_size = small_image.size
+
+    small_result = run_model(small_image, model_type)
+    small_mask = np.array(small_result.getchannel('A'))
+    del small_result, small_image
+
+    guide = np.asarray(rgb_image.convert('L'))
+    alpha = refine_mask(small_mask, guide, settings['tile_size'] if tiled else None)
+    del guide
+
+    # putalpha turns the RGB copy into RGBA in place - no extra full-size buffer
+    result = rgb_image.copy() if rgb_image is image else rgb_image
+    result.putalpha(Image.fromarray(alpha, mode='L'))
+    result.info['inference_size'] = f'{inference_size[0]}x{inference_size[1]}'
+    result.info['tiled'] = tiled
+    return result
@@ -0,0 +1,66 @@
+"""
+Model Change Hooks for PEBDEQ
+Feeds committed inserts/updates/deletes of a model to in-memory indexes
+"""
+
+import threading
+from itertools import chain
+from typing import Any, Callable, Dict
+
+# snapshot() result for an object whose change doesn't concern the subscriber
+UNCHANGED = object()
+
+_subscribers = []
+_lock = threading.Lock()
+
+
+def subscribe(model, snapshot: Callable[[Any], Any], apply: Callable[[Dict[int, Any]], None]):
+    """
+    Call apply({primary key: snapshot(obj) or None}) after each commit touching model
+
+    snapshot runs at flush time, while the object's state and attribute
+    history are still loaded, and may return UNCHANGED to skip the object;
+    deleted rows map to None. Changes from rolled back transactions are
+    never applied.
+    """
+    from sqlalchemy import event
+    from sqlalchemy.orm import Session
+    with _lock:
+        if not _subscribers:
+            event.listen(Session, 'after_flush', _after_flush)
+            event.listen(Session, 'after_commit', _after_commit)
+            event.listen(Session, 'after_rollback', _after_rollback)
+        _subscribers.append((model, snapshot, apply))
+
+
+def _key(obj):
+    from sqlalchemy import inspect
+    key = inspect(obj).mapper.primary_key_from_instance(obj)
+    return key[0] if len(key) == 1 else tuple(key)
+
+
+def _after_flush(session, flush_context):
+    pending = session.info.setdefault('model_changes', {})
+    for index, (model, snapshot, _) in enumerate(_subscribers):
+        for obj in chain(session.new, session.dirty):
+            if isinstance(obj, model):
+                value = snapshot(obj)
+                if value is not UNCHANGED:
+                    pending.setdefault(index, {})[_key(obj)] = value
+        for obj in session.deleted:
+            if isinstance(obj, model):
+                pending.setdefault(index, {})[_key(obj)] = None
+
+
+def _after_commit(session):
+    pending = session.info.pop('model_changes', None)
+    for index, changes in (pending or {}).items():
+        model, _, apply = _subscribers[index]
+        try:
+            apply(changes)
+        except Exception as e:
+            print(f"⚠️  Applying {model.__name__} changes to an index failed: {str(e)}")
+
+
+def _after_rollback(session):
+    session.info.pop('model_changes', None)
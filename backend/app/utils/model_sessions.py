@@ -0,0 +1,167 @@
+"""
+Background Removal Model Session Pool for PEBDEQ
+Keeps rembg / BRIA model sessions resident between requests
+"""
+
+import os
+import gc
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+# Approximate resident memory (MB) of each model once loaded
+MODEL_MEMORY_MB = {
+    'u2net': 180,
+    'birefnet-general': 1000,
+    'bria-rmbg-1.4': 350,
+}
+
+DEFAULT_MODEL_MEMORY_MB = 500
+
+
+def _load_rembg_session(model_name: str) -> Any:
+    """Create a rembg ONNX session"""
+    from rembg import new_session
+    return new_session(model_name)
+
+
+def _load_bria_pipeline(model_name: str) -> Any:
+    """Create the BRIA RMBG-1.4 transformers pipeline"""
+    from transformers import pipeline
+    return pipeline(
+        "image-segmentation",
+        model="briaai/RMBG-1.4",
+        trust_remote_code=True,
+        device="cpu"  # Use CPU for consistency
+    )
+
+
+MODEL_LOADERS = {
+    'u2net': _load_rembg_session,
+    'birefnet-general': _load_rembg_session,
+    'bria-rmbg-1.4': _load_bria_pipeline,
+}
+
+
+class ModelSessionPool:
+    """Process-wide registry of warm model sessions with LRU eviction"""
+
+    def __init__(self, memory_budget_mb: Optional[int] = None):
+        """Initialize the pool with a resident memory budget"""
+        if memory_budget_mb is None:
+            memory_budget_mb = int(os.environ.get('BG_MODEL_MEMORY_BUDGET_MB') or 2048)
+        self.memory_budget_mb = memory_budget_mb
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_locks = {}
+        self._stats = {'loads': 0, 'hits': 0, 'evictions': 0, 'load_seconds': 0.0}
+
+    def _model_memory(self, model_name: str) -> int:
+        return MODEL_MEMORY_MB.get(model_name, DEFAULT_MODEL_MEMORY_MB)
+
+    def _resident_memory(self) -> int:
+        return sum(self._model_memory(name) for name in self._sessions)
+
+    def _evict_for(self, model_name: str):
+        """Evict least recently used sessions until model_name fits the budget"""
+        needed = self._model_memory(model_name)
+        evicted = False
+        while self._sessions and self._resident_memory() + needed > self.memory_budget_mb:
+            old_name, _ = self._sessions.popitem(last=False)
+            self._stats['evictions'] += 1
+            evicted = True
+            print(f"   ♻️  Model pool: evicted {old_name} (memory budget {self.memory_budget_mb} MB)")
+        if evicted:
+            gc.collect()
+
+    def get(self, model_name: str) -> Any:
+        """Return a warm session for model_name, loading it on first use"""
+        with self._lock:
+            session = self._sessions.get(model_name)
+            if session is not None:
+                self._sessions.move_to_end(model_name)
+                self._stats['hits'] += 1
+                return session
+            load_lock = self._load_locks.setdefault(model_name, threading.Lock())
+
+        # Load outside the pool lock so hits on other models are not blocked
+        with load_lock:
+            with self._lock:
+                session = self._sessions.get(model_name)
+                if session is not None:
+                    self._sessions.move_to_end(model_name)
+                    self._stats['hits'] += 1
+                    return session
+
+            loader = MODEL_LOADERS.get(model_name)
+            if loader is None:
+                raise ValueError(f"Unknown background removal model: {model_name}")
+
+            start = time.perf_counter()
+            print(f"   🧠 Model pool: loading {model_name}...")
+            session = loader(model_name)
+            elapsed = time.perf_counter() - start
+            print(f"   ✅ Model pool: {model_name} loaded in {elapsed:.2f}s")
+
+            with self._lock:
+                self._evict_for(model_name)
+                self._sessions[model_name] = session
+                self._stats['loads'] += 1
+                self._stats['load_seconds'] += elapsed
+            return session
+
+    def warm_up(self, model_names) -> Dict[str, str]:
+        """Preload the given models, returning per-model status"""
+        results = {}
+        for model_name in model_names:
+            try:
+                self.get(model_name)
+                results[model_name] = 'loaded'
+            except Exception as e:
+                results[model_name] = f'failed: {str(e)}'
+        return results
+
+    def evict(self, model_name: str) -> bool:
+        """Drop a single model from the pool"""
+        with self._lock:
+            if self._sessions.pop(model_name, None) is None:
+                return False
+            self._stats['evictions'] += 1
+        gc.collect()
+        return True
+
+    def clear(self):
+        """Drop every resident model"""
+        with self._lock:
+            self._stats['evictions'] += len(self._sessions)
+            self._sessions.clear()
+        gc.collect()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return load/hit/evict counters and resident models"""
+        with self._lock:
+            return {
+                'loads': self._stats['loads'],
+                'hits': self._stats['hits'],
+                'evictions': self._stats['evictions'],
+                'load_seconds': round(self._stats['load_seconds'], 3),
+                'resident_models': list(self._sessions.keys()),
+                'resident_memory_mb': self._resident_memory(),
+                'memory_budget_mb': self.memory_budget_mb,
+            }
+
+
+# Global model session pool - lazy loading
+model_session_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_model_session_pool() -> ModelSessionPool:
+    """Get or create the process-wide model session pool"""
+    global model_session_pool
+    if model_session_pool is None:
+        with _pool_lock:
+            if model_session_pool is None:
+                model_session_pool = ModelSessionPool()
+    return model_session_pool
@@ -0,0 +1,222 @@
+"""
+Product Counters for PEBDEQ
+Keeps Product.units_sold / revenue / order_count / like_count / review_count / rating_total /
+rating_N_count (and BlogPost.like_count) in step with order items, likes and reviews, inside the transaction
+that changes them
+"""
+
+from collections import defaultdict
+from typing import Optional
+
+# Orders in these states don't count as sales
+UNCOUNTED_ORDER_STATUSES = ('cancelled', 'returned')
+
+RATING_STARS = (1, 2, 3, 4, 5)
+
+COUNTER_COLUMNS = ('units_sold', 'revenue', 'order_count', 'like_count', 'review_count', 'rating_total') + \
+    tuple(f'rating_{star}_count' for star in RATING_STARS)
+
+_installed = False
+
+
+def order_counts(status: Optional[str]) -> bool:
+    return status not in UNCOUNTED_ORDER_STATUSES
+
+
+def _previous(obj, attribute):
+    """Value of attribute before this flush's changes"""
+    from sqlalchemy import inspect
+    history = inspect(obj).attrs[attribute].history
+    if history.deleted:
+        return history.deleted[0]
+    return getattr(obj, attribute)
+
+
+def _changed(obj, *attributes) -> bool:
+    from sqlalchemy import inspect
+    state = inspect(obj)
+    return any(state.attrs[attribute].history.has_changes() for attribute in attributes)
+
+
+class _Deltas:
+    def __init__(self):
+        # (table name, row id) -> column -> delta
+        self.by_row = defaultdict(lambda: defaultdict(float))
+
+    def add(self, product_id, sign: int, table: str = 'product', **amounts):
+        if product_id is None:
+            return
+        for column, amount in amounts.items():
+            self.by_row[(table, product_id)][column] += sign * amount
+
+    def sale(self, product_id, quantity, price, sign: int):
+        quantity = quantity or 0
+        self.add(product_id, sign, units_sold=quantity, revenue=quantity * (price or 0), order_count=1)
+
+    def review(self, product_id, rating, sign: int):
+        self.add(product_id, sign, review_count=1, rating_total=rating or 0)
+        if rating in RATING_STARS:
+            self.add(product_id, sign, **{f'rating_{rating}_count': 1})
+
+
+def _collect(session) -> _Deltas:
+    from app.models.models import Order, OrderItem, ProductLike, ProductReview, BlogLike
+    deltas = _Deltas()
+    new, dirty, deleted = set(session.new), set(session.dirty), set(session.deleted)
+    handled_items = set()
+
+    def order_of(item):
+        order = item.order if item.order is not None else session.get(Order, item.order_id)
+        return order
+
+    def previously_counted(order) -> bool:
+        if order is None or order in new:
+            return False
+        return order_counts(_previous(order, 'status'))
+
+    with session.no_autoflush:
+        # Orders moving into or out of cancelled/returned, or deleted outright
+        for order in (o for o in dirty | deleted if isinstance(o, Order)):
+            was = previously_counted(order)
+            now = order not in deleted and order_counts(order.status)
+            if was == now:
+                continue
+            for item in order.order_items:
+                if item in new:
+                    continue
+                handled_items.add(item)
+                deltas.sale(_previous(item, 'product_id'), _previous(item, 'quantity'), _previous(item, 'price'),
+                            1 if now else -1)
+
+        for obj in new:
+            if isinstance(obj, OrderItem) and obj not in handled_items:
+                order = order_of(obj)
+                if order is not None and order not in deleted and order_counts(order.status):
+                    deltas.sale(obj.product_id, obj.quantity, obj.price, 1)
+            elif isinstance(obj, ProductLike):
+                deltas.add(obj.product_id, 1, like_count=1)
+            elif isinstance(obj, BlogLike):
+                deltas.add(obj.blog_post_id, 1, 'blog_post', like_count=1)
+            elif isinstance(obj, ProductReview) and obj.is_approved is not False:
+                deltas.review(obj.product_id, obj.rating, 1)
+
+        for obj in deleted:
+            if isinstance(obj, OrderItem) and obj not in handled_items:
+                if previously_counted(order_of(obj)):
+                    deltas.sale(_previous(obj, 'product_id'), _previous(obj, 'quantity'), _previous(obj, 'price'), -1)
+            elif isinstance(obj, ProductLike):
+                deltas.add(_previous(obj, 'product_id'), -1, like_count=1)
+            elif isinstance(obj, BlogLike):
+                deltas.add(_previous(obj, 'blog_post_id'), -1, 'blog_post', like_count=1)
+            elif isinstance(obj, ProductReview) and _previous(obj, 'is_approved') is not False:
+                deltas.review(_previous(obj, 'product_id'), _previous(obj, 'rating'), -1)
+
+        for obj in dirty:
+            if isinstance(obj, OrderItem) and obj not in handled_items \
+                    and _changed(obj, 'product_id', 'quantity', 'price'):
+                if previously_counted(order_of(obj)):
+                    deltas.sale(_previous(obj, 'product_id'), _previous(obj, 'quantity'), _previous(obj, 'price'), -1)
+                    deltas.sale(obj.product_id, obj.quantity, obj.price, 1)
+            elif isinstance(obj, ProductReview) and _changed(obj, 'product_id', 'rating', 'is_approved'):
+                if _previous(obj, 'is_approved') is not False:
+                    deltas.review(_previous(obj, 'product_id'), _previous(obj, 'rating'), -1)
+                if obj.is_approved is not False:
+                    deltas.review(obj.product_id, obj.rating, 1)
+    return deltas
+
+
+def _before_flush(session, flush_context, instances):
+    session.info['product_counter_deltas'] = _collect(session)
+
+
+def _after_flush(session, flush_context):
+    from app.models.models import Product, BlogPost
+    deltas = session.info.pop('product_counter_deltas', None)
+    if deltas is None:
+        return
+    tables = {'product': Product.__table__, 'blog_post': BlogPost.__table__}
+    connection = session.connection()
+    for (table_name, row_id), amounts in deltas.by_row.items():
+        table = tables[table_name]
+        values = {table.c[column]: table.c[column] + amount for column, amount in amounts.items() if amount}
+        if values:
+            # Keep updated_at: counters changing is not an edit of the row
+            values[table.c.updated_at] = table.c.updated_at
+            connection.execute(table.update().where(table.c.id == row_id).values(values))
+
+
+def _load_old_value(target, value, oldvalue, initiator):
+    """No-op; registering it with active_history=True is what loads oldvalue"""
+
+
+def install_product_counters():
+    """Maintain the counters on every ORM flush (once per process)"""
+    global _installed
+    if _installed:
+        return
+    from sqlalchemy import event
+    from sqlalchemy.orm import Session
+    from app.models.models import Order, OrderItem, ProductReview
+    # Load the previous value even when an expired attribute is assigned, so _previous() sees it
+    for attribute in (Order.status, OrderItem.product_id, OrderItem.quantity, OrderItem.price,
+                      ProductReview.product_id, ProductReview.rating, ProductReview.is_approved):
+        event.listen(attribute, 'set', _load_old_value, active_history=True)
+    event.listen(Session, 'before_flush', _before_flush)
+    event.listen(Session, 'after_flush', _after_flush)
+    _installed = True
+
+
+def reconcile_product_counters(connection) -> int:
+    """
+    Recompute every product's counters from order items, likes and reviews
+
+    Runs set-based UPDATEs on connection (a migration's bind or the
+    session's connection) and returns the number of products. Counter
+    columns the database doesn't have yet (older migrations) are skipped.
+    """
+    from sqlalchemy import select, func, and_, update, inspect
+    from app.models.models import Product, Order, OrderItem, ProductLike, ProductReview
+    product = Product.__table__
+    order_item = OrderItem.__table__
+    order = Order.__table__
+    like = ProductLike.__table__
+    review = ProductReview.__table__
+
+    counted_items = order_item.join(order, order.c.id == order_item.c.order_id)
+    sales = and_(order_item.c.product_id == product.c.id,
+                 func.coalesce(order.c.status, '').notin_(UNCOUNTED_ORDER_STATUSES))
+    approved = and_(review.c.product_id == product.c.id, func.coalesce(review.c.is_approved, True) == True)
+
+    def subquery(expression, from_, where):
+        return func.coalesce(select(expression).select_from(from_).where(where).scalar_subquery(), 0)
+
+    counters = {
+        'units_sold': subquery(func.sum(order_item.c.quantity), counted_items, sales),
+        'revenue': subquery(func.sum(order_item.c.quantity * order_item.c.price), counted_items, sales),
+        'order_count': subquery(func.count(order_item.c.id), counted_items, sales),
+        'like_count': subquery(func.count(like.c.id), like, like.c.product_id == product.c.id),
+        'review_count': subquery(func.count(review.c.id), review, approved),
+        'rating_total': subquery(func.sum(review.c.rating), review, approved),
+    }
+    for star in RATING_STARS:
+        counters[f'rating_{star}_count'] = subquery(func.count(review.c.id), review,
+                                                    and_(approved, review.c.rating == star))
+
+    existing = {column['name'] for column in inspect(connection).get_columns('product')}
+    values = {product.c[name]: value for name, value in counters.items() if name in existing}
+    values[product.c.updated_at] = product.c.updated_at
+    result = connection.execute(update(product).values(values))
+    return result.rowcount
+
+
+def reconcile_blog_like_counts(connection) -> int:
+    """Recompute every blog post's like_count; returns the number of posts"""
+    from sqlalchemy import select, func, update
+    from app.models.models import BlogPost, BlogLike
+    blog_post, blog_like = BlogPost.__table__, BlogLike.__table__
+    count = select(func.count(blog_like.c.id)).where(blog_like.c.blog_post_id == blog_post.c.id).scalar_subquery()
+    result = connection.execute(update(blog_post).values({
+        blog_post.c.like_count: count,
+        blog_post.c.updated_at: blog_post.c.updated_at,
+    }))
+    return result.rowcount
@@ -0,0 +1,458 @@
+"""
+Product Facets for PEBDEQ
+Bitmap index over active products for catalog filter counts without COUNT queries
+"""
+
+import os
+import time
+import bisect
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# (min, max) price buckets, max exclusive; None means open-ended
+PRICE_BUCKETS = [(0, 25), (25, 50), (50, 100), (100, 250), (250, 500), (500, None)]
+
+FACETS = ('category', 'price', 'material', 'in_stock', 'has_variations')
+
+
+def bitmap_from_ids(ids: Iterable[int]) -> int:
+    """Integer with bit i set for every id - Python ints are the bitmaps (& | bit_count)"""
+    ids = list(ids)
+    if not ids:
+        return 0
+    bits = bytearray(max(ids) // 8 + 1)
+    for product_id in ids:
+        bits[product_id >> 3] |= 1 << (product_id & 7)
+    return int.from_bytes(bits, 'little')
+
+
+def material_key(material: Optional[str]) -> str:
+    return (material or '').strip().lower()
+
+
+def price_bucket(price: float) -> int:
+    for index, (low, high) in enumerate(PRICE_BUCKETS):
+        if price >= low and (high is None or price < high):
+            return index
+    return 0
+
+
+class FacetIndex:
+    """
+    One bitmap per facet value, keyed by product id
+
+    Only active products are indexed, so every bitmap is already the
+    is_active slice; category_id, price bucket, material, in-stock and
+    has-variations each map a value to the products that have it.
+    """
+
+    def __init__(self):
+        """Initialize an empty index"""
+        self._lock = threading.RLock()
+        self._reset()
+        self.built_at = None
+        self.build_seconds = None
+        self._pending = None
+
+    def _reset(self):
+        self._products = {}
+        self._all = 0
+        self._bitmaps = {facet: {} for facet in FACETS}
+        self._material_labels = {}
+        self._prices = []  # sorted (price, id)
+
+    @staticmethod
+    def _values(row: Tuple) -> Dict[str, Any]:
+        category_id, price, material, stock_quantity, has_variations = row
+        values = {
+            'category': category_id,
+            'price': price_bucket(price or 0),
+            'in_stock': (stock_quantity or 0) > 0,
+            'has_variations': bool(has_variations)
+        }
+        if material_key(material):
+            values['material'] = material_key(material)
+        return values
+
+    def _add(self, product_id: int, row: Tuple):
+        bit = 1 << product_id
+        self._products[product_id] = row
+        self._all |= bit
+        for facet, value in self._values(row).items():
+            bitmaps = self._bitmaps[facet]
+            bitmaps[value] = bitmaps.get(value, 0) | bit
+        if material_key(row[2]):
+            self._material_labels.setdefault(material_key(row[2]), row[2].strip())
+        bisect.insort(self._prices, (row[1] or 0, product_id))
+
+    def _discard(self, product_id: int):
+        row = self._products.pop(product_id, None)
+        if row is None:
+            return
+        mask = ~(1 << product_id)
+        self._all &= mask
+        for facet, value in self._values(row).items():
+            bitmaps = self._bitmaps[facet]
+            bitmaps[value] &= mask
+            if not bitmaps[value]:
+                del bitmaps[value]
+                if facet == 'material':
+                    self._material_labels.pop(value, None)
+        position = bisect.bisect_left(self._prices, (row[1] or 0, product_id))
+        if position < len(self._prices) and self._prices[position] == (row[1] or 0, product_id):
+            del self._prices[position]
+
+    def upsert(self, product_id: int, row: Optional[Tuple]):
+        """(category_id, price, material, stock_quantity, has_variations), or None to drop the product"""
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append((product_id, row))
+            self._discard(product_id)
+            if row is not None:
+                self._add(product_id, row)
+
+    def build(self, rows: Iterable[Tuple]):
+        """Replace the index from (id, category_id, price, material, stock_quantity, has_variations) rows"""
+        started = time.perf_counter()
+        with self._lock:
+            self._pending = []
+        try:
+            products = {row[0]: tuple(row[1:]) for row in rows}
+        except Exception:
+            with self._lock:
+                self._pending = None
+            raise
+
+        # Group ids per value first, then turn each group into a bitmap in one go
+        groups = {facet: {} for facet in FACETS}
+        labels = {}
+        for product_id, row in products.items():
+            for facet, value in self._values(row).items():
+                groups[facet].setdefault(value, []).append(product_id)
+            if material_key(row[2]):
+                labels.setdefault(material_key(row[2]), row[2].strip())
+        bitmaps = {facet: {value: bitmap_from_ids(ids) for value, ids in values.items()}
+                   for facet, values in groups.items()}
+        prices = sorted((row[1] or 0, product_id) for product_id, row in products.items())
+
+        with self._lock:
+            self._products, self._bitmaps, self._material_labels, self._prices = products, bitmaps, labels, prices
+            self._all = bitmap_from_ids(products)
+            pending, self._pending = self._pending, None
+            for product_id, row in pending:
+                self.upsert(product_id, row)
+            self.built_at = time.time()
+            self.build_seconds = round(time.perf_counter() - started, 3)
+
+    def _price_range(self, min_price: Optional[float], max_price: Optional[float]) -> int:
+        """Bitmap of products with min_price <= price <= max_price"""
+        low = 0 if min_price is None else bisect.bisect_left(self._prices, (min_price, -1))
+        high = len(self._prices) if max_price is None else bisect.bisect_right(self._prices, (max_price, float('inf')))
+        return bitmap_from_ids(product_id for _, product_id in self._prices[low:high])
+
+    def _any_of(self, facet: str, values: Iterable) -> int:
+        bitmaps = self._bitmaps[facet]
+        result = 0
+        for value in values:
+            result |= bitmaps.get(value, 0)
+        return result
+
+    def query(self, category_ids: Optional[List[int]] = None, min_price: Optional[float] = None,
+              max_price: Optional[float] = None, price_buckets: Optional[List[int]] = None,
+              materials: Optional[List[str]] = None, in_stock: Optional[bool] = None,
+              has_variations: Optional[bool] = None, restrict: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Total and facet counts for a filter combination
+
+        Each facet is counted with every filter except its own applied, so
+        the counts show what picking another value would return. restrict
+        is an extra bitmap (e.g. full-text matches) that always applies.
+        """
+        with self._lock:
+            filters = {}
+            if category_ids:
+                filters['category'] = self._any_of('category', category_ids)
+            if min_price is not None or max_price is not None:
+                filters['price'] = self._price_range(min_price, max_price)
+            if price_buckets:
+                filters['price'] = filters.get('price', -1) & self._any_of('price', price_buckets)
+            if materials:
+                filters['material'] = self._any_of('material', [material_key(m) for m in materials])
+            if in_stock is not None:
+                filters['in_stock'] = self._bitmaps['in_stock'].get(in_stock, 0)
+            if has_variations is not None:
+                filters['has_variations'] = self._bitmaps['has_variations'].get(has_variations, 0)
+
+            base = self._all if restrict is None else self._all & restrict
+            result = base
+            for bitmap in filters.values():
+                result &= bitmap
+
+            facets = {}
+            for facet in FACETS:
+                scope = base
+                for other, bitmap in filters.items():
+                    if other != facet:
+                        scope &= bitmap
+                facets[facet] = {value: (scope & bitmap).bit_count()
+                                 for value, bitmap in self._bitmaps[facet].items()}
+
+            return {
+                'total': result.bit_count(),
+                'bitmap': result,
+                'facets': facets,
+                'material_labels': dict(self._material_labels)
+            }
+
+    def apply_changes(self, changes: Dict[int, Optional[Tuple]]):
+        """Committed product changes from model_events; None drops the product"""
+        for product_id, row in changes.items():
+            self.upsert(product_id, row)
+
+    def stats(self) -> Dict[str, Any]:
+        """Indexed products, distinct values per facet and the last build time"""
+        with self._lock:
+            return {
+                'products': len(self._products),
+                'values': {facet: len(values) for facet, values in self._bitmaps.items()},
+                'built_at': self.built_at,
+                'build_seconds': self.build_seconds
+            }
+
+
+def count_facet_groups(groups: Iterable[Tuple], category_ids: Optional[List[int]] = None,
+                       min_price: Optional[float] = None, max_price: Optional[float] = None,
+                       price_buckets: Optional[List[int]] = None, materials: Optional[List[str]] = None,
+                       in_stock: Optional[bool] = None, has_variations: Optional[bool] = None) -> Dict[str, Any]:
+    """
+    FacetIndex.query over grouped rows (see load_facet_groups) instead of bitmaps
+
+    Used where the matching products come from SQL (full-text search):
+    there are at most a few hundred value combinations, however many
+    products match. Returns the same total, facets and material_labels.
+    """
+    checks = {}
+    if category_ids:
+        checks['category'] = lambda group: group[0] in category_ids
+    if min_price is not None or max_price is not None or price_buckets:
+        checks['price'] = lambda group: group[6] and (not price_buckets or group[1] in price_buckets)
+    if materials:
+        keys = {material_key(m) for m in materials}
+        checks['material'] = lambda group: group[2] in keys
+    if in_stock is not None:
+        checks['in_stock'] = lambda group: group[4] == in_stock
+    if has_variations is not None:
+        checks['has_variations'] = lambda group: group[5] == has_variations
+
+    total = 0
+    facets = {facet: {} for facet in FACETS}
+    labels = {}
+    for group in groups:
+        category_id, bucket, material, label, stock, variations, _, count = group
+        values = {'category': category_id, 'price': bucket, 'material': material,
+                  'in_stock': bool(stock), 'has_variations': bool(variations)}
+        failed = [facet for facet, check in checks.items() if not check(group)]
+        if not failed:
+            total += count
+        # A facet's counts apply every filter except its own
+        if not failed:
+            counted = FACETS
+        else:
+            counted = failed if len(failed) == 1 else ()
+        for facet in counted:
+            value = values[facet]
+            if facet == 'material' and not value:
+                continue
+            facets[facet][value] = facets[facet].get(value, 0) + count
+        if material:
+            labels.setdefault(material, label)
+    return {'total': total, 'facets': facets, 'material_labels': labels}
+
+
+def price_bucket_facets(counts: Dict[int, int], selected: Iterable[int] = ()) -> List[Dict[str, Any]]:
+    """Price facet entries in bucket order; max is exclusive"""
+    selected = set(selected)
+    return [{
+        'bucket': index,
+        'min': low,
+        'max': high,
+        'label': f'{low}+' if high is None else f'{low}-{high}',
+        'count': counts.get(index, 0),
+        'selected': index in selected
+    } for index, (low, high) in enumerate(PRICE_BUCKETS)]
+
+
+def parse_price_buckets(value: Optional[str]) -> List[int]:
+    """'1,2' or '25-50,50-100' -> bucket indexes"""
+    labels = {('%s+' % low if high is None else f'{low}-{high}'): index
+              for index, (low, high) in enumerate(PRICE_BUCKETS)}
+    buckets = []
+    for part in (value or '').split(','):
+        part = part.strip()
+        if part.isdigit() and int(part) < len(PRICE_BUCKETS):
+            buckets.append(int(part))
+        elif part in labels:
+            buckets.append(labels[part])
+    return buckets
+
+
+def parse_flag(value: Optional[str]) -> Optional[bool]:
+    """'true'/'1' -> True, 'false'/'0' -> False, anything else -> not filtered"""
+    value = (value or '').lower()
+    if value in ('true', '1', 'yes'):
+        return True
+    if value in ('false', '0', 'no'):
+        return False
+    return None
+
+
+def serialize_facets(result: Dict[str, Any], categories, selection: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    JSON facets for a FacetIndex.query result
+
+    categories are Category rows used for names; values with no products
+    are left out unless selected.
+    """
+    counts = result['facets']
+    selected_categories = set(selection.get('category_ids') or [])
+    selected_materials = {material_key(m) for m in selection.get('materials') or []}
+
+    category_facets = [{
+        'id': category.id,
+        'name': category.name,
+        'slug': category.slug,
+        'count': counts['category'].get(category.id, 0),
+        'selected': category.id in selected_categories
+    } for category in categories
+        if counts['category'].get(category.id) or category.id in selected_categories]
+
+    material_facets = sorted(({
+        'value': result['material_labels'].get(key, key),
+        'count': count,
+        'selected': key in selected_materials
+    } for key, count in counts['material'].items() if count or key in selected_materials),
+        key=lambda entry: (-entry['count'], entry['value'].lower()))
+
+    def flag_facet(facet):
+        return [{'value': value, 'count': counts[facet].get(value, 0), 'selected': selection.get(facet) is value}
+                for value in (True, False)]
+
+    return {
+        'category': category_facets,
+        'price': price_bucket_facets(counts['price'], selection.get('price_buckets') or ()),
+        'material': material_facets,
+        'in_stock': flag_facet('in_stock'),
+        'has_variations': flag_facet('has_variations')
+    }
+
+
+# ---- database wiring ---------------------------------------------------
+
+def _row(product) -> Tuple:
+    return (product.category_id, product.price, product.material, product.stock_quantity, product.has_variations)
+
+
+def load_rows():
+    """Facet rows for every active product"""
+    from app import db
+    from app.models.models import Product
+    products = db.session.query(
+        Product.id, Product.category_id, Product.price, Product.material,
+        Product.stock_quantity, Product.has_variations
+    ).filter(Product.is_active == True).yield_per(1000)
+    for product in products:
+        yield tuple(product)
+
+
+def load_facet_groups(query, min_price: Optional[float] = None, max_price: Optional[float] = None) -> List[Tuple]:
+    """
+    (category_id, price bucket, material key, material, in stock, has variations, in price range, count)
+    for a Product query, grouped in SQL for count_facet_groups
+    """
+    from app import db
+    from app.models.models import Product
+    price = db.func.coalesce(Product.price, 0)
+    bucket = db.case(*[
+        (db.and_(price >= low, price < high) if high is not None else price >= low, index)
+        for index, (low, high) in enumerate(PRICE_BUCKETS)
+    ], else_=0)
+    material = db.func.lower(db.func.trim(db.func.coalesce(Product.material, '')))
+    in_stock = db.func.coalesce(Product.stock_quantity, 0) > 0
+    has_variations = db.func.coalesce(Product.has_variations, False)
+    in_range = db.true()
+    if min_price is not None:
+        in_range = db.and_(in_range, price >= min_price)
+    if max_price is not None:
+        in_range = db.and_(in_range, price <= max_price)
+    in_range = db.case((in_range, True), else_=False)
+    rows = query.order_by(None).with_entities(
+        Product.category_id, bucket, material, db.func.min(db.func.trim(Product.material)),
+        in_stock, has_variations, in_range, db.func.count(Product.id)
+    ).group_by(Product.category_id, bucket, material, in_stock, has_variations, in_range)
+    return [tuple(row) for row in rows]
+
+
+# Global facet index - lazy loading
+facet_index = None
+_building = None
+_subscribed = False
+_index_lock = threading.Lock()
+
+
+def _apply_changes(changes: Dict[int, Optional[Tuple]]):
+    # While the first build runs, its pending list collects the changes
+    index = facet_index or _building
+    if index is not None:
+        index.apply_changes(changes)
+
+
+def facet_max_age() -> int:
+    """FACET_INDEX_MAX_AGE seconds before a rebuild picks up other workers' edits (0 disables)"""
+    return int(os.environ.get('FACET_INDEX_MAX_AGE') or 300)
+
+
+def get_facet_index() -> FacetIndex:
+    """
+    Get the facet index, built on first use
+
+    Commits in this process update it immediately; once it is older than
+    FACET_INDEX_MAX_AGE it is rebuilt in the background for edits made by
+    other workers.
+    """
+    global facet_index, _building, _subscribed
+    if facet_index is None:
+        with _index_lock:
+            if facet_index is None:
+                if not _subscribed:
+                    from app.models.models import Product
+                    from app.utils.model_events import subscribe
+                    subscribe(Product, lambda p: _row(p) if p.is_active else None, _apply_changes)
+                    _subscribed = True
+                _building = FacetIndex()
+                try:
+                    _building.build(load_rows())
+                    facet_index = _building
+                finally:
+                    _building = None
+                print(f"✅ Facet index built: {facet_index.stats()['products']} products "
+                      f"in {facet_index.build_seconds}s")
+        return facet_index
+
+    max_age = facet_max_age()
+    if max_age and time.time() - facet_index.built_at > max_age and _index_lock.acquire(blocking=False):
+        from flask import current_app
+        app = current_app._get_current_object()
+        # Push built_at forward so only one refresh runs
+        facet_index.built_at = time.time()
+
+        def _refresh():
+            try:
+                with app.app_context():
+                    facet_index.build(load_rows())
+            except Exception as e:
+                print(f"⚠️  Facet index refresh failed: {str(e)}")
+            finally:
+                _index_lock.release()
+
+        threading.Thread(target=_refresh, daemon=True).start()
+    return facet_index
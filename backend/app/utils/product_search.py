@@ -0,0 +1,211 @@
+"""
+Product Search for PEBDEQ
+Full-text index over product name and description: SQLite FTS5 or a Postgres tsvector column
+"""
+
+import re
+import html
+import threading
+import unicodedata
+from typing import Dict, List
+
+from sqlalchemy import text
+
+MAX_TERMS = 8
+SNIPPET_WORDS = 24
+
+TERM_RE = re.compile(r'\w+', re.UNICODE)
+TAG_RE = re.compile(r'<[^>]+>')
+
+# External-content FTS5 table: the text lives in product, the index is kept in sync by triggers
+SQLITE_SETUP = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS product_search USING fts5(
+        name, description,
+        content='product', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS product_search_ai AFTER INSERT ON product BEGIN
+        INSERT INTO product_search(rowid, name, description) VALUES (new.id, new.name, new.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS product_search_ad AFTER DELETE ON product BEGIN
+        INSERT INTO product_search(product_search, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS product_search_au AFTER UPDATE OF name, description ON product BEGIN
+        INSERT INTO product_search(product_search, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO product_search(rowid, name, description) VALUES (new.id, new.name, new.description);
+    END""",
+]
+
+# Generated column: Postgres recomputes it on every insert/update, the GIN index makes @@ cheap.
+# 'simple' keeps words unstemmed - product names mix Turkish and English
+POSTGRES_SETUP = [
+    """ALTER TABLE product ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', coalesce(name, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+        ) STORED""",
+    "CREATE INDEX IF NOT EXISTS ix_product_search_vector ON product USING gin (search_vector)",
+]
+
+
+def search_terms(query: str) -> List[str]:
+    """Lower-cased words of a search box query (punctuation and operators dropped)"""
+    return [term.lower() for term in TERM_RE.findall(query or '')][:MAX_TERMS]
+
+
+class ProductSearchIndex:
+    """Creates the index for the current database on first use and builds match queries"""
+
+    def __init__(self):
+        """Initialize with no database set up yet"""
+        self._lock = threading.Lock()
+        self._backends = {}
+
+    def backend(self) -> str:
+        """'fts5', 'tsvector' or 'like' (no full-text support) for the app's database"""
+        from app import db
+        engine = db.engine
+        key = str(engine.url)
+        if key not in self._backends:
+            with self._lock:
+                if key not in self._backends:
+                    self._backends[key] = self._setup(engine)
+        return self._backends[key]
+
+    def _setup(self, engine) -> str:
+        dialect = engine.dialect.name
+        try:
+            if dialect == 'sqlite':
+                with engine.begin() as conn:
+                    # Triggers go away with the product table (drop_all), leaving a stale index
+                    exists = conn.execute(text(
+                        "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'product_search_ai'"
+                    )).first()
+                    for statement in SQLITE_SETUP:
+                        conn.execute(text(statement))
+                    if not exists:
+                        # Index the products that were there before the table
+                        conn.execute(text("INSERT INTO product_search(product_search) VALUES ('rebuild')"))
+                        print("✅ Product search: FTS5 index built")
+                return 'fts5'
+            if dialect == 'postgresql':
+                with engine.begin() as conn:
+                    for statement in POSTGRES_SETUP:
+                        conn.execute(text(statement))
+                return 'tsvector'
+        except Exception as e:
+            print(f"⚠️  Product search: full-text index unavailable ({str(e)}), using LIKE")
+        return 'like'
+
+    def rebuild(self) -> str:
+        """Re-index every product (after bulk changes made with triggers disabled)"""
+        from app import db
+        backend = self.backend()
+        if backend == 'fts5':
+            with db.engine.begin() as conn:
+                conn.execute(text("INSERT INTO product_search(product_search) VALUES ('rebuild')"))
+        elif backend == 'tsvector':
+            with db.engine.begin() as conn:
+                conn.execute(text("REINDEX INDEX ix_product_search_vector"))
+        return backend
+
+    def apply(self, query, search: str):
+        """
+        Restrict a Product query to full-text matches of search
+
+        Every word is matched as a prefix, all words must match. Returns
+        (query, rank) where ordering by rank ascending puts the best
+        matches first (name hits outweigh description hits).
+        """
+        from app import db
+        from app.models.models import Product
+
+        terms = search_terms(search)
+        if not terms:
+            return query.filter(db.false()), db.literal(0)
+
+        backend = self.backend()
+        if backend == 'fts5':
+            match = text(
+                "SELECT rowid AS product_id, bm25(product_search, 10.0, 1.0) AS rank "
+                "FROM product_search WHERE product_search MATCH :match"
+            ).bindparams(match=' '.join(f'"{term}"*' for term in terms))
+        elif backend == 'tsvector':
+            match = text(
+                "SELECT id AS product_id, -ts_rank(search_vector, to_tsquery('simple', :match)) AS rank "
+                "FROM product WHERE search_vector @@ to_tsquery('simple', :match)"
+            ).bindparams(match=' & '.join(f'{term}:*' for term in terms))
+        else:
+            for term in terms:
+                query = query.filter(Product.name.ilike(f'%{term}%') | Product.description.ilike(f'%{term}%'))
+            return query, db.case((Product.name.ilike(f'%{terms[0]}%'), 0), else_=1)
+
+        matches = match.columns(product_id=db.Integer, rank=db.Float).subquery('search_matches')
+        return query.join(matches, matches.c.product_id == Product.id), matches.c.rank
+
+
+def _fold(value: str) -> str:
+    """Lower-case without diacritics, like the FTS5 tokenizer (café -> cafe)"""
+    decomposed = unicodedata.normalize('NFKD', value.lower())
+    return ''.join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def _highlight_words(words: List[str], pattern) -> str:
+    parts = []
+    for word in words:
+        escaped = html.escape(word)
+        parts.append(f'<mark>{escaped}</mark>' if pattern.match(_fold(word)) else escaped)
+    return ' '.join(parts)
+
+
+def highlight_product(product, search: str) -> Dict[str, str]:
+    """
+    HTML-safe name and description snippet with matched words in <mark>
+
+    The snippet is the SNIPPET_WORDS window of the description holding
+    the most matches, starting a few words before the first of them.
+    """
+    terms = search_terms(search)
+    if not terms:
+        return {'name': html.escape(product.name or ''), 'description': ''}
+    pattern = re.compile(r'\W*(?:' + '|'.join(re.escape(_fold(term)) for term in terms) + ')')
+
+    words = TAG_RE.sub(' ', product.description or '').split()
+    start = 0
+    if len(words) > SNIPPET_WORDS:
+        hit_positions = [i for i, word in enumerate(words) if pattern.match(_fold(word))]
+        best = 0
+        for position in hit_positions:
+            candidate = max(0, min(position - SNIPPET_WORDS // 4, len(words) - SNIPPET_WORDS))
+            count = sum(1 for p in hit_positions if candidate <= p < candidate + SNIPPET_WORDS)
+            if count > best:
+                best, start = count, candidate
+    snippet = _highlight_words(words[start:start + SNIPPET_WORDS], pattern)
+    if start > 0:
+        snippet = '… ' + snippet
+    if start + SNIPPET_WORDS < len(words):
+        snippet += ' …'
+
+    return {
+        'name': _highlight_words((product.name or '').split(), pattern),
+        'description': snippet
+    }
+
+
+# Global search index - lazy loading
+product_search_index = None
+
+
+def get_product_search() -> ProductSearchIndex:
+    """Get or create the product search index"""
+    global product_search_index
+    if product_search_index is None:
+        product_search_index = ProductSearchIndex()
+    return product_search_index
+
+
+def apply_product_search(query, search: str):
+    """Shortcut for get_product_search().apply(query, search)"""
+    return get_product_search().apply(query, search)
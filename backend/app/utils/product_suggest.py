@@ -0,0 +1,448 @@
+"""
+Product Suggest for PEBDEQ
+In-memory trie over product and category names/slugs for typo-tolerant autocomplete
+"""
+
+import os
+import re
+import time
+import heapq
+import threading
+import unicodedata
+from typing import Any, Dict, List, Optional, Tuple
+
+WORD_RE = re.compile(r'\w+', re.UNICODE)
+# Letters NFKD does not decompose (dotless i is common in Turkish product names)
+FOLD_TABLE = str.maketrans({'ı': 'i', 'ß': 'ss', 'ø': 'o', 'æ': 'ae', 'œ': 'oe', 'ł': 'l', 'đ': 'd'})
+
+# Words gathered per query token and entries scored per query - bounds latency for
+# one-letter queries and very common words (postings list categories and featured products first)
+MAX_WORDS_PER_TOKEN = 64
+MAX_CANDIDATES = 200
+# Other query words filter candidates by posting lookups (a union set past 4 words);
+# larger unions are only checked per candidate
+MAX_FILTER_SIZE = 50000
+# Trie nodes a fuzzy lookup may visit before giving up on further typo candidates
+MAX_FUZZY_NODES = 4000
+
+CATEGORY_BOOST = 2.0
+FEATURED_BOOST = 1.0
+
+_POSTINGS = None  # trie node key holding {entry key: None} for the word ending at that node
+
+
+def fold(value: str) -> str:
+    """Lower-case without diacritics (Çay -> cay)"""
+    decomposed = unicodedata.normalize('NFKD', (value or '').lower().translate(FOLD_TABLE))
+    return ''.join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def words_of(*values: str) -> List[str]:
+    """Distinct folded words of the given strings, in order"""
+    seen = {}
+    for value in values:
+        for word in WORD_RE.findall(fold(value)):
+            seen.setdefault(word, None)
+    return list(seen)
+
+
+def max_edits(token: str) -> int:
+    """Typos tolerated for a token: none up to 3 letters, 1 up to 7, then 2"""
+    if len(token) <= 3:
+        return 0
+    return 1 if len(token) <= 7 else 2
+
+
+class SuggestIndex:
+    """
+    Word trie plus an entry table
+
+    Entries are keyed ('product', id) / ('category', id) and hold the
+    label, slug, weight and folded words. Every word of an entry's name
+    and slug points back to it from its trie node.
+    """
+
+    def __init__(self):
+        """Initialize an empty index"""
+        self._lock = threading.RLock()
+        self._root = {}
+        self._entries = {}
+        self._words = 0
+        self.built_at = None
+        self.build_seconds = None
+        # Changes committed while a rebuild reads the database, replayed onto the new trie
+        self._pending = None
+        # One build at a time, so a second build cannot drop the first one's pending changes
+        self._build_lock = threading.Lock()
+
+    # ---- maintenance -------------------------------------------------
+
+    @staticmethod
+    def _add_word(root: dict, word: str, key) -> int:
+        """Link key from word's node; returns 1 when the word is new to the trie"""
+        node = root
+        for char in word:
+            node = node.setdefault(char, {})
+        postings = node.get(_POSTINGS)
+        node.setdefault(_POSTINGS, {})[key] = None
+        return 1 if postings is None else 0
+
+    def _remove_word(self, word: str, key):
+        path = [self._root]
+        for char in word:
+            node = path[-1].get(char)
+            if node is None:
+                return
+            path.append(node)
+        postings = path[-1].get(_POSTINGS)
+        if postings is None:
+            return
+        postings.pop(key, None)
+        if postings:
+            return
+        del path[-1][_POSTINGS]
+        self._words -= 1
+        # Prune branches that no longer lead to any word
+        for depth in range(len(word), 0, -1):
+            if path[depth]:
+                break
+            del path[depth - 1][word[depth - 1]]
+
+    def _put(self, root: dict, entries: dict, key, label: str, slug: str, weight: float, extra: Dict[str, Any]) -> int:
+        """Store an entry and index its words; returns the number of new words"""
+        words = tuple(words_of(label, slug.replace('-', ' ')))
+        entries[key] = {'label': label, 'slug': slug, 'weight': weight, 'folded': fold(label),
+                        'words': words, 'extra': extra}
+        return sum(self._add_word(root, word, key) for word in words)
+
+    def upsert(self, kind: str, entry_id: int, label: str, slug: str, weight: float = 0.0, **extra):
+        """Add or replace one product/category"""
+        key = (kind, entry_id)
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append(('upsert', kind, entry_id, label, slug, weight, extra))
+            self._discard(key)
+            self._words += self._put(self._root, self._entries, key, label or '', slug or '', weight, extra)
+
+    def remove(self, kind: str, entry_id: int):
+        """Drop one product/category"""
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append(('remove', kind, entry_id))
+            self._discard((kind, entry_id))
+
+    def _discard(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            for word in entry['words']:
+                self._remove_word(word, key)
+
+    def build(self, rows, if_unbuilt: bool = False) -> bool:
+        """
+        Replace the whole index from (kind, id, label, slug, weight, extra) rows
+
+        Lookups keep using the previous trie until the new one is swapped in.
+        Builds are serialized; with if_unbuilt, a build that finds the index
+        already built (e.g. by the warm-up thread it waited for) is skipped.
+        Returns whether a build ran.
+        """
+        with self._build_lock:
+            if if_unbuilt and self.built_at is not None:
+                return False
+            started = time.perf_counter()
+            with self._lock:
+                self._pending = []
+            root, entries, words = {}, {}, 0
+            try:
+                for kind, entry_id, label, slug, weight, extra in rows:
+                    words += self._put(root, entries, (kind, entry_id), label or '', slug or '', weight, extra)
+            except Exception:
+                with self._lock:
+                    self._pending = None
+                raise
+            with self._lock:
+                self._root, self._entries, self._words = root, entries, words
+                pending, self._pending = self._pending, None
+                for change in pending:
+                    if change[0] == 'upsert':
+                        self.upsert(*change[1:6], **change[6])
+                    else:
+                        self.remove(*change[1:])
+                self.built_at = time.time()
+                self.build_seconds = round(time.perf_counter() - started, 3)
+            return True
+
+    # ---- lookup ------------------------------------------------------
+
+    def _completions(self, node: dict, distance: int, found: Dict[str, Tuple], prefix: str, budget: List[int]):
+        """Breadth-first words under node (shortest first) into found[word] = (edits, node)"""
+        queue = [(prefix, node)]
+        while queue and budget[0] > 0:
+            next_queue = []
+            for word, current in queue:
+                if _POSTINGS in current:
+                    if word not in found or distance < found[word][0]:
+                        found[word] = (distance, current)
+                        budget[0] -= 1
+                        if budget[0] <= 0:
+                            return
+                for char, child in current.items():
+                    if char is not _POSTINGS:
+                        next_queue.append((word + char, child))
+            queue = next_queue
+
+    def _match_token(self, token: str) -> Dict[str, Tuple]:
+        """{word: (edits, node)} for indexed words that start with token, allowing max_edits(token) typos"""
+        found = {}
+        budget = [MAX_WORDS_PER_TOKEN]
+
+        node = self._root
+        for char in token:
+            node = node.get(char)
+            if node is None:
+                break
+        if node is not None:
+            self._completions(node, 0, found, token, budget)
+
+        limit = max_edits(token)
+        if limit == 0 or budget[0] <= 0:
+            return found
+
+        # Damerau-Levenshtein (optimal string alignment) rows down the trie; a node
+        # whose last cell is within the limit matches the whole token, so its
+        # completions are candidates and its subtree needs no further rows.
+        # Typos in the first letter are rare, anchoring on it keeps the walk small
+        first = self._root.get(token[0])
+        if first is None:
+            return found
+        first_row = [1]
+        for i in range(1, len(token) + 1):
+            first_row.append(min(first_row[i - 1] + 1, i + 1, i - 1 + (token[i - 1] != token[0])))
+        visited = 0
+        stack = [(first, token[0], first_row, list(range(len(token) + 1)), token[0])]
+        while stack and visited < MAX_FUZZY_NODES and budget[0] > 0:
+            current, prefix, row, previous_row, previous_char = stack.pop()
+            for char, child in current.items():
+                if char is _POSTINGS:
+                    continue
+                visited += 1
+                new_row = [row[0] + 1]
+                for i in range(1, len(token) + 1):
+                    cost = min(new_row[i - 1] + 1, row[i] + 1, row[i - 1] + (token[i - 1] != char))
+                    if i > 1 and previous_row is not None and token[i - 1] == previous_char and token[i - 2] == char:
+                        cost = min(cost, previous_row[i - 2] + 1)
+                    new_row.append(cost)
+                if new_row[-1] <= limit:
+                    self._completions(child, new_row[-1], found, prefix + char, budget)
+                elif min(new_row) <= limit:
+                    stack.append((child, prefix + char, new_row, row, char))
+        return found
+
+    @staticmethod
+    def _token_distance(token: str, matched: Dict[str, Tuple], words) -> Optional[int]:
+        """Edits needed for token to prefix-match one of an entry's words, None if it does not"""
+        best = None
+        for word in words:
+            if word.startswith(token):
+                return 0
+            if word in matched and (best is None or matched[word][0] < best):
+                best = matched[word][0]
+        return best
+
+    def suggest(self, query: str, limit: int = 8) -> List[Dict[str, Any]]:
+        """
+        Best products/categories for a partially typed query
+
+        Every query word must prefix-match a word of the name or slug
+        (within max_edits typos). Fewer typos rank first, then names that
+        start with the query, then categories and featured products.
+        """
+        tokens = words_of(query)
+        if not tokens:
+            return []
+        folded_query = ' '.join(tokens)
+
+        with self._lock:
+            matched = [self._match_token(token) for token in tokens]
+            # Candidates come from the most selective word in posting order; the
+            # other words filter them through set lookups and are scored per entry
+            sizes = [sum(len(node[_POSTINGS]) for _, node in words.values()) for words in matched]
+            driver = sizes.index(min(sizes))
+            others = [i for i in range(len(tokens)) if i != driver]
+            filters = []
+            for i in others:
+                postings = [node[_POSTINGS] for _, node in matched[i].values()]
+                if len(postings) <= 4:
+                    filters.append(postings)
+                elif sizes[i] <= MAX_FILTER_SIZE:
+                    filters.append([set().union(*postings)])
+
+            candidates = {}
+            for word, (distance, node) in sorted(matched[driver].items(), key=lambda item: (item[1][0], len(item[0]))):
+                for key in node[_POSTINGS]:
+                    if all(any(key in keys for keys in postings) for postings in filters) and \
+                            (key not in candidates or distance < candidates[key]):
+                        candidates[key] = distance
+                        if len(candidates) >= MAX_CANDIDATES:
+                            break
+                if len(candidates) >= MAX_CANDIDATES:
+                    break
+
+            scored = []
+            for key, total in candidates.items():
+                entry = self._entries[key]
+                for i in others:
+                    distance = self._token_distance(tokens[i], matched[i], entry['words'])
+                    if distance is None:
+                        break
+                    total += distance
+                else:
+                    scored.append((
+                        total,
+                        0 if entry['folded'].startswith(folded_query) else 1,
+                        -entry['weight'],
+                        len(entry['label']),
+                        entry['label'],
+                        key
+                    ))
+            best = heapq.nsmallest(limit, scored)
+            results = []
+            for total, _, _, _, _, key in best:
+                entry = self._entries[key]
+                result = {'type': key[0], 'id': key[1], 'label': entry['label'],
+                          'slug': entry['slug'], 'typos': total}
+                result.update(entry['extra'])
+                results.append(result)
+        return results
+
+    def stats(self) -> Dict[str, Any]:
+        """Entry and word counts and the last build time"""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'words': self._words,
+                'built_at': self.built_at,
+                'build_seconds': self.build_seconds
+            }
+
+
+# ---- database wiring ---------------------------------------------------
+
+def _product_row(product) -> Tuple:
+    weight = FEATURED_BOOST if product.is_featured else 0.0
+    return ('product', product.id, product.name, product.slug, weight, {'category_id': product.category_id})
+
+
+def _category_row(category) -> Tuple:
+    return ('category', category.id, category.name, category.slug, CATEGORY_BOOST, {})
+
+
+def load_rows():
+    """Index rows for active categories, then featured products, then the newest products"""
+    from app import db
+    from app.models.models import Product, Category
+    # Posting lists keep insertion order and lookups read them front first
+    for category in db.session.query(Category.id, Category.name, Category.slug).filter(Category.is_active == True):
+        yield _category_row(category)
+    products = db.session.query(
+        Product.id, Product.name, Product.slug, Product.is_featured, Product.category_id
+    ).filter(Product.is_active == True).order_by(Product.is_featured.desc(), Product.id.desc()).yield_per(1000)
+    for product in products:
+        yield _product_row(product)
+
+
+def _apply_changes(kind: str, changes: Dict[int, Optional[Tuple]]):
+    """Committed product/category changes; None means deleted or deactivated"""
+    for entry_id, row in changes.items():
+        if row is None:
+            suggest_index.remove(kind, entry_id)
+        else:
+            suggest_index.upsert(*row[:5], **row[5])
+
+
+def _install_listeners():
+    """Keep the index in step with committed product/category changes"""
+    from app.models.models import Product, Category
+    from app.utils.model_events import subscribe
+    subscribe(Product, lambda p: _product_row(p) if p.is_active else None,
+              lambda changes: _apply_changes('product', changes))
+    subscribe(Category, lambda c: _category_row(c) if c.is_active else None,
+              lambda changes: _apply_changes('category', changes))
+
+
+# Global suggest index - lazy loading
+suggest_index = None
+_index_lock = threading.Lock()
+_refreshing = False
+
+
+def get_suggest_index() -> SuggestIndex:
+    """Get or create the suggest index (empty until build_suggest_index runs)"""
+    global suggest_index
+    if suggest_index is None:
+        with _index_lock:
+            if suggest_index is None:
+                _install_listeners()
+                suggest_index = SuggestIndex()
+    return suggest_index
+
+
+def build_suggest_index(app=None, if_unbuilt: bool = False) -> SuggestIndex:
+    """(Re)build the index from the database, inside app's context when given"""
+    index = get_suggest_index()
+    if app is not None:
+        with app.app_context():
+            built = index.build(load_rows(), if_unbuilt)
+    else:
+        built = index.build(load_rows(), if_unbuilt)
+    if built:
+        stats = index.stats()
+        print(f"✅ Suggest index built: {stats['entries']} entries, {stats['words']} words "
+              f"in {stats['build_seconds']}s")
+    return index
+
+
+def suggest_max_age() -> int:
+    """SUGGEST_INDEX_MAX_AGE seconds before a rebuild picks up other workers' edits (0 disables)"""
+    return int(os.environ.get('SUGGEST_INDEX_MAX_AGE') or 300)
+
+
+def current_suggest_index() -> SuggestIndex:
+    """
+    The suggest index, ready for lookups
+
+    Built on first use, or waits for a warm-up build that is already running.
+    Commits in this process update it immediately; once it is older than
+    SUGGEST_INDEX_MAX_AGE it is rebuilt in the background for edits made by
+    other workers.
+    """
+    global _refreshing
+    index = get_suggest_index()
+    if index.built_at is None:
+        return build_suggest_index(if_unbuilt=True)
+
+    max_age = suggest_max_age()
+    if max_age and time.time() - index.built_at > max_age:
+        with _index_lock:
+            if _refreshing:
+                return index
+            _refreshing = True
+        from flask import current_app
+        app = current_app._get_current_object()
+
+        def _refresh():
+            global _refreshing
+            try:
+                build_suggest_index(app)
+            except Exception as e:
+                print(f"⚠️  Suggest index refresh failed: {str(e)}")
+            finally:
+                _refreshing = False
+
+        threading.Thread(target=_refresh, daemon=True).start()
+    return index
+
+
+def suggest_warmup_enabled() -> bool:
+    """SUGGEST_WARMUP (default true): build the index in the background at startup"""
+    return os.environ.get('SUGGEST_WARMUP', 'true').lower() in ['true', 'on', '1']
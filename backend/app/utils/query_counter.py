@@ -0,0 +1,97 @@
+"""
+SQL Statement Counting for PEBDEQ
+Counts the statements a block of code or a request runs, to catch N+1 query patterns
+"""
+
+import os
+import threading
+from contextlib import contextmanager
+from typing import List, Optional
+
+QUERY_COUNT_HEADER = 'X-Query-Count'
+
+_local = threading.local()
+_listening = False
+_listen_lock = threading.Lock()
+
+
+class QueryCounter:
+    """Statements executed on the current thread while the counter is active"""
+
+    def __init__(self):
+        self.statements: List[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    for counter in getattr(_local, 'counters', ()):
+        counter.statements.append(statement)
+
+
+def _ensure_listening():
+    global _listening
+    with _listen_lock:
+        if not _listening:
+            from sqlalchemy import event
+            from sqlalchemy.engine import Engine
+            event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+            _listening = True
+
+
+@contextmanager
+def count_queries():
+    """with count_queries() as counter: ... then counter.count / counter.statements"""
+    _ensure_listening()
+    counter = QueryCounter()
+    counters = _local.__dict__.setdefault('counters', [])
+    counters.append(counter)
+    try:
+        yield counter
+    finally:
+        counters.remove(counter)
+
+
+@contextmanager
+def assert_query_count(expected: int, maximum: bool = False):
+    """
+    Fail unless the block runs exactly expected statements (at most, with maximum=True)
+
+        with assert_query_count(4):
+            client.get('/api/categories')
+    """
+    with count_queries() as counter:
+        yield counter
+    if counter.count > expected or (not maximum and counter.count != expected):
+        executed = '\n'.join(f'  {i + 1}. {statement}' for i, statement in enumerate(counter.statements))
+        limit = f'at most {expected}' if maximum else f'{expected}'
+        raise AssertionError(f'Expected {limit} SQL statements, got {counter.count}:\n{executed}')
+
+
+def query_count_header_enabled() -> bool:
+    return os.environ.get('QUERY_COUNT_HEADER', 'false').lower() in ['true', 'on', '1']
+
+
+def install_query_count_header(app):
+    """Report each response's statement count in X-Query-Count (QUERY_COUNT_HEADER=true)"""
+    from flask import g
+
+    @app.before_request
+    def _start_query_count():
+        g._query_count = count_queries()
+        g._query_counter = g._query_count.__enter__()
+
+    @app.after_request
+    def _add_query_count_header(response):
+        counter: Optional[QueryCounter] = g.pop('_query_counter', None)
+        if counter is not None:
+            response.headers[QUERY_COUNT_HEADER] = str(counter.count)
+        return response
+
+    @app.teardown_request
+    def _stop_query_count(exc):
+        query_count = g.pop('_query_count', None)
+        if query_count is not None:
+            query_count.__exit__(None, None, None)
@@ -0,0 +1,113 @@
+"""
+Query Plan Checks for PEBDEQ
+EXPLAIN the hot route queries and flag the ones that fall back to a full table scan
+"""
+
+import re
+import json
+from datetime import datetime
+from typing import Any, Dict, List
+
+# SQLite: "SCAN product" is a table scan, "SCAN product USING INDEX ..." walks an index in order
+SQLITE_FULL_SCAN = re.compile(r'^SCAN (\S+)$')
+
+
+def hot_queries() -> Dict[str, Any]:
+    """The queries behind the busiest routes, with representative filter values"""
+    from app import db
+    from app.models.models import (Product, ProductReview, Order, OrderItem, Cart, CartItem,
+                                   User, Invoice, EmailQueue, EmailLog)
+    since = datetime(2025, 1, 1)
+
+    return {
+        # products.product_list / products_by_category
+        'catalog_category_newest': Product.query.filter_by(is_active=True)
+            .filter(Product.category_id == 1).order_by(Product.created_at.desc()).limit(12),
+        'catalog_newest_cursor': Product.query.filter_by(is_active=True)
+            .filter(db.tuple_(Product.created_at, Product.id) < db.tuple_(since, 100))
+            .order_by(Product.created_at.desc(), Product.id.desc()).limit(13),
+        'catalog_price_low_cursor': Product.query.filter_by(is_active=True)
+            .filter(db.tuple_(Product.price, Product.id) > db.tuple_(10.0, 100))
+            .order_by(Product.price.asc(), Product.id.asc()).limit(13),
+        # main.home
+        'home_featured': Product.query.filter_by(is_featured=True, is_active=True).limit(8),
+        # products.get_product_reviews
+        'product_reviews': ProductReview.query.filter_by(product_id=1, is_approved=True)
+            .order_by(ProductReview.created_at.desc()),
+        # orders.get_user_orders / users.get_user_orders
+        'user_orders': Order.query.filter_by(user_id=1).order_by(Order.created_at.desc()),
+        # admin.dashboard
+        'orders_by_status': Order.query.filter_by(status='pending'),
+        # orders.get_orders, admin.get_admin_users, invoices.get_invoices (cursor mode)
+        'admin_orders_cursor': Order.query.filter(db.tuple_(Order.created_at, Order.id) < db.tuple_(since, 100))
+            .order_by(Order.created_at.desc(), Order.id.desc()).limit(11),
+        'admin_users_cursor': User.query.filter(db.tuple_(User.created_at, User.id) < db.tuple_(since, 100))
+            .order_by(User.created_at.desc(), User.id.desc()).limit(11),
+        'admin_invoices_cursor': Invoice.query.filter(db.tuple_(Invoice.invoice_date, Invoice.id) < db.tuple_(since, 100))
+            .order_by(Invoice.invoice_date.desc(), Invoice.id.desc()).limit(11),
+        # Order.order_items and product sales
+        'order_items_of_order': OrderItem.query.filter_by(order_id=1),
+        'order_items_of_product': OrderItem.query.filter_by(product_id=1),
+        # cart routes
+        'guest_cart': Cart.query.filter_by(session_id='guest-session'),
+        'user_cart': Cart.query.filter_by(user_id=1),
+        'cart_item_lookup': CartItem.query.filter_by(cart_id=1, product_id=1),
+        # email_service.process_email_queue / _check_rate_limits
+        'email_queue_batch': EmailQueue.query.filter_by(status='pending')
+            .filter(EmailQueue.scheduled_at.is_(None) | (EmailQueue.scheduled_at <= since))
+            .order_by(EmailQueue.priority.asc(), EmailQueue.created_at.asc()).limit(10),
+        'email_rate_limit': EmailLog.query.filter(EmailLog.created_at >= since, EmailLog.status == 'sent'),
+    }
+
+
+def explain(query) -> List[str]:
+    """Plan of query as text lines (SQLite EXPLAIN QUERY PLAN, Postgres EXPLAIN)"""
+    from app import db
+    bind = db.session.get_bind()
+    sql = str(query.statement.compile(dialect=bind.dialect, compile_kwargs={'literal_binds': True}))
+    connection = db.session.connection()
+
+    if bind.dialect.name == 'sqlite':
+        return [row[-1] for row in connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {sql}')]
+
+    if bind.dialect.name == 'postgresql':
+        # Small tables are always cheapest to scan; without seq scans the planner only
+        # falls back to one when no index applies
+        connection.exec_driver_sql('SET LOCAL enable_seqscan = off')
+        try:
+            plan = connection.exec_driver_sql(f'EXPLAIN (FORMAT JSON) {sql}').scalar()
+        finally:
+            connection.exec_driver_sql('RESET enable_seqscan')
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        lines = []
+        nodes = [plan[0]['Plan']]
+        while nodes:
+            node = nodes.pop(0)
+            relation = node.get('Relation Name')
+            index = node.get('Index Name')
+            lines.append(' '.join(filter(None, [node['Node Type'], relation and f'on {relation}', index and f'using {index}'])))
+            nodes.extend(node.get('Plans', []))
+        return lines
+
+    raise RuntimeError(f'No query plan support for {bind.dialect.name}')
+
+
+def full_scans(plan: List[str]) -> List[str]:
+    """Tables read by a full scan in an explain() plan"""
+    tables = []
+    for line in plan:
+        match = SQLITE_FULL_SCAN.match(line)
+        if match:
+            tables.append(match.group(1))
+        elif line.startswith('Seq Scan on '):
+            tables.append(line.split()[3])
+    return tables
+
+
+def check_query_plans() -> List[Dict[str, Any]]:
+    """[{name, plan, full_scans}] for every hot query; failures have a non-empty full_scans"""
+    return [
+        {'name': name, 'plan': plan, 'full_scans': full_scans(plan)}
+        for name, plan in ((name, explain(query)) for name, query in hot_queries().items())
+    ]
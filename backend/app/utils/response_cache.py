@@ -0,0 +1,325 @@
+"""
+Response Cache for PEBDEQ
+Tagged, size-bounded caching of GET responses with an in-process LRU or a Redis backend
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Dict, Iterable, Optional
+
+from flask import request, make_response
+
+
+class CacheEntry:
+    """A serialized response body with the headers needed to replay it"""
+
+    __slots__ = ('body', 'status', 'mimetype', 'etag', 'tags', 'expires_at')
+
+    def __init__(self, body: bytes, status: int, mimetype: str, etag: str, tags, expires_at: float):
+        self.body = body
+        self.status = status
+        self.mimetype = mimetype
+        self.etag = etag
+        self.tags = tuple(tags)
+        self.expires_at = expires_at
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + 200
+
+
+class MemoryCacheBackend:
+    """Per-process LRU with TTL, bounded by total body size"""
+
+    name = 'memory'
+
+    def __init__(self, max_bytes: int):
+        """Initialize the LRU with a byte budget"""
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._tags = {}
+        self._size = 0
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._size -= entry.size
+        for tag in entry.tags:
+            keys = self._tags.get(tag)
+            if keys:
+                keys.discard(key)
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= time.time():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CacheEntry):
+        if entry.size > self.max_bytes:
+            return
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = entry
+            self._size += entry.size
+            for tag in entry.tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while self._size > self.max_bytes and self._entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate(self, tags: Iterable[str]) -> int:
+        removed = 0
+        with self._lock:
+            for tag in tags:
+                for key in list(self._tags.pop(tag, ())):
+                    if key in self._entries:
+                        self._remove(key)
+                        removed += 1
+        return removed
+
+    def clear(self) -> int:
+        with self._lock:
+            removed = len(self._entries)
+            self._entries.clear()
+            self._tags.clear()
+            self._size = 0
+        return removed
+
+    def info(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'size_mb': round(self._size / (1024 * 1024), 3),
+                'max_size_mb': round(self.max_bytes / (1024 * 1024), 3),
+                'evictions': self.evictions
+            }
+
+
+class RedisCacheBackend:
+    """Shared cache for all workers; Redis maxmemory/TTL bound its footprint"""
+
+    name = 'redis'
+
+    def __init__(self, url: str, prefix: str = 'pebdeq:rc:'):
+        """Connect to Redis (raises if the server is unreachable)"""
+        import redis
+        self._redis = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        self._redis.ping()
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        raw = self._redis.hgetall(self.prefix + key)
+        if not raw:
+            return None
+        meta = json.loads(raw[b'meta'])
+        return CacheEntry(raw[b'body'], meta['status'], meta['mimetype'], meta['etag'], meta['tags'], meta['expires_at'])
+
+    def set(self, key: str, entry: CacheEntry):
+        ttl = max(1, int(entry.expires_at - time.time()))
+        meta = json.dumps({'status': entry.status, 'mimetype': entry.mimetype, 'etag': entry.etag,
+                           'tags': list(entry.tags), 'expires_at': entry.expires_at})
+        pipe = self._redis.pipeline()
+        pipe.hset(self.prefix + key, mapping={'body': entry.body, 'meta': meta})
+        pipe.expire(self.prefix + key, ttl)
+        for tag in entry.tags:
+            pipe.sadd(f'{self.prefix}tag:{tag}', key)
+            pipe.expire(f'{self.prefix}tag:{tag}', ttl * 2)
+        pipe.execute()
+
+    def invalidate(self, tags: Iterable[str]) -> int:
+        removed = 0
+        for tag in tags:
+            tag_key = f'{self.prefix}tag:{tag}'
+            keys = self._redis.smembers(tag_key)
+            if keys:
+                removed += self._redis.delete(*[self.prefix + k.decode() for k in keys])
+            self._redis.delete(tag_key)
+        return removed
+
+    def clear(self) -> int:
+        removed = 0
+        for key in self._redis.scan_iter(match=f'{self.prefix}*', count=500):
+            removed += self._redis.delete(key)
+        return removed
+
+    def info(self) -> Dict[str, Any]:
+        return {'entries': sum(1 for _ in self._redis.scan_iter(match=f'{self.prefix}*', count=500))}
+
+
+class ResponseCache:
+    """Backend facade with hit/miss metrics"""
+
+    def __init__(self, backend):
+        """Wrap a cache backend"""
+        self.backend = backend
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'not_modified': 0, 'sets': 0, 'invalidations': 0, 'errors': 0}
+
+    def _count(self, name: str, amount: int = 1):
+        with self._lock:
+            self._stats[name] += amount
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        try:
+            entry = self.backend.get(key)
+        except Exception as e:
+            print(f"⚠️  Response cache read failed: {str(e)}")
+            self._count('errors')
+            entry = None
+        self._count('hits' if entry is not None else 'misses')
+        return entry
+
+    def set(self, key: str, entry: CacheEntry):
+        try:
+            self.backend.set(key, entry)
+            self._count('sets')
+        except Exception as e:
+            print(f"⚠️  Response cache write failed: {str(e)}")
+            self._count('errors')
+
+    def invalidate(self, *tags: str) -> int:
+        """Drop every cached response carrying one of the tags"""
+        try:
+            removed = self.backend.invalidate(tags)
+        except Exception as e:
+            print(f"⚠️  Response cache invalidation failed: {str(e)}")
+            self._count('errors')
+            return 0
+        self._count('invalidations')
+        return removed
+
+    def clear(self) -> int:
+        return self.backend.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for this process plus backend usage"""
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 3) if lookups else 0
+        stats['backend'] = self.backend.name
+        try:
+            stats.update(self.backend.info())
+        except Exception as e:
+            stats['backend_error'] = str(e)
+        return stats
+
+
+def _create_backend():
+    """RESPONSE_CACHE_BACKEND: memory (default) or redis, falling back to memory"""
+    max_bytes = int(float(os.environ.get('RESPONSE_CACHE_MAX_MB') or 64) * 1024 * 1024)
+    if (os.environ.get('RESPONSE_CACHE_BACKEND') or 'memory').lower() == 'redis':
+        url = os.environ.get('RESPONSE_CACHE_REDIS_URL') or os.environ.get('REDIS_URL') or 'redis://localhost:6379/0'
+        try:
+            backend = RedisCacheBackend(url)
+            print(f"✅ Response cache: Redis at {url}")
+            return backend
+        except Exception as e:
+            print(f"⚠️  Response cache: Redis unavailable ({str(e)}), using in-process cache")
+    return MemoryCacheBackend(max_bytes)
+
+
+# Global response cache instance - lazy loading
+response_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Get or create the response cache"""
+    global response_cache
+    if response_cache is None:
+        with _cache_lock:
+            if response_cache is None:
+                response_cache = ResponseCache(_create_backend())
+    return response_cache
+
+
+def _cache_enabled() -> bool:
+    return (os.environ.get('RESPONSE_CACHE_BACKEND') or 'memory').lower() != 'none'
+
+
+def _replay(entry: CacheEntry):
+    """Build a response from a cache entry, or a 304 if the client already has it"""
+    if entry.etag in request.if_none_match:
+        get_response_cache()._count('not_modified')
+        response = make_response('', 304)
+    else:
+        response = make_response(entry.body, entry.status)
+        response.mimetype = entry.mimetype
+    response.set_etag(entry.etag)
+    response.headers['X-Cache'] = 'HIT'
+    return response
+
+
+def cached(timeout: int = 300, tags: Iterable[str] = ()):
+    """
+    Cache a GET view's successful response for timeout seconds
+
+    The key covers the view, its URL arguments and the sorted query string.
+    Responses carry an ETag so repeat visitors get 304s, and tags let write
+    endpoints drop them early via invalidate_cache / @invalidates.
+    Pass ?no_cache=1 to bypass the cache.
+    """
+    tags = tuple(tags)
+
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if not _cache_enabled() or request.args.get('no_cache') == '1':
+                return f(*args, **kwargs)
+
+            query = sorted(request.args.items(multi=True))
+            cache_key = f'{f.__module__}.{f.__name__}:{sorted(kwargs.items())}:{query}'
+            cache = get_response_cache()
+
+            entry = cache.get(cache_key)
+            if entry is not None:
+                return _replay(entry)
+
+            response = make_response(f(*args, **kwargs))
+            if response.status_code != 200 or response.direct_passthrough:
+                return response
+
+            body = response.get_data()
+            etag = hashlib.sha1(body).hexdigest()
+            cache.set(cache_key, CacheEntry(body, 200, response.mimetype, etag, tags, time.time() + timeout))
+            response.set_etag(etag)
+            response.headers['X-Cache'] = 'MISS'
+            return response.make_conditional(request)
+        return decorated_function
+    return decorator
+
+
+def invalidate_cache(*tags: str) -> int:
+    """Drop cached responses for the given tags (e.g. 'products', 'categories')"""
+    if not _cache_enabled():
+        return 0
+    return get_response_cache().invalidate(*tags)
+
+
+def invalidates(*tags: str):
+    """Invalidate tags after a write endpoint succeeds"""
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            response = make_response(f(*args, **kwargs))
+            if response.status_code < 400:
+                invalidate_cache(*tags)
+            return response
+        return decorated_function
+    return decorator
@@ -0,0 +1,163 @@
+"""
+Background Removal Result Cache for PEBDEQ
+Disk-backed, content-addressed PNG cache with a size cap and LRU eviction
+"""
+
+import os
+import json
+import hashlib
+import threading
+from io import BytesIO
+from typing import Any, Dict, Optional
+
+
+def make_cache_key(image_bytes: bytes, model: str, params: Dict[str, Any]) -> str:
+    """SHA-256 over the input bytes, the model and its post-processing parameters"""
+    digest = hashlib.sha256(image_bytes)
+    digest.update(b'\0' + model.encode('utf-8') + b'\0')
+    digest.update(json.dumps(params, sort_keys=True).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _default_cache_dir() -> str:
+    # backend/uploads/bg_cache
+    backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    return os.path.join(backend_dir, 'uploads', 'bg_cache')
+
+
+class ResultCache:
+    """Content-addressed result store shared by every process on the host"""
+
+    def __init__(self, cache_dir: Optional[str] = None, max_size_mb: Optional[int] = None):
+        """Initialize the cache directory and size cap"""
+        self.cache_dir = cache_dir or os.environ.get('BG_CACHE_DIR') or _default_cache_dir()
+        if max_size_mb is None:
+            max_size_mb = int(os.environ.get('BG_CACHE_MAX_MB') or 1024)
+        self.max_bytes = max_size_mb * 1024 * 1024
+        self._lock = threading.Lock()
+        self._size_bytes = None
+        self._stats = {'hits': 0, 'misses': 0, 'writes': 0, 'evictions': 0}
+
+    def _path(self, key: str) -> str:
+        # Two-level fan-out keeps directories small
+        return os.path.join(self.cache_dir, key[:2], f'{key}.png')
+
+    def _scan(self):
+        """Return [(mtime, size, path)] for every cached file"""
+        entries = []
+        if not os.path.isdir(self.cache_dir):
+            return entries
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith('.png'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return cached PNG bytes for key, or None on a miss"""
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            # mtime doubles as the LRU timestamp across processes
+            os.utime(path, None)
+        except OSError:
+            with self._lock:
+                self._stats['misses'] += 1
+            return None
+        with self._lock:
+            self._stats['hits'] += 1
+        return data
+
+    def put(self, key: str, data: bytes):
+        """Store PNG bytes under key and evict old entries past the size cap"""
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self._stats['writes'] += 1
+            if self._size_bytes is None:
+                self._size_bytes = sum(size for _, size, _ in self._scan())
+            else:
+                self._size_bytes += len(data)
+            if self._size_bytes > self.max_bytes:
+                self._evict()
+
+    def put_image(self, key: str, image):
+        """Encode a PIL image as PNG, store it and keep the bytes in image.info"""
+        try:
+            buffer = BytesIO()
+            image.save(buffer, format='PNG', compress_level=1)
+            data = buffer.getvalue()
+            self.put(key, data)
+            image.info['cached_png'] = data
+        except Exception as e:
+            print(f"   ⚠️  Could not write background removal cache entry: {str(e)}")
+
+    def _evict(self):
+        """Delete least recently used files until the cache is at 90% of its cap"""
+        entries = sorted(self._scan())
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * 0.9
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+                self._stats['evictions'] += 1
+            except OSError:
+                pass
+        self._size_bytes = total
+
+    def clear(self) -> int:
+        """Delete every cached result, returning the number removed"""
+        removed = 0
+        with self._lock:
+            for _, _, path in self._scan():
+                try:
+                    os.remove(path)
+                    removed += 1
+                except OSError:
+                    pass
+            self._size_bytes = 0
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters (this process) and on-disk usage (all processes)"""
+        entries = self._scan()
+        with self._lock:
+            lookups = self._stats['hits'] + self._stats['misses']
+            self._size_bytes = sum(size for _, size, _ in entries)
+            return {
+                'hits': self._stats['hits'],
+                'misses': self._stats['misses'],
+                'hit_rate': round(self._stats['hits'] / lookups, 3) if lookups else 0,
+                'writes': self._stats['writes'],
+                'evictions': self._stats['evictions'],
+                'entries': len(entries),
+                'size_mb': round(self._size_bytes / (1024 * 1024), 2),
+                'max_size_mb': round(self.max_bytes / (1024 * 1024), 2)
+            }
+
+
+# Global result cache instance - lazy loading
+result_cache = None
+
+
+def get_result_cache() -> ResultCache:
+    """Get or create the background removal result cache"""
+    global result_cache
+    if result_cache is None:
+        result_cache = ResultCache()
+    return result_cache
@@ -0,0 +1,682 @@
+"""
+Site Settings Field Registry for PEBDEQ
+Every site setting with its type, default and visibility, plus validation, a diff-and-apply
+that touches only the fields that actually change, and the public/admin payloads.
+Fields are grouped into sections by key prefix; each section is stored as one document.
+Adding a setting is one SettingsField line in SETTINGS_FIELDS: no column or migration.
+"""
+
+import copy
+from typing import Any, Dict, Optional, Tuple
+
+# Settings the backend maintains itself; the form's copies are ignored
+DERIVED_FIELDS = ('site_stylesheet_url',)
+
+TRUE_STRINGS = ('true', '1', 'yes', 'on')
+FALSE_STRINGS = ('false', '0', 'no', 'off')
+
+# Sections by key prefix; the first match wins, anything else is 'site'
+SETTINGS_SECTIONS = (
+    ('homepage_products2', ('homepage_products2_',)),
+    ('homepage_products', ('homepage_products_',)),
+    ('products_page', ('products_page_',)),
+    ('product_detail', ('product_detail_',)),
+    ('about_page', ('about_page_',)),
+    ('marquee', ('marquee_',)),
+    ('header', ('header_', 'nav_link_', 'navigation_links', 'mobile_nav_')),
+    ('footer', ('footer_', 'social_')),
+    ('homepage', ('welcome_', 'homepage_', 'collections_')),
+    ('integrations', ('google_oauth_',)),
+    ('stylesheet', ('site_stylesheet_',)),
+)
+DEFAULT_SECTION = 'site'
+SECTION_NAMES = tuple(name for name, _ in SETTINGS_SECTIONS) + (DEFAULT_SECTION,)
+
+
+def section_of(key: str) -> str:
+    for name, prefixes in SETTINGS_SECTIONS:
+        if key.startswith(prefixes):
+            return name
+    return DEFAULT_SECTION
+
+
+class SettingsField:
+    """
+    One setting: its kind (string/text/boolean/integer/float/json), limits and default
+
+    public fields are served to every visitor by /api/site-settings; the
+    admin GET serves all of them. fallback is served when the stored value is None.
+    """
+
+    __slots__ = ('name', 'kind', 'max_length', 'nullable', 'section', 'public', '_default', '_fallback')
+
+    def __init__(self, name: str, kind: str, max_length: Optional[int] = None, nullable: bool = True,
+                 default: Any = None, public: bool = False, fallback: Any = None):
+        self.name = name
+        self.kind = kind
+        self.max_length = max_length
+        self.nullable = nullable
+        self.section = section_of(name)
+        self.public = public
+        self._default = default
+        self._fallback = fallback
+
+    @property
+    def default(self) -> Any:
+        """The value of an unset field; list defaults are copied fresh each time"""
+        return copy.deepcopy(self._default)
+
+    @property
+    def fallback(self) -> Any:
+        return copy.deepcopy(self._fallback)
+
+    def coerce(self, value: Any) -> Any:
+        """The value to store, or ValueError with the reason it is invalid"""
+        if value is None:
+            if not self.nullable:
+                raise ValueError('may not be null')
+            return None
+        coerce = getattr(self, f'_coerce_{self.kind}')
+        return coerce(value)
+
+    def _coerce_string(self, value):
+        if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+            raise ValueError('must be a string')
+        value = str(value)
+        if self.max_length and len(value) > self.max_length:
+            raise ValueError(f'must be at most {self.max_length} characters')
+        return value
+
+    _coerce_text = _coerce_string
+
+    def _coerce_boolean(self, value):
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, int) and value in (0, 1):
+            return bool(value)
+        if isinstance(value, str) and value.strip().lower() in TRUE_STRINGS + FALSE_STRINGS:
+            return value.strip().lower() in TRUE_STRINGS
+        raise ValueError('must be true or false')
+
+    def _coerce_integer(self, value):
+        if isinstance(value, str):
+            if not value.strip() and self.nullable:
+                return None
+            try:
+                value = float(value)
+            except ValueError:
+                raise ValueError('must be a whole number')
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or value != int(value):
+            raise ValueError('must be a whole number')
+        return int(value)
+
+    def _coerce_float(self, value):
+        if isinstance(value, str):
+            if not value.strip() and self.nullable:
+                return None
+            try:
+                return float(value)
+            except ValueError:
+                raise ValueError('must be a number')
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValueError('must be a number')
+        return float(value)
+
+    def _coerce_json(self, value):
+        if not isinstance(value, (list, dict, str, int, float, bool)):
+            raise ValueError('must be JSON')
+        return value
+
+
+_NAVIGATION_LINKS = [
+    {'id': 1, 'title': 'Home', 'url': '/', 'enabled': True, 'order': 1, 'is_internal': True, 'show_for': 'all', 'type': 'page'},
+    {'id': 2, 'title': 'Products', 'url': '/products', 'enabled': True, 'order': 2, 'is_internal': True, 'show_for': 'all', 'type': 'page'},
+    {'id': 3, 'title': 'About', 'url': '/about', 'enabled': True, 'order': 3, 'is_internal': True, 'show_for': 'all', 'type': 'page'},
+    {'id': 4, 'title': 'Blog', 'url': '/blog', 'enabled': True, 'order': 4, 'is_internal': True, 'show_for': 'all', 'type': 'page'},
+    {'id': 5, 'title': 'Contact', 'url': '/contact', 'enabled': True, 'order': 5, 'is_internal': True, 'show_for': 'all', 'type': 'page'},
+    {'id': 6, 'title': 'Login', 'url': '/login', 'enabled': True, 'order': 6, 'is_internal': True, 'show_for': 'guest', 'type': 'auth'},
+    {'id': 7, 'title': 'Register', 'url': '/register', 'enabled': True, 'order': 7, 'is_internal': True, 'show_for': 'guest', 'type': 'auth'},
+    {'id': 8, 'title': 'Profile', 'url': '/profile', 'enabled': True, 'order': 8, 'is_internal': True, 'show_for': 'user', 'type': 'auth'},
+    {'id': 9, 'title': 'Admin', 'url': '/admin', 'enabled': True, 'order': 9, 'is_internal': True, 'show_for': 'admin', 'type': 'auth'},
+    {'id': 10, 'title': 'Logout', 'url': 'logout', 'enabled': True, 'order': 10, 'is_internal': True, 'show_for': 'user', 'type': 'auth'},
+]
+
+_FOOTER_SUPPORT_LINKS = [
+    {'title': 'Contact Us', 'url': '/contact', 'is_external': False},
+    {'title': 'FAQ', 'url': '/faq', 'is_external': False},
+    {'title': 'Shipping Info', 'url': '/shipping', 'is_external': False},
+    {'title': 'Returns', 'url': '/returns', 'is_external': False},
+]
+
+_FOOTER_QUICK_LINKS = [
+    {'title': 'About Us', 'url': '/about', 'is_external': False},
+    {'title': 'Products', 'url': '/products', 'is_external': False},
+    {'title': 'Blog', 'url': '/blog', 'is_external': False},
+    {'title': 'Privacy Policy', 'url': '/privacy', 'is_external': False},
+]
+
+
+SETTINGS_FIELDS = (
+    # Site Identity
+    SettingsField('site_name', 'string', 100, default='pebdeq', public=True),
+    SettingsField('site_logo', 'string', 255, public=True),
+    SettingsField('use_logo', 'boolean', default=False, public=True),
+    SettingsField('logo_width', 'integer', default=120, public=True),
+    SettingsField('logo_height', 'integer', default=40, public=True),
+    SettingsField('site_logo2', 'string', 255, public=True),
+    SettingsField('use_logo2', 'boolean', default=False, public=True),
+    SettingsField('logo2_width', 'integer', default=120, public=True),
+    SettingsField('logo2_height', 'integer', default=40, public=True),
+
+    # Logo Shadow Settings
+    SettingsField('logo_shadow_enabled', 'boolean', default=False, public=True),
+    SettingsField('logo_shadow_color', 'string', 7, default='#000000', public=True),
+    SettingsField('logo_shadow_blur', 'integer', default=5, public=True),
+    SettingsField('logo_shadow_offset_x', 'integer', default=2, public=True),
+    SettingsField('logo_shadow_offset_y', 'integer', default=2, public=True),
+    SettingsField('logo_shadow_opacity', 'float', default=0.3, public=True),
+
+    # Second Logo Shadow Settings
+    SettingsField('logo2_shadow_enabled', 'boolean', default=False, public=True),
+    SettingsField('logo2_shadow_color', 'string', 7, default='#000000', public=True),
+    SettingsField('logo2_shadow_blur', 'integer', default=5, public=True),
+    SettingsField('logo2_shadow_offset_x', 'integer', default=2, public=True),
+    SettingsField('logo2_shadow_offset_y', 'integer', default=2, public=True),
+    SettingsField('logo2_shadow_opacity', 'float', default=0.3, public=True),
+
+    # Header Settings
+    SettingsField('header_background_color', 'string', 7, default='#ffffff', public=True),
+    SettingsField('header_text_color', 'string', 7, default='#2c3e50', public=True),
+    SettingsField('header_height', 'integer', default=60, public=True),
+    SettingsField('header_padding', 'integer', default=15, public=True),
+    SettingsField('header_sticky', 'boolean', default=False, public=True),
+    SettingsField('header_shadow', 'boolean', default=True, public=True),
+    SettingsField('header_border_bottom', 'boolean', default=True, public=True),
+    SettingsField('header_border_color', 'string', 7, default='#e9ecef', public=True),
+    SettingsField('header_logo_position', 'string', 20, default='left', public=True),
+    SettingsField('header_nav_position', 'string', 20, default='right', public=True),
+    SettingsField('header_nav_spacing', 'integer', default=20, public=True),
+
+    # Navigation Links Settings (Dynamic)
+    SettingsField('navigation_links', 'json', default=_NAVIGATION_LINKS, public=True, fallback=[]),
+
+    # Navigation Styling
+    SettingsField('nav_link_color', 'string', 7, default='#2c3e50', public=True),
+    SettingsField('nav_link_hover_color', 'string', 7, default='#007bff', public=True),
+    SettingsField('nav_link_active_color', 'string', 7, default='#007bff', public=True),
+    SettingsField('nav_link_font_size', 'integer', default=16, public=True),
+    SettingsField('nav_link_font_weight', 'string', 20, default='500', public=True),
+    SettingsField('nav_link_text_transform', 'string', 20, default='none', public=True),
+    SettingsField('nav_link_underline', 'boolean', default=False, public=True),
+    SettingsField('nav_link_hover_effect', 'string', 20, default='color', public=True),
+    SettingsField('nav_link_font_family', 'string', 100, default='inherit', public=True),
+    SettingsField('nav_link_text_shadow', 'boolean', default=False, public=True),
+
+    # Mobile Navigation Settings
+    SettingsField('mobile_nav_enabled', 'boolean', default=True),
+    SettingsField('mobile_nav_hamburger_color', 'string', 7, default='#2c3e50'),
+    SettingsField('mobile_nav_background_color', 'string', 7, default='#ffffff'),
+    SettingsField('mobile_nav_overlay', 'boolean', default=True),
+    SettingsField('mobile_nav_slide_direction', 'string', 20, default='left'),
+
+    # Header Actions
+    SettingsField('header_show_search', 'boolean', default=False),
+    SettingsField('header_show_cart', 'boolean', default=False),
+    SettingsField('header_show_account', 'boolean', default=True),
+    SettingsField('header_show_language', 'boolean', default=False),
+    SettingsField('header_show_currency', 'boolean', default=False),
+
+    # Marquee Settings
+    SettingsField('marquee_enabled', 'boolean', default=False, public=True),
+    SettingsField('marquee_text', 'text', default='Welcome to our store! Special offers available now.', public=True),
+    SettingsField('marquee_font_family', 'string', 100, default='Arial, sans-serif', public=True),
+    SettingsField('marquee_font_size', 'string', 20, default='14px', public=True),
+    SettingsField('marquee_font_weight', 'string', 20, default='normal', public=True),
+    SettingsField('marquee_color', 'string', 7, default='#ffffff', public=True),
+    SettingsField('marquee_background_color', 'string', 7, default='#ff6b6b', public=True),
+    SettingsField('marquee_speed', 'integer', default=30, public=True),
+    SettingsField('marquee_direction', 'string', 10, default='left', public=True),
+    SettingsField('marquee_pause_on_hover', 'boolean', default=True, public=True),
+
+    # Welcome Section Settings
+    SettingsField('welcome_title', 'string', 200, default='Welcome to Pebdeq', public=True),
+    SettingsField('welcome_subtitle', 'string', 200, default='Crafted. Vintage. Smart.', public=True),
+    SettingsField('welcome_background_image', 'string', 255, public=True),
+    SettingsField('welcome_background_color', 'string', 7, default='#667eea', public=True),
+    SettingsField('welcome_text_color', 'string', 7, default='#ffffff', public=True),
+    SettingsField('welcome_button_text', 'string', 100, default='Explore Products', public=True),
+    SettingsField('welcome_button_link', 'string', 255, default='/products', public=True),
+    SettingsField('welcome_button_color', 'string', 7, default='#00b894', public=True),
+
+    # Homepage General Settings
+    SettingsField('homepage_background_color', 'string', 7, default='#ffffff', public=True),
+
+    # Collections Section Settings
+    SettingsField('collections_title', 'string', 200, default='Our Collections', public=True),
+    SettingsField('collections_show_categories', 'json', default=[], public=True),
+    SettingsField('collections_categories_per_row', 'integer', default=4, public=True),
+    SettingsField('collections_max_rows', 'integer', default=1, public=True),
+    SettingsField('collections_show_section', 'boolean', default=True, public=True),
+
+    # Contact & Social Settings
+    SettingsField('contact_phone', 'string', 20),
+    SettingsField('contact_email', 'string', 120),
+    SettingsField('contact_address', 'text'),
+    SettingsField('social_instagram', 'string', 100, public=True),
+    SettingsField('social_facebook', 'string', 100, public=True),
+    SettingsField('social_twitter', 'string', 100, public=True),
+    SettingsField('social_youtube', 'string', 100, public=True),
+    SettingsField('social_linkedin', 'string', 100, public=True),
+
+    # SEO Settings
+    SettingsField('meta_title', 'string', 200),
+    SettingsField('meta_description', 'text'),
+    SettingsField('meta_keywords', 'text'),
+
+    # About Page Settings
+    SettingsField('about_page_title', 'string', 200, default='About Us', public=True),
+    SettingsField('about_page_subtitle', 'string', 200, default='Learn more about our company and mission', public=True),
+    SettingsField('about_page_content', 'text', default='Welcome to PEBDEQ, your trusted e-commerce platform.', public=True),
+    SettingsField('about_page_mission_title', 'string', 200, default='Our Mission', public=True),
+    SettingsField('about_page_mission_content', 'text', default='At PEBDEQ, we specialize in providing high-quality products across four main categories: 3D printing services, professional tools, vintage light bulbs, and custom laser engraving.', public=True),
+    SettingsField('about_page_values_title', 'string', 200, default='Our Values', public=True),
+    SettingsField('about_page_values_content', 'text', default='Quality products and services, competitive prices, fast and reliable shipping, excellent customer support, secure payment options.', public=True),
+    SettingsField('about_page_team_title', 'string', 200, default='Our Team', public=True),
+    SettingsField('about_page_team_content', 'text', default='Our dedicated team works hard to provide the best experience for our customers.', public=True),
+    SettingsField('about_page_history_title', 'string', 200, default='Our History', public=True),
+    SettingsField('about_page_history_content', 'text', default='Founded with a vision to bring quality products to customers worldwide.', public=True),
+    SettingsField('about_page_contact_title', 'string', 200, default='Get in Touch', public=True),
+    SettingsField('about_page_contact_content', 'text', default='Contact us for more information about our products and services.', public=True),
+    SettingsField('about_page_show_mission', 'boolean', default=True, public=True),
+    SettingsField('about_page_show_values', 'boolean', default=True, public=True),
+    SettingsField('about_page_show_team', 'boolean', default=True, public=True),
+    SettingsField('about_page_show_history', 'boolean', default=True, public=True),
+    SettingsField('about_page_show_contact', 'boolean', default=True, public=True),
+    SettingsField('about_page_background_image', 'string', 255, public=True),
+    SettingsField('about_page_background_color', 'string', 7, default='#ffffff', public=True),
+
+    # Business Settings
+    SettingsField('currency_symbol', 'string', 10, default='₺'),
+    SettingsField('currency_code', 'string', 3, default='TRY'),
+    SettingsField('shipping_cost', 'float', default=0.0),
+    SettingsField('free_shipping_threshold', 'float', default=0.0),
+
+    # Feature Flags
+    SettingsField('enable_reviews', 'boolean', default=True),
+    SettingsField('enable_wishlist', 'boolean', default=True),
+    SettingsField('enable_compare', 'boolean', default=True),
+    SettingsField('enable_newsletter', 'boolean', default=True),
+    SettingsField('maintenance_mode', 'boolean', default=False),
+
+    # Google OAuth Settings
+    SettingsField('google_oauth_enabled', 'boolean', default=False, fallback=False),
+    SettingsField('google_oauth_client_id', 'string', 200, fallback=''),
+    SettingsField('google_oauth_client_secret', 'string', 200, fallback=''),
+    SettingsField('google_oauth_redirect_uri', 'string', 200, default='http://localhost:3000/auth/google/callback', fallback=''),
+    SettingsField('google_oauth_scope', 'string', 200, default='profile email', fallback='openid email profile'),
+
+    # Site URL Settings
+    SettingsField('site_base_url', 'string', 200, default='http://localhost:3000'),
+    SettingsField('site_is_production', 'boolean', default=False),
+    SettingsField('site_ssl_enabled', 'boolean', default=False),
+
+    # Footer Settings
+    SettingsField('footer_show_section', 'boolean', default=True, public=True),
+    SettingsField('footer_background_color', 'string', 7, default='#2c3e50', public=True),
+    SettingsField('footer_text_color', 'string', 7, default='#ffffff', public=True),
+    SettingsField('footer_company_name', 'string', 100, default='PEBDEQ', public=True),
+    SettingsField('footer_company_description', 'text', default='Crafted with passion, delivered with precision.', public=True),
+    SettingsField('footer_copyright_text', 'string', 200, default='© 2024 PEBDEQ. All rights reserved.', public=True),
+    SettingsField('footer_use_logo', 'boolean', default=False, public=True),
+    SettingsField('footer_logo', 'string', 255, public=True),
+    SettingsField('footer_logo_width', 'integer', default=120, public=True),
+    SettingsField('footer_logo_height', 'integer', default=40, public=True),
+
+    # Footer Support Section
+    SettingsField('footer_support_title', 'string', 100, default='Support', public=True),
+    SettingsField('footer_support_show_section', 'boolean', default=True, public=True),
+    SettingsField('footer_support_links', 'json', default=_FOOTER_SUPPORT_LINKS, public=True),
+
+    # Footer Quick Links Section
+    SettingsField('footer_quick_links_title', 'string', 100, default='Quick Links', public=True),
+    SettingsField('footer_quick_links_show_section', 'boolean', default=True, public=True),
+    SettingsField('footer_quick_links', 'json', default=_FOOTER_QUICK_LINKS, public=True),
+
+    # Footer Social Section
+    SettingsField('footer_social_title', 'string', 100, default='Follow Us', public=True),
+    SettingsField('footer_social_show_section', 'boolean', default=True, public=True),
+
+    # Footer Newsletter Section
+    SettingsField('footer_newsletter_title', 'string', 100, default='Newsletter', public=True),
+    SettingsField('footer_newsletter_show_section', 'boolean', default=True, public=True),
+    SettingsField('footer_newsletter_description', 'text', default='Subscribe to get updates about new products and offers.', public=True),
+    SettingsField('footer_newsletter_placeholder', 'string', 100, default='Enter your email address', public=True),
+    SettingsField('footer_newsletter_button_text', 'string', 50, default='Subscribe', public=True),
+
+    # Footer Legal Links Section
+    SettingsField('footer_legal_title', 'string', 100, default='Legal', public=True),
+    SettingsField('footer_legal_show_section', 'boolean', default=True, public=True),
+    SettingsField('footer_legal_privacy_policy_title', 'string', 100, default='Privacy Policy', public=True),
+    SettingsField('footer_legal_privacy_policy_content', 'text', default=''),
+    SettingsField('footer_legal_terms_of_service_title', 'string', 100, default='Terms of Service', public=True),
+    SettingsField('footer_legal_terms_of_service_content', 'text', default=''),
+    SettingsField('footer_legal_return_policy_title', 'string', 100, default='Return Policy', public=True),
+    SettingsField('footer_legal_return_policy_content', 'text', default=''),
+    SettingsField('footer_legal_shipping_policy_title', 'string', 100, default='Shipping Policy', public=True),
+    SettingsField('footer_legal_shipping_policy_content', 'text', default=''),
+    SettingsField('footer_legal_cookie_policy_title', 'string', 100, default='Cookie Policy', public=True),
+    SettingsField('footer_legal_cookie_policy_content', 'text', default=''),
+    SettingsField('footer_legal_dmca_notice_title', 'string', 100, default='DMCA Notice', public=True),
+    SettingsField('footer_legal_dmca_notice_content', 'text', default=''),
+    SettingsField('footer_legal_accessibility_statement_title', 'string', 100, default='Accessibility Statement', public=True),
+    SettingsField('footer_legal_accessibility_statement_content', 'text', default=''),
+
+    # Homepage Products Settings
+    SettingsField('homepage_products_show_section', 'boolean', default=True, public=True),
+    SettingsField('homepage_products_title', 'string', 200, default='Featured Products', public=True),
+    SettingsField('homepage_products_subtitle', 'string', 200, default='Discover our most popular items', public=True),
+    SettingsField('homepage_products_max_rows', 'integer', default=2, public=True),
+    SettingsField('homepage_products_per_row', 'integer', default=4, public=True),
+    SettingsField('homepage_products_max_items', 'integer', default=8, public=True),
+    SettingsField('homepage_products_show_images', 'boolean', default=True, public=True),
+    SettingsField('homepage_products_image_height', 'integer', default=200, public=True),
+    SettingsField('homepage_products_image_width', 'integer', default=300, public=True),
+    SettingsField('homepage_products_show_favorite', 'boolean', default=True, public=True),
+    SettingsField('homepage_products_show_buy_now', 'boolean', default=True, public=True),
+    SettingsField('homepage_products_show_details', 'boolean', default=True, public=True),
+    SettingsField('homepage_products_show_price', 'boolean', default=True, public=True),
+    SettingsField('homepage_products_show_original_price', 'boolean', default=True, public=True),
+    SettingsField('homepage_products_show_stock', 'boolean', default=True, public=True),
+    SettingsField('homepage_products_show_category', 'boolean', default=True, public=True),
+    SettingsField('homepage_products_sort_by', 'string', 50, default='featured', public=True),
+    SettingsField('homepage_products_filter_categories', 'json', default=[], public=True),
+    SettingsField('homepage_products_show_view_all', 'boolean', default=True, public=True),
+    SettingsField('homepage_products_view_all_text', 'string', 100, default='View All Products', public=True),
+    SettingsField('homepage_products_view_all_link', 'string', 255, default='/products', public=True),
+    SettingsField('homepage_products_card_style', 'string', 50, default='modern', public=True),
+    SettingsField('homepage_products_card_shadow', 'boolean', default=True, public=True),
+    SettingsField('homepage_products_card_hover_effect', 'boolean', default=True, public=True),
+    SettingsField('homepage_products_show_badges', 'boolean', default=True, public=True),
+    SettingsField('homepage_products_show_rating', 'boolean', default=False, public=True),
+    SettingsField('homepage_products_show_quick_view', 'boolean', default=False, public=True),
+    SettingsField('homepage_products_enable_image_preview', 'boolean', default=True, public=True),
+
+    # Homepage Products 2 Settings
+    SettingsField('homepage_products2_show_section', 'boolean', default=True, public=True),
+    SettingsField('homepage_products2_title', 'string', 200, default='Latest Products', public=True),
+    SettingsField('homepage_products2_subtitle', 'string', 200, default='Check out our newest arrivals', public=True),
+    SettingsField('homepage_products2_max_rows', 'integer', default=2, public=True),
+    SettingsField('homepage_products2_per_row', 'integer', default=4, public=True),
+    SettingsField('homepage_products2_max_items', 'integer', default=8, public=True),
+    SettingsField('homepage_products2_show_images', 'boolean', default=True, public=True),
+    SettingsField('homepage_products2_image_height', 'integer', default=200, public=True),
+    SettingsField('homepage_products2_image_width', 'integer', default=300, public=True),
+    SettingsField('homepage_products2_show_favorite', 'boolean', default=True, public=True),
+    SettingsField('homepage_products2_show_buy_now', 'boolean', default=True, public=True),
+    SettingsField('homepage_products2_show_details', 'boolean', default=True, public=True),
+    SettingsField('homepage_products2_show_price', 'boolean', default=True, public=True),
+    SettingsField('homepage_products2_show_original_price', 'boolean', default=True, public=True),
+    SettingsField('homepage_products2_show_stock', 'boolean', default=True, public=True),
+    SettingsField('homepage_products2_show_category', 'boolean', default=True, public=True),
+    SettingsField('homepage_products2_sort_by', 'string', 50, default='newest', public=True),
+    SettingsField('homepage_products2_filter_categories', 'json', default=[], public=True),
+    SettingsField('homepage_products2_show_view_all', 'boolean', default=True, public=True),
+    SettingsField('homepage_products2_view_all_text', 'string', 100, default='View All Products', public=True),
+    SettingsField('homepage_products2_view_all_link', 'string', 255, default='/products', public=True),
+    SettingsField('homepage_products2_card_style', 'string', 50, default='modern', public=True),
+    SettingsField('homepage_products2_card_shadow', 'boolean', default=True, public=True),
+    SettingsField('homepage_products2_card_hover_effect', 'boolean', default=True, public=True),
+    SettingsField('homepage_products2_show_badges', 'boolean', default=True, public=True),
+    SettingsField('homepage_products2_show_rating', 'boolean', default=False, public=True),
+    SettingsField('homepage_products2_show_quick_view', 'boolean', default=False, public=True),
+    SettingsField('homepage_products2_enable_image_preview', 'boolean', default=True, public=True),
+
+    # Products Page Settings
+    SettingsField('products_page_background_color', 'string', 7, default='#ffffff', public=True),
+    SettingsField('products_page_per_row', 'integer', default=4, public=True),
+    SettingsField('products_page_max_items_per_page', 'integer', default=12, public=True),
+    SettingsField('products_page_show_images', 'boolean', default=True, public=True),
+    SettingsField('products_page_image_height', 'integer', default=200),
+    SettingsField('products_page_image_width', 'integer', default=300),
+    SettingsField('products_page_remove_image_background', 'boolean', default=False),
+    SettingsField('products_page_show_favorite', 'boolean', default=True, public=True),
+    SettingsField('products_page_show_buy_now', 'boolean', default=True, public=True),
+    SettingsField('products_page_show_details', 'boolean', default=True, public=True),
+    SettingsField('products_page_show_price', 'boolean', default=True, public=True),
+    SettingsField('products_page_show_original_price', 'boolean', default=True, public=True),
+    SettingsField('products_page_show_stock', 'boolean', default=True, public=True),
+    SettingsField('products_page_show_category', 'boolean', default=True, public=True),
+    SettingsField('products_page_default_sort_by', 'string', 50, default='newest', public=True),
+    SettingsField('products_page_card_style', 'string', 50, default='modern', public=True),
+    SettingsField('products_page_card_shadow', 'boolean', default=True, public=True),
+    SettingsField('products_page_card_hover_effect', 'boolean', default=True, public=True),
+    SettingsField('products_page_show_badges', 'boolean', default=True, public=True),
+    SettingsField('products_page_show_rating', 'boolean', default=False, public=True),
+    SettingsField('products_page_show_quick_view', 'boolean', default=False, public=True),
+    SettingsField('products_page_enable_pagination', 'boolean', default=True, public=True),
+    SettingsField('products_page_enable_filters', 'boolean', default=True, public=True),
+    SettingsField('products_page_enable_search', 'boolean', default=True, public=True),
+    SettingsField('products_page_enable_image_preview', 'boolean', default=True, public=True),
+
+    # Product Detail Page Settings
+    SettingsField('product_detail_show_thumbnails', 'boolean', default=True),
+    SettingsField('product_detail_show_category_badge', 'boolean', default=True),
+    SettingsField('product_detail_show_featured_badge', 'boolean', default=True),
+    SettingsField('product_detail_show_stock_info', 'boolean', default=True),
+    SettingsField('product_detail_show_variations', 'boolean', default=True),
+    SettingsField('product_detail_show_description', 'boolean', default=True),
+    SettingsField('product_detail_show_details_section', 'boolean', default=True),
+    SettingsField('product_detail_show_video', 'boolean', default=True),
+    SettingsField('product_detail_show_buy_now_button', 'boolean', default=True),
+    SettingsField('product_detail_show_continue_shopping_button', 'boolean', default=True),
+    SettingsField('product_detail_show_quantity_selector', 'boolean', default=True),
+    SettingsField('product_detail_show_image_lightbox', 'boolean', default=True),
+
+    # Product Detail Button Colors
+    SettingsField('product_detail_add_to_cart_button_color', 'string', 7, default='#007bff', public=True),
+    SettingsField('product_detail_add_to_cart_button_text_color', 'string', 7, default='#ffffff', public=True),
+    SettingsField('product_detail_buy_now_button_color', 'string', 7, default='#28a745', public=True),
+    SettingsField('product_detail_buy_now_button_text_color', 'string', 7, default='#ffffff', public=True),
+    SettingsField('product_detail_continue_shopping_button_color', 'string', 7, default='#007bff', public=True),
+    SettingsField('product_detail_continue_shopping_button_text_color', 'string', 7, default='#007bff', public=True),
+
+    # Product Detail Text Colors
+    SettingsField('product_detail_product_name_color', 'string', 7, default='#333333'),
+    SettingsField('product_detail_product_price_color', 'string', 7, default='#007bff'),
+    SettingsField('product_detail_product_description_color', 'string', 7, default='#333333'),
+    SettingsField('product_detail_product_details_label_color', 'string', 7, default='#666666'),
+    SettingsField('product_detail_product_details_value_color', 'string', 50, default='#333333'),
+
+    # Product Detail Page Font Settings
+    SettingsField('product_detail_product_name_font_family', 'string', 100, default='Arial, sans-serif'),
+    SettingsField('product_detail_product_name_font_size', 'integer', default=28),
+    SettingsField('product_detail_product_name_font_weight', 'string', 20, default='bold'),
+    SettingsField('product_detail_product_name_font_style', 'string', 20, default='normal'),
+    SettingsField('product_detail_product_price_font_family', 'string', 100, default='Arial, sans-serif'),
+    SettingsField('product_detail_product_price_font_size', 'integer', default=24),
+    SettingsField('product_detail_product_price_font_weight', 'string', 20, default='bold'),
+    SettingsField('product_detail_product_price_font_style', 'string', 20, default='normal'),
+    SettingsField('product_detail_product_description_font_family', 'string', 100, default='Arial, sans-serif'),
+    SettingsField('product_detail_product_description_font_size', 'integer', default=16),
+    SettingsField('product_detail_product_description_font_weight', 'string', 20, default='normal'),
+    SettingsField('product_detail_product_description_font_style', 'string', 20, default='normal'),
+    SettingsField('product_detail_product_details_label_font_family', 'string', 100, default='Arial, sans-serif'),
+    SettingsField('product_detail_product_details_label_font_size', 'integer', default=14),
+    SettingsField('product_detail_product_details_label_font_weight', 'string', 20, default='bold'),
+    SettingsField('product_detail_product_details_label_font_style', 'string', 20, default='normal'),
+    SettingsField('product_detail_product_details_value_font_family', 'string', 100, default='Arial, sans-serif'),
+    SettingsField('product_detail_product_details_value_font_size', 'integer', default=14),
+    SettingsField('product_detail_product_details_value_font_weight', 'string', 20, default='normal'),
+    SettingsField('product_detail_product_details_value_font_style', 'string', 20, default='normal'),
+
+    # Products Page Font & Color Settings
+    SettingsField('products_page_product_name_color', 'string', 7, default='#333333'),
+    SettingsField('products_page_product_name_font_family', 'string', 100, default='Arial, sans-serif'),
+    SettingsField('products_page_product_name_font_size', 'integer', default=18),
+    SettingsField('products_page_product_name_font_weight', 'string', 20, default='bold'),
+    SettingsField('products_page_product_name_font_style', 'string', 20, default='normal'),
+    SettingsField('products_page_title_color', 'string', 7, default='#333333'),
+    SettingsField('products_page_title_font_family', 'string', 100, default='Arial, sans-serif'),
+    SettingsField('products_page_title_font_size', 'integer', default=32),
+    SettingsField('products_page_title_font_weight', 'string', 20, default='bold'),
+    SettingsField('products_page_title_font_style', 'string', 20, default='normal'),
+    SettingsField('products_page_subtitle_color', 'string', 7, default='#666666'),
+    SettingsField('products_page_subtitle_font_family', 'string', 100, default='Arial, sans-serif'),
+    SettingsField('products_page_subtitle_font_size', 'integer', default=16),
+    SettingsField('products_page_subtitle_font_weight', 'string', 20, default='normal'),
+    SettingsField('products_page_subtitle_font_style', 'string', 20, default='normal'),
+    SettingsField('products_page_product_price_color', 'string', 7, default='#007bff'),
+    SettingsField('products_page_product_price_font_family', 'string', 100, default='Arial, sans-serif'),
+    SettingsField('products_page_product_price_font_size', 'integer', default=16),
+    SettingsField('products_page_product_price_font_weight', 'string', 20, default='bold'),
+    SettingsField('products_page_product_price_font_style', 'string', 20, default='normal'),
+    SettingsField('products_page_product_category_color', 'string', 7, default='#666666'),
+    SettingsField('products_page_product_category_font_family', 'string', 100, default='Arial, sans-serif'),
+    SettingsField('products_page_product_category_font_size', 'integer', default=14),
+    SettingsField('products_page_product_category_font_weight', 'string', 20, default='normal'),
+    SettingsField('products_page_product_category_font_style', 'string', 20, default='normal'),
+    SettingsField('products_page_stock_info_color', 'string', 7, default='#28a745'),
+    SettingsField('products_page_stock_info_font_family', 'string', 100, default='Arial, sans-serif'),
+    SettingsField('products_page_stock_info_font_size', 'integer', default=12),
+    SettingsField('products_page_stock_info_font_weight', 'string', 20, default='normal'),
+    SettingsField('products_page_stock_info_font_style', 'string', 20, default='normal'),
+    SettingsField('products_page_view_details_button_color', 'string', 7, default='#007bff', public=True),
+    SettingsField('products_page_view_details_button_text_color', 'string', 7, default='#ffffff', public=True),
+    SettingsField('products_page_view_details_button_font_family', 'string', 100, default='Arial, sans-serif'),
+    SettingsField('products_page_view_details_button_font_size', 'integer', default=14),
+    SettingsField('products_page_view_details_button_font_weight', 'string', 20, default='normal'),
+    SettingsField('products_page_view_details_button_font_style', 'string', 20, default='normal'),
+    SettingsField('products_page_add_to_cart_button_color', 'string', 7, default='#28a745', public=True),
+    SettingsField('products_page_add_to_cart_button_text_color', 'string', 7, default='#ffffff', public=True),
+    SettingsField('products_page_add_to_cart_button_font_family', 'string', 100, default='Arial, sans-serif'),
+    SettingsField('products_page_add_to_cart_button_font_size', 'integer', default=14),
+    SettingsField('products_page_add_to_cart_button_font_weight', 'string', 20, default='normal'),
+    SettingsField('products_page_add_to_cart_button_font_style', 'string', 20, default='normal'),
+
+    # Homepage Products 1 Font & Color Settings
+    SettingsField('homepage_products_product_name_color', 'string', 7, default='#333333'),
+    SettingsField('homepage_products_product_name_font_family', 'string', 100, default='Arial, sans-serif'),
+    SettingsField('homepage_products_product_name_font_size', 'integer', default=18),
+    SettingsField('homepage_products_product_name_font_weight', 'string', 20, default='bold'),
+    SettingsField('homepage_products_product_name_font_style', 'string', 20, default='normal'),
+    SettingsField('homepage_products_product_price_color', 'string', 7, default='#007bff'),
+    SettingsField('homepage_products_product_price_font_family', 'string', 100, default='Arial, sans-serif'),
+    SettingsField('homepage_products_product_price_font_size', 'integer', default=16),
+    SettingsField('homepage_products_product_price_font_weight', 'string', 20, default='bold'),
+    SettingsField('homepage_products_product_price_font_style', 'string', 20, default='normal'),
+    SettingsField('homepage_products_product_category_color', 'string', 7, default='#666666'),
+    SettingsField('homepage_products_product_category_font_family', 'string', 100, default='Arial, sans-serif'),
+    SettingsField('homepage_products_product_category_font_size', 'integer', default=14),
+    SettingsField('homepage_products_product_category_font_weight', 'string', 20, default='normal'),
+    SettingsField('homepage_products_product_category_font_style', 'string', 20, default='normal'),
+    SettingsField('homepage_products_stock_info_color', 'string', 7, default='#28a745'),
+    SettingsField('homepage_products_stock_info_font_family', 'string', 100, default='Arial, sans-serif'),
+    SettingsField('homepage_products_stock_info_font_size', 'integer', default=12),
+    SettingsField('homepage_products_stock_info_font_weight', 'string', 20, default='normal'),
+    SettingsField('homepage_products_stock_info_font_style', 'string', 20, default='normal'),
+    SettingsField('homepage_products_view_details_button_color', 'string', 7, default='#007bff', public=True),
+    SettingsField('homepage_products_view_details_button_text_color', 'string', 7, default='#ffffff', public=True),
+    SettingsField('homepage_products_view_details_button_font_family', 'string', 100, default='Arial, sans-serif'),
+    SettingsField('homepage_products_view_details_button_font_size', 'integer', default=14),
+    SettingsField('homepage_products_view_details_button_font_weight', 'string', 20, default='normal'),
+    SettingsField('homepage_products_view_details_button_font_style', 'string', 20, default='normal'),
+    SettingsField('homepage_products_add_to_cart_button_color', 'string', 7, default='#28a745', public=True),
+    SettingsField('homepage_products_add_to_cart_button_text_color', 'string', 7, default='#ffffff', public=True),
+    SettingsField('homepage_products_add_to_cart_button_font_family', 'string', 100, default='Arial, sans-serif'),
+    SettingsField('homepage_products_add_to_cart_button_font_size', 'integer', default=14),
+    SettingsField('homepage_products_add_to_cart_button_font_weight', 'string', 20, default='normal'),
+    SettingsField('homepage_products_add_to_cart_button_font_style', 'string', 20, default='normal'),
+
+    # Homepage Products 2 Font & Color Settings
+    SettingsField('homepage_products2_product_name_color', 'string', 7, default='#333333'),
+    SettingsField('homepage_products2_product_name_font_family', 'string', 100, default='Arial, sans-serif'),
+    SettingsField('homepage_products2_product_name_font_size', 'integer', default=18),
+    SettingsField('homepage_products2_product_name_font_weight', 'string', 20, default='bold'),
+    SettingsField('homepage_products2_product_name_font_style', 'string', 20, default='normal'),
+    SettingsField('homepage_products2_product_price_color', 'string', 7, default='#007bff'),
+    SettingsField('homepage_products2_product_price_font_family', 'string', 100, default='Arial, sans-serif'),
+    SettingsField('homepage_products2_product_price_font_size', 'integer', default=16),
+    SettingsField('homepage_products2_product_price_font_weight', 'string', 20, default='bold'),
+    SettingsField('homepage_products2_product_price_font_style', 'string', 20, default='normal'),
+    SettingsField('homepage_products2_product_category_color', 'string', 7, default='#666666'),
+    SettingsField('homepage_products2_product_category_font_family', 'string', 100, default='Arial, sans-serif'),
+    SettingsField('homepage_products2_product_category_font_size', 'integer', default=14),
+    SettingsField('homepage_products2_product_category_font_weight', 'string', 20, default='normal'),
+    SettingsField('homepage_products2_product_category_font_style', 'string', 20, default='normal'),
+    SettingsField('homepage_products2_stock_info_color', 'string', 7, default='#28a745'),
+    SettingsField('homepage_products2_stock_info_font_family', 'string', 100, default='Arial, sans-serif'),
+    SettingsField('homepage_products2_stock_info_font_size', 'integer', default=12),
+    SettingsField('homepage_products2_stock_info_font_weight', 'string', 20, default='normal'),
+    SettingsField('homepage_products2_stock_info_font_style', 'string', 20, default='normal'),
+    SettingsField('homepage_products2_view_details_button_color', 'string', 7, default='#007bff', public=True),
+    SettingsField('homepage_products2_view_details_button_text_color', 'string', 7, default='#ffffff', public=True),
+    SettingsField('homepage_products2_view_details_button_font_family', 'string', 100, default='Arial, sans-serif'),
+    SettingsField('homepage_products2_view_details_button_font_size', 'integer', default=14),
+    SettingsField('homepage_products2_view_details_button_font_weight', 'string', 20, default='normal'),
+    SettingsField('homepage_products2_view_details_button_font_style', 'string', 20, default='normal'),
+    SettingsField('homepage_products2_add_to_cart_button_color', 'string', 7, default='#28a745', public=True),
+    SettingsField('homepage_products2_add_to_cart_button_text_color', 'string', 7, default='#ffffff', public=True),
+    SettingsField('homepage_products2_add_to_cart_button_font_family', 'string', 100, default='Arial, sans-serif'),
+    SettingsField('homepage_products2_add_to_cart_button_font_size', 'integer', default=14),
+    SettingsField('homepage_products2_add_to_cart_button_font_weight', 'string', 20, default='normal'),
+    SettingsField('homepage_products2_add_to_cart_button_font_style', 'string', 20, default='normal'),
+
+    # Compiled theme + settings CSS bundle, maintained by utils/site_stylesheet.py (see DERIVED_FIELDS)
+    SettingsField('site_stylesheet_url', 'string', 255, public=True),
+)
+
+_fields = None
+
+
+def settings_fields() -> Dict[str, SettingsField]:
+    """{name: SettingsField} for every setting, in SETTINGS_FIELDS order"""
+    global _fields
+    if _fields is None:
+        _fields = {field.name: field for field in SETTINGS_FIELDS}
+    return _fields
+
+
+def settings_payload(settings, public: bool = False) -> Dict[str, Any]:
+    """
+    The settings as a JSON-ready dict: every field, or only the public ones
+
+    With no settings stored yet, every field has its default.
+    """
+    payload = {}
+    for name, field in settings_fields().items():
+        if public and not field.public:
+            continue
+        value = getattr(settings, name) if settings is not None else field.default
+        payload[name] = field.fallback if value is None else value
+    return payload
+
+
+def validate_settings(data: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """
+    (values, errors) for a settings payload
+
+    Keys that aren't writable settings (ids, timestamps, derived fields
+    the admin GET adds) are ignored, as the form sends its whole state.
+    """
+    fields = settings_fields()
+    values, errors = {}, {}
+    for key, value in data.items():
+        field = fields.get(key)
+        if field is None or key in DERIVED_FIELDS:
+            continue
+        try:
+            values[key] = field.coerce(value)
+        except ValueError as e:
+            errors[key] = str(e)
+    return values, errors
+
+
+def apply_settings(settings, values: Dict[str, Any]) -> Dict[str, Tuple[Any, Any]]:
+    """Set only the values that differ from settings; returns {name: (old, new)} of what changed"""
+    changes = {}
+    for key, value in values.items():
+        current = getattr(settings, key)
+        if current != value:
+            changes[key] = (current, value)
+            setattr(settings, key, value)
+    return changes
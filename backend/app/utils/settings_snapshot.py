@@ -0,0 +1,125 @@
+"""
+Site Settings Snapshot for PEBDEQ
+The public site settings payload is serialized to JSON once per settings version and
+served as stored bytes; the stored section versions (utils/settings_store.py) are the key
+every worker checks. Each section (header, footer, ...) is serialized on its own so pages
+can fetch only theirs
+"""
+
+import hashlib
+import threading
+from typing import Any, Callable, Dict, Iterable
+
+from app.utils.settings_fields import SECTION_NAMES, section_of
+
+_UNBUILT = object()
+
+
+class SettingsSectionError(ValueError):
+    """Unknown or missing section name in ?sections="""
+
+
+def split_sections(payload: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """{section: {key: value}} for every section, empty ones included"""
+    sections = {name: {} for name in SECTION_NAMES}
+    for key, value in payload.items():
+        sections[section_of(key)][key] = value
+    return sections
+
+
+def _etag(body: bytes) -> str:
+    return hashlib.sha1(body).hexdigest()
+
+
+class SettingsSnapshot:
+    """JSON bytes and ETags of the public settings payload and its sections, for the current settings version"""
+
+    def __init__(self):
+        """Initialize an empty snapshot"""
+        self._version = _UNBUILT
+        self._stamp = None
+        self._body = None
+        self._etag = None
+        self._sections = {}
+        self._lock = threading.Lock()
+        self.builds = 0
+        self.hits = 0
+
+    def _current(self, build: Callable[[Any], Dict[str, Any]]):
+        """(version, body, etag, sections), rebuilt only when a stored section moved"""
+        from app.utils.settings_store import get_settings_store
+        store = get_settings_store()
+        stamps = store.stamps()
+        with self._lock:
+            if self._body is not None and self._stamp == tuple(sorted(stamps.items())):
+                self.hits += 1
+                return self._version, self._body, self._etag, self._sections
+
+        from flask import current_app
+        settings = store.load(stamps)
+        payload = build(settings)
+        body = current_app.json.dumps(payload).encode('utf-8')
+        sections = {}
+        for name, values in split_sections(payload).items():
+            section_body = current_app.json.dumps(values).encode('utf-8')
+            sections[name] = (section_body, _etag(section_body))
+        # Key by the sections actually serialized
+        version = settings.settings_version if settings else None
+        with self._lock:
+            self._version, self._body, self._etag, self._sections = version, body, _etag(body), sections
+            self._stamp = settings.stamp if settings else ()
+            self.builds += 1
+            return self._version, self._body, self._etag, self._sections
+
+    def get(self, build: Callable[[Any], Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        {body, etag, version} of the whole payload for the current version
+
+        build(settings or None) makes the payload; it only runs when the
+        version moved since the last call in this process.
+        """
+        version, body, etag, _ = self._current(build)
+        return {'body': body, 'etag': etag, 'version': version}
+
+    def get_sections(self, build: Callable[[Any], Dict[str, Any]], names: Iterable[str]) -> Dict[str, Any]:
+        """
+        {body, etag, version} of just the named sections, merged into one flat object
+
+        The stored section bodies are spliced together rather than
+        re-serialized; the ETag changes only when one of these sections does.
+        """
+        names = sorted(set(names))
+        unknown = [name for name in names if name not in SECTION_NAMES]
+        if not names or unknown:
+            raise SettingsSectionError(f"Unknown settings sections: {', '.join(unknown) or '(none)'}; "
+                             f"available: {', '.join(SECTION_NAMES)}")
+        version, _, _, sections = self._current(build)
+        parts = [sections[name][0][1:-1] for name in names if sections[name][0] != b'{}']
+        body = b'{' + b','.join(parts) + b'}'
+        if len(names) == 1:
+            etag = sections[names[0]][1]
+        else:
+            etag = _etag('-'.join(sections[name][1] for name in names).encode())
+        return {'body': body, 'etag': etag, 'version': version}
+
+    def stats(self) -> Dict[str, Any]:
+        """Get snapshot statistics"""
+        return {
+            'version': None if self._version is _UNBUILT else self._version,
+            'size_bytes': len(self._body) if self._body else 0,
+            'section_bytes': {name: len(body) for name, (body, _) in self._sections.items()},
+            'builds': self.builds,
+            'hits': self.hits
+        }
+
+
+# Global settings snapshot instance
+settings_snapshot = None
+
+
+def get_settings_snapshot() -> SettingsSnapshot:
+    """Get or create the global settings snapshot instance"""
+    global settings_snapshot
+    if settings_snapshot is None:
+        settings_snapshot = SettingsSnapshot()
+    return settings_snapshot
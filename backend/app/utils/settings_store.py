@@ -0,0 +1,238 @@
+"""
+Site Settings Store for PEBDEQ
+Site settings are stored as one JSON document per section (SettingsSection) rather than one
+row of ~400 columns. A read re-fetches only the sections whose version moved and a write
+rewrites only the sections it changes; SettingsView keeps the old attribute-style access
+"""
+
+import copy
+import threading
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from app.utils.settings_fields import section_of, settings_fields
+
+LEGACY_TABLE = 'site_settings'
+SECTIONS_TABLE = 'settings_section'
+
+
+class SettingsView:
+    """
+    The site settings with attribute access, like the old SiteSettings row
+
+    Fields that were never set read as their registry default. Assignments
+    are kept as pending changes until SettingsStore.save() writes them.
+    """
+
+    def __init__(self, documents: Dict[str, Dict[str, Any]], stamps: Dict[str, tuple]):
+        object.__setattr__(self, '_documents', dict(documents))  # {section: {field: value}}
+        object.__setattr__(self, '_stamps', dict(stamps))  # {section: (version, updated_at)}
+        object.__setattr__(self, '_pending', {})
+
+    def _stored(self, name: str) -> Any:
+        field = settings_fields()[name]
+        document = self._documents.get(field.section, {})
+        if name not in document:
+            return field.default
+        value = document[name]
+        # Documents are shared with the store's cache
+        return copy.deepcopy(value) if isinstance(value, (list, dict)) else value
+
+    def __getattr__(self, name):
+        if name not in settings_fields():
+            raise AttributeError(f"'{name}' is not a site setting")
+        if name in self._pending:
+            return self._pending[name]
+        return self._stored(name)
+
+    def __setattr__(self, name, value):
+        if name not in settings_fields():
+            raise AttributeError(f"'{name}' is not a site setting")
+        self._pending[name] = value
+
+    @property
+    def id(self) -> int:
+        return 1
+
+    @property
+    def settings_version(self) -> int:
+        """Sum of the section versions; moves on every write"""
+        return sum(version for version, _ in self._stamps.values())
+
+    @property
+    def stamp(self) -> tuple:
+        """Identifies exactly which stored sections this view was read from"""
+        return tuple(sorted(self._stamps.items()))
+
+
+class SettingsStore:
+    """Reads and writes the per-section settings documents, caching them per section version"""
+
+    def __init__(self):
+        """Initialize an empty document cache"""
+        self._documents = {}  # {section: (stamp, document)}
+        self._lock = threading.Lock()
+        self.fetched_sections = 0
+        self.written_sections = 0
+        self.imports = 0
+
+    @staticmethod
+    def stamps() -> Dict[str, tuple]:
+        """{section: (version, updated_at)} of every stored section, in one query"""
+        from app import db
+        from app.models.models import SettingsSection
+        rows = db.session.query(SettingsSection.section, SettingsSection.version, SettingsSection.updated_at)
+        return {section: (version, updated_at) for section, version, updated_at in rows}
+
+    def load(self, stamps: Dict[str, tuple] = None) -> Optional[SettingsView]:
+        """
+        The current settings, or None when there are none
+
+        Only sections whose stamp differs from the cached copy are read.
+        The first load after upgrading imports the old SiteSettings row.
+        """
+        from app import db
+        from app.models.models import SettingsSection
+        stamps = self.stamps() if stamps is None else dict(stamps)
+        if not stamps:
+            if not self._import_legacy():
+                return None
+            stamps = self.stamps()
+
+        with self._lock:
+            stale = [section for section, stamp in stamps.items()
+                     if self._documents.get(section, (None,))[0] != stamp]
+        if stale:
+            rows = db.session.query(
+                SettingsSection.section, SettingsSection.version, SettingsSection.updated_at, SettingsSection.data
+            ).filter(SettingsSection.section.in_(stale)).all()
+            with self._lock:
+                for section, version, updated_at, data in rows:
+                    stamps[section] = (version, updated_at)
+                    self._documents[section] = ((version, updated_at), data)
+                self.fetched_sections += len(rows)
+
+        with self._lock:
+            documents = {section: self._documents[section][1] for section in stamps if section in self._documents}
+        return SettingsView(documents, stamps)
+
+    def new(self) -> SettingsView:
+        """An empty view (every field at its default), for creating the first settings"""
+        return SettingsView({}, {})
+
+    def save(self, settings: SettingsView) -> Dict[str, Tuple[Any, Any]]:
+        """
+        Write the view's pending changes in the caller's transaction; returns {name: (old, new)}
+
+        Only sections with a changed field are read and rewritten, each with
+        its version bumped, so editing the footer leaves the header untouched.
+        The changes are merged into the stored document, so concurrent
+        edits to other fields of the same section are kept.
+        """
+        from app import db
+        from app.models.models import SettingsSection
+        fields = settings_fields()
+        changes, by_section = {}, {}
+        for name, value in settings._pending.items():
+            old = settings._stored(name)
+            if old != value:
+                changes[name] = (old, value)
+                by_section.setdefault(fields[name].section, {})[name] = value
+        settings._pending.clear()
+        if not by_section:
+            return changes
+
+        rows = {row.section: row for row in SettingsSection.query.filter(
+            SettingsSection.section.in_(list(by_section))).with_for_update()}
+        for section, values in by_section.items():
+            row = rows.get(section)
+            if row is None:
+                db.session.add(SettingsSection(section=section, data=values, version=1))
+            else:
+                row.data = {**row.data, **values}
+                row.version = SettingsSection.version + 1
+            settings._documents[section] = {**settings._documents.get(section, {}), **values}
+        self.written_sections += len(by_section)
+        return changes
+
+    def _import_legacy(self) -> bool:
+        from app import db
+        from sqlalchemy.exc import IntegrityError
+        try:
+            imported = import_legacy_settings(db.session.connection())
+            db.session.commit()
+        except IntegrityError:
+            # Another worker imported first
+            db.session.rollback()
+            return True
+        if imported:
+            self.imports += 1
+            print(f"⚙️  Imported site settings into {imported} sections")
+        return bool(imported)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get store statistics"""
+        return {
+            'cached_sections': sorted(self._documents),
+            'fetched_sections': self.fetched_sections,
+            'written_sections': self.written_sections,
+            'imports': self.imports
+        }
+
+
+def _sections_table():
+    import sqlalchemy as sa
+    return sa.table(SECTIONS_TABLE, sa.column('section', sa.String), sa.column('data', sa.JSON),
+                    sa.column('version', sa.Integer), sa.column('updated_at', sa.DateTime))
+
+
+def import_legacy_settings(connection) -> int:
+    """Copy the SiteSettings row into per-section documents; returns how many sections were written"""
+    import sqlalchemy as sa
+    if LEGACY_TABLE not in sa.inspect(connection).get_table_names():
+        return 0
+    legacy = sa.Table(LEGACY_TABLE, sa.MetaData(), autoload_with=connection)
+    row = connection.execute(sa.select(legacy).order_by(legacy.c.id).limit(1)).mappings().first()
+    if row is None:
+        return 0
+    documents = {}
+    fields = settings_fields()
+    for name, value in row.items():
+        if name in fields:
+            documents.setdefault(section_of(name), {})[name] = value
+    now = datetime.utcnow()
+    connection.execute(sa.insert(_sections_table()), [
+        {'section': section, 'data': data, 'version': 1, 'updated_at': now}
+        for section, data in documents.items()
+    ])
+    return len(documents)
+
+
+def export_legacy_settings(connection) -> int:
+    """Write the section documents back into the SiteSettings row (for downgrades); returns the field count"""
+    import sqlalchemy as sa
+    legacy = sa.Table(LEGACY_TABLE, sa.MetaData(), autoload_with=connection)
+    sections = _sections_table()
+    values = {}
+    for (data,) in connection.execute(sa.select(sections.c.data)):
+        values.update({name: value for name, value in data.items() if name in legacy.c})
+    if not values:
+        return 0
+    row_id = connection.execute(sa.select(legacy.c.id).order_by(legacy.c.id).limit(1)).scalar()
+    if row_id is None:
+        connection.execute(sa.insert(legacy).values(**values))
+    else:
+        connection.execute(sa.update(legacy).where(legacy.c.id == row_id).values(**values))
+    return len(values)
+
+
+# Global settings store instance
+settings_store = None
+
+
+def get_settings_store() -> SettingsStore:
+    """Get or create the global settings store instance"""
+    global settings_store
+    if settings_store is None:
+        settings_store = SettingsStore()
+    return settings_store
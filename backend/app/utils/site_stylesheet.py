@@ -0,0 +1,288 @@
+"""
+Site Stylesheet for PEBDEQ
+The active theme and the color/font site settings are compiled into one minified CSS file
+named by its content hash (uploads/css/site-<hash>.css). It is rebuilt after commits that
+change settings or themes and its URL is published in the settings payload, so browsers
+cache it forever instead of pages applying hundreds of styles at runtime
+"""
+
+import os
+import re
+import json
+import hashlib
+import threading
+from typing import Any, Dict, Optional
+
+CSS_FOLDER = 'css'
+HASH_LENGTH = 20
+# Superseded bundles kept for pages still referencing them
+KEEP_STYLESHEETS = 5
+
+# Settings with these suffixes become custom properties: header_text_color -> --header-text-color
+STYLE_SUFFIXES = ('_color', '_font_family', '_font_weight', '_font_style', '_font_size')
+
+# Custom properties the frontend's site settings integration used to set at runtime
+SYNCED_PROPERTIES = {
+    '--header-bg-synced': 'header_background_color',
+    '--header-text-synced': 'header_text_color',
+    '--header-border-synced': 'header_border_color',
+    '--nav-link-color-synced': 'nav_link_color',
+    '--nav-link-hover-synced': 'nav_link_hover_color',
+    '--footer-bg-synced': 'footer_background_color',
+    '--footer-text-synced': 'footer_text_color',
+    '--welcome-bg-synced': 'welcome_background_color',
+    '--welcome-text-synced': 'welcome_text_color',
+    '--welcome-button-synced': 'welcome_button_color',
+    '--homepage-bg-synced': 'homepage_background_color',
+    '--marquee-bg-synced': 'marquee_background_color',
+    '--marquee-color-synced': 'marquee_color',
+    '--products-page-bg-synced': 'products_page_background_color',
+    '--products-page-title-synced': 'products_page_title_color',
+    '--products-page-name-synced': 'products_page_product_name_color',
+    '--products-page-price-synced': 'products_page_product_price_color',
+    '--products-page-category-synced': 'products_page_product_category_color',
+    '--homepage-products-name-synced': 'homepage_products_product_name_color',
+    '--homepage-products-price-synced': 'homepage_products_product_price_color',
+    '--homepage-products-category-synced': 'homepage_products_product_category_color',
+    '--product-detail-name-synced': 'product_detail_product_name_color',
+    '--product-detail-price-synced': 'product_detail_product_price_color',
+    '--product-detail-description-synced': 'product_detail_product_description_color',
+}
+
+# Extra names the theme switcher gives some theme colors
+THEME_COLOR_ALIASES = {
+    'primary': '--primary-color',
+    'secondary': '--secondary-color',
+    'backgroundPrimary': '--background-primary',
+    'backgroundSecondary': '--background-secondary',
+    'textPrimary': '--text-primary',
+    'textSecondary': '--text-secondary',
+    'borderColor': '--border-color',
+}
+
+# A value that could close the declaration or the rule is left out
+UNSAFE_VALUE_RE = re.compile(r'[;{}<>\\\r\n]|/\*|\*/')
+
+
+def _css_value(value: Any) -> Optional[str]:
+    if value is None or isinstance(value, (bool, dict, list)):
+        return None
+    value = str(value).strip()
+    if not value or UNSAFE_VALUE_RE.search(value):
+        return None
+    return value
+
+
+def _theme_property(key: str) -> str:
+    # Same naming as the theme switcher: primaryDark -> --primary-dark
+    return '--' + re.sub(r'([A-Z])', r'-\1', key).lower()
+
+
+def theme_properties(theme_data: Dict[str, Any]) -> Dict[str, str]:
+    """Custom properties of a theme's colors, typography and spacing"""
+    properties = {}
+    for key, value in (theme_data.get('colors') or {}).items():
+        value = _css_value(value)
+        if value is None:
+            continue
+        properties[_theme_property(key)] = value
+        if key in THEME_COLOR_ALIASES:
+            properties[THEME_COLOR_ALIASES[key]] = value
+    for key, value in (theme_data.get('typography') or {}).items():
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            # Settings-style sizes are pixels, template sizes rems
+            if '_size' in key:
+                value = f'{value}px'
+            elif 'Size' in key:
+                value = f'{value}rem'
+        value = _css_value(value)
+        if value is not None:
+            properties[_theme_property(key)] = value
+    for key, value in (theme_data.get('spacing') or {}).items():
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            value = f'{value}rem'
+        value = _css_value(value)
+        if value is not None:
+            properties[f'--spacing-{key}'] = value
+    return properties
+
+
+def settings_properties(settings) -> Dict[str, str]:
+    """Custom properties of every color and font setting, plus the legacy -synced names"""
+    from app.utils.settings_fields import settings_fields
+    properties = {}
+    for name, field in settings_fields().items():
+        if not name.endswith(STYLE_SUFFIXES):
+            continue
+        value = getattr(settings, name)
+        if name.endswith('_font_size') and field.kind == 'integer' and value is not None:
+            value = f'{value}px'
+        value = _css_value(value)
+        if value is not None:
+            properties['--' + name.replace('_', '-')] = value
+    for prop, name in SYNCED_PROPERTIES.items():
+        value = _css_value(getattr(settings, name))
+        if value is not None:
+            properties[prop] = value
+    return properties
+
+
+def compile_site_css(settings, theme=None) -> str:
+    """The stylesheet of the settings and (optionally) a CustomTheme: theme first, so settings win"""
+    properties = {}
+    theme_css = ''
+    if theme is not None:
+        try:
+            theme_data = json.loads(theme.theme_data or '{}')
+        except ValueError:
+            theme_data = {}
+        properties.update(theme_properties(theme_data if isinstance(theme_data, dict) else {}))
+        theme_css = theme.css_content or ''
+    if settings is not None:
+        properties.update(settings_properties(settings))
+    declarations = '\n'.join(f'  {prop}: {value};' for prop, value in properties.items())
+    return f':root {{\n{declarations}\n}}\n{theme_css}'
+
+
+def minify_css(css: str) -> str:
+    """Drop comments and the whitespace CSS doesn't need (quoted strings aren't special-cased)"""
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.S)
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{};,>])\s*', r'\1', css)
+    css = re.sub(r':\s+', ':', css)
+    return css.replace(';}', '}').strip()
+
+
+def active_theme():
+    """The default CustomTheme, if one is active"""
+    from app.models.models import CustomTheme
+    return CustomTheme.query.filter_by(is_default=True, is_active=True).order_by(CustomTheme.id).first()
+
+
+class SiteStylesheet:
+    """Writes content-hashed stylesheet bundles and keeps the settings pointing at the current one"""
+
+    def __init__(self, uploads_dir: Optional[str] = None):
+        """Initialize the bundle folder and the rebuild queue"""
+        from app.utils.upload_store import get_upload_store
+        self.css_dir = os.path.join(uploads_dir or get_upload_store().uploads_dir, CSS_FOLDER)
+        self._worker = None
+        self._pending = False
+        self._lock = threading.Lock()
+        self.builds = 0
+        self.written = 0
+
+    def write(self, css: str) -> str:
+        """Store a minified bundle (once per content) and return its URL"""
+        body = minify_css(css).encode('utf-8')
+        name = f'site-{hashlib.sha256(body).hexdigest()[:HASH_LENGTH]}.css'
+        path = os.path.join(self.css_dir, name)
+        if not os.path.exists(path):
+            os.makedirs(self.css_dir, exist_ok=True)
+            tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(body)
+            os.replace(tmp_path, path)
+            self.written += 1
+            self._prune(keep=path)
+        return f'/uploads/{CSS_FOLDER}/{name}'
+
+    def _prune(self, keep: str):
+        # Other workers prune too: skip bundles that vanish between listdir and stat
+        bundles = []
+        for name in os.listdir(self.css_dir):
+            if name.startswith('site-') and name.endswith('.css'):
+                path = os.path.join(self.css_dir, name)
+                try:
+                    bundles.append((os.path.getmtime(path), path))
+                except OSError:
+                    continue
+        bundles.sort(reverse=True)
+        for _, path in bundles[KEEP_STYLESHEETS:]:
+            if path != keep:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def rebuild(self) -> Optional[str]:
+        """Compile the current settings and theme; stores the URL in the settings if it moved"""
+        from app import db
+        from app.utils.settings_store import get_settings_store
+        store = get_settings_store()
+        settings = store.load()
+        if settings is None:
+            return None
+        url = self.write(compile_site_css(settings, active_theme()))
+        self.builds += 1
+        if settings.site_stylesheet_url != url:
+            settings.site_stylesheet_url = url
+            store.save(settings)
+            db.session.commit()
+            print(f"🎨 Site stylesheet rebuilt: {url}")
+        return url
+
+    def schedule(self, app):
+        """Rebuild in the background; changes arriving meanwhile are coalesced"""
+        with self._lock:
+            self._pending = True
+            if self._worker is not None:
+                return
+            self._worker = threading.Thread(target=self._run, args=(app,), daemon=True)
+            self._worker.start()
+
+    def _run(self, app):
+        while True:
+            with self._lock:
+                if not self._pending:
+                    self._worker = None
+                    return
+                self._pending = False
+            try:
+                with app.app_context():
+                    self.rebuild()
+            except Exception as e:
+                print(f"⚠️  Site stylesheet rebuild failed: {str(e)}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Get build statistics"""
+        return {
+            'builds': self.builds,
+            'written': self.written,
+            'pending': self._pending
+        }
+
+
+# Global site stylesheet instance
+site_stylesheet = None
+_app = None
+
+
+def get_site_stylesheet() -> SiteStylesheet:
+    """Get or create the global site stylesheet instance"""
+    global site_stylesheet
+    if site_stylesheet is None:
+        site_stylesheet = SiteStylesheet()
+    return site_stylesheet
+
+
+def stylesheet_url(settings) -> Optional[str]:
+    """The settings' bundle URL; schedules the first build when there is none yet"""
+    url = settings.site_stylesheet_url if settings else None
+    if url is None and _app is not None:
+        get_site_stylesheet().schedule(_app)
+    return url
+
+
+def install_site_stylesheet(app):
+    """Rebuild the bundle after each commit touching the settings or a theme"""
+    global _app
+    first_install = _app is None
+    _app = app
+    if not first_install:
+        return
+    from app.models.models import SettingsSection, CustomTheme
+    from app.utils.model_events import subscribe
+    stylesheet = get_site_stylesheet()
+    for model in (SettingsSection, CustomTheme):
+        subscribe(model, lambda obj: True, lambda changes: stylesheet.schedule(_app))
@@ -0,0 +1,86 @@
+"""
+Upload Serving for PEBDEQ
+Cache headers, strong ETags, conditional GET / byte ranges and nginx offload for /uploads
+"""
+
+import os
+import re
+import mimetypes
+from typing import Optional
+
+from flask import abort, current_app, request, send_file
+from werkzeug.security import safe_join
+
+# blobs/ab/<sha256>.<ext> and css/site-<hash>.css - the name is the content hash, so the bytes never change
+CONTENT_ADDRESSED_RE = re.compile(r'blobs/[0-9a-f]{2}/([0-9a-f]{64})\.[a-z0-9]+|css/site-([0-9a-f]{20})\.css')
+
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+# Folders that must never sit in shared caches
+PRIVATE_FOLDERS = ('invoices/',)
+
+
+def _offload_mode() -> str:
+    """UPLOADS_OFFLOAD: none (Python streams the file), x-accel (nginx) or x-sendfile (Apache/lighttpd)"""
+    mode = (os.environ.get('UPLOADS_OFFLOAD') or 'none').lower()
+    return mode if mode in ('none', 'x-accel', 'x-sendfile') else 'none'
+
+
+def cache_policy(filename: str):
+    """(Cache-Control value, strong etag or None) for an upload path"""
+    match = CONTENT_ADDRESSED_RE.fullmatch(filename)
+    if match:
+        return f'public, max-age={IMMUTABLE_MAX_AGE}, immutable', match.group(1) or match.group(2)
+    if filename.startswith(PRIVATE_FOLDERS):
+        return 'private, no-cache', None
+    max_age = int(os.environ.get('UPLOADS_MAX_AGE') or 86400)
+    # Legacy uuid names and derivatives can be rebuilt in place - revalidate after max-age
+    return f'public, max-age={max_age}', None
+
+
+def _offload_response(mode: str, filename: str, full_path: str, cache_control: str, etag: Optional[str]):
+    """Empty response that tells the front-end server which file to stream"""
+    response = current_app.response_class(status=200)
+    if mode == 'x-accel':
+        prefix = (os.environ.get('UPLOADS_ACCEL_PREFIX') or '/internal-uploads/').rstrip('/') + '/'
+        response.headers['X-Accel-Redirect'] = prefix + filename
+    else:
+        response.headers['X-Sendfile'] = full_path
+    response.headers['Content-Type'] = mimetypes.guess_type(full_path)[0] or 'application/octet-stream'
+    response.headers['Cache-Control'] = cache_control
+    if etag:
+        response.set_etag(etag)
+    return response
+
+
+def serve_upload(upload_folder: str, filename: str):
+    """
+    Send a file from the uploads folder
+
+    Content-addressed blobs get their SHA-256 as a strong ETag and an
+    immutable Cache-Control, other files a mtime/size ETag and a bounded
+    max-age. Conditional GET (304) and single byte ranges come from
+    werkzeug's conditional responses; with UPLOADS_OFFLOAD set the bytes
+    are left to the front-end server.
+    """
+    full_path = safe_join(upload_folder, filename)
+    if full_path is None or not os.path.isfile(full_path):
+        abort(404)
+
+    cache_control, etag = cache_policy(filename)
+    mode = _offload_mode()
+
+    if mode != 'none':
+        # The front-end server handles Range itself; answer 304 here to skip the round trip
+        if etag and etag in request.if_none_match:
+            response = current_app.response_class(status=304)
+            response.set_etag(etag)
+            response.headers['Cache-Control'] = cache_control
+            return response
+        return _offload_response(mode, filename, full_path, cache_control, etag)
+
+    # etag=True falls back to werkzeug's mtime/size/name tag
+    response = send_file(full_path, conditional=True, etag=etag or True, max_age=None)
+    response.headers['Cache-Control'] = cache_control
+    response.headers['Accept-Ranges'] = 'bytes'
+    return response
@@ -0,0 +1,475 @@
+"""
+Content-Addressed Upload Store for PEBDEQ
+Deduplicates uploaded files by SHA-256, counts the records referencing each blob
+and deletes a blob once its count drops to zero
+"""
+
+import os
+import re
+import time
+import uuid
+import hashlib
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional
+
+CHUNK_SIZE = 1024 * 1024
+BLOBS_FOLDER = 'blobs'
+TMP_FOLDER = 'tmp'
+
+# /uploads/blobs/ab/<sha256>.<ext> - derivatives live in a subfolder and never match
+BLOB_URL_RE = re.compile(r'/uploads/blobs/[0-9a-f]{2}/[0-9a-f]{64}\.[a-z0-9]+')
+
+
+def _default_uploads_dir() -> str:
+    # backend/uploads
+    backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    return os.path.join(backend_dir, 'uploads')
+
+
+def _clean_extension(extension: str) -> str:
+    extension = (extension or '').lower().lstrip('.')
+    return extension if re.fullmatch(r'[a-z0-9]{1,10}', extension) else 'bin'
+
+
+def release_grace_seconds() -> float:
+    """A blob uploaded or re-uploaded this recently survives its count dropping to zero (UPLOAD_RELEASE_GRACE_SECONDS)"""
+    return float(os.getenv('UPLOAD_RELEASE_GRACE_SECONDS', '600'))
+
+
+def _referencing_columns():
+    """(model, [columns]) for every model that can hold an upload URL"""
+    from app import db
+    from app.models.models import (Product, ProductVariation, VariationOption, Category, BlogPost, SiteSettings,
+                                   SettingsSection)
+    text_types = (db.String, db.Text, db.JSON)
+    for model in (Product, ProductVariation, VariationOption, Category, BlogPost, SiteSettings, SettingsSection):
+        # image_variants only mirrors Product.images, it is not a reference of its own
+        columns = [column for column in model.__table__.columns
+                   if isinstance(column.type, text_types) and column.name != 'image_variants']
+        if columns:
+            yield model, columns
+
+
+def _blob_urls(value) -> Counter:
+    """Blob URL -> number of times value mentions it"""
+    if not value:
+        return Counter()
+    text = value if isinstance(value, str) else str(value)
+    if '/uploads/blobs/' not in text:
+        return Counter()
+    return Counter(BLOB_URL_RE.findall(text))
+
+
+def count_references(connection) -> Dict[str, int]:
+    """
+    Count references to each blob URL across products, variations,
+    categories, blog posts (including inline content) and site settings
+
+    Scans every referencing row on connection (a migration's bind or the
+    session's connection). Columns the database doesn't have yet are skipped.
+    """
+    from sqlalchemy import select, inspect
+    counts = Counter()
+    inspector = inspect(connection)
+    for model, columns in _referencing_columns():
+        table = model.__table__
+        existing = {column['name'] for column in inspector.get_columns(table.name)}
+        columns = [column for column in columns if column.name in existing]
+        if not columns:
+            continue
+        for row in connection.execute(select(*columns).execution_options(yield_per=500)):
+            for value in row:
+                counts.update(_blob_urls(value))
+    return dict(counts)
+
+
+def reconcile_upload_refcounts(connection, counts: Optional[Dict[str, int]] = None, dry_run: bool = False) -> int:
+    """
+    Make the upload_blob table match counts (count_references() by default)
+
+    Returns the number of blobs whose stored count was wrong. Rows of
+    unreferenced blobs are dropped rather than kept at zero.
+    """
+    from sqlalchemy import select
+    from app.models.models import UploadBlob
+    table = UploadBlob.__table__
+    if counts is None:
+        counts = count_references(connection)
+    stored = dict(connection.execute(select(table.c.url, table.c.refcount)).all())
+    now = datetime.utcnow()
+    corrected = 0
+    for url, refcount in stored.items():
+        if counts.get(url, 0) == refcount:
+            continue
+        if refcount:
+            corrected += 1
+        if dry_run:
+            continue
+        if url in counts:
+            connection.execute(table.update().where(table.c.url == url).values(refcount=counts[url], updated_at=now))
+        else:
+            connection.execute(table.delete().where(table.c.url == url))
+    missing = [{'url': url, 'refcount': count, 'updated_at': now} for url, count in counts.items() if url not in stored]
+    corrected += len(missing)
+    if missing and not dry_run:
+        connection.execute(table.insert(), missing)
+    return corrected
+
+
+class UploadStore:
+    """Shared blob store: one file per distinct content, whatever route uploaded it"""
+
+    def __init__(self, uploads_dir: Optional[str] = None):
+        """Initialize the store under the uploads directory"""
+        self.uploads_dir = uploads_dir or _default_uploads_dir()
+        self.blobs_dir = os.path.join(self.uploads_dir, BLOBS_FOLDER)
+        self._lock = threading.Lock()
+        self._stats = {'stored': 0, 'deduplicated': 0, 'bytes_saved': 0}
+
+    def _blob_path(self, digest: str, extension: str) -> str:
+        return os.path.join(self.blobs_dir, digest[:2], f'{digest}.{extension}')
+
+    def url_for(self, digest: str, extension: str) -> str:
+        return f'/uploads/{BLOBS_FOLDER}/{digest[:2]}/{digest}.{extension}'
+
+    def path_for_url(self, url: str) -> Optional[str]:
+        """Filesystem path of a blob URL, or None for anything else"""
+        if not BLOB_URL_RE.fullmatch(url or ''):
+            return None
+        return os.path.join(self.uploads_dir, url[len('/uploads/'):])
+
+    def save_stream(self, stream, extension: str) -> Dict[str, Any]:
+        """
+        Write a file-like object into the store, hashing while it is written
+
+        Returns {'url', 'sha256', 'size', 'deduplicated'}. When the content
+        already exists the temporary copy is discarded and the existing
+        blob's URL is returned.
+        """
+        extension = _clean_extension(extension)
+        tmp_dir = os.path.join(self.blobs_dir, TMP_FOLDER)
+        os.makedirs(tmp_dir, exist_ok=True)
+        tmp_path = os.path.join(tmp_dir, uuid.uuid4().hex)
+
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            with open(tmp_path, 'wb') as f:
+                while True:
+                    chunk = stream.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    digest.update(chunk)
+                    f.write(chunk)
+                    size += len(chunk)
+
+            sha256 = digest.hexdigest()
+            blob_path = self._blob_path(sha256, extension)
+            deduplicated = os.path.exists(blob_path)
+            if deduplicated:
+                os.remove(tmp_path)
+                # Fresh mtime keeps the GC grace period from reaping a blob that was just re-uploaded
+                os.utime(blob_path, None)
+            else:
+                os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+                os.replace(tmp_path, blob_path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        with self._lock:
+            if deduplicated:
+                self._stats['deduplicated'] += 1
+                self._stats['bytes_saved'] += size
+            else:
+                self._stats['stored'] += 1
+
+        return {
+            'url': self.url_for(sha256, extension),
+            'sha256': sha256,
+            'size': size,
+            'deduplicated': deduplicated
+        }
+
+    def save_file(self, file_storage, extension: Optional[str] = None) -> Dict[str, Any]:
+        """Store a werkzeug FileStorage upload"""
+        if extension is None:
+            filename = file_storage.filename or ''
+            extension = filename.rsplit('.', 1)[-1] if '.' in filename else ''
+        return self.save_stream(file_storage.stream, extension)
+
+    def save_bytes(self, data: bytes, extension: str) -> Dict[str, Any]:
+        """Store in-memory bytes (processed or re-encoded images)"""
+        from io import BytesIO
+        return self.save_stream(BytesIO(data), extension)
+
+    def blobs(self):
+        """Yield (url, path, size, mtime) for every stored blob"""
+        if not os.path.isdir(self.blobs_dir):
+            return
+        for prefix in sorted(os.listdir(self.blobs_dir)):
+            prefix_dir = os.path.join(self.blobs_dir, prefix)
+            if prefix == TMP_FOLDER or not os.path.isdir(prefix_dir):
+                continue
+            for name in os.listdir(prefix_dir):
+                path = os.path.join(prefix_dir, name)
+                url = f'/uploads/{BLOBS_FOLDER}/{prefix}/{name}'
+                if not BLOB_URL_RE.fullmatch(url):
+                    continue
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                yield url, path, stat.st_size, stat.st_mtime
+
+    def reference_counts(self) -> Dict[str, int]:
+        """Scan the database for references to each blob URL (see count_references)"""
+        from app import db
+        return count_references(db.session.connection())
+
+    def refcount(self, url: str) -> int:
+        """Stored reference count of a blob URL"""
+        from app import db
+        from app.models.models import UploadBlob
+        row = db.session.get(UploadBlob, url)
+        return row.refcount if row else 0
+
+    def _remove_derivatives(self, path: str):
+        """Delete the image derivatives built for a blob"""
+        derivatives_dir = os.path.join(os.path.dirname(path), 'derivatives')
+        if not os.path.isdir(derivatives_dir):
+            return
+        stem = os.path.basename(path).rsplit('.', 1)[0]
+        # The same bytes uploaded with another extension share the derivatives
+        if any(name.startswith(f'{stem}.') for name in os.listdir(os.path.dirname(path))):
+            return
+        for name in os.listdir(derivatives_dir):
+            if name == f'{stem}.json' or name.startswith(f'{stem}_'):
+                try:
+                    os.remove(os.path.join(derivatives_dir, name))
+                except OSError:
+                    pass
+        try:
+            os.rmdir(derivatives_dir)
+        except OSError:
+            pass
+
+    def _remove_blob(self, path: str) -> bool:
+        """Delete a blob file with its derivatives; False if it was already gone"""
+        try:
+            os.remove(path)
+        except OSError:
+            return False
+        self._remove_derivatives(path)
+        try:
+            # Drop the fan-out directory once its last blob is gone
+            os.rmdir(os.path.dirname(path))
+        except OSError:
+            pass
+        return True
+
+    def release(self, urls: Iterable[str], grace_seconds: Optional[float] = None) -> int:
+        """
+        Delete the blobs among urls whose reference count is zero
+
+        Blobs stored or re-uploaded within grace_seconds are kept for the
+        garbage collector: the form that uploaded them may not be saved yet.
+        Returns the number of blobs deleted.
+        """
+        from sqlalchemy import select
+        from app import db
+        from app.models.models import UploadBlob
+        table = UploadBlob.__table__
+        if grace_seconds is None:
+            grace_seconds = release_grace_seconds()
+        cutoff = time.time() - grace_seconds
+        removed = 0
+        with db.engine.begin() as connection:
+            for url in urls:
+                path = self.path_for_url(url)
+                if not path:
+                    continue
+                refcount = connection.execute(select(table.c.refcount).where(table.c.url == url)).scalar()
+                if refcount and refcount > 0:
+                    continue
+                try:
+                    if os.stat(path).st_mtime > cutoff:
+                        continue
+                except OSError:
+                    pass
+                connection.execute(table.delete().where(table.c.url == url))
+                if self._remove_blob(path):
+                    removed += 1
+        return removed
+
+    def collect_garbage(self, grace_hours: float = 24, dry_run: bool = False) -> Dict[str, Any]:
+        """
+        Reconcile the stored reference counts and delete blobs nothing references
+
+        Counts normally reach zero and free their blob on commit; this full
+        scan corrects counts that drifted (raw SQL edits, crashes between
+        commit and delete) and removes uploads never saved into a record.
+        Blobs younger than grace_hours are kept: an upload is referenced
+        only once the product/category/post form that uploaded it is saved.
+        """
+        from app import db
+        with db.engine.begin() as connection:
+            references = count_references(connection)
+            corrected = reconcile_upload_refcounts(connection, references, dry_run=dry_run)
+        cutoff = time.time() - grace_hours * 3600
+        result = {'scanned': 0, 'referenced': 0, 'in_grace_period': 0, 'removed': 0,
+                  'removed_bytes': 0, 'refcounts_corrected': corrected, 'dry_run': dry_run, 'removed_urls': []}
+
+        for url, path, size, mtime in self.blobs():
+            result['scanned'] += 1
+            if references.get(url):
+                result['referenced'] += 1
+                continue
+            if mtime > cutoff:
+                result['in_grace_period'] += 1
+                continue
+            if not dry_run and not self._remove_blob(path):
+                continue
+            result['removed'] += 1
+            result['removed_bytes'] += size
+            result['removed_urls'].append(url)
+
+        # Interrupted uploads leave temporary files behind
+        tmp_dir = os.path.join(self.blobs_dir, TMP_FOLDER)
+        if not dry_run and os.path.isdir(tmp_dir):
+            for name in os.listdir(tmp_dir):
+                tmp_path = os.path.join(tmp_dir, name)
+                try:
+                    if os.stat(tmp_path).st_mtime < cutoff:
+                        os.remove(tmp_path)
+                except OSError:
+                    pass
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        """Blob count and size on disk plus this process's dedup counters"""
+        count = 0
+        total = 0
+        for _, _, size, _ in self.blobs():
+            count += 1
+            total += size
+        with self._lock:
+            return dict(self._stats, blobs=count, size_mb=round(total / (1024 * 1024), 2))
+
+
+# Reference counting: session hooks keep upload_blob in step with the referencing records
+
+_referencing_attributes = {}
+
+
+def _collect_refcount_deltas(session) -> Counter:
+    """Blob URL -> change in references made by this flush"""
+    from sqlalchemy import inspect
+    deltas = Counter()
+
+    def attributes(obj):
+        for model, keys in _referencing_attributes.items():
+            if isinstance(obj, model):
+                return keys
+        return ()
+
+    with session.no_autoflush:
+        for obj in session.new:
+            for key in attributes(obj):
+                deltas.update(_blob_urls(getattr(obj, key)))
+        for obj in session.deleted:
+            state = inspect(obj)
+            for key in attributes(obj):
+                history = state.attrs[key].history
+                value = history.deleted[0] if history.deleted else getattr(obj, key)
+                deltas.subtract(_blob_urls(value))
+        for obj in session.dirty:
+            keys = attributes(obj)
+            if not keys:
+                continue
+            state = inspect(obj)
+            for key in keys:
+                history = state.attrs[key].history
+                if not history.has_changes():
+                    continue
+                for value in history.deleted:
+                    deltas.subtract(_blob_urls(value))
+                for value in history.added:
+                    deltas.update(_blob_urls(value))
+    return Counter({url: delta for url, delta in deltas.items() if delta})
+
+
+def _refcounts_before_flush(session, flush_context, instances):
+    session.info['upload_refcount_deltas'] = _collect_refcount_deltas(session)
+
+
+def _refcounts_after_flush(session, flush_context):
+    from app.models.models import UploadBlob
+    deltas = session.info.pop('upload_refcount_deltas', None)
+    if not deltas:
+        return
+    table = UploadBlob.__table__
+    connection = session.connection()
+    now = datetime.utcnow()
+    for url, delta in deltas.items():
+        updated = connection.execute(table.update().where(table.c.url == url)
+                                     .values(refcount=table.c.refcount + delta, updated_at=now))
+        if not updated.rowcount:
+            connection.execute(table.insert().values(url=url, refcount=delta, updated_at=now))
+    # Blobs that lost a reference are deleted after commit if their count ended at zero
+    session.info.setdefault('upload_released', set()).update(url for url, delta in deltas.items() if delta < 0)
+
+
+def _refcounts_after_commit(session):
+    released = session.info.pop('upload_released', None)
+    if not released:
+        return
+    try:
+        removed = get_upload_store().release(released)
+        if removed:
+            print(f"🗑️  Removed {removed} unreferenced upload blobs")
+    except Exception as e:
+        print(f"⚠️  Releasing upload blobs failed: {str(e)}")
+
+
+def _refcounts_after_rollback(session):
+    session.info.pop('upload_refcount_deltas', None)
+    session.info.pop('upload_released', None)
+
+
+def _load_old_value(target, value, oldvalue, initiator):
+    """No-op; registering it with active_history=True is what loads oldvalue"""
+
+
+def install_upload_refcounts():
+    """Maintain upload_blob reference counts on every ORM flush (once per process)"""
+    if _referencing_attributes:
+        return
+    from sqlalchemy import event, inspect
+    from sqlalchemy.orm import Session
+    for model, columns in _referencing_columns():
+        mapper = inspect(model)
+        keys = [mapper.get_property_by_column(column).key for column in columns]
+        # Load the previous value even when an expired attribute is assigned, so its references are released
+        for key in keys:
+            event.listen(getattr(model, key), 'set', _load_old_value, active_history=True)
+        _referencing_attributes[model] = keys
+    event.listen(Session, 'before_flush', _refcounts_before_flush)
+    event.listen(Session, 'after_flush', _refcounts_after_flush)
+    event.listen(Session, 'after_commit', _refcounts_after_commit)
+    event.listen(Session, 'after_rollback', _refcounts_after_rollback)
+
+
+# Global upload store instance - lazy loading
+upload_store = None
+
+
+def get_upload_store() -> UploadStore:
+    """Get or create the shared upload store"""
+    global upload_store
+    if upload_store is None:
+        upload_store = UploadStore()
+    return upload_store
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+⏱️  Alpha Matte Post-Processing Benchmark
+========================================
+
+Compares the previous PIL multi-pass matte clean-up (threshold -> blur ->
+unsharp -> re-threshold, each pass allocating a new image) with the
+single-buffer postprocess_alpha stage on a large synthetic matte. Memory is
+the peak growth of process RSS, so PIL and OpenCV buffers are counted too.
+
+Usage: python benchmark_alpha_postprocess.py [size]
+"""
+
+import sys
+import time
+
+import numpy as np
+from PIL import Image, ImageFilter
+
+from app.utils.alpha_matte import ALPHA_BACKEND, postprocess_alpha
+from app.utils.background_removal import POSTPROCESS_PARAMS
+from app.utils.large_image import PeakMemoryTracker
+
+
+def make_matte(size):
+    """Soft-edged ellipse with noise, roughly what a segmentation model returns"""
+    yy, xx = np.ogrid[:size, :size]
+    center = size / 2
+    distance = np.sqrt(((xx - center) / (size * 0.35)) ** 2 + ((yy - center) / (size * 0.45)) ** 2)
+    alpha = np.clip((1.2 - distance) * 255 / 0.4, 0, 255)
+    alpha += np.random.default_rng(0).normal(0, 12, alpha.shape)
+    return np.clip(alpha, 0, 255).astype(np.uint8)
+
+
+def legacy_premium(alpha):
+    """The old BiRefNet path, pass for pass: threshold, blur, threshold, unsharp, threshold"""
+    np.unique(alpha)
+    alpha_ultra = np.where(alpha > 160, 255, 0).astype(np.uint8)
+    alpha_blurred = Image.fromarray(alpha_ultra, mode='L').filter(ImageFilter.GaussianBlur(radius=0.3))
+    alpha_final = np.where(np.array(alpha_blurred) > 100, 255, 0).astype(np.uint8)
+    alpha_crisp = Image.fromarray(alpha_final, mode='L').filter(
+        ImageFilter.UnsharpMask(radius=0.5, percent=200, threshold=1))
+    alpha_final = np.where(np.array(alpha_crisp) > 127, 255, 0).astype(np.uint8)
+    np.unique(alpha_final)
+    return alpha_final
+
+
+def legacy_ultra(alpha):
+    """The old BRIA path: float copy, two blurs, then auto-invert"""
+    mask_smooth = (alpha > 80).astype(np.float32)
+    image = Image.fromarray((mask_smooth * 255).astype(np.uint8), mode='L')
+    image = image.filter(ImageFilter.GaussianBlur(radius=1.0))
+    image = image.filter(ImageFilter.GaussianBlur(radius=0.5))
+    mask = np.array(image)
+    if np.sum(mask < 50) > np.sum(mask > 200):
+        mask = 255 - mask
+    np.unique(mask)
+    return mask
+
+
+def measure(label, fn, alpha):
+    with PeakMemoryTracker(interval=0.002) as memory:
+        start = time.perf_counter()
+        result = fn(alpha)
+        elapsed = time.perf_counter() - start
+    print(f"   {label:<28} {elapsed * 1000:8.1f} ms   peak +{memory.delta_mb:7.1f} MB RSS")
+    return result
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 4000
+    alpha = make_matte(size)
+    print(f"🔬 {size}x{size} matte, backend: {ALPHA_BACKEND}")
+
+    for mode, legacy in [('premium', legacy_premium), ('ultra', legacy_ultra)]:
+        params = POSTPROCESS_PARAMS[mode]
+        print(f"\n📋 {mode}")
+        old = measure('legacy PIL multi-pass', legacy, alpha.copy())
+        new = measure('postprocess_alpha', lambda a: postprocess_alpha(a, params), alpha.copy())
+        agreement = float(np.mean(np.abs(old.astype(np.int16) - new.astype(np.int16)) <= 8))
+        print(f"   pixels within 8 levels: {agreement:.4f}")
+
+
+if __name__ == '__main__':
+    main()
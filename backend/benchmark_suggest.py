@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+⏱️  Suggest Index Benchmark
+===========================
+
+Builds the autocomplete index from synthetic product names (no database)
+and times prefix, multi-word and misspelled lookups.
+
+Usage: python benchmark_suggest.py [products]
+"""
+
+import sys
+import time
+import random
+
+from app.utils.product_suggest import SuggestIndex
+
+ADJECTIVES = ['red', 'blue', 'green', 'vintage', 'antique', 'handmade', 'ceramic', 'wooden', 'brass',
+              'laser', 'engraved', 'custom', 'printed', 'industrial', 'rustic', 'modern', 'classic',
+              'mini', 'large', 'portable', 'Edison', 'çelik', 'ahşap', 'kırmızı']
+NOUNS = ['mug', 'lamp', 'bulb', 'drill', 'hammer', 'vase', 'figurine', 'keychain', 'coaster', 'sign',
+         'chess set', 'planter', 'wrench', 'saw', 'clock', 'frame', 'box', 'bracket', 'gear', 'lantern',
+         'pendant', 'filament', 'nozzle', 'toolbox', 'screwdriver', 'lampshade']
+
+QUERIES = ['l', 'la', 'lan', 'lant', 'lantern', 'vintage lamp', 'rustic lan', 'ceramc', 'lanetrn',
+           'screwdrivr', 'handmde mug', 'edison bul', 'kirmizi', 'zzzz', 'engraved wooden sign']
+
+
+def make_rows(count):
+    # Categories first, like load_rows, so they lead every posting list
+    for i, noun in enumerate(NOUNS):
+        yield ('category', i, noun.title(), noun.replace(' ', '-'), 2.0, {})
+    rng = random.Random(0)
+    for i in range(count):
+        name = f'{rng.choice(ADJECTIVES)} {rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} {rng.randint(1, 5000)}'
+        yield ('product', i, name.title(), name.lower().replace(' ', '-') + f'-{i}', 0.0, {'category_id': i % 12})
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    index = SuggestIndex()
+    index.build(make_rows(count))
+    stats = index.stats()
+    print(f"🔬 {count} products: {stats['entries']} entries, {stats['words']} words, built in {stats['build_seconds']}s")
+
+    print(f"\n{'query':<26}{'p50 ms':>9}{'max ms':>9}  top result")
+    worst = 0.0
+    for query in QUERIES:
+        timings = []
+        for _ in range(50):
+            started = time.perf_counter()
+            results = index.suggest(query)
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        worst = max(worst, timings[-1])
+        top = f"{results[0]['label']} (typos {results[0]['typos']})" if results else '-'
+        print(f"{query:<26}{timings[len(timings) // 2]:>9.2f}{timings[-1]:>9.2f}  {top}")
+
+    # Incremental updates, as admin edits apply them
+    started = time.perf_counter()
+    for i in range(1000):
+        index.upsert('product', i, f'Renamed lantern {i}', f'renamed-lantern-{i}')
+    print(f"\n✏️  1000 upserts: {(time.perf_counter() - started):.3f}s")
+    print(f"⏱️  worst lookup: {worst:.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
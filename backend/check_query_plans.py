@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Check that the hot route queries use indexes
+Usage: python check_query_plans.py [--verbose]
+
+Runs EXPLAIN QUERY PLAN (SQLite) or EXPLAIN (PostgreSQL) on each query
+listed in app/utils/query_plans.py against the configured database and
+exits with status 1 if any of them falls back to a full table scan.
+Run it after `flask db upgrade` and whenever a route query changes.
+"""
+
+import sys
+import os
+
+# Add the parent directory to the path to import the app
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import create_app
+from app.utils.query_plans import check_query_plans
+
+
+def main():
+    verbose = '--verbose' in sys.argv
+    app = create_app()
+    with app.app_context():
+        results = check_query_plans()
+
+    failures = [result for result in results if result['full_scans']]
+    for result in results:
+        if result['full_scans']:
+            print(f"❌ {result['name']}: full scan of {', '.join(result['full_scans'])}")
+        else:
+            print(f"✅ {result['name']}")
+        if verbose or result['full_scans']:
+            for line in result['plan']:
+                print(f"     {line}")
+
+    print(f"\n📊 {len(results) - len(failures)}/{len(results)} queries use an index")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -52,6 +52,19 @@ def create_test_images():
     
     return test_images
 
+def remove_background(api_url, files, data, timeout=60):
+    """Queue a background removal job, wait for it and return the response with its JSON result"""
+    submitted = requests.post(f'{api_url}/api/products/remove-background/jobs', files=files, data=data, timeout=10)
+    if submitted.status_code != 202:
+        return submitted
+    urls = submitted.json()
+    job = urls['job']
+    deadline = time.time() + timeout
+    while job['status'] in ('pending', 'running') and time.time() < deadline:
+        time.sleep(0.5)
+        job = requests.get(api_url + urls['status_url'], timeout=10).json()['job']
+    return requests.get(api_url + urls['result_url'], params={'format': 'json'}, timeout=10)
+
 def test_api_method(image_data, image_name, model_type, api_url="http://localhost:5005"):
     """Test a specific model via API"""
     print(f"   🎯 Testing {model_type} with {image_name}...")
@@ -59,8 +72,8 @@ def test_api_method(image_data, image_name, model_type, api_url="http://localhos
     try:
         start_time = time.time()
         
-        response = requests.post(
-            f'{api_url}/api/products/remove-background',
+        response = remove_background(
+            api_url,
             files={'image': (f'{image_name}.png', BytesIO(image_data), 'image/png')},
             data={'model_type': model_type},
             timeout=30
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Garbage-collect unreferenced upload blobs
+Usage: python gc_uploads.py [--dry-run] [--grace-hours 24]
+
+Blobs are normally deleted as soon as their reference count drops to zero.
+This recounts the references of every product, variation, category, blog
+post and site setting, corrects counts that drifted, and deletes files in
+uploads/blobs nothing references, together with their image derivatives.
+Blobs newer than the grace period are kept so uploads whose form has not
+been saved yet survive. Run it from cron (e.g. nightly).
+"""
+
+import sys
+import os
+import argparse
+
+# Add the parent directory to the path to import the app
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import create_app
+from app.utils.upload_store import get_upload_store
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Remove unreferenced upload blobs')
+    parser.add_argument('--dry-run', action='store_true', help='only report what would be removed')
+    parser.add_argument('--grace-hours', type=float, default=24, help='keep blobs younger than this (default 24)')
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        store = get_upload_store()
+        result = store.collect_garbage(grace_hours=args.grace_hours, dry_run=args.dry_run)
+
+    verb = 'Would remove' if args.dry_run else 'Removed'
+    for url in result['removed_urls']:
+        print(f"   🗑️  {url}")
+    print(f"\n📦 Scanned {result['scanned']} blobs: {result['referenced']} referenced, "
+          f"{result['in_grace_period']} in grace period")
+    print(f"✅ {verb} {result['removed']} blobs ({result['removed_bytes'] / (1024 * 1024):.2f} MB)")
+    if result['refcounts_corrected']:
+        verb = 'Would correct' if args.dry_run else 'Corrected'
+        print(f"⚠️  {verb} {result['refcounts_corrected']} drifted reference counts")
+
+
+if __name__ == '__main__':
+    main()
@@ -6,6 +6,7 @@
 Direct test of BiRefNet vs U2Net to see which works better.
 """
 
+import time
 import requests
 from PIL import Image
 from io import BytesIO
@@ -18,6 +19,19 @@ def create_test_image():
     buffer.seek(0)
     return buffer
 
+def remove_background(api_url, files, data, timeout=60):
+    """Queue a background removal job, wait for it and return the response with its JSON result"""
+    submitted = requests.post(f'{api_url}/api/products/remove-background/jobs', files=files, data=data, timeout=10)
+    if submitted.status_code != 202:
+        return submitted
+    urls = submitted.json()
+    job = urls['job']
+    deadline = time.time() + timeout
+    while job['status'] in ('pending', 'running') and time.time() < deadline:
+        time.sleep(0.5)
+        job = requests.get(api_url + urls['status_url'], timeout=10).json()['job']
+    return requests.get(api_url + urls['result_url'], params={'format': 'json'}, timeout=10)
+
 def main():
     print("🧪 MANUAL BiRefNet TEST")
     print("=" * 40)
@@ -26,8 +40,8 @@ def main():
     print("\n🎯 Testing BiRefNet (Default)...")
     test_image = create_test_image()
     
-    response = requests.post(
-        'http://localhost:5005/api/products/remove-background',
+    response = remove_background(
+        'http://localhost:5005',
         files={'image': ('test.png', test_image, 'image/png')},
         data={
             'model_type': 'rembg',
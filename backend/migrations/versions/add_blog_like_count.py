@@ -0,0 +1,31 @@
+"""add blog post like count
+
+Revision ID: add_blog_like_count
+Revises: add_product_counters
+Create Date: 2026-10-17 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_blog_like_count'
+down_revision = 'add_product_counters'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    from app.utils.product_counters import reconcile_blog_like_counts
+
+    with op.batch_alter_table('blog_post', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('like_count', sa.Integer(), nullable=False, server_default='0'))
+
+    # Fill the counter from existing likes
+    reconcile_blog_like_counts(op.get_bind())
+
+
+def downgrade():
+    with op.batch_alter_table('blog_post', schema=None) as batch_op:
+        batch_op.drop_column('like_count')
@@ -0,0 +1,33 @@
+"""add catalog indexes
+
+Revision ID: add_catalog_indexes
+Revises: add_product_search_index
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_catalog_indexes'
+down_revision = 'add_product_search_index'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ('ix_product_active_category_created', 'product', ['is_active', 'category_id', 'created_at']),
+    ('ix_product_active_created_id', 'product', ['is_active', 'created_at', 'id']),
+    ('ix_product_active_price_id', 'product', ['is_active', 'price', 'id']),
+    ('ix_product_featured_active', 'product', ['is_featured', 'is_active']),
+    ('ix_product_review_product_approved_created', 'product_review', ['product_id', 'is_approved', 'created_at']),
+]
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,30 @@
+"""add email queue and log indexes
+
+Revision ID: add_email_indexes
+Revises: add_order_cart_indexes
+Create Date: 2026-10-17 14:10:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_email_indexes'
+down_revision = 'add_order_cart_indexes'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ('ix_email_queue_status_priority_created', 'email_queue', ['status', 'priority', 'created_at']),
+    ('ix_email_log_status_created', 'email_log', ['status', 'created_at']),
+]
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
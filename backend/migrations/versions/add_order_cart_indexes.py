@@ -0,0 +1,38 @@
+"""add order, cart, user and invoice indexes
+
+Revision ID: add_order_cart_indexes
+Revises: add_catalog_indexes
+Create Date: 2026-10-17 14:05:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_order_cart_indexes'
+down_revision = 'add_catalog_indexes'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ('ix_order_user_created', 'order', ['user_id', 'created_at']),
+    ('ix_order_status', 'order', ['status']),
+    ('ix_order_created_at_id', 'order', ['created_at', 'id']),
+    ('ix_order_item_order', 'order_item', ['order_id']),
+    ('ix_order_item_product', 'order_item', ['product_id']),
+    ('ix_cart_session', 'cart', ['session_id']),
+    ('ix_cart_user', 'cart', ['user_id']),
+    ('ix_cart_item_cart_product', 'cart_item', ['cart_id', 'product_id']),
+    ('ix_user_created_at_id', 'user', ['created_at', 'id']),
+    ('ix_invoice_date_id', 'invoice', ['invoice_date', 'id']),
+]
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,32 @@
+"""add page snapshot table
+
+Revision ID: add_page_snapshot_table
+Revises: add_email_indexes
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_page_snapshot_table'
+down_revision = 'add_email_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('page_snapshot',
+    sa.Column('key', sa.String(length=50), nullable=False),
+    sa.Column('sections', sa.JSON(), nullable=False),
+    sa.Column('section_built_at', sa.JSON(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('etag', sa.String(length=64), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('key')
+    )
+
+
+def downgrade():
+    op.drop_table('page_snapshot')
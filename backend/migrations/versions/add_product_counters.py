@@ -0,0 +1,42 @@
+"""add product counters
+
+Revision ID: add_product_counters
+Revises: add_page_snapshot_table
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_product_counters'
+down_revision = 'add_page_snapshot_table'
+branch_labels = None
+depends_on = None
+
+COLUMNS = [
+    ('units_sold', sa.Integer()),
+    ('revenue', sa.Float()),
+    ('order_count', sa.Integer()),
+    ('like_count', sa.Integer()),
+    ('review_count', sa.Integer()),
+    ('rating_total', sa.Integer()),
+]
+
+
+def upgrade():
+    from app.utils.product_counters import reconcile_product_counters
+
+    with op.batch_alter_table('product', schema=None) as batch_op:
+        for name, column_type in COLUMNS:
+            batch_op.add_column(sa.Column(name, column_type, nullable=False, server_default='0'))
+
+    # Fill the counters from existing orders, likes and reviews
+    reconcile_product_counters(op.get_bind())
+
+
+def downgrade():
+    with op.batch_alter_table('product', schema=None) as batch_op:
+        for name, _ in reversed(COLUMNS):
+            batch_op.drop_column(name)
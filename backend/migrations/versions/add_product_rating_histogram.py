@@ -0,0 +1,35 @@
+"""add product rating histogram
+
+Revision ID: add_product_rating_histogram
+Revises: add_blog_like_count
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_product_rating_histogram'
+down_revision = 'add_blog_like_count'
+branch_labels = None
+depends_on = None
+
+COLUMNS = [f'rating_{star}_count' for star in range(1, 6)]
+
+
+def upgrade():
+    from app.utils.product_counters import reconcile_product_counters
+
+    with op.batch_alter_table('product', schema=None) as batch_op:
+        for name in COLUMNS:
+            batch_op.add_column(sa.Column(name, sa.Integer(), nullable=False, server_default='0'))
+
+    # Fill the histogram from existing reviews
+    reconcile_product_counters(op.get_bind())
+
+
+def downgrade():
+    with op.batch_alter_table('product', schema=None) as batch_op:
+        for name in reversed(COLUMNS):
+            batch_op.drop_column(name)
@@ -0,0 +1,39 @@
+"""add product search index
+
+Revision ID: add_product_search_index
+Revises: add_product_image_variants
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_product_search_index'
+down_revision = 'add_product_image_variants'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    from app.utils.product_search import SQLITE_SETUP, POSTGRES_SETUP
+
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        for statement in SQLITE_SETUP:
+            op.execute(statement)
+        op.execute("INSERT INTO product_search(product_search) VALUES ('rebuild')")
+    elif dialect == 'postgresql':
+        for statement in POSTGRES_SETUP:
+            op.execute(statement)
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        for trigger in ('product_search_ai', 'product_search_ad', 'product_search_au'):
+            op.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+        op.execute('DROP TABLE IF EXISTS product_search')
+    elif dialect == 'postgresql':
+        op.execute('DROP INDEX IF EXISTS ix_product_search_vector')
+        op.execute('ALTER TABLE product DROP COLUMN IF EXISTS search_vector')
@@ -0,0 +1,36 @@
+"""store site settings as per-section documents
+
+Revision ID: add_settings_sections
+Revises: add_settings_version
+Create Date: 2026-10-17 23:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_settings_sections'
+down_revision = 'add_settings_version'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    from app.utils.settings_store import import_legacy_settings
+    op.create_table('settings_section',
+    sa.Column('section', sa.String(length=50), nullable=False),
+    sa.Column('data', sa.JSON(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('section')
+    )
+    # The site_settings row is kept as it was; its values are copied over
+    import_legacy_settings(op.get_bind())
+
+
+def downgrade():
+    from app.utils.settings_store import export_legacy_settings
+    # Carry edits made since the upgrade back into the site_settings row
+    export_legacy_settings(op.get_bind())
+    op.drop_table('settings_section')
@@ -0,0 +1,26 @@
+"""add site settings version
+
+Revision ID: add_settings_version
+Revises: add_product_rating_histogram
+Create Date: 2026-10-17 21:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_settings_version'
+down_revision = 'add_product_rating_histogram'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('site_settings', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('settings_version', sa.Integer(), nullable=False, server_default='1'))
+
+
+def downgrade():
+    with op.batch_alter_table('site_settings', schema=None) as batch_op:
+        batch_op.drop_column('settings_version')
@@ -0,0 +1,26 @@
+"""add site stylesheet url
+
+Revision ID: add_site_stylesheet_url
+Revises: add_settings_sections
+Create Date: 2026-10-18 00:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_site_stylesheet_url'
+down_revision = 'add_settings_sections'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('site_settings', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('site_stylesheet_url', sa.String(length=255), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('site_settings', schema=None) as batch_op:
+        batch_op.drop_column('site_stylesheet_url')
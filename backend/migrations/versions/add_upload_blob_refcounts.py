@@ -0,0 +1,34 @@
+"""add upload blob refcounts
+
+Revision ID: add_upload_blob_refcounts
+Revises: drop_site_stylesheet_url
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_upload_blob_refcounts'
+down_revision = 'drop_site_stylesheet_url'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    from app.utils.upload_store import reconcile_upload_refcounts
+
+    op.create_table('upload_blob',
+    sa.Column('url', sa.String(length=255), nullable=False),
+    sa.Column('refcount', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('url')
+    )
+
+    # Count the references already stored in products, categories, posts and settings
+    reconcile_upload_refcounts(op.get_bind())
+
+
+def downgrade():
+    op.drop_table('upload_blob')
@@ -0,0 +1,27 @@
+"""drop site settings version
+
+Revision ID: drop_settings_version
+Revises: add_site_stylesheet_url
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'drop_settings_version'
+down_revision = 'add_site_stylesheet_url'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Settings versions are kept per section in settings_section
+    with op.batch_alter_table('site_settings', schema=None) as batch_op:
+        batch_op.drop_column('settings_version')
+
+
+def downgrade():
+    with op.batch_alter_table('site_settings', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('settings_version', sa.Integer(), nullable=False, server_default='1'))
@@ -0,0 +1,27 @@
+"""drop site stylesheet url
+
+Revision ID: drop_site_stylesheet_url
+Revises: drop_settings_version
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'drop_site_stylesheet_url'
+down_revision = 'drop_settings_version'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # The URL is kept in the 'stylesheet' settings section
+    with op.batch_alter_table('site_settings', schema=None) as batch_op:
+        batch_op.drop_column('site_stylesheet_url')
+
+
+def downgrade():
+    with op.batch_alter_table('site_settings', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('site_stylesheet_url', sa.String(length=255), nullable=True))
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Rebuild the product full-text search index
+Usage: python rebuild_search_index.py
+
+The index is created on the first search and kept in sync by the
+database itself; run this after restoring a backup or after changing
+product rows outside the application with triggers disabled.
+"""
+
+import sys
+import os
+
+# Add the parent directory to the path to import the app
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import create_app
+from app.utils.product_search import get_product_search
+
+
+def main():
+    app = create_app()
+    with app.app_context():
+        backend = get_product_search().rebuild()
+
+    if backend == 'like':
+        print("⚠️  No full-text support for this database - search uses LIKE")
+    else:
+        print(f"✅ Product search index rebuilt ({backend})")
+
+
+if __name__ == '__main__':
+    main()
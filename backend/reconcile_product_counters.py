@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Recompute the denormalized product counters from scratch
+Usage: python reconcile_product_counters.py
+
+units_sold, revenue, order_count, like_count, review_count,
+rating_total and blog post like counts are kept up to date on every
+commit; run this from cron (e.g. nightly) or after editing orders,
+likes or reviews with raw SQL.
+Reports how many products had drifted.
+"""
+
+import sys
+import os
+
+# Add the parent directory to the path to import the app
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import create_app, db
+from app.models.models import Product
+from app.utils.product_counters import COUNTER_COLUMNS, reconcile_product_counters, reconcile_blog_like_counts
+
+
+def read_counters():
+    columns = [getattr(Product, column) for column in COUNTER_COLUMNS]
+    return {row[0]: tuple(row[1:]) for row in db.session.query(Product.id, *columns)}
+
+
+def main():
+    app = create_app()
+    with app.app_context():
+        before = read_counters()
+        products = reconcile_product_counters(db.session.connection())
+        posts = reconcile_blog_like_counts(db.session.connection())
+        db.session.commit()
+        after = read_counters()
+
+    drifted = [product_id for product_id, counters in after.items() if before.get(product_id) != counters]
+    print(f"✅ Reconciled counters of {products} products and {posts} blog posts")
+    if drifted:
+        print(f"⚠️  {len(drifted)} products had drifted: {', '.join(map(str, drifted[:20]))}"
+              f"{' ...' if len(drifted) > 20 else ''}")
+
+
+if __name__ == '__main__':
+    main()
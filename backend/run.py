@@ -1,5 +1,6 @@
 from app import create_app, db
 from app.models.models import User, Category, Product, Order, OrderItem, BlogPost, ContactMessage, VariationType, VariationOption, ProductVariation, SiteSettings
+from app.utils.settings_store import get_settings_store
 import os
 from dotenv import load_dotenv
 
@@ -286,7 +287,8 @@ def create_default_site_settings():
     """Create default site settings if they don't exist"""
     try:
         with app.app_context():
-            if not SiteSettings.query.first():
+            # Seeds the legacy row; the settings store imports it on first load
+            if get_settings_store().load() is None:
                 settings = SiteSettings(
                     site_name='PEBDEQ',
                     site_logo='/images/logo.png',
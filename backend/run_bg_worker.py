@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Run the background removal worker pool as its own service
+Usage: BG_WORKER_MODE=external python run_bg_worker.py
+
+Web workers with BG_WORKER_MODE=external only enqueue jobs; this process
+supervises the host's inference workers (BG_WORKERS, sized to the host's
+cores and RAM by default). Run one per host, e.g. under systemd.
+"""
+
+import sys
+import os
+import signal
+
+# Add the parent directory to the path to import the app
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from dotenv import load_dotenv
+from app.utils.background_jobs import get_background_job_manager
+
+
+def main():
+    load_dotenv()
+    manager = get_background_job_manager()
+
+    def stop(signum, frame):
+        raise SystemExit(0)
+
+    signal.signal(signal.SIGTERM, stop)
+    try:
+        manager.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print("🛑 Stopping background removal workers...")
+        manager.shutdown()
+
+
+if __name__ == '__main__':
+    main()
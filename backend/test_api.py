@@ -3,10 +3,24 @@
 🧪 Background Removal API Test
 """
 
+import time
 import requests
 from PIL import Image
 from io import BytesIO
 
+def remove_background(api_url, files, data, timeout=60):
+    """Queue a background removal job, wait for it and return the response with its JSON result"""
+    submitted = requests.post(f'{api_url}/api/products/remove-background/jobs', files=files, data=data, timeout=10)
+    if submitted.status_code != 202:
+        return submitted
+    urls = submitted.json()
+    job = urls['job']
+    deadline = time.time() + timeout
+    while job['status'] in ('pending', 'running') and time.time() < deadline:
+        time.sleep(0.5)
+        job = requests.get(api_url + urls['status_url'], timeout=10).json()['job']
+    return requests.get(api_url + urls['result_url'], params={'format': 'json'}, timeout=10)
+
 def test_background_removal_api():
     """Test the background removal API"""
     print("🧪 Testing Background Removal API...")
@@ -21,8 +35,8 @@ def test_background_removal_api():
         print("✅ Test image created")
         
         # Test API
-        response = requests.post(
-            'http://localhost:5005/api/products/remove-background',
+        response = remove_background(
+            'http://localhost:5005',
             files={'image': ('test.png', buffer, 'image/png')},
             data={'model_type': 'rembg'}
         )
@@ -85,7 +85,7 @@ def test_api_compatibility():
     try:
         # Test that API endpoint still works
         print("   API endpoint available for testing with:")
-        print("   POST /api/products/remove-background")
+        print("   POST /api/products/remove-background/jobs (then poll the job)")
         print("   Parameters:")
         print("   - image: image file")
         print("   - model_preference: 'fast' or 'premium'")
@@ -493,39 +493,78 @@ const BackgroundRemovalModal = ({
     formData.append('model_type', 'smart');
     formData.append('model_preference', speedMode); // fast or premium
 
-    const backgroundRemovalResponse = await fetch(getApiUrl('/api/products/remove-background'), {
+    // Queue the job for the server's worker pool, then poll it
+    const submitResponse = await fetch(getApiUrl('/api/products/remove-background/jobs'), {
       method: 'POST',
       body: formData
     });
 
-    if (backgroundRemovalResponse.ok) {
-      const result = await backgroundRemovalResponse.json();
-      
-      // Update preview
-      setImagePreviews(prev => ({
-        ...prev,
-        [imageIndex]: result.preview
-      }));
-      
-      // Update state to show preview
-      setImageStates(prev => ({
-        ...prev,
-        [imageIndex]: 'preview'
-      }));
-      
-            const modeName = 'Web Standart Model';
-      const qualityInfo = '';
-      toast.success(`⚡ Background removed using ${modeName}${qualityInfo} in ${result.processing_time}!`);
-    } else {
-      const error = await backgroundRemovalResponse.json();
-      toast.error(`Web processing failed: ${error.error}`);
-      
-      // Reset state
+    const resetState = () => {
       setImageStates(prev => ({
         ...prev,
         [imageIndex]: 'none'
       }));
+    };
+
+    if (!submitResponse.ok) {
+      const error = await submitResponse.json();
+      if (submitResponse.status === 429) {
+        toast.error(`⏳ Background removal is busy, please retry in ${error.retry_after || 5} seconds`);
+      } else {
+        toast.error(`Web processing failed: ${error.error}`);
+      }
+      resetState();
+      return;
     }
+
+    const { job, status_url: statusUrl } = await submitResponse.json();
+    const poll = async () => {
+      try {
+        const statusResponse = await fetch(getApiUrl(statusUrl));
+        const { job: current } = await statusResponse.json();
+
+        if (!statusResponse.ok || !current) {
+          throw new Error('Job not found');
+        }
+
+        if (current.status === 'pending' || current.status === 'running') {
+          setTimeout(poll, 1000);
+          return;
+        }
+
+        if (current.status !== 'done') {
+          throw new Error(current.error || `Job ${current.status}`);
+        }
+
+        const resultResponse = await fetch(getApiUrl(`${statusUrl}/result?format=json`));
+        const result = await resultResponse.json();
+        if (!resultResponse.ok) {
+          throw new Error(result.error);
+        }
+
+        // Update preview
+        setImagePreviews(prev => ({
+          ...prev,
+          [imageIndex]: result.preview
+        }));
+
+        // Update state to show preview
+        setImageStates(prev => ({
+          ...prev,
+          [imageIndex]: 'preview'
+        }));
+
+        const modeName = 'Web Standart Model';
+        const qualityInfo = '';
+        toast.success(`⚡ Background removed using ${modeName}${qualityInfo} in ${result.processing_time}!`);
+      } catch (error) {
+        console.error(`❌ Web processing job ${job.id} failed:`, error);
+        toast.error(`Web processing failed: ${error.message}`);
+        resetState();
+      }
+    };
+
+    poll();
   };
 
   const handleDesktopProcessing = async (imageUrl, imageIndex) => {
@@ -2,6 +2,57 @@ import { useState, useEffect } from 'react';
 import { useAuth } from '../contexts/AuthContext';
 import { toast } from 'react-hot-toast';
 
+// Product like statuses requested in the same tick (e.g. a product grid) share one request
+let pendingProductIds = new Map();
+let batchTimer = null;
+
+const flushProductLikeStatuses = async () => {
+  const pending = pendingProductIds;
+  pendingProductIds = new Map();
+  batchTimer = null;
+
+  const token = localStorage.getItem('token');
+  const headers = { 'Content-Type': 'application/json' };
+  if (token) {
+    headers.Authorization = `Bearer ${token}`;
+  }
+
+  const ids = [...pending.keys()];
+  try {
+    const statuses = {};
+    // The endpoint takes at most 100 ids per request
+    for (let i = 0; i < ids.length; i += 100) {
+      const response = await fetch('/api/products/like-status', {
+        method: 'POST',
+        headers: headers,
+        body: JSON.stringify({ product_ids: ids.slice(i, i + 100) })
+      });
+      if (!response.ok) {
+        throw new Error(`like-status ${response.status}`);
+      }
+      const data = await response.json();
+      const liked = new Set(data.liked);
+      Object.entries(data.like_counts).forEach(([id, count]) => {
+        statuses[id] = { is_liked: liked.has(Number(id)), like_count: count };
+      });
+    }
+    pending.forEach((callbacks, id) => {
+      callbacks.forEach(({ resolve }) => resolve(statuses[id] || null));
+    });
+  } catch (error) {
+    pending.forEach((callbacks) => callbacks.forEach(({ reject }) => reject(error)));
+  }
+};
+
+const loadProductLikeStatus = (productId) => new Promise((resolve, reject) => {
+  const callbacks = pendingProductIds.get(productId) || [];
+  callbacks.push({ resolve, reject });
+  pendingProductIds.set(productId, callbacks);
+  if (!batchTimer) {
+    batchTimer = setTimeout(flushProductLikeStatuses, 0);
+  }
+});
+
 const LikeButton = ({ type, itemId, className = '' }) => {
   const { user } = useAuth();
   const [isLiked, setIsLiked] = useState(false);
@@ -16,6 +67,15 @@ const LikeButton = ({ type, itemId, className = '' }) => {
 
   const fetchLikeStatus = async () => {
     try {
+      if (type !== 'blog') {
+        const data = await loadProductLikeStatus(itemId);
+        if (data) {
+          setIsLiked(data.is_liked);
+          setLikeCount(data.like_count);
+        }
+        return;
+      }
+
       const token = localStorage.getItem('token');
       const headers = {
         'Content-Type': 'application/json'
@@ -34,7 +34,7 @@ const About = () => {
   const fetchAboutData = async () => {
     try {
       setLoading(true);
-      const response = await fetch(createApiUrl('api/site-settings'));
+      const response = await fetch(createApiUrl('api/site-settings?sections=about_page'));
       
       if (response.ok) {
         const data = await response.json();
@@ -31,6 +31,8 @@ const ProductDetail = () => {
   };
   const [relatedProducts, setRelatedProducts] = useState([]);
   const [productReviews, setProductReviews] = useState([]);
+  const [reviewSummary, setReviewSummary] = useState(null);
+  const [reviewsPagination, setReviewsPagination] = useState(null);
   const [userReview, setUserReview] = useState({ rating: 5, comment: '' });
   
   // Listen for theme settings updates and force re-render
@@ -74,6 +76,7 @@ const ProductDetail = () => {
       if (response.ok) {
         const data = await response.json();
         setProduct(data.product);
+        setReviewSummary(data.product.review_summary || null);
         // Set default variation if product has variations
         if (data.product.has_variations && data.product.variation_options && data.product.variation_options.length > 0) {
           setSelectedVariation(data.product.variation_options[0]);
@@ -111,12 +114,15 @@ const ProductDetail = () => {
     }
   };
 
-  const fetchProductReviews = async (productId) => {
+  const fetchProductReviews = async (productId, page = 1) => {
     try {
-      const response = await fetch(`/api/products/${productId}/reviews`);
+      const response = await fetch(`/api/products/${productId}/reviews?page=${page}`);
       if (response.ok) {
         const data = await response.json();
-        setProductReviews(data.reviews || []);
+        // Later pages are appended ("load more")
+        setProductReviews(prev => (page > 1 ? [...prev, ...(data.reviews || [])] : (data.reviews || [])));
+        setReviewSummary(data.summary || null);
+        setReviewsPagination(data.pagination || null);
       }
     } catch (error) {
       console.error('Error fetching product reviews:', error);
@@ -651,7 +657,7 @@ const ProductDetail = () => {
                   className={`tab-btn ${activeTab === 'reviews' ? 'active' : ''}`}
                   onClick={() => setActiveTab('reviews')}
                 >
-                  Yorumlar ({productReviews.length})
+                  Yorumlar ({reviewSummary ? reviewSummary.review_count : productReviews.length})
                 </button>
                 <button 
                   className={`tab-btn ${activeTab === 'shipping' ? 'active' : ''}`}
@@ -782,6 +788,35 @@ const ProductDetail = () => {
                       </div>
                     )}
 
+                    {/* Rating Summary */}
+                    {reviewSummary && reviewSummary.review_count > 0 && (
+                      <div className="review-summary">
+                        <div className="review-summary-average">
+                          <strong>{reviewSummary.average_rating}</strong>
+                          <span className="rating">
+                            {'★'.repeat(Math.round(reviewSummary.average_rating))}{'☆'.repeat(5 - Math.round(reviewSummary.average_rating))}
+                          </span>
+                          <span>{reviewSummary.review_count} yorum</span>
+                        </div>
+                        <div className="review-histogram">
+                          {Object.entries(reviewSummary.histogram)
+                            .sort(([a], [b]) => b - a)
+                            .map(([stars, count]) => (
+                              <div key={stars} className="histogram-row">
+                                <span>{stars} ★</span>
+                                <div className="histogram-bar">
+                                  <div
+                                    className="histogram-fill"
+                                    style={{ width: `${(count / reviewSummary.review_count) * 100}%` }}
+                                  />
+                                </div>
+                                <span>{count}</span>
+                              </div>
+                            ))}
+                        </div>
+                      </div>
+                    )}
+
                     {/* Reviews List */}
                     <div className="reviews-list">
                       {productReviews.length > 0 ? (
@@ -802,6 +837,14 @@ const ProductDetail = () => {
                       ) : (
                         <p>Henüz yorum yok. Bu ürüne ilk yorum yapan siz olun!</p>
                       )}
+                      {reviewsPagination && reviewsPagination.has_next && (
+                        <button
+                          className="btn btn-secondary"
+                          onClick={() => fetchProductReviews(product.id, reviewsPagination.page + 1)}
+                        >
+                          Daha Fazla Yorum
+                        </button>
+                      )}
                     </div>
                   </div>
                 )}
@@ -1706,6 +1749,47 @@ const ProductDetail = () => {
             margin-top: 1.5rem;
           }
 
+          .review-summary {
+            display: flex;
+            gap: 2rem;
+            align-items: center;
+            margin-top: 1.5rem;
+          }
+
+          .review-summary-average {
+            display: flex;
+            flex-direction: column;
+            align-items: center;
+          }
+
+          .review-summary-average strong {
+            font-size: 2rem;
+          }
+
+          .review-histogram {
+            flex: 1;
+          }
+
+          .histogram-row {
+            display: flex;
+            align-items: center;
+            gap: 0.5rem;
+            font-size: 0.875rem;
+          }
+
+          .histogram-bar {
+            flex: 1;
+            height: 8px;
+            background: #eee;
+            border-radius: 4px;
+            overflow: hidden;
+          }
+
+          .histogram-fill {
+            height: 100%;
+            background: #ffd700;
+          }
+
           .review-item {
             padding: 1rem;
             border: 1px solid #eee;
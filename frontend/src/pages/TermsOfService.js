@@ -7,7 +7,7 @@ const TermsOfService = () => {
 
   const fetchSiteSettings = async () => {
     try {
-      const response = await fetch(createApiUrl('api/site-settings'));
+      const response = await fetch(createApiUrl('api/site-settings?sections=footer'));
       if (response.ok) {
         const data = await response.json();
         setSiteSettings(data);
@@ -61,12 +61,29 @@ export const getResolvedStyle = (siteSettingValue, fallbackCssVar) => {
 
 /**
  * Apply theme-synced styles to document
- * This is now mainly for CSS variable fallbacks
+ * Links the stylesheet the backend compiles from the settings and the active theme;
+ * the CSS variables are only set at runtime when there is no compiled stylesheet yet
  * @param {Object} siteSettings - Site settings object
  */
 export const applyThemeSyncedStyles = (siteSettings) => {
   if (!siteSettings) return;
 
+  if (siteSettings.site_stylesheet_url) {
+    // Content-hashed URL, so the browser caches it until the settings change
+    const href = createApiUrl(siteSettings.site_stylesheet_url);
+    let link = document.querySelector('link[data-site-stylesheet]');
+    if (!link) {
+      link = document.createElement('link');
+      link.rel = 'stylesheet';
+      link.setAttribute('data-site-stylesheet', 'true');
+      document.head.appendChild(link);
+    }
+    if (link.getAttribute('href') !== href) {
+      link.setAttribute('href', href);
+    }
+    return;
+  }
+
   const root = document.documentElement;
   
   // Apply site settings as CSS variables for fallback
@@ -307,6 +307,36 @@ class TestAdminAPI(unittest.TestCase):
                 'message': f'Error testing products list: {str(e)}'
             })
     
+    def test_response_cache_stats(self):
+        """Test response cache stats endpoint"""
+        test_name = "Response Cache Stats"
+        try:
+            response = self.api_client.make_request(
+                'GET', 
+                '/api/admin/cache/stats',
+                headers={'Authorization': self.admin_token}
+            )
+            
+            if response and 'hits' in response and 'misses' in response:
+                self.results.append({
+                    'test': test_name,
+                    'status': 'PASS',
+                    'message': f"Cache backend {response.get('backend')}, hit rate {response.get('hit_rate')}"
+                })
+            else:
+                self.results.append({
+                    'test': test_name,
+                    'status': 'FAIL',
+                    'message': f'Failed to get cache stats: {response}'
+                })
+                
+        except Exception as e:
+            self.results.append({
+                'test': test_name,
+                'status': 'ERROR',
+                'message': f'Error testing cache stats: {str(e)}'
+            })
+    
     def run_all_tests(self):
         """Run all admin API tests and return results"""
         print("[TEST] Running Admin API Tests...")
@@ -319,7 +349,8 @@ class TestAdminAPI(unittest.TestCase):
             self.test_admin_dashboard_endpoint,
             self.test_admin_health_check,
             self.test_admin_users_list,
-            self.test_admin_products_list
+            self.test_admin_products_list,
+            self.test_response_cache_stats
         ]
         
         all_results = []
@@ -477,6 +477,387 @@ class TestProductAPI(unittest.TestCase):
                 'message': f'Error testing image upload: {str(e)}'
             })
     
+    def test_background_model_pool_stats(self):
+        """Test background removal model pool stats endpoint"""
+        test_name = "Background Model Pool Stats"
+        try:
+            response = self.api_client.make_request(
+                'GET',
+                '/api/products/remove-background/models',
+                headers={'Authorization': f'Bearer {self.admin_token}'}
+            )
+            
+            # One entry per inference worker that has reported (models live in the worker processes)
+            expected_fields = ['loads', 'hits', 'evictions', 'resident_models', 'memory_budget_mb']
+            workers = response.get('workers') if response else None
+            if isinstance(workers, list) and all(field in worker for worker in workers for field in expected_fields):
+                self.results.append({
+                    'test': test_name,
+                    'status': 'PASS',
+                    'message': f'Model pool stats retrieved: {[w.get("resident_models") for w in workers]}'
+                })
+            else:
+                self.results.append({
+                    'test': test_name,
+                    'status': 'FAIL',
+                    'message': f'Model pool stats missing fields: {response}'
+                })
+                
+        except Exception as e:
+            self.results.append({
+                'test': test_name,
+                'status': 'ERROR',
+                'message': f'Error testing model pool stats: {str(e)}'
+            })
+    
+    def test_background_removal_job_not_found(self):
+        """Test polling an unknown background removal job"""
+        test_name = "Background Removal Job Not Found"
+        try:
+            response = self.api_client.make_request(
+                'GET',
+                '/api/products/remove-background/jobs/' + '0' * 32
+            )
+            
+            if response and response.get('error'):
+                self.results.append({
+                    'test': test_name,
+                    'status': 'PASS',
+                    'message': 'Unknown job correctly reported as not found'
+                })
+            else:
+                self.results.append({
+                    'test': test_name,
+                    'status': 'FAIL',
+                    'message': f'Unknown job should return an error: {response}'
+                })
+                
+        except Exception as e:
+            self.results.append({
+                'test': test_name,
+                'status': 'ERROR',
+                'message': f'Error testing job polling: {str(e)}'
+            })
+    
+    def test_product_list_srcset_data(self):
+        """Test public product list returns srcset data for every image"""
+        test_name = "Product List Srcset Data"
+        try:
+            response = self.api_client.make_request('GET', '/api/products/')
+            
+            products = response.get('products', []) if response else None
+            if products is not None and all(
+                len(p.get('image_srcset', [])) == len(p.get('images') or []) for p in products
+            ):
+                self.results.append({
+                    'test': test_name,
+                    'status': 'PASS',
+                    'message': f'Srcset data returned for {len(products)} products'
+                })
+            else:
+                self.results.append({
+                    'test': test_name,
+                    'status': 'FAIL',
+                    'message': f'Product list missing image_srcset: {response}'
+                })
+                
+        except Exception as e:
+            self.results.append({
+                'test': test_name,
+                'status': 'ERROR',
+                'message': f'Error testing srcset data: {str(e)}'
+            })
+    
+    def test_product_search_highlights(self):
+        """Test full-text product search returns highlighted matches"""
+        test_name = "Product Search Highlights"
+        try:
+            response = self.api_client.make_request('GET', '/api/products/search?q=a')
+            
+            products = response.get('products', []) if response else None
+            if products is not None and all('highlight' in p for p in products):
+                self.results.append({
+                    'test': test_name,
+                    'status': 'PASS',
+                    'message': f'Search returned {len(products)} highlighted products'
+                })
+            else:
+                self.results.append({
+                    'test': test_name,
+                    'status': 'FAIL',
+                    'message': f'Search results missing highlights: {response}'
+                })
+                
+        except Exception as e:
+            self.results.append({
+                'test': test_name,
+                'status': 'ERROR',
+                'message': f'Error testing product search: {str(e)}'
+            })
+    
+    def test_product_suggest_endpoint(self):
+        """Test autocomplete suggestions endpoint"""
+        test_name = "Product Suggest Endpoint"
+        try:
+            response = self.api_client.make_request('GET', '/api/products/suggest?q=a')
+            
+            if response and isinstance(response.get('suggestions'), list):
+                self.results.append({
+                    'test': test_name,
+                    'status': 'PASS',
+                    'message': f"{len(response['suggestions'])} suggestions in {response.get('took_ms')} ms"
+                })
+            else:
+                self.results.append({
+                    'test': test_name,
+                    'status': 'FAIL',
+                    'message': f'Suggest endpoint failed: {response}'
+                })
+                
+        except Exception as e:
+            self.results.append({
+                'test': test_name,
+                'status': 'ERROR',
+                'message': f'Error testing suggest endpoint: {str(e)}'
+            })
+    
+    def test_product_list_facets(self):
+        """Test product list returns facet counts matching its total"""
+        test_name = "Product List Facets"
+        try:
+            response = self.api_client.make_request('GET', '/api/products/')
+            
+            facets = response.get('facets') if response else None
+            total = response.get('pagination', {}).get('total') if response else None
+            if facets and sum(entry['count'] for entry in facets.get('in_stock', [])) == total:
+                self.results.append({
+                    'test': test_name,
+                    'status': 'PASS',
+                    'message': f"Facets returned for {total} products, {len(facets.get('category', []))} categories"
+                })
+            else:
+                self.results.append({
+                    'test': test_name,
+                    'status': 'FAIL',
+                    'message': f'Product list facets missing or inconsistent: {response}'
+                })
+                
+        except Exception as e:
+            self.results.append({
+                'test': test_name,
+                'status': 'ERROR',
+                'message': f'Error testing product facets: {str(e)}'
+            })
+    
+    def test_product_list_cursor_pagination(self):
+        """Test cursor pages of the product list do not overlap"""
+        test_name = "Product List Cursor Pagination"
+        try:
+            first = self.api_client.make_request('GET', '/api/products/?cursor=&per_page=2&sort=price_low')
+            pagination = first.get('pagination', {}) if first else {}
+            if not first or 'products' not in first:
+                self.results.append({
+                    'test': test_name,
+                    'status': 'FAIL',
+                    'message': f'Cursor mode not supported: {first}'
+                })
+                return
+            
+            if not pagination.get('next_cursor'):
+                self.results.append({
+                    'test': test_name,
+                    'status': 'PASS',
+                    'message': f"Single cursor page of {len(first['products'])} products"
+                })
+                return
+            
+            second = self.api_client.make_request(
+                'GET', f"/api/products/?cursor={pagination['next_cursor']}&per_page=2&sort=price_low")
+            first_ids = {p['id'] for p in first['products']}
+            second_ids = {p['id'] for p in (second or {}).get('products', [])}
+            if second_ids and not first_ids & second_ids:
+                self.results.append({
+                    'test': test_name,
+                    'status': 'PASS',
+                    'message': f"Cursor pages returned {len(first_ids)} + {len(second_ids)} distinct products"
+                })
+            else:
+                self.results.append({
+                    'test': test_name,
+                    'status': 'FAIL',
+                    'message': f'Second cursor page empty or overlapping: {second}'
+                })
+                
+        except Exception as e:
+            self.results.append({
+                'test': test_name,
+                'status': 'ERROR',
+                'message': f'Error testing cursor pagination: {str(e)}'
+            })
+    
+    def test_public_endpoint_query_counts(self):
+        """Test public endpoints run an exact number of SQL statements once warm (no N+1 queries)"""
+        test_name = "Public Endpoint Query Counts"
+        # Exact counts that must not grow with the number of products or categories
+        # (no_cache=1 skips the response cache so the queries are actually run)
+        pinned = {
+            '/': 1,
+            '/api/categories?no_cache=1': 2,
+            '/api/products/?no_cache=1': 2
+        }
+        try:
+            # Counted in-process against the backend's database, not via the live server
+            from app import create_app
+            from app.utils.query_counter import assert_query_count
+        except ImportError as e:
+            self.results.append({
+                'test': test_name,
+                'status': 'SKIP',
+                'message': f'Backend not importable in-process: {str(e)}'
+            })
+            return
+        try:
+            import time
+            client = create_app().test_client()
+            # The first requests build the home snapshot and in-memory indexes
+            for endpoint in pinned:
+                client.get(endpoint)
+            time.sleep(1)
+            
+            failures = {}
+            for endpoint, expected in pinned.items():
+                try:
+                    with assert_query_count(expected):
+                        response = client.get(endpoint)
+                    if response.status_code != 200:
+                        failures[endpoint] = f'HTTP {response.status_code}'
+                except AssertionError as e:
+                    failures[endpoint] = str(e)
+            
+            if not failures:
+                self.results.append({
+                    'test': test_name,
+                    'status': 'PASS',
+                    'message': f'Query counts match: {pinned}'
+                })
+            else:
+                self.results.append({
+                    'test': test_name,
+                    'status': 'FAIL',
+                    'message': f'Query counts differ: {failures}'
+                })
+                
+        except Exception as e:
+            self.results.append({
+                'test': test_name,
+                'status': 'ERROR',
+                'message': f'Error testing query counts: {str(e)}'
+            })
+    
+    def test_public_catalog_cache(self):
+        """Test repeat catalog GETs are served from the response cache and revalidate with a 304"""
+        test_name = "Public Catalog Cache"
+        try:
+            failures = []
+            for endpoint in ('/api/categories', '/api/products/', '/api/blog'):
+                self.api_client.get(endpoint)
+                second = self.api_client.get(endpoint)
+                etag = second.headers.get('ETag')
+                if second.status_code != 200 or second.headers.get('X-Cache') != 'HIT' or not etag:
+                    failures.append(f"{endpoint}: status {second.status_code}, X-Cache {second.headers.get('X-Cache')}")
+                    continue
+                revalidated = self.api_client._make_request('GET', endpoint, headers={'If-None-Match': etag})
+                if revalidated.status_code != 304:
+                    failures.append(f'{endpoint}: expected 304 for a matching ETag, got {revalidated.status_code}')
+            
+            if not failures:
+                self.results.append({
+                    'test': test_name,
+                    'status': 'PASS',
+                    'message': 'Categories, products and blog served from the response cache'
+                })
+            else:
+                self.results.append({
+                    'test': test_name,
+                    'status': 'FAIL',
+                    'message': f"Not cached: {'; '.join(failures)}"
+                })
+                
+        except Exception as e:
+            self.results.append({
+                'test': test_name,
+                'status': 'ERROR',
+                'message': f'Error testing catalog cache: {str(e)}'
+            })
+    
+    def test_bulk_like_status(self):
+        """Test like counts for several products come back from one request"""
+        test_name = "Bulk Like Status"
+        try:
+            products = self.api_client.make_request('GET', '/api/products/?per_page=5')
+            product_ids = [p['id'] for p in (products or {}).get('products', [])]
+            response = self.api_client.make_request('POST', '/api/products/like-status',
+                                                    json={'product_ids': product_ids})
+            
+            counts = response.get('like_counts') if response else None
+            if counts is not None and set(counts) == {str(i) for i in product_ids} \
+                    and isinstance(response.get('liked'), list):
+                self.results.append({
+                    'test': test_name,
+                    'status': 'PASS',
+                    'message': f'Like counts returned for {len(counts)} products'
+                })
+            else:
+                self.results.append({
+                    'test': test_name,
+                    'status': 'FAIL',
+                    'message': f'Bulk like status failed: {response}'
+                })
+                
+        except Exception as e:
+            self.results.append({
+                'test': test_name,
+                'status': 'ERROR',
+                'message': f'Error testing bulk like status: {str(e)}'
+            })
+    
+    def test_product_reviews_summary(self):
+        """Test the review feed is paginated and its summary matches the histogram"""
+        test_name = "Product Reviews Summary"
+        try:
+            products = self.api_client.make_request('GET', '/api/products/?per_page=1')
+            items = (products or {}).get('products', [])
+            if not items:
+                self.results.append({
+                    'test': test_name,
+                    'status': 'PASS',
+                    'message': 'No products to check reviews for'
+                })
+                return
+            
+            response = self.api_client.make_request('GET', f"/api/products/{items[0]['id']}/reviews?per_page=5")
+            summary = response.get('summary') if response else None
+            if summary and sum(summary['histogram'].values()) == summary['review_count'] \
+                    and len(response.get('reviews', [])) <= 5 and 'pagination' in response:
+                self.results.append({
+                    'test': test_name,
+                    'status': 'PASS',
+                    'message': f"{summary['review_count']} reviews, average {summary['average_rating']}"
+                })
+            else:
+                self.results.append({
+                    'test': test_name,
+                    'status': 'FAIL',
+                    'message': f'Review feed missing summary or pagination: {response}'
+                })
+                
+        except Exception as e:
+            self.results.append({
+                'test': test_name,
+                'status': 'ERROR',
+                'message': f'Error testing product reviews: {str(e)}'
+            })
+    
     def get_test_results(self):
         """Return test results"""
         return self.results
@@ -504,7 +885,18 @@ def run_product_api_tests():
         'test_category_analytics',
         'test_product_variations_support',
         'test_public_product_access',
-        'test_product_image_upload_validation'
+        'test_product_image_upload_validation',
+        'test_background_model_pool_stats',
+        'test_background_removal_job_not_found',
+        'test_product_list_srcset_data',
+        'test_product_search_highlights',
+        'test_product_suggest_endpoint',
+        'test_product_list_facets',
+        'test_product_list_cursor_pagination',
+        'test_public_endpoint_query_counts',
+        'test_public_catalog_cache',
+        'test_bulk_like_status',
+        'test_product_reviews_summary'
     ]
     
     all_results = []
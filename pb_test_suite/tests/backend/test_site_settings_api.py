@@ -7,6 +7,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', '..', 'ba
 
 import unittest
 import json
+import time
 from unittest.mock import patch, MagicMock
 from config.test_config import TestConfig
 from helpers.api_client import APIClient
@@ -307,6 +308,175 @@ class TestSiteSettingsAPI(unittest.TestCase):
                 'message': f'Error testing theme settings integration: {str(e)}'
             })
     
+    def test_public_settings_etag(self):
+        """Test public site settings revalidate with a 304 while unchanged"""
+        test_name = "Public Settings ETag"
+        try:
+            first = self.api_client.get('/api/site-settings')
+            etag = first.headers.get('ETag')
+            if first.status_code != 200 or not etag:
+                self.results.append({
+                    'test': test_name,
+                    'status': 'FAIL',
+                    'message': f'No ETag on public settings (status {first.status_code})'
+                })
+                return
+            
+            second = self.api_client._make_request('GET', '/api/site-settings', headers={'If-None-Match': etag})
+            if second.status_code == 304:
+                self.results.append({
+                    'test': test_name,
+                    'status': 'PASS',
+                    'message': f"304 for settings version {first.headers.get('X-Settings-Version')}"
+                })
+            else:
+                self.results.append({
+                    'test': test_name,
+                    'status': 'FAIL',
+                    'message': f'Expected 304 for a matching ETag, got {second.status_code}'
+                })
+                
+        except Exception as e:
+            self.results.append({
+                'test': test_name,
+                'status': 'ERROR',
+                'message': f'Error testing settings ETag: {str(e)}'
+            })
+    
+    def test_public_settings_sections(self):
+        """Test ?sections= returns only the requested groups of keys"""
+        test_name = "Public Settings Sections"
+        try:
+            full = self.api_client.make_request('GET', '/api/site-settings')
+            header = self.api_client.make_request('GET', '/api/site-settings?sections=header')
+            unknown = self.api_client.get('/api/site-settings?sections=no_such_section')
+            
+            if full and header and set(header) < set(full) and 'header_background_color' in header \
+                    and not any(key.startswith('footer_') for key in header) and unknown.status_code == 400:
+                self.results.append({
+                    'test': test_name,
+                    'status': 'PASS',
+                    'message': f'Header section has {len(header)} of {len(full)} keys'
+                })
+            else:
+                self.results.append({
+                    'test': test_name,
+                    'status': 'FAIL',
+                    'message': f'Sectioned settings wrong (unknown section status {unknown.status_code}): {header}'
+                })
+                
+        except Exception as e:
+            self.results.append({
+                'test': test_name,
+                'status': 'ERROR',
+                'message': f'Error testing settings sections: {str(e)}'
+            })
+    
+    def test_update_site_settings_validation(self):
+        """Test settings updates are type checked field by field"""
+        test_name = "Update Site Settings Validation"
+        try:
+            response = self.api_client._make_request(
+                'PUT',
+                '/api/admin/site-settings',
+                headers={'Authorization': f'Bearer {self.admin_token}'},
+                json={'logo_width': 'wide', 'use_logo': 'maybe'}
+            )
+            fields = response.json().get('fields', {}) if response.status_code == 400 else {}
+            
+            if {'logo_width', 'use_logo'} <= set(fields):
+                self.results.append({
+                    'test': test_name,
+                    'status': 'PASS',
+                    'message': f'Invalid fields rejected: {fields}'
+                })
+            else:
+                self.results.append({
+                    'test': test_name,
+                    'status': 'FAIL',
+                    'message': f'Expected 400 with field errors, got {response.status_code}: {response.text[:200]}'
+                })
+                
+        except Exception as e:
+            self.results.append({
+                'test': test_name,
+                'status': 'ERROR',
+                'message': f'Error testing settings validation: {str(e)}'
+            })
+    
+    def test_section_write_isolation(self):
+        """Test saving one section leaves the other stored sections untouched"""
+        test_name = "Settings Section Write Isolation"
+        headers = {'Authorization': f'Bearer {self.admin_token}'}
+        try:
+            original = self.api_client.make_request('GET', '/api/site-settings')['header_background_color']
+            footer = self.api_client.get('/api/site-settings?sections=footer')
+            
+            response = self.api_client._make_request(
+                'PUT', '/api/admin/site-settings', headers=headers,
+                json={'header_background_color': '#123456' if original != '#123456' else '#654321'}
+            )
+            changed_sections = response.json().get('changed_sections') if response.status_code == 200 else None
+            footer_after = self.api_client.get('/api/site-settings?sections=footer')
+            self.api_client._make_request('PUT', '/api/admin/site-settings', headers=headers,
+                                          json={'header_background_color': original})
+            
+            if changed_sections == ['header'] and footer.headers.get('ETag') == footer_after.headers.get('ETag'):
+                self.results.append({
+                    'test': test_name,
+                    'status': 'PASS',
+                    'message': 'Header edit rewrote only the header section'
+                })
+            else:
+                self.results.append({
+                    'test': test_name,
+                    'status': 'FAIL',
+                    'message': f'Changed sections {changed_sections}, footer ETag '
+                               f'{footer.headers.get("ETag")} -> {footer_after.headers.get("ETag")}'
+                })
+                
+        except Exception as e:
+            self.results.append({
+                'test': test_name,
+                'status': 'ERROR',
+                'message': f'Error testing section write isolation: {str(e)}'
+            })
+    
+    def test_site_stylesheet_bundle(self):
+        """Test the settings payload links a compiled, immutable stylesheet"""
+        test_name = "Site Stylesheet Bundle"
+        try:
+            url = None
+            # The first bundle is built in the background
+            for _ in range(10):
+                url = self.api_client.make_request('GET', '/api/site-settings').get('site_stylesheet_url')
+                if url:
+                    break
+                time.sleep(0.5)
+            response = self.api_client.get(url) if url else None
+            
+            if response is not None and response.status_code == 200 \
+                    and 'immutable' in response.headers.get('Cache-Control', '') \
+                    and response.text.startswith(':root{'):
+                self.results.append({
+                    'test': test_name,
+                    'status': 'PASS',
+                    'message': f'{url} ({len(response.content)} bytes)'
+                })
+            else:
+                self.results.append({
+                    'test': test_name,
+                    'status': 'FAIL',
+                    'message': f'Stylesheet missing or not immutable: {url}'
+                })
+                
+        except Exception as e:
+            self.results.append({
+                'test': test_name,
+                'status': 'ERROR',
+                'message': f'Error testing site stylesheet: {str(e)}'
+            })
+    
     def get_test_results(self):
         """Return test results"""
         return self.results
@@ -330,7 +500,12 @@ def run_site_settings_tests():
         'test_update_site_settings_regular_user',
         'test_theme_sync_endpoint',
         'test_google_oauth_settings',
-        'test_theme_settings_integration'
+        'test_theme_settings_integration',
+        'test_public_settings_etag',
+        'test_public_settings_sections',
+        'test_update_site_settings_validation',
+        'test_section_write_isolation',
+        'test_site_stylesheet_bundle'
     ]
     
     all_results = []
@@ -312,6 +312,97 @@ class TestUploadAPI(unittest.TestCase):
                 'message': f'Error testing image processing: {str(e)}'
             })
     
+    def test_duplicate_upload_deduplicated(self):
+        """Test uploading identical bytes twice returns the same stored file"""
+        test_name = "Duplicate Upload Deduplicated"
+        try:
+            import tempfile
+            from PIL import Image
+            
+            with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp:
+                Image.new('RGB', (32, 32), (12, 34, 56)).save(tmp, format='PNG')
+                tmp_path = tmp.name
+            
+            original_token = self.api_client.auth_token
+            self.api_client.auth_token = f'Bearer {self.admin_token}'
+            self.api_client.auth_header = 'Authorization'
+            try:
+                first = self.api_client.upload_file('/api/upload/category-image', tmp_path, 'file')
+                second = self.api_client.upload_file('/api/upload/category-image', tmp_path, 'file')
+            finally:
+                self.api_client.auth_token = original_token
+                os.remove(tmp_path)
+            
+            first_url = first.json().get('url') if first.status_code == 200 else None
+            second_url = second.json().get('url') if second.status_code == 200 else None
+            
+            if first_url and first_url == second_url:
+                self.results.append({
+                    'test': test_name,
+                    'status': 'PASS',
+                    'message': f'Identical uploads share one blob: {first_url}'
+                })
+            else:
+                self.results.append({
+                    'test': test_name,
+                    'status': 'FAIL',
+                    'message': f'Identical uploads stored separately: {first_url} / {second_url}'
+                })
+                
+        except Exception as e:
+            self.results.append({
+                'test': test_name,
+                'status': 'ERROR',
+                'message': f'Error testing upload deduplication: {str(e)}'
+            })
+    
+    def test_delete_unreferenced_blob(self):
+        """Test deleting an upload nothing references removes the stored file right away"""
+        test_name = "Delete Unreferenced Blob"
+        try:
+            import tempfile
+            import random
+            from PIL import Image
+            
+            with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp:
+                color = tuple(random.randint(0, 255) for _ in range(3))
+                Image.new('RGB', (32, 32), color).save(tmp, format='PNG')
+                tmp_path = tmp.name
+            
+            original_token = self.api_client.auth_token
+            self.api_client.auth_token = f'Bearer {self.admin_token}'
+            self.api_client.auth_header = 'Authorization'
+            try:
+                upload = self.api_client.upload_file('/api/upload/category-image', tmp_path, 'file')
+                url = upload.json().get('url') if upload.status_code == 200 else None
+                delete = self.api_client.post('/api/delete-file', json_data={'file_path': url}) if url else None
+            finally:
+                self.api_client.auth_token = original_token
+                os.remove(tmp_path)
+            
+            fetch = self.api_client.get(url) if url else None
+            if delete is not None and delete.status_code == 200 and fetch.status_code == 404:
+                self.results.append({
+                    'test': test_name,
+                    'status': 'PASS',
+                    'message': f'Unreferenced blob deleted immediately: {url}'
+                })
+            else:
+                self.results.append({
+                    'test': test_name,
+                    'status': 'FAIL',
+                    'message': f'Blob not deleted: upload {upload.status_code}, '
+                               f'delete {delete.status_code if delete is not None else None}, '
+                               f'fetch {fetch.status_code if fetch is not None else None}'
+                })
+                
+        except Exception as e:
+            self.results.append({
+                'test': test_name,
+                'status': 'ERROR',
+                'message': f'Error testing blob deletion: {str(e)}'
+            })
+    
     def get_test_results(self):
         """Return test results"""
         return self.results
@@ -329,7 +420,9 @@ def run_upload_api_tests():
         'test_file_validation_rules',
         'test_upload_unauthorized_access',
         'test_background_removal_integration',
-        'test_image_compression_processing'
+        'test_image_compression_processing',
+        'test_duplicate_upload_deduplicated',
+        'test_delete_unreferenced_blob'
     ]
     
     all_results = []